@@ -5,15 +5,22 @@ import hashlib
 import json
 import logging
 import os
+import queue
 import re
 import stat
+import threading
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional, Union
 
 from frece.config import Config, load_config
-from frece.errors import AcquisitionError
+from frece.container import ContainerWriter
+from frece.errors import AcquisitionError, FreceError
+from frece.hash_cache import HashCache
+from frece.imagesource import ImageSource
+from frece.pieces import PieceHasher, manifest_path_for, merkle_root, write_piece_manifest
+from frece.pipeline import CopyPipeline, ring_buffer_size
 from frece.sandbox import SandboxedExecutor
 
 
@@ -22,6 +29,90 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+_PROGRESS_STEP = 100 * 1024 * 1024  # log acquisition progress every 100 MiB
+OUTPUT_FORMATS = ("raw", "frc")
+DURABILITY_MODES = ("file", "group")
+_SMALL_BATCH_FILES = 64  # small files handed to one worker at a time
+_SMALL_BATCH_BYTES = 8 * 1024 * 1024
+_GROUP_COMMIT = 256  # acquired files made durable and logged together
+
+
+def _walk_sources(
+    sources: list[Path], recursive: bool
+) -> Iterator[tuple[Path, int, Optional[str]]]:
+    """Yield ``(path, size, None)`` per file, or ``(path, 0, reason)`` on failure.
+
+    Directories are walked depth-first with ``os.scandir`` (one open
+    directory at a time, no symlinked directories), so the walk streams
+    instead of materialising the tree.
+    """
+    for source in sources:
+        source_path = Path(source)
+        if source_path.is_file():
+            try:
+                yield source_path, source_path.stat().st_size, None
+            except OSError as exc:
+                yield source_path, 0, str(exc)
+            continue
+        if not (source_path.is_dir() and recursive):
+            yield source_path, 0, "Source not found or unsupported for acquisition"
+            continue
+        stack = [str(source_path)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                yield Path(entry.path), entry.stat().st_size, None
+                        except OSError as exc:
+                            yield Path(entry.path), 0, str(exc)
+            except OSError as exc:
+                yield Path(directory), 0, f"Cannot list directory: {exc}"
+
+
+def _fsync_path(path: Path) -> None:
+    """fsync a file or directory by path (directories are skipped where unsupported)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # e.g. directories on Windows
+    finally:
+        os.close(fd)
+
+
+def _copy_error(source_path: Path, exc: OSError) -> AcquisitionError:
+    if isinstance(exc, FileNotFoundError):
+        return AcquisitionError(
+            f"Source not found: {source_path}",
+            remediation="Verify the file path",
+        )
+    return AcquisitionError(
+        f"Cannot acquire {source_path}",
+        remediation="Check file permissions and disk space",
+    )
+
+
+def _source_reader(source: ImageSource) -> Callable[[memoryview], int]:
+    """Sequential ``readinto`` over an :class:`ImageSource`, for the pipeline."""
+    offset = 0
+
+    def readinto(view: memoryview) -> int:
+        nonlocal offset
+        count = source.readinto(view, offset)
+        offset += count
+        return count
+
+    return readinto
+
+
 class AcquisitionBatchResult(dict):
     """Batch acquisition result with explicit failure tracking.
 
@@ -124,9 +215,11 @@ class EvidenceAcquisition:
         self,
         logger: Optional[logging.Logger] = None,
         config: Optional[Config] = None,
+        hash_cache: Optional[HashCache] = None,
     ):
         self.logger = logger or logging.getLogger(__name__)
         self.config = config or load_config()
+        self.hash_cache = hash_cache  # used by hash_file only, never by acquisition
         self.executor = SandboxedExecutor(logger)
 
     @staticmethod
@@ -184,6 +277,7 @@ class EvidenceAcquisition:
         output_path: Path,
         writeblock_required: bool = True,
         force_no_writeblock: bool = False,
+        output_format: str = "raw",
     ) -> dict:
         """Acquire device image with hashing.
 
@@ -192,6 +286,8 @@ class EvidenceAcquisition:
             output_path: Output image file.
             writeblock_required: If True, enforce write-block.
             force_no_writeblock: Override write-block requirement.
+            output_format: ``"raw"``, or ``"frc"`` for a seekable compressed
+                container with sparse zero chunks (see :mod:`frece.container`).
 
         Returns:
             Acquisition metadata dict with hashes.
@@ -199,6 +295,11 @@ class EvidenceAcquisition:
         Raises:
             AcquisitionError: If acquisition fails.
         """
+        if output_format not in OUTPUT_FORMATS:
+            raise AcquisitionError(
+                f"Unknown output format: {output_format}",
+                remediation=f"Use one of: {', '.join(OUTPUT_FORMATS)}",
+            )
         if writeblock_required and not force_no_writeblock:
             WriteBlockChecker.require_writeblock(source, force=False)
 
@@ -207,26 +308,50 @@ class EvidenceAcquisition:
 
         self.logger.info(f"Starting acquisition from {source} to {output_path}")
 
-        try:
-            with open(source, "rb") as src, open(output_path, "wb") as dst:
-                sha256_hash = hashlib.sha256()
-                # MD5 is computed for legacy chain-of-custody compatibility
-                # (many forensic standards/tools still record MD5 alongside
-                # SHA-256). usedforsecurity=False documents that this is an
-                # evidence-integrity checksum, not a cryptographic primitive.
-                md5_hash = hashlib.md5(usedforsecurity=False)
-                bytes_written = 0
-                chunk_size = self.config.chunk_size
-
-                while chunk := src.read(chunk_size):
-                    dst.write(chunk)
-                    sha256_hash.update(chunk)
-                    md5_hash.update(chunk)
-                    bytes_written += len(chunk)
+        # MD5 is computed for legacy chain-of-custody compatibility (many
+        # forensic standards/tools still record MD5 alongside SHA-256).
+        pipeline = CopyPipeline(
+            algorithms=("sha256", "md5"),
+            buffer_size=ring_buffer_size(
+                self.config.chunk_size, self.config.max_ram_per_operation
+            ),
+        )
+        pieces = PieceHasher(self.config.piece_size_mb * 1024 * 1024)
+        next_report = _PROGRESS_STEP
 
-                    if bytes_written % (100 * 1024 * 1024) == 0:
-                        self.logger.info(f"Acquired {bytes_written / (1024**3):.2f} GB")
+        def _progress(done: int) -> None:
+            nonlocal next_report
+            if done >= next_report:
+                self.logger.info(f"Acquired {done / (1024**3):.2f} GB")
+                next_report = done - done % _PROGRESS_STEP + _PROGRESS_STEP
 
+        try:
+            with open(source, "rb", buffering=0) as src, open(output_path, "wb") as dst:
+                writer = None
+                if output_format == "frc":
+                    writer = ContainerWriter(
+                        dst, level=self.config.container_compression_level
+                    )
+                try:
+                    result = pipeline.run(
+                        src.readinto,
+                        writer or dst,
+                        progress=_progress,
+                        sinks={"pieces": pieces.update},
+                    )
+                    if writer is not None:
+                        writer.finish(
+                            {
+                                "source": source,
+                                "acquired": _utc_now_iso(),
+                                "sha256": result.digests["sha256"],
+                                "md5": result.digests["md5"],
+                            }
+                        )
+                finally:
+                    if writer is not None:
+                        writer.abort()
+                bytes_written = result.bytes_processed
                 dst.flush()
                 os.fsync(dst.fileno())
 
@@ -246,14 +371,41 @@ class EvidenceAcquisition:
                 remediation="Check disk space and device status",
             ) from e
 
-        metadata = {
+        metadata: dict[str, Any] = {
             "source": source,
             "output_file": str(output_path),
             "timestamp": _utc_now_iso(),
             "bytes_acquired": bytes_written,
-            "sha256": sha256_hash.hexdigest(),
-            "md5": md5_hash.hexdigest(),
+            "sha256": result.digests["sha256"],
+            "md5": result.digests["md5"],
+            "throughput": result.throughput(),
+            "format": output_format,
         }
+        if writer is not None:
+            metadata["stored_bytes"] = writer.stored_bytes
+            metadata["sparse_chunks"] = writer.zero_chunks
+            metadata["compression_ratio"] = (
+                round(bytes_written / writer.stored_bytes, 2) if writer.stored_bytes else 0.0
+            )
+        pieces.finish()
+        manifest_path = manifest_path_for(output_path)
+        try:
+            write_piece_manifest(
+                pieces.manifest(
+                    output_path,
+                    digests={"sha256": metadata["sha256"], "md5": metadata["md5"]},
+                    source=source,
+                ),
+                manifest_path,
+            )
+        except OSError as e:
+            raise AcquisitionError(
+                f"Cannot write piece manifest: {manifest_path}",
+                remediation="Check disk space and permissions next to the image",
+            ) from e
+        metadata["piece_manifest"] = str(manifest_path)
+        metadata["piece_size"] = pieces.piece_size
+        metadata["merkle_root"] = merkle_root(pieces.digests)
 
         self.logger.info(
             json.dumps(
@@ -262,6 +414,7 @@ class EvidenceAcquisition:
                     "source": source,
                     "bytes": bytes_written,
                     "sha256": metadata["sha256"],
+                    "mb_per_s": metadata["throughput"]["mb_per_s"],
                 }
             )
         )
@@ -270,12 +423,23 @@ class EvidenceAcquisition:
 
     def hash_file(
         self,
-        file_path: Path,
+        file_path: Union[Path, ImageSource],
         algorithms: tuple[str, ...] = ("sha256", "sha1", "md5"),
     ) -> dict:
-        """Hash an evidence file with one or more algorithms."""
-        file_path = Path(file_path)
-        if not file_path.exists():
+        """Hash an evidence file with one or more algorithms.
+
+        An :class:`~frece.imagesource.ImageSource` is hashed as its logical
+        media, so a split raw set or an E01 image hashes like the original
+        device without being reassembled on disk. With a
+        :class:`~frece.hash_cache.HashCache`, an unchanged regular file is
+        answered from the cache (``"cached": true``) unless it is strict.
+        """
+        source: Optional[ImageSource]
+        if isinstance(file_path, ImageSource):
+            source, file_path = file_path, file_path.path
+        else:
+            source, file_path = None, Path(file_path)
+        if source is None and not file_path.exists():
             raise AcquisitionError(
                 f"File not found: {file_path}",
                 remediation="Verify the file path",
@@ -289,42 +453,63 @@ class EvidenceAcquisition:
 
         # MD5/SHA1 are supported for legacy chain-of-custody compatibility —
         # these are evidence-integrity checksums, not cryptographic security
-        # primitives, so usedforsecurity=False is set where the constructor
-        # accepts it (Python 3.9+ on OpenSSL backends).
-        _legacy_hash_algorithms = {"md5", "sha1"}
+        # primitives, so usedforsecurity=False is set (see pipeline.new_hasher).
         try:
-            hashers = {}
-            for alg in algorithms:
-                if alg.lower() in _legacy_hash_algorithms:
-                    hashers[alg] = hashlib.new(alg, usedforsecurity=False)
-                else:
-                    hashers[alg] = hashlib.new(alg)
+            pipeline = CopyPipeline(
+                algorithms=algorithms,
+                buffer_size=ring_buffer_size(
+                    self.config.chunk_size, self.config.max_ram_per_operation
+                ),
+            )
         except ValueError as e:
             raise AcquisitionError(
                 f"Unsupported hash algorithm: {e}",
                 remediation="Use algorithms supported by hashlib, such as sha256, sha1, or md5",
             ) from e
 
-        size = 0
+        cache = self.hash_cache if source is None else None
+        identity: Optional[os.stat_result] = None
+        if cache is not None:
+            identity = cache.identity(file_path)
+            try:
+                cached = cache.get(identity, algorithms) if identity else None
+            except FreceError as exc:
+                cache.disable(exc)
+                cached = None
+            if identity is not None and cached is not None:
+                return self._hash_result(
+                    file_path, identity.st_size, {**cached, "cached": True}
+                )
+
         try:
-            with open(file_path, "rb") as f:
-                while chunk := f.read(1024 * 1024):
-                    size += len(chunk)
-                    for hasher in hashers.values():
-                        hasher.update(chunk)
+            if source is not None:
+                run = pipeline.run(_source_reader(source))
+            else:
+                with open(file_path, "rb", buffering=0) as f:
+                    run = pipeline.run(f.readinto)
         except OSError as e:
             raise AcquisitionError(
                 f"Cannot read {file_path}",
                 remediation="Check file permissions",
             ) from e
+        if cache is not None and identity is not None:
+            try:
+                cache.put(file_path, identity, run.digests)
+            except FreceError as exc:
+                cache.disable(exc)
+        return self._hash_result(
+            file_path,
+            run.bytes_processed,
+            {**run.digests, "cached": False, "throughput": run.throughput()},
+        )
 
+    def _hash_result(self, file_path: Path, size: int, fields: dict) -> dict:
         result = {
             "source": str(file_path),
             "size_bytes": size,
             "timestamp": _utc_now_iso(),
         }
-        for alg, hasher in hashers.items():
-            result[alg] = hasher.hexdigest()
+        result.update(fields)
 
         self.logger.info(
             json.dumps(
@@ -333,6 +518,7 @@ class EvidenceAcquisition:
                     "source": str(file_path),
                     "sha256": result.get("sha256", ""),
                     "size_bytes": size,
+                    "cached": result.get("cached", False),
                     "timestamp": result["timestamp"],
                 }
             )
@@ -344,82 +530,205 @@ class EvidenceAcquisition:
         sources: list[Path],
         output_dir: Path,
         recursive: bool = False,
+        result_log: Optional[Path] = None,
+        collect: bool = True,
     ) -> AcquisitionBatchResult:
         """Acquire multiple files with hashing.
 
+        Files are streamed from an ``os.scandir`` walk through a bounded
+        queue to ``acquire_workers`` copy threads, so memory stays flat on
+        trees with millions of files. Files up to ``small_file_kb`` are
+        copied in batches by a single worker. Every result is appended to a
+        JSONL log (*result_log*, default ``<output_dir>/acquisition.jsonl``)
+        as soon as its copy is durable. With ``acquire_durability = "group"``
+        copies are not fsynced one by one; results are fsynced and logged in
+        groups instead.
+
         Args:
             sources: List of source file/directory paths.
             output_dir: Output directory.
             recursive: If True, recurse into directories.
+            result_log: JSONL log of every acquired or failed file.
+            collect: If False, results are only written to the log and the
+                returned ``acquired`` dict stays empty (for very large trees).
 
         Returns:
             Batch result with acquired-file metadata and surfaced failures.
         """
+        durability = self.config.acquire_durability
+        if durability not in DURABILITY_MODES:
+            raise AcquisitionError(
+                f"Unknown acquire_durability: {durability}",
+                remediation=f"Use one of: {', '.join(DURABILITY_MODES)}",
+            )
         output_dir.mkdir(parents=True, exist_ok=True)
+        result_log = result_log or output_dir / "acquisition.jsonl"
+        sync_each = durability == "file"
+        small_limit = self.config.small_file_kb * 1024
+        workers = self.config.acquire_workers or min(32, (os.cpu_count() or 1) + 4)
         acquired: dict[str, dict] = {}
         failed: dict[str, str] = {}
 
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {}
-
-            for source in sources:
-                source_path = Path(source)
+        work: queue.Queue = queue.Queue(maxsize=4 * workers)
+        results: queue.Queue = queue.Queue(maxsize=64 * workers)
+        walk_errors: list[BaseException] = []
 
-                if source_path.is_file():
-                    future = executor.submit(
-                        self._acquire_single_file, source_path, output_dir
+        def walker() -> None:
+            batch: list[Path] = []
+            batch_bytes = 0
+            try:
+                for path, size, error in _walk_sources(sources, recursive):
+                    if error is not None:
+                        results.put((str(path), None, error))
+                    elif size > small_limit:
+                        work.put(([path], False))
+                    else:
+                        batch.append(path)
+                        batch_bytes += size
+                        if len(batch) >= _SMALL_BATCH_FILES or batch_bytes >= _SMALL_BATCH_BYTES:
+                            work.put((batch, True))
+                            batch, batch_bytes = [], 0
+                if batch:
+                    work.put((batch, True))
+            except BaseException as exc:  # surfaced after the workers drain
+                walk_errors.append(exc)
+            finally:
+                for _ in range(workers):
+                    work.put(None)
+
+        def worker() -> None:
+            try:
+                while (item := work.get()) is not None:
+                    batch, small = item
+                    for result in self._acquire_batch(batch, small, output_dir, sync_each):
+                        results.put(result)
+            finally:
+                results.put(None)
+
+        threads = [threading.Thread(target=walker, name="frece-acq-walk", daemon=True)]
+        threads += [
+            threading.Thread(target=worker, name=f"frece-acq-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        pending: list[dict] = []
+        committed = 0
+        with open(result_log, "a", encoding="utf-8") as log:
+
+            def commit() -> None:
+                nonlocal committed
+                if not pending:
+                    return
+                if not sync_each:
+                    for record in pending:
+                        _fsync_path(Path(record["output_file"]))
+                _fsync_path(output_dir)  # makes the renames themselves durable
+                for record in pending:
+                    log.write(json.dumps(record) + "\n")
+                    if collect:
+                        acquired[record["source"]] = record
+                log.flush()
+                os.fsync(log.fileno())
+                committed += len(pending)
+                pending.clear()
+                self.logger.info(
+                    json.dumps(
+                        {
+                            "event": "ACQUIRE_PROGRESS",
+                            "acquired": committed,
+                            "failed": len(failed),
+                        }
                     )
-                    futures[str(source_path)] = future
-                elif source_path.is_dir() and recursive:
-                    for file_path in source_path.rglob("*"):
-                        if file_path.is_file():
-                            future = executor.submit(
-                                self._acquire_single_file, file_path, output_dir
-                            )
-                            futures[str(file_path)] = future
-                else:
-                    failed[str(source_path)] = (
-                        "Source not found or unsupported for acquisition"
-                    )
-                    self.logger.error(
-                        json.dumps(
-                            {
-                                "event": "ACQUIRE_FAILED",
-                                "source": str(source_path),
-                                "reason": failed[str(source_path)],
-                            }
-                        )
+                )
+
+            finished = 0
+            while finished < workers:
+                item = results.get()
+                if item is None:
+                    finished += 1
+                    continue
+                source_str, metadata, reason = item
+                if metadata is not None:
+                    pending.append(metadata)
+                    if len(pending) >= _GROUP_COMMIT:
+                        commit()
+                    continue
+                failed[source_str] = reason
+                log.write(json.dumps({"source": source_str, "error": reason}) + "\n")
+                self.logger.error(
+                    json.dumps(
+                        {
+                            "event": "ACQUIRE_FAILED",
+                            "source": source_str,
+                            "reason": reason,
+                        }
                     )
+                )
+            commit()
 
-            for source_str, future in futures.items():
-                try:
-                    acquired[source_str] = future.result()
-                except AcquisitionError as exc:
-                    failed[source_str] = exc.message
-                    self.logger.error(
-                        json.dumps(
-                            {
-                                "event": "ACQUIRE_FAILED",
-                                "source": source_str,
-                                "reason": exc.message,
-                            }
-                        )
-                    )
-                except Exception as exc:
-                    failed[source_str] = str(exc)
-                    self.logger.error(
-                        json.dumps(
-                            {
-                                "event": "ACQUIRE_FAILED",
-                                "source": source_str,
-                                "reason": str(exc),
-                            }
-                        )
-                    )
+        for thread in threads:
+            thread.join()
+        if walk_errors:
+            raise AcquisitionError(
+                f"Source walk failed: {walk_errors[0]}",
+                remediation="Check the source paths; results so far are in the result log",
+            ) from walk_errors[0]
 
         return AcquisitionBatchResult(acquired, failed)
 
-    def _acquire_single_file(self, source_path: Path, output_dir: Path) -> dict:
+    def _acquire_batch(
+        self, batch: list[Path], small: bool, output_dir: Path, sync: bool
+    ) -> list[tuple[str, Optional[dict], Optional[str]]]:
+        """Acquire a batch from the walker as ``(source, metadata, error)`` items."""
+        if small:
+            return [self._acquire_small_file(path, output_dir, sync) for path in batch]
+        items: list[tuple[str, Optional[dict], Optional[str]]] = []
+        for path in batch:
+            try:
+                items.append((str(path), self._acquire_single_file(path, output_dir, sync), None))
+            except AcquisitionError as exc:
+                items.append((str(path), None, exc.message))
+        return items
+
+    def _acquire_small_file(
+        self, source_path: Path, output_dir: Path, sync: bool
+    ) -> tuple[str, Optional[dict], Optional[str]]:
+        """Copy a small file with one read and one write, skipping the chunk loop."""
+        source_str = str(source_path)
+        try:
+            data = source_path.read_bytes()
+        except OSError as e:
+            return source_str, None, _copy_error(source_path, e).message
+        sha256_hex = hashlib.sha256(data).hexdigest()
+        output_file = output_dir / f"{sha256_hex[:8]}_{source_path.name}"
+        tmp_path = output_dir / f".acquiring_{uuid.uuid4().hex}_{source_path.name}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if sync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, output_file)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            return source_str, None, _copy_error(source_path, e).message
+        return source_str, {
+            "source": source_str,
+            "output_file": str(output_file),
+            "sha256": sha256_hex,
+            "size_bytes": len(data),
+            "timestamp": _utc_now_iso(),
+        }, None
+
+    def _acquire_single_file(
+        self, source_path: Path, output_dir: Path, sync: bool = True
+    ) -> dict:
         """Acquire a single file with hashing.
 
         Streams the source file exactly once: hashes and copies simultaneously,
@@ -429,13 +738,13 @@ class EvidenceAcquisition:
         Args:
             source_path: Source file path.
             output_dir: Output directory.
+            sync: fsync the copy before it is renamed into place.
 
         Returns:
             File metadata dict.
         """
-        import uuid
-
         sha256_hash = hashlib.sha256()
+        size = 0
         # Unique temp name so parallel acquisitions never collide on the same path
         tmp_path = output_dir / f".acquiring_{uuid.uuid4().hex}_{source_path.name}.tmp"
 
@@ -444,19 +753,13 @@ class EvidenceAcquisition:
                 while chunk := src.read(self.config.chunk_size):
                     sha256_hash.update(chunk)
                     dst.write(chunk)
+                    size += len(chunk)
                 dst.flush()
-                os.fsync(dst.fileno())
+                if sync:
+                    os.fsync(dst.fileno())
         except OSError as e:
             tmp_path.unlink(missing_ok=True)
-            if isinstance(e, FileNotFoundError):
-                raise AcquisitionError(
-                    f"Source not found: {source_path}",
-                    remediation="Verify the file path",
-                ) from e
-            raise AcquisitionError(
-                f"Cannot acquire {source_path}",
-                remediation="Check file permissions and disk space",
-            ) from e
+            raise _copy_error(source_path, e) from e
 
         partial_hex = sha256_hash.hexdigest()[:8]
         output_file = output_dir / f"{partial_hex}_{source_path.name}"
@@ -474,5 +777,6 @@ class EvidenceAcquisition:
             "source": str(source_path),
             "output_file": str(output_file),
             "sha256": sha256_hash.hexdigest(),
+            "size_bytes": size,
             "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         }
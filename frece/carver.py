@@ -9,7 +9,7 @@ import struct
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, BinaryIO, Generator
+from typing import Any, BinaryIO, Generator, Union
 
 from frece.classifier import classify_file
 try:
@@ -27,6 +27,7 @@ except ImportError:
 from frece.metadata import extract as extract_metadata
 from frece.scoring import score_artifact
 from frece.errors import CarveError, ValidationError
+from frece.imagesource import ImageSource
 
 
 def _utc_now_iso() -> str:
@@ -34,6 +35,29 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+# ── carve sources ────────────────────────────────────────────────────────────
+# A source is a filesystem path or an ``imagesource.ImageSource`` (raw, split
+# raw or native E01), which is read in place.
+CarveSource = Union[Path, ImageSource]
+
+
+def _as_source(source: Any) -> Any:
+    return source if isinstance(source, ImageSource) else Path(source)
+
+
+def _open_source(source: Any) -> BinaryIO:
+    """Open an independent seekable binary handle on *source*."""
+    if isinstance(source, ImageSource):
+        return source.open()
+    return open(source, "rb")
+
+
+def _source_size(source: Any) -> int:
+    if isinstance(source, ImageSource):
+        return source.size
+    return Path(source).stat().st_size
+
+
 @dataclass
 class CarvedFile:
     """Metadata for a carved file."""
@@ -282,14 +306,18 @@ class StreamingCarver:
 
     def carve(
         self,
-        source_path: Path,
+        source_path: CarveSource,
         output_dir: Path,
         verify: bool = True,
         yara_rules_path: object = None,
         show_progress: bool = False,
     ):
-        """Carve files from source with streaming reads."""
-        source_path = Path(source_path)
+        """Carve files from source with streaming reads.
+
+        *source_path* may be a path or an :class:`~frece.imagesource.ImageSource`,
+        so split raw sets and E01 media are carved in place.
+        """
+        source_path = _as_source(source_path)
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -449,7 +477,7 @@ class StreamingCarver:
         return manifest
 
     def _scan_and_hash(
-        self, source_path: Path, show_progress: bool = False
+        self, source_path: CarveSource, show_progress: bool = False
     ) -> tuple[str, dict[int, list[str]]]:
         """Single pass: compute SHA256 and collect all signature positions."""
         sha256 = hashlib.sha256()
@@ -457,7 +485,7 @@ class StreamingCarver:
         chunk_offset = 0
         previous_overlap = b""
 
-        with open(source_path, "rb") as handle:
+        with _open_source(source_path) as handle:
             while True:
                 chunk = handle.read(self.chunk_size)
                 if not chunk:
@@ -478,9 +506,9 @@ class StreamingCarver:
 
         return sha256.hexdigest(), found_sigs
 
-    def _measure_file_size(self, source_path: Path, offset: int, file_type: str) -> int:
+    def _measure_file_size(self, source_path: CarveSource, offset: int, file_type: str) -> int:
         """Determine how many bytes to carve — type-specific termination prevents over-run."""
-        with open(source_path, "rb") as handle:
+        with _open_source(source_path) as handle:
             handle.seek(offset)
             if file_type in {"mp4", "mov", "heic", "m4v"}:
                 return self._get_mp4_size(handle, offset, source_path)
@@ -633,7 +661,7 @@ class StreamingCarver:
         total += len(carry)
         return max(total, 1)
 
-    def _quick_validate_sig(self, source_path: Path, offset: int, sig_type: str) -> bool:
+    def _quick_validate_sig(self, source_path: CarveSource, offset: int, sig_type: str) -> bool:
         """Fast pre-validation to reject obvious false positives before full carving.
 
         Returns True if the hit looks plausible, False to discard it.
@@ -646,7 +674,7 @@ class StreamingCarver:
             return True
 
         try:
-            with open(source_path, "rb") as fh:
+            with _open_source(source_path) as fh:
                 fh.seek(offset)
                 # Bug-B fix: read 128 bytes so PE offset field (at byte 60) is reachable
                 head = fh.read(128)
@@ -735,7 +763,7 @@ class StreamingCarver:
         return True
 
     def _disambiguate_type(
-        self, source_path: Path, offset: int, types: list[str]
+        self, source_path: CarveSource, offset: int, types: list[str]
     ) -> str:
         """Resolve ambiguous signatures to a specific canonical type."""
         unique_types = set(types)
@@ -743,7 +771,7 @@ class StreamingCarver:
         # ── ftyp ISO Base Media (MP4, MOV, HEIC, HEIF, M4V, …) ──────────────
         if "ftyp" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset + 8)
                     brand = handle.read(4)
                     handle.seek(offset + 8)
@@ -766,7 +794,7 @@ class StreamingCarver:
         # ── RIFF container: WAV / AVI / WebP ─────────────────────────────────
         if "riff" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset + 8)
                     riff_type = handle.read(4)
                     if riff_type == b"WAVE":
@@ -782,7 +810,7 @@ class StreamingCarver:
         # ── ZIP / DOCX / XLSX / PPTX ─────────────────────────────────────────
         if "zip" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset + 30)
                     filename = handle.read(256).split(b"\x00")[0].decode(
                         "utf-8", errors="ignore"
@@ -800,7 +828,7 @@ class StreamingCarver:
         # ── OLE compound document: DOC / XLS / PPT / MSG ─────────────────────
         if "ole" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset)
                     sample = handle.read(4096)
                 # Look for well-known OLE stream name markers
@@ -819,7 +847,7 @@ class StreamingCarver:
         # ── EML: validate it has RFC-822 headers ─────────────────────────────
         if "eml" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset)
                     next_bytes = handle.read(512)
                     if re.search(rb"^[A-Za-z\-]+:\s", next_bytes, re.MULTILINE):
@@ -832,7 +860,7 @@ class StreamingCarver:
         # ── Script: check shebang line ────────────────────────────────────────
         if "script" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset)
                     line = handle.read(64)
                     if b"python" in line:
@@ -852,7 +880,7 @@ class StreamingCarver:
         # ── PE: validate MZ header ────────────────────────────────────────────
         if "pe" in unique_types:
             try:
-                with open(source_path, "rb") as handle:
+                with _open_source(source_path) as handle:
                     handle.seek(offset)
                     header = handle.read(64)
                     if header[:2] == b"MZ":
@@ -873,7 +901,7 @@ class StreamingCarver:
         return types[0] if types else "unknown"
 
     def _write_carved_file(
-        self, source_path: Path, offset: int, size: int, output_file: Path
+        self, source_path: CarveSource, offset: int, size: int, output_file: Path
     ) -> tuple[str, int]:
         """Stream-copy bytes from the source image into an output artifact."""
         sha256 = hashlib.sha256()
@@ -881,7 +909,7 @@ class StreamingCarver:
         chunk_size = 4 * 1024 * 1024
 
         try:
-            with open(source_path, "rb") as src, open(output_file, "wb") as dst:
+            with _open_source(source_path) as src, open(output_file, "wb") as dst:
                 src.seek(offset)
                 remaining = size
                 while remaining > 0:
@@ -904,9 +932,9 @@ class StreamingCarver:
 
         return sha256.hexdigest(), written
 
-    def _get_mp4_size(self, handle: BinaryIO, offset: int, source_path: Path) -> int:
+    def _get_mp4_size(self, handle: BinaryIO, offset: int, source_path: CarveSource) -> int:
         """Scan forward from ftyp to find total file extent via mdat atom."""
-        source_size = source_path.stat().st_size
+        source_size = _source_size(source_path)
         fallback_size = source_size - offset
         if self.max_video_size > 0:
             fallback_size = min(fallback_size, self.max_video_size)
@@ -938,10 +966,10 @@ class StreamingCarver:
             pos += atom_size
         return fallback_size
 
-    def _find_zip_end(self, handle: BinaryIO, offset: int, source_path: Path) -> int:
+    def _find_zip_end(self, handle: BinaryIO, offset: int, source_path: CarveSource) -> int:
         """Find ZIP end-of-central-directory to bound ZIP-based containers."""
         start_pos = handle.tell()
-        source_size = source_path.stat().st_size
+        source_size = _source_size(source_path)
         max_size = min(500 * 1024 * 1024, source_size - offset)
         chunk_size = 1024 * 1024
         overlap = 66 * 1024
@@ -1014,10 +1042,10 @@ class StreamingCarver:
 
         return min(max_size, pos - start_pos)
 
-    def _find_pdf_end(self, handle: BinaryIO, offset: int, source_path: Path) -> int:
+    def _find_pdf_end(self, handle: BinaryIO, offset: int, source_path: CarveSource) -> int:
         """Find the last PDF EOF marker within the carving window."""
         start_pos = handle.tell()
-        source_size = source_path.stat().st_size
+        source_size = _source_size(source_path)
         max_size = min(500 * 1024 * 1024, source_size - offset)
 
         chunk_size = 1024 * 1024
@@ -117,6 +117,35 @@ ENTROPY_MEDIUM = 6.5  # possibly compressed or encoded
 ENTROPY_LOW = 3.0     # text / structured data
 
 
+# Triage tiers, most urgent first
+PRIORITY_ORDER: tuple[str, ...] = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+# File extensions that name a type by something other than its canonical key
+_EXTENSION_TYPE: dict[str, str] = {
+    "exe": "pe", "dll": "pe", "sys": "pe", "scr": "pe", "msi": "pe",
+    "so": "elf", "ko": "elf",
+    "dylib": "macho",
+    "sh": "script", "bat": "script", "cmd": "script", "ps1": "script",
+    "vbs": "script", "js": "script", "py": "script", "pl": "script",
+    "sqlite3": "sqlite", "db3": "sqlite",
+    "pf": "prefetch",
+    "dat": "hive",
+    "cap": "pcap",
+}
+
+# Path fragments (lower-case, "/"-separated) that move a file up or down a tier
+_HOT_PATH_HINTS = (
+    "/users/", "/home/", "documents/", "desktop/", "downloads/", "/.ssh/",
+    "appdata/roaming/", "/recent/", "outlook/", "thunderbird/",
+    "$recycle.bin/", "/.trash",
+)
+_COLD_PATH_HINTS = (
+    "windows/winsxs/", "windows/installer/", "/cache/", "/caches/",
+    "/temp/", "/tmp/", "thumbs.db", "/$extend/", "/node_modules/",
+)
+_LARGE_FILE = 512 * 1024 * 1024  # media-sized: defer so small evidence lands first
+
+
 @dataclass
 class ClassificationResult:
     """Result of classifying a single file."""
@@ -219,6 +248,28 @@ def classify_file(
     )
 
 
+def predict_priority(name: str, size: int = 0) -> str:
+    """Estimate the triage priority of a file before its content is available.
+
+    Applies the same category table and :func:`_compute_priority` rules as
+    :func:`classify_file`, with the type taken from the extension and entropy
+    taken as zero.  User-data paths are promoted one tier, cache/system paths
+    and very large files are demoted one tier.
+    """
+    normalized = "/" + name.replace("\\", "/").lower().lstrip("/")
+    basename = normalized.rsplit("/", 1)[-1]
+    extension = basename.rsplit(".", 1)[-1] if "." in basename else ""
+    file_type = _EXTENSION_TYPE.get(extension, extension)
+    category = _TYPE_CATEGORY.get(file_type, ForensicCategory.UNKNOWN)
+    rank = PRIORITY_ORDER.index(_compute_priority(category, file_type, 0.0, Path(name)))
+
+    if any(hint in normalized for hint in _COLD_PATH_HINTS) or size >= _LARGE_FILE:
+        rank += 1
+    elif any(hint in normalized for hint in _HOT_PATH_HINTS):
+        rank -= 1
+    return PRIORITY_ORDER[max(0, min(rank, len(PRIORITY_ORDER) - 1))]
+
+
 def classify_bytes(
     data: bytes,
     file_type: str,
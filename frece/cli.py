@@ -6,6 +6,7 @@ import getpass
 import json
 import os
 import re
+import sqlite3
 import subprocess
 import sys
 from dataclasses import asdict
@@ -25,21 +26,29 @@ from frece.custody import (
     rotate_case_secret_key,
 )
 from frece.errors import AcquisitionError, CustodyError, FreceError, RecoveryError
+from frece.filetype import detect_path_type
+from frece.export_cache import ExportCache, default_export_dir
+from frece.hash_cache import HashCache, default_hash_cache_path
+from frece.listing_cache import ListingCache, default_cache_path
 from frece.logging import setup_logging
 from frece.partition import list_partitions
+from frece.pieces import load_piece_manifest, manifest_path_for, verify_pieces
 from frece.recovery import DeletedFileRecovery
 from frece.sandbox import InputValidator
-from frece.ewf import open_image, is_ewf_image
+from frece.ewf import EwfImage, open_image, is_ewf_image
 from frece.metadata import extract as extract_metadata
 from frece.report import render_html_report, render_dfxml_report
 from frece.scoring import score_batch
 from frece.trash import TrashRecovery
 from frece.timeline import (
-    build_timeline,
-    events_to_csv,
-    events_to_json,
-    events_to_text,
+    TimelineIndex,
+    default_index_path,
+    filter_events,
+    parse_when,
+    stream_timeline,
+    write_events,
 )
+from frece.toolrunner import configure_runner, get_runner
 
 
 def _utc_now_iso() -> str:
@@ -74,6 +83,7 @@ def main(argv: list[str] | None = None) -> int:
 
     try:
         validate_cli_args(args)
+        configure_runner(load_config().max_tool_processes)
         if args.command == "tool-status":
             return check_tools()
         if args.command == "carve":
@@ -110,6 +120,8 @@ def main(argv: list[str] | None = None) -> int:
             return handle_metadata(args)
         if args.command == "score":
             return handle_score(args)
+        if args.command == "cache":
+            return handle_cache(args)
     except FreceError as exc:
         print(str(exc), file=sys.stderr)
         return 1
@@ -144,10 +156,17 @@ def validate_cli_args(args: argparse.Namespace) -> None:
         args.image = InputValidator.validate_path(str(args.image))
         return
 
+    if args.command == "cache":
+        if getattr(args, "image", None) is not None:
+            args.image = InputValidator.validate_path(str(args.image))
+        return
+
     if args.command == "hash":
         args.source = InputValidator.validate_path(str(args.source))
         if args.output is not None:
             args.output = InputValidator.validate_path(str(args.output))
+        if args.verify_pieces:
+            args.verify_pieces = InputValidator.validate_path(args.verify_pieces)
         return
 
     if args.command == "acquire":
@@ -323,6 +342,27 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Write hash result to JSON file",
     )
+    hash_parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Answer from the hash cache when the file looks unchanged instead of "
+        "re-reading it (not for hashes recorded for chain of custody)",
+    )
+    hash_parser.add_argument(
+        "--verify-pieces",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="MANIFEST",
+        help="Verify the image against its piece manifest "
+        "(default: <source>.pieces.json) and report corrupted ranges",
+    )
+    hash_parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Pieces verified in parallel with --verify-pieces (default: CPU count)",
+    )
 
     recover_parser = subparsers.add_parser(
         "recover",
@@ -351,6 +391,44 @@ def build_parser() -> argparse.ArgumentParser:
         default=0,
         help="Timeout in seconds for Sleuth Kit commands (0 = unlimited)",
     )
+    recover_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip inodes already recovered by an interrupted run (per the output journal)",
+    )
+    recover_parser.add_argument(
+        "--prioritize",
+        action="store_true",
+        help="Extract likely high-value files first, rewriting the manifest after each tier",
+    )
+
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Inspect or invalidate cached fls listings and E01 exports",
+    )
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command")
+    cache_list = cache_subparsers.add_parser("list", help="List cached image listings")
+    cache_clear = cache_subparsers.add_parser(
+        "clear",
+        help="Drop cached listings (all, or for one image)",
+    )
+    cache_clear.add_argument(
+        "--image",
+        type=Path,
+        default=None,
+        help="Only drop listings for this image (all offsets)",
+    )
+    for cache_sub in (cache_list, cache_clear):
+        cache_sub.add_argument(
+            "--exports",
+            action="store_true",
+            help="Operate on cached ewfexport raw images instead of fls listings",
+        )
+    cache_clear.add_argument(
+        "--hashes",
+        action="store_true",
+        help="Drop cached file digests (all, or for the --image path) instead",
+    )
 
     trash_parser = subparsers.add_parser(
         "trash",
@@ -423,6 +501,13 @@ def build_parser() -> argparse.ArgumentParser:
     acquire_parser.add_argument("--output", required=True, type=Path)
     acquire_parser.add_argument("--force-no-writeblock", action="store_true")
     acquire_parser.add_argument("--no-writeblock-required", action="store_true")
+    acquire_parser.add_argument(
+        "--format",
+        choices=("raw", "frc"),
+        default="raw",
+        help="Output format: raw copy, or frc seekable compressed container "
+        "with sparse zero chunks (default: raw)",
+    )
 
     custody_parser = subparsers.add_parser(
         "custody",
@@ -443,8 +528,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     custody_encrypt_p.add_argument("case_dir", type=Path)
     custody_encrypt_p.add_argument(
-        "--passphrase", required=True,
-        help="Encryption passphrase",
+        "--passphrase", default=None,
+        help="Encryption passphrase (optional while the key agent holds the key)",
     )
 
     custody_decrypt_p = custody_subparsers.add_parser(
@@ -453,14 +538,28 @@ def build_parser() -> argparse.ArgumentParser:
     )
     custody_decrypt_p.add_argument("enc_file", type=Path)
     custody_decrypt_p.add_argument(
-        "--passphrase", required=True,
-        help="Decryption passphrase",
+        "--passphrase", default=None,
+        help="Decryption passphrase (optional while the key agent holds the key)",
     )
     custody_decrypt_p.add_argument(
         "--output", type=Path, default=None,
         help="Output path for decrypted DB",
     )
 
+    custody_agent_p = custody_subparsers.add_parser(
+        "agent",
+        help="Keep derived encryption keys unlocked for this session",
+    )
+    custody_agent_p.add_argument("agent_command", choices=["start", "stop", "status"])
+    custody_agent_p.add_argument(
+        "--ttl", type=int, default=None,
+        help="Seconds to keep keys unlocked (default: custody_agent_ttl, 900)",
+    )
+    custody_agent_p.add_argument(
+        "--socket", type=Path, default=None,
+        help="Agent socket (default: $FRECE_AGENT_SOCK or a per-user runtime dir)",
+    )
+
     case_parser = subparsers.add_parser(
         "case",
         help="Manage FRECE investigation cases",
@@ -508,6 +607,12 @@ def build_parser() -> argparse.ArgumentParser:
         default="json",
         dest="report_format",
     )
+    report_parser.add_argument(
+        "--full-verify",
+        action="store_true",
+        help="Re-verify the whole custody log instead of entries after the last "
+        "confirmed checkpoint",
+    )
 
     # ── timeline ───────────────────────────────────────────────────
     timeline_parser = subparsers.add_parser(
@@ -535,6 +640,49 @@ def build_parser() -> argparse.ArgumentParser:
         dest="mactime_file",
         help="Supplemental fls -m body file to merge into the timeline",
     )
+    timeline_parser.add_argument(
+        "--from",
+        dest="time_from",
+        default=None,
+        help="Only events at or after this time (ISO-8601 or epoch seconds)",
+    )
+    timeline_parser.add_argument(
+        "--to",
+        dest="time_to",
+        default=None,
+        help="Only events before this time (ISO-8601 or epoch seconds)",
+    )
+    timeline_parser.add_argument(
+        "--source",
+        dest="sources",
+        action="append",
+        default=None,
+        help="Only this event source (filesystem, recovery, carving, custody); repeatable",
+    )
+    timeline_parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        default=None,
+        help="Only this event type (modified, carved, acquire, ...); repeatable",
+    )
+    timeline_parser.add_argument(
+        "--path-glob",
+        default=None,
+        help="Only artifacts whose path matches this glob (case-sensitive)",
+    )
+    timeline_parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Parse every source instead of using the case's timeline.db index",
+    )
+    timeline_parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=None,
+        help="With --no-index: events held in memory before sorted runs spill to disk "
+        "(default: timeline_memory_mb, 256)",
+    )
 
     # ── search ──────────────────────────────────────────────────────
     search_parser = subparsers.add_parser(
@@ -743,13 +891,25 @@ def handle_carve(args: argparse.Namespace) -> int:
 
     carver = StreamingCarver(config)
 
-    with open_image(args.source) as handle:
-        source_path = handle.raw_path
+    with open_image(
+        args.source,
+        cache_bytes=config.ewf_cache_mb * 1024 * 1024,
+        readahead_workers=config.ewf_readahead_workers,
+        export_cache=_export_cache(config),
+    ) as handle:
+        source_path = handle.source
+        native = getattr(handle, "native", False)
         if is_ewf_image(args.source):
-            logger.info(json.dumps({"event": "EWF_EXPORT", "source": str(args.source),
-                                    "raw_path": str(source_path)}))
-            print("E01/EWF image detected — exported to raw for carving",
-                  file=sys.stderr)
+            if native:
+                logger.info(json.dumps({"event": "EWF_NATIVE", "source": str(args.source),
+                                        "segments": handle.image_info.get("segments")}))
+                print("E01/EWF image detected — carving through the native reader",
+                      file=sys.stderr)
+            else:
+                logger.info(json.dumps({"event": "EWF_EXPORT", "source": str(args.source),
+                                        "raw_path": str(source_path)}))
+                print("E01/EWF image detected — exported to raw for carving",
+                      file=sys.stderr)
 
         show_prog = getattr(args, "progress", False)
         manifest = carver.carve(
@@ -758,10 +918,16 @@ def handle_carve(args: argparse.Namespace) -> int:
             yara_rules_path=yara_rules_path,
             show_progress=show_prog,
         )
+        cache_stats = source_path.cache_stats() if isinstance(source_path, EwfImage) else None
+        if cache_stats is not None:
+            logger.info(json.dumps({"event": "EWF_CACHE_STATS", "source": str(args.source),
+                                    **cache_stats}))
 
     output = manifest.to_dict()
     output["manifest_path"] = str(args.output / "carve_manifest.json")
     output["files_carved"] = len(manifest.carved_files)
+    if cache_stats is not None:
+        output["ewf_cache"] = cache_stats
     logger.info(
         json.dumps(
             {
@@ -779,7 +945,13 @@ def handle_recover(args: argparse.Namespace) -> int:
     """Handle the recover command."""
     logger = setup_logging(args.log_dir, name="frece.recovery")
     config = load_config()
-    recovery = DeletedFileRecovery(logger, config=config, timeout=args.timeout)
+    recovery = DeletedFileRecovery(
+        logger,
+        config=config,
+        timeout=args.timeout,
+        listing_cache=_listing_cache(config),
+        hash_cache=_hash_cache(config),
+    )
 
     inodes = None
     if args.inodes:
@@ -801,6 +973,8 @@ def handle_recover(args: argparse.Namespace) -> int:
         verify=args.verify_inodes,
         inodes=inodes,
         file_types=file_types,
+        resume=args.resume,
+        prioritize=args.prioritize,
     )
 
     print(
@@ -816,6 +990,66 @@ def handle_recover(args: argparse.Namespace) -> int:
     return 0
 
 
+def _listing_cache(config) -> ListingCache | None:
+    """Return the shared fls listing cache unless disabled in config."""
+    if not config.listing_cache:
+        return None
+    return ListingCache(default_cache_path(config.cache_dir))
+
+
+def _hash_cache(config, strict: bool = False) -> HashCache | None:
+    """Return the shared digest cache unless disabled in config."""
+    if not config.hash_cache:
+        return None
+    return HashCache(
+        default_hash_cache_path(config.cache_dir),
+        strict=strict or config.hash_cache_strict,
+    )
+
+
+def _export_cache(config) -> ExportCache | None:
+    """Return the shared ewfexport cache unless disabled in config."""
+    if config.export_cache_gb <= 0:
+        return None
+    return ExportCache(
+        default_export_dir(config.cache_dir), config.export_cache_gb * 1024 ** 3
+    )
+
+
+def handle_cache(args: argparse.Namespace) -> int:
+    """Handle the cache command - list or invalidate cached listings and exports."""
+    config = load_config()
+    cache_command = getattr(args, "cache_command", None)
+    if cache_command == "clear" and getattr(args, "hashes", False):
+        with HashCache(default_hash_cache_path(config.cache_dir)) as hashes:
+            removed = hashes.invalidate(getattr(args, "image", None))
+        print(json.dumps({"removed_hashes": removed}, indent=2))
+        return 0
+    if getattr(args, "exports", False):
+        exports = ExportCache(
+            default_export_dir(config.cache_dir), config.export_cache_gb * 1024 ** 3
+        )
+        if cache_command == "list":
+            print(json.dumps(exports.list_exports(), indent=2))
+            return 0
+        if cache_command == "clear":
+            removed = exports.invalidate(getattr(args, "image", None))
+            print(json.dumps({"removed_exports": removed}, indent=2))
+            return 0
+
+    cache = ListingCache(default_cache_path(config.cache_dir))
+    if cache_command == "list":
+        print(json.dumps(cache.list_listings(), indent=2))
+        return 0
+    if cache_command == "clear":
+        removed = cache.invalidate(getattr(args, "image", None))
+        print(json.dumps({"removed_listings": removed}, indent=2))
+        return 0
+
+    print("Specify a subcommand: 'frece cache list' or 'frece cache clear'.", file=sys.stderr)
+    return 1
+
+
 def _trash_to_csv(entries: list) -> str:
     """Render trash entries as CSV for spreadsheet/automation workflows."""
     import csv
@@ -841,7 +1075,13 @@ def handle_trash(args: argparse.Namespace) -> int:
     import tempfile
 
     logger = setup_logging(name="frece.trash")
-    trash = TrashRecovery(logger)
+    config = load_config()
+    trash = TrashRecovery(
+        logger,
+        config,
+        listing_cache=_listing_cache(config),
+        hash_cache=_hash_cache(config),
+    )
     trash_command = getattr(args, "trash_command", None)
 
     if trash_command is None:
@@ -945,6 +1185,7 @@ def handle_acquire(args: argparse.Namespace) -> int:
         args.output,
         writeblock_required=not args.no_writeblock_required,
         force_no_writeblock=args.force_no_writeblock,
+        output_format=args.format,
     )
     print(json.dumps(metadata, indent=2))
     return 0
@@ -954,7 +1195,9 @@ def handle_scan(args: argparse.Namespace) -> int:
     """Handle the scan command - list deleted files, no extraction."""
     logger = setup_logging(name="frece.scan")
     config = load_config()
-    recovery = DeletedFileRecovery(logger, config=config, timeout=args.timeout)
+    recovery = DeletedFileRecovery(
+        logger, config=config, timeout=args.timeout, listing_cache=_listing_cache(config)
+    )
 
     all_entries_flag = getattr(args, "all_entries", False)
     use_mactime = getattr(args, "mactime", False)
@@ -1024,11 +1267,31 @@ def handle_scan(args: argparse.Namespace) -> int:
 
 def handle_hash(args: argparse.Namespace) -> int:
     """Handle the hash command."""
-    acquisition = EvidenceAcquisition(setup_logging(name="frece.hash"))
-    algorithms = tuple(
-        algorithm.strip() for algorithm in args.algorithms.split(",") if algorithm.strip()
-    )
-    result = acquisition.hash_file(args.source, algorithms=algorithms)
+    logger = setup_logging(name="frece.hash")
+    if args.verify_pieces is not None:
+        manifest_path = args.verify_pieces or manifest_path_for(args.source)
+        result = verify_pieces(
+            args.source, load_piece_manifest(manifest_path), workers=args.workers
+        )
+        logger.info(
+            json.dumps(
+                {
+                    "event": "PIECES_VERIFIED",
+                    "image": str(args.source),
+                    "verified": result["verified"],
+                    "corrupted": len(result["corrupted"]),
+                }
+            )
+        )
+    else:
+        algorithms = tuple(
+            algorithm.strip() for algorithm in args.algorithms.split(",") if algorithm.strip()
+        )
+        config = load_config()
+        acquisition = EvidenceAcquisition(
+            logger, config=config, hash_cache=_hash_cache(config, strict=not args.use_cache)
+        )
+        result = acquisition.hash_file(args.source, algorithms=algorithms)
     output_str = json.dumps(result, indent=2)
 
     if args.output:
@@ -1037,7 +1300,7 @@ def handle_hash(args: argparse.Namespace) -> int:
     else:
         print(output_str)
 
-    return 0
+    return 0 if result.get("verified", True) else 1
 
 
 def handle_partitions(args: argparse.Namespace) -> int:
@@ -1048,16 +1311,18 @@ def handle_partitions(args: argparse.Namespace) -> int:
 
 
 def handle_custody(args: argparse.Namespace) -> int:
-    """Handle custody subcommands: verify, encrypt, decrypt."""
+    """Handle custody subcommands: verify, encrypt, decrypt, agent."""
     if args.custody_command == "verify":
         return verify_custody_case(args.case_dir, args.evidence_id, args.source)
     if args.custody_command == "encrypt":
         return _handle_custody_encrypt(args)
     if args.custody_command == "decrypt":
         return _handle_custody_decrypt(args)
+    if args.custody_command == "agent":
+        return _handle_custody_agent(args)
     raise CustodyError(
         "Missing custody subcommand",
-        remediation="Use 'frece custody verify|encrypt|decrypt'",
+        remediation="Use 'frece custody verify|encrypt|decrypt|agent'",
     )
 
 
@@ -1073,7 +1338,7 @@ def _handle_custody_encrypt(args: argparse.Namespace) -> int:
         print(json.dumps({
             "status": "encrypted", "plaintext": str(db_path),
             "encrypted": str(enc), "algorithm": "AES-256-GCM",
-            "kdf": "scrypt(N=2^20,r=8,p=1)",
+            "format": "FRECE_ENC_V2", "kdf": "scrypt(N=2^20,r=8,p=1)",
         }, indent=2))
         return 0
     except Exception as exc:
@@ -1081,6 +1346,22 @@ def _handle_custody_encrypt(args: argparse.Namespace) -> int:
         return 1
 
 
+def _handle_custody_agent(args: argparse.Namespace) -> int:
+    """Start, stop or query the custody key agent."""
+    from frece import keyagent
+    if args.agent_command == "start":
+        ttl = args.ttl if args.ttl is not None else load_config().custody_agent_ttl
+        print(json.dumps(keyagent.start_agent(ttl, args.socket), indent=2))
+        return 0
+    if args.agent_command == "stop":
+        stopped = keyagent.stop_agent(args.socket)
+        print(json.dumps({"status": "stopped" if stopped else "not running"}, indent=2))
+        return 0
+    status = keyagent.agent_status(args.socket)
+    print(json.dumps(status or {"ok": False, "status": "not running"}, indent=2))
+    return 0 if status else 1
+
+
 def _handle_custody_decrypt(args: argparse.Namespace) -> int:
     """Decrypt a custody.db.enc file."""
     from frece.custody import decrypt_custody_db
@@ -1107,6 +1388,7 @@ def handle_case(args: argparse.Namespace, extras: list[str]) -> int:
         CustodyDatabase(
             case_dir / "custody.db",
             get_case_secret_key(case_dir, case_name=args.case_name),
+            checkpoint_interval=load_config().custody_checkpoint_interval,
         )
         print(json.dumps({"case_dir": str(case_dir)}, indent=2))
         return 0
@@ -1161,9 +1443,12 @@ def handle_report(args: argparse.Namespace) -> int:
     if db_path.exists():
         try:
             custody_db = load_custody_db(case_dir, case_name=args.case_name)
-            total, _ = custody_db.verify_database()
+            total, _ = custody_db.verify_database(
+                incremental=not args.full_verify, workers=0
+            )
             report["custody_entries"] = total
             report["custody_verified"] = True
+            report["custody_verification"] = "full" if args.full_verify else "incremental"
         except Exception as exc:
             report["custody_verified"] = False
             report["custody_error"] = str(exc)
@@ -1288,22 +1573,62 @@ def handle_timeline(args: argparse.Namespace) -> int:
         return 1
 
     mactime_file = getattr(args, "mactime_file", None)
-    events = build_timeline(case_dir, mactime_file=mactime_file)
+    try:
+        filters = {
+            "since": parse_when(args.time_from),
+            "until": parse_when(args.time_to),
+            "sources": args.sources,
+            "types": args.types,
+            "path_glob": args.path_glob,
+        }
+    except ValueError as exc:
+        print(f"Invalid time filter: {exc}", file=sys.stderr)
+        return 1
 
-    fmt = args.timeline_format
-    if fmt == "json":
-        output_str = events_to_json(events)
-    elif fmt == "csv":
-        output_str = events_to_csv(events)
-    else:
-        output_str = events_to_text(events)
+    index = None if args.no_index else TimelineIndex(default_index_path(case_dir))
+    if index is not None:
+        try:
+            index.refresh(case_dir, mactime_file)
+            events = index.query(**filters)
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Timeline index unavailable ({exc}); parsing sources", file=sys.stderr)
+            index.close()
+            index = None
+    if index is None:
+        memory_mb = args.memory_mb or load_config().timeline_memory_mb
+        events = filter_events(
+            stream_timeline(case_dir, mactime_file=mactime_file, memory_mb=memory_mb),
+            **filters,
+        )
 
-    if args.output:
-        _write_text_output(args.output, output_str, RecoveryError, "timeline output")
-        print(f"Timeline written to {args.output} ({len(events)} events)")
-    else:
-        print(output_str)
+    fmt = args.timeline_format
+    try:
+        if not args.output:
+            write_events(events, sys.stdout, fmt)
+            sys.stdout.write("\n")
+            return 0
 
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with args.output.open("w", encoding="utf-8", newline="") as handle:
+                count = write_events(events, handle, fmt)
+                handle.flush()
+                os.fsync(handle.fileno())
+        except OSError as exc:
+            raise RecoveryError(
+                f"Cannot write timeline output: {args.output}",
+                remediation="Check output directory permissions and disk space",
+            ) from exc
+    except sqlite3.Error as exc:
+        # Index rows are streamed, so a failure can surface mid-write.
+        raise RecoveryError(
+            f"Timeline index query failed: {default_index_path(case_dir)}",
+            remediation="Delete the index file or rerun with --no-index",
+        ) from exc
+    finally:
+        if index is not None:
+            index.close()
+    print(f"Timeline written to {args.output} ({count} events)")
     return 0
 
 
@@ -1462,13 +1787,7 @@ def handle_fsstat(args: argparse.Namespace) -> int:
     command.append(str(args.image))
 
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
-        )
+        result = get_runner().run(command, timeout=30)
     except FileNotFoundError:
         print("fsstat not found — install The Sleuth Kit", file=sys.stderr)
         return 1
@@ -1505,7 +1824,7 @@ def _detect_type_for_classify(filepath: Path) -> str:
     """Best-effort file type detection for classify command.
 
     Priority: 1) carved-output suffix pattern (_jpeg / _pdf), 2) file extension,
-    3) python-magic MIME type.
+    3) header signature (libmagic only as a last resort), see frece.filetype.
     """
     # FRECE carver output filenames end with _<type>  e.g. 00000200_jpeg
     name = filepath.name
@@ -1519,13 +1838,7 @@ def _detect_type_for_classify(filepath: Path) -> str:
         # normalise common variants
         return {"jpg": "jpeg", "tif": "tiff"}.get(ext, ext)
 
-    try:
-        import magic as _magic
-        mime = _magic.from_file(str(filepath), mime=True) or ""
-        # e.g. "image/jpeg" → "jpeg"
-        return mime.split("/")[-1].split(";")[0].strip()
-    except Exception:
-        return "bin"
+    return detect_path_type(filepath)
 
 
 def handle_classify(args: argparse.Namespace) -> int:
@@ -1717,7 +2030,12 @@ def load_custody_db(case_dir: Path, case_name: str | None = None) -> CustodyData
         )
 
     secret_key = get_case_secret_key(case_dir, case_name=case_name, create=False)
-    return CustodyDatabase(db_path, secret_key, initialize=False)
+    return CustodyDatabase(
+        db_path,
+        secret_key,
+        initialize=False,
+        checkpoint_interval=load_config().custody_checkpoint_interval,
+    )
 
 
 def verify_custody_case(
@@ -1727,7 +2045,7 @@ def verify_custody_case(
 ) -> int:
     """Verify custody integrity for an existing case directory."""
     custody_db = load_custody_db(case_dir, case_name=case_dir.name)
-    total, tampered = custody_db.verify_database()
+    total, tampered = custody_db.verify_database(workers=0)
 
     result = {
         "case_dir": str(case_dir),
@@ -10,6 +10,10 @@ def _default_case_root() -> Path:
     return Path.home() / ".frece" / "cases"
 
 
+def _default_cache_dir() -> Path:
+    return Path.home() / ".frece" / "cache"
+
+
 @dataclass
 class Config:
     """FRECE configuration."""
@@ -25,6 +29,23 @@ class Config:
     max_fls_timeout: int = 0  # 0 = unlimited
     max_path_length: int = 4096
     max_case_name_length: int = 255
+    native_fat: bool = True  # walk FAT/exFAT volumes without fls/icat
+    cache_dir: Path = field(default_factory=_default_cache_dir)
+    listing_cache: bool = True  # reuse parsed fls listings across commands
+    max_tool_processes: int = 0  # concurrent external tools; 0 = CPU count
+    ewf_cache_mb: int = 256  # decompressed E01 chunks kept per open image
+    ewf_readahead_workers: int = 0  # E01 inflate threads; 0 = CPU count, -1 = off
+    export_cache_gb: int = 0  # ewfexport raw images kept under cache_dir; 0 = off
+    piece_size_mb: int = 256  # piece size of the per-image hash manifest
+    container_compression_level: int = 6  # zlib level for acquire --format frc
+    acquire_workers: int = 0  # logical-acquisition copy threads; 0 = automatic
+    acquire_durability: str = "file"  # "file": fsync each copy; "group": batched
+    small_file_kb: int = 256  # files up to this size are copied in batches
+    hash_cache: bool = True  # reuse digests of unchanged files for re-checks
+    hash_cache_strict: bool = False  # always re-read files (chain-of-custody runs)
+    custody_checkpoint_interval: int = 1000  # signed custody chain checkpoint every N entries
+    custody_agent_ttl: int = 900  # seconds the key agent keeps derived keys unlocked
+    timeline_memory_mb: int = 256  # timeline events kept in memory before spilling sorted runs
 
     def ensure_case_root(self) -> None:
         """Create the case root directory on demand (not on every load)."""
@@ -68,6 +89,42 @@ def load_config(config_path: Path = Path.home() / ".frece" / "config.toml") -> C
                 config.max_icat_timeout = frece_config["max_icat_timeout"]
             if "max_fls_timeout" in frece_config:
                 config.max_fls_timeout = frece_config["max_fls_timeout"]
+            if "native_fat" in frece_config:
+                config.native_fat = frece_config["native_fat"]
+            if "cache_dir" in frece_config:
+                config.cache_dir = Path(frece_config["cache_dir"]).expanduser()
+            if "listing_cache" in frece_config:
+                config.listing_cache = frece_config["listing_cache"]
+            if "max_tool_processes" in frece_config:
+                config.max_tool_processes = frece_config["max_tool_processes"]
+            if "ewf_cache_mb" in frece_config:
+                config.ewf_cache_mb = frece_config["ewf_cache_mb"]
+            if "ewf_readahead_workers" in frece_config:
+                config.ewf_readahead_workers = frece_config["ewf_readahead_workers"]
+            if "export_cache_gb" in frece_config:
+                config.export_cache_gb = frece_config["export_cache_gb"]
+            if "piece_size_mb" in frece_config:
+                config.piece_size_mb = frece_config["piece_size_mb"]
+            if "container_compression_level" in frece_config:
+                config.container_compression_level = frece_config[
+                    "container_compression_level"
+                ]
+            if "acquire_workers" in frece_config:
+                config.acquire_workers = frece_config["acquire_workers"]
+            if "acquire_durability" in frece_config:
+                config.acquire_durability = frece_config["acquire_durability"]
+            if "small_file_kb" in frece_config:
+                config.small_file_kb = frece_config["small_file_kb"]
+            if "hash_cache" in frece_config:
+                config.hash_cache = frece_config["hash_cache"]
+            if "hash_cache_strict" in frece_config:
+                config.hash_cache_strict = frece_config["hash_cache_strict"]
+            if "custody_checkpoint_interval" in frece_config:
+                config.custody_checkpoint_interval = frece_config["custody_checkpoint_interval"]
+            if "custody_agent_ttl" in frece_config:
+                config.custody_agent_ttl = frece_config["custody_agent_ttl"]
+            if "timeline_memory_mb" in frece_config:
+                config.timeline_memory_mb = frece_config["timeline_memory_mb"]
 
     return config
 
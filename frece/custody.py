@@ -14,13 +14,20 @@ except ImportError:
 import json
 import os
 import sqlite3
+import struct
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Union
 
+from frece import keyagent
 from frece.errors import CustodyError
+from frece.timecodec import iso_to_epoch_us
 
 
 KEY_STORE_ENV = "FRECE_KEY_STORE"
@@ -84,6 +91,295 @@ def _key_path(case_dir: Path, case_name: Optional[str] = None) -> Path:
     return case_dir / ".case_secret"
 
 
+# Entry hash the first chained entry links to.
+GENESIS_HASH = "0" * 64
+DEFAULT_CHECKPOINT_INTERVAL = 1000
+
+_ENTRY_COLUMNS = "id, event_type, evidence_id, operator, timestamp, details, entry_hash, prev_hash"
+
+
+def _entry_hmac(secret_key: bytes, entry_dict: dict) -> str:
+    entry_json = json.dumps(entry_dict, sort_keys=True, separators=(",", ":"))
+    return hmac.new(secret_key, entry_json.encode(), hashlib.sha256).hexdigest()
+
+
+def _checkpoint_hmac(secret_key: bytes, entry_id: int, chain_hash: str, created: str) -> str:
+    return _entry_hmac(
+        secret_key,
+        {"checkpoint": entry_id, "chain_hash": chain_hash, "created": created},
+    )
+
+
+def _confirmation_hmac(
+    secret_key: bytes, entry_id: int, chain_hash: str, verified_at: str
+) -> str:
+    return _entry_hmac(
+        secret_key,
+        {"confirmed": entry_id, "chain_hash": chain_hash, "verified_at": verified_at},
+    )
+
+
+def _verify_segment(
+    db_path: str,
+    secret_key: bytes,
+    after_id: int,
+    through_id: Optional[int],
+    prev_hash: Optional[str],
+) -> tuple[int, list[int], Optional[str]]:
+    """Stream-verify entries with ``after_id < id <= through_id``.
+
+    *prev_hash* is the entry hash the first entry must link to (the chain
+    head recorded by the checkpoint at *after_id*). Returns
+    ``(entries, tampered_ids, last_entry_hash)``. Runs in worker processes,
+    so it opens its own read-only connection.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        columns = _ENTRY_COLUMNS
+        if "prev_hash" not in {row[1] for row in conn.execute("PRAGMA table_info(custody_log)")}:
+            columns = columns.replace("prev_hash", "NULL")  # never written to since chaining
+        query = f"SELECT {columns} FROM custody_log WHERE id > ?"
+        params: tuple = (after_id,)
+        if through_id is not None:
+            query += " AND id <= ?"
+            params += (through_id,)
+        if after_id == 0:
+            prev_hash = GENESIS_HASH
+        count = 0
+        tampered: list[int] = []
+        for row_id, event_type, evidence_id, operator, timestamp, details_json, \
+                stored_hash, row_prev in conn.execute(query + " ORDER BY id", params):
+            count += 1
+            entry_dict = {
+                "event_type": event_type,
+                "evidence_id": evidence_id,
+                "operator": operator,
+                "timestamp": timestamp,
+                "details": json.loads(details_json),
+            }
+            if row_prev is not None:
+                entry_dict["prev_hash"] = row_prev
+                linked = row_prev == prev_hash
+            else:
+                linked = True  # written before hash chaining; HMAC only
+            if not linked or _entry_hmac(secret_key, entry_dict) != stored_hash:
+                tampered.append(row_id)
+            prev_hash = stored_hash
+        return count, tampered, prev_hash
+    finally:
+        conn.close()
+
+
+def _has_column(conn: sqlite3.Connection, column: str) -> bool:
+    return column in {row[1] for row in conn.execute("PRAGMA table_info(custody_log)")}
+
+
+def _migrate_chain(conn: sqlite3.Connection) -> None:
+    """v1: base table, hash-chain column and signed checkpoints."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS custody_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT NOT NULL,
+            evidence_id TEXT NOT NULL,
+            operator TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            details TEXT NOT NULL,
+            entry_hash TEXT NOT NULL,
+            verified INTEGER DEFAULT 0,
+            prev_hash TEXT
+        )
+    """
+    )
+    if not _has_column(conn, "prev_hash"):
+        conn.execute("ALTER TABLE custody_log ADD COLUMN prev_hash TEXT")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS custody_checkpoints (
+            entry_id INTEGER PRIMARY KEY,
+            chain_hash TEXT NOT NULL,
+            created TEXT NOT NULL,
+            signature TEXT NOT NULL,
+            verified_at TEXT
+        )
+    """
+    )
+
+
+def _migrate_query_indexes(conn: sqlite3.Connection) -> None:
+    """v2: integer timestamp column plus indexes for evidence/type/time queries."""
+    if not _has_column(conn, "ts_epoch_us"):
+        conn.execute("ALTER TABLE custody_log ADD COLUMN ts_epoch_us INTEGER")
+    conn.executemany(
+        "UPDATE custody_log SET ts_epoch_us = ? WHERE id = ?",
+        (
+            (_row_epoch_us(timestamp), row_id)
+            for row_id, timestamp in conn.execute(
+                "SELECT id, timestamp FROM custody_log WHERE ts_epoch_us IS NULL"
+            ).fetchall()
+        ),
+    )
+    # Each index ends in (ts_epoch_us, id), the keyset used for pagination.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_custody_evidence "
+        "ON custody_log (evidence_id, ts_epoch_us, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_custody_evidence_type "
+        "ON custody_log (evidence_id, event_type, ts_epoch_us, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_custody_type "
+        "ON custody_log (event_type, ts_epoch_us, id)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_custody_time ON custody_log (ts_epoch_us, id)")
+
+
+def _migrate_signed_confirmations(conn: sqlite3.Connection) -> None:
+    """v3: sign checkpoint confirmations; unsigned ones are discarded."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(custody_checkpoints)")}
+    if "confirmation" not in columns:
+        conn.execute("ALTER TABLE custody_checkpoints ADD COLUMN confirmation TEXT")
+    conn.execute("UPDATE custody_checkpoints SET verified_at = NULL WHERE confirmation IS NULL")
+
+
+# Index i upgrades a database from user_version i to i + 1.
+_MIGRATIONS = (_migrate_chain, _migrate_query_indexes, _migrate_signed_confirmations)
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_epoch_us(value: Union[str, int, float, datetime]) -> int:
+    """Microseconds since the Unix epoch for an ISO string, datetime or epoch seconds."""
+    if isinstance(value, (int, float)):
+        return int(round(value * 1_000_000))
+    if isinstance(value, str):
+        try:
+            return iso_to_epoch_us(value)
+        except ValueError as exc:
+            raise CustodyError(
+                f"Invalid custody timestamp: {value!r}",
+                remediation="Use an ISO-8601 timestamp such as 2025-01-31T12:00:00Z",
+            ) from exc
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _row_epoch_us(timestamp: str) -> int:
+    """:func:`_to_epoch_us` for a stored row; an unparseable timestamp sorts as 0."""
+    try:
+        return _to_epoch_us(timestamp)
+    except CustodyError:
+        return 0
+
+
+def _row_details(details_json: Optional[str]) -> dict:
+    """Decoded ``details`` of a stored row; ``{}`` when it is not a JSON object."""
+    try:
+        details = json.loads(details_json) if details_json else {}
+    except ValueError:
+        return {}
+    return details if isinstance(details, dict) else {}
+
+
+def query_custody_events(
+    conn: sqlite3.Connection,
+    evidence_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    since: Union[str, int, float, datetime, None] = None,
+    until: Union[str, int, float, datetime, None] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple[int, int]] = None,
+) -> tuple[list["CustodyEntry"], Optional[tuple[int, int]]]:
+    """One page of custody entries in ``(time, id)`` order.
+
+    Filters combine: *evidence_id*, *event_type*, and the half-open window
+    ``since <= time < until``. Pages are keyset-paginated: pass the returned
+    cursor as *after* to get the next page; it is None after the last page.
+    On a database not yet migrated to the indexed schema the same results
+    are produced by a scan. A stored row with an unparseable timestamp sorts
+    at epoch 0 and bad ``details`` JSON reads as ``{}``, so one damaged row
+    never hides the others.
+    """
+    clauses = []
+    params: list = []
+    if evidence_id is not None:
+        clauses.append("evidence_id = ?")
+        params.append(evidence_id)
+    if event_type is not None:
+        clauses.append("event_type = ?")
+        params.append(event_type)
+
+    indexed = _has_column(conn, "ts_epoch_us")
+    low = _to_epoch_us(since) if since is not None else None
+    high = _to_epoch_us(until) if until is not None else None
+    if indexed:
+        if low is not None:
+            clauses.append("ts_epoch_us >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append("ts_epoch_us < ?")
+            params.append(high)
+        if after is not None:
+            clauses.append("(ts_epoch_us, id) > (?, ?)")
+            params.extend(after)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = (
+        "SELECT id, event_type, evidence_id, operator, timestamp, details, entry_hash"
+        f"{', ts_epoch_us' if indexed else ''} FROM custody_log{where}"
+    )
+
+    if indexed:
+        query += " ORDER BY ts_epoch_us, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+    else:
+        rows = []
+        for row in conn.execute(query, params):
+            ts = _row_epoch_us(row[4])
+            key = (ts, row[0])
+            if (low is None or ts >= low) and (high is None or ts < high) \
+                    and (after is None or key > tuple(after)):
+                rows.append((*row, ts))
+        rows.sort(key=lambda row: (row[7], row[0]))
+        if limit is not None:
+            rows = rows[:limit]
+
+    entries = [
+        CustodyEntry(
+            event_type=event_type_,
+            evidence_id=eid,
+            operator=operator,
+            timestamp=timestamp,
+            details=_row_details(details_json),
+            hash_sha256=entry_hash,
+            entry_id=row_id,
+            timestamp_us=ts,
+        )
+        for row_id, event_type_, eid, operator, timestamp, details_json, entry_hash, ts in rows
+    ]
+    cursor = None
+    if limit is not None and len(entries) == limit:
+        cursor = (entries[-1].timestamp_us, entries[-1].entry_id)
+    return entries, cursor
+
+
+def iter_custody_events(
+    conn: sqlite3.Connection, page_size: int = 1000, **filters
+) -> Iterator["CustodyEntry"]:
+    """Yield every entry matching *filters* (see :func:`query_custody_events`), page by page."""
+    after = None
+    while True:
+        entries, after = query_custody_events(conn, limit=page_size, after=after, **filters)
+        yield from entries
+        if after is None:
+            return
+
+
 @dataclass
 class CustodyEntry:
     """Chain of custody log entry."""
@@ -94,15 +390,50 @@ class CustodyEntry:
     timestamp: str
     details: dict
     hash_sha256: str
+    entry_id: int = 0  # row id, set on entries read back from the database
+    timestamp_us: int = 0  # timestamp as microseconds since the epoch
 
 
 class CustodyDatabase:
-    """SQLite-based chain of custody tracking with HMAC protection."""
+    """SQLite-based chain of custody tracking with HMAC protection.
+
+    The database runs in WAL mode with ``synchronous=FULL``. One write
+    connection and one read-only connection are opened on first use and kept
+    until :meth:`close` (the object is also a context manager), so logging
+    and lookups no longer open the file on every call.
+
+    Every entry is hash-chained: its HMAC also covers ``prev_hash``, the
+    entry hash of the entry before it, so deleting or reordering rows breaks
+    the chain. Every *checkpoint_interval* entries a signed row in
+    ``custody_checkpoints`` records the chain head. :meth:`verify_chain`
+    streams the log, verifies the segments between checkpoints in parallel,
+    and with ``incremental=True`` only re-verifies entries after the last
+    checkpoint that a previous verification confirmed. Entries written
+    before chaining existed keep their plain HMAC; the chain starts after
+    them.
+
+    Durability: :meth:`log_event` commits each event on its own.
+    :meth:`log_events` signs every event with its own HMAC and inserts the
+    batch in a single transaction, so the whole batch is on disk when it
+    returns, or none of it is. A :meth:`session` buffers events and commits
+    them in such batches, so a crash loses at most the events logged since
+    the session's last flush.
+    """
 
-    def __init__(self, db_path: Path, secret_key: bytes, initialize: bool = True):
+    def __init__(
+        self,
+        db_path: Path,
+        secret_key: bytes,
+        initialize: bool = True,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ):
         """Initialize custody database."""
         self.db_path = db_path
         self.secret_key = secret_key
+        self.checkpoint_interval = max(checkpoint_interval, 1)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
 
         db_path.parent.mkdir(parents=True, exist_ok=True)
         if initialize:
@@ -111,32 +442,76 @@ class CustodyDatabase:
     def _connect(self, read_only: bool = False) -> sqlite3.Connection:
         """Open the custody database with the appropriate access mode."""
         if read_only:
-            return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
-        return sqlite3.connect(self.db_path)
+            return sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = FULL")
+        return conn
+
+    def _write_conn(self) -> sqlite3.Connection:
+        if self._writer is None:
+            conn = self._connect()
+            self._ensure_schema(conn)
+            self._writer = conn
+        return self._writer
+
+    def _read_conn(self) -> sqlite3.Connection:
+        if self._reader is None:
+            reader = self._connect(read_only=True)
+            if reader.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                try:
+                    self._write_conn()  # migrates the schema
+                except sqlite3.OperationalError:
+                    # Read-only copy of an older case: queries fall back to scans.
+                    pass
+            self._reader = reader
+        return self._reader
+
+    def close(self) -> None:
+        """Close the persistent connections (they reopen on next use)."""
+        with self._lock:
+            for conn in (self._reader, self._writer):
+                if conn is not None:
+                    conn.close()
+            self._reader = self._writer = None
+
+    def __enter__(self) -> "CustodyDatabase":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def checkpoint(self) -> None:
+        """Fold the WAL into the main file, so copying ``custody.db`` alone is complete."""
+        with self._lock:
+            self._write_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
     def _init_db(self) -> None:
         """Create custody table if not exists."""
         conn = self._connect()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS custody_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_type TEXT NOT NULL,
-                evidence_id TEXT NOT NULL,
-                operator TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                details TEXT NOT NULL,
-                entry_hash TEXT NOT NULL,
-                verified INTEGER DEFAULT 0
-            )
-        """
-        )
-
-        conn.commit()
+        self._ensure_schema(conn)
         conn.close()
 
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection) -> None:
+        """Bring the schema up to :data:`SCHEMA_VERSION` (tracked in ``user_version``)."""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock: another process may have migrated.
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, migrate in enumerate(_MIGRATIONS, start=1):
+                if version < target:
+                    migrate(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
     def log_event(
         self,
         event_type: str,
@@ -145,87 +520,265 @@ class CustodyDatabase:
         details: dict,
     ) -> CustodyEntry:
         """Log a custody event with HMAC signature."""
-        timestamp = _utc_now_iso()
-
-        entry_dict = {
-            "event_type": event_type,
-            "evidence_id": evidence_id,
-            "operator": operator,
-            "timestamp": timestamp,
-            "details": details,
-        }
+        return self.log_events(
+            [
+                {
+                    "event_type": event_type,
+                    "evidence_id": evidence_id,
+                    "operator": operator,
+                    "details": details,
+                }
+            ]
+        )[0]
+
+    def log_events(self, events: Iterable[dict]) -> list[CustodyEntry]:
+        """Sign, chain and insert many events in one transaction.
+
+        Each event is a dict with ``event_type``, ``evidence_id``,
+        ``operator`` and ``details`` (and optionally ``timestamp`` and
+        ``verified``). Every event gets its own HMAC, exactly as with
+        :meth:`log_event`.
+        """
+        events = list(events)
+        if not events:
+            return []
+
+        with self._lock:
+            conn = self._write_conn()
+            # IMMEDIATE takes the write lock before the chain head is read, so
+            # concurrent writers cannot both link to the same entry.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                entries = self._append_chained(conn, events)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
 
-        entry_hash = self._compute_hmac(entry_dict)
+        return entries
 
-        conn = self._connect()
-        cursor = conn.cursor()
+    def _append_chained(self, conn: sqlite3.Connection, events: list[dict]) -> list[CustodyEntry]:
+        head = conn.execute(
+            "SELECT id, entry_hash FROM custody_log ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        last_id, prev_hash = head if head else (0, GENESIS_HASH)
+        last_checkpoint = conn.execute(
+            "SELECT COALESCE(MAX(entry_id), 0) FROM custody_checkpoints"
+        ).fetchone()[0]
 
-        cursor.execute(
+        entries = []
+        rows = []
+        checkpoints = []
+        for event in events:
+            last_id += 1
+            entry_dict = {
+                "event_type": event["event_type"],
+                "evidence_id": event["evidence_id"],
+                "operator": event["operator"],
+                "timestamp": event.get("timestamp") or _utc_now_iso(),
+                "details": event["details"],
+            }
+            entry_hash = self._compute_hmac({**entry_dict, "prev_hash": prev_hash})
+            timestamp_us = _to_epoch_us(entry_dict["timestamp"])
+            rows.append(
+                (
+                    last_id,
+                    entry_dict["event_type"],
+                    entry_dict["evidence_id"],
+                    entry_dict["operator"],
+                    entry_dict["timestamp"],
+                    json.dumps(entry_dict["details"]),
+                    entry_hash,
+                    event.get("verified", 0),
+                    prev_hash,
+                    timestamp_us,
+                )
+            )
+            entries.append(
+                CustodyEntry(
+                    **entry_dict,
+                    hash_sha256=entry_hash,
+                    entry_id=last_id,
+                    timestamp_us=timestamp_us,
+                )
+            )
+            prev_hash = entry_hash
+            if last_id - last_checkpoint >= self.checkpoint_interval:
+                created = _utc_now_iso()
+                checkpoints.append(
+                    (
+                        last_id,
+                        entry_hash,
+                        created,
+                        _checkpoint_hmac(self.secret_key, last_id, entry_hash, created),
+                    )
+                )
+                last_checkpoint = last_id
+
+        conn.executemany(
             """
             INSERT INTO custody_log
-            (event_type, evidence_id, operator, timestamp, details, entry_hash)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (id, event_type, evidence_id, operator, timestamp, details, entry_hash,
+             verified, prev_hash, ts_epoch_us)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-            (
-                event_type,
-                evidence_id,
-                operator,
-                timestamp,
-                json.dumps(details),
-                entry_hash,
-            ),
+            rows,
         )
-
-        conn.commit()
-        conn.close()
-
-        return CustodyEntry(
-            event_type=event_type,
-            evidence_id=evidence_id,
-            operator=operator,
-            timestamp=timestamp,
-            details=details,
-            hash_sha256=entry_hash,
+        conn.executemany(
+            "INSERT INTO custody_checkpoints (entry_id, chain_hash, created, signature) "
+            "VALUES (?, ?, ?, ?)",
+            checkpoints,
         )
+        return entries
 
-    def _compute_hmac(self, entry_dict: dict) -> str:
-        """Compute HMAC-SHA256 of entry fields."""
-        entry_json = json.dumps(entry_dict, sort_keys=True, separators=(",", ":"))
-        signature = hmac.new(
-            self.secret_key, entry_json.encode(), hashlib.sha256
-        ).hexdigest()
-        return signature
-
-    def verify_database(self) -> tuple[int, int]:
-        """Verify all entries in database for tampering."""
-        conn = self._connect(read_only=True)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT id, event_type, evidence_id, operator, timestamp, details, entry_hash "
-            "FROM custody_log"
-        )
-        rows = cursor.fetchall()
-        conn.close()
+    @contextmanager
+    def session(self, batch_size: int = 1000) -> Iterator["CustodySession"]:
+        """Buffer events and commit them in batches of *batch_size*.
 
-        total = len(rows)
-        tampered = 0
+        Example::
 
-        for row_id, event_type, evidence_id, operator, timestamp, details_json, stored_hash in rows:
-            details = json.loads(details_json)
+            with custody_db.session() as session:
+                for artifact in carved:
+                    session.log_event("CARVE", artifact.id, operator, {...})
 
-            entry_dict = {
-                "event_type": event_type,
-                "evidence_id": evidence_id,
-                "operator": operator,
-                "timestamp": timestamp,
-                "details": details,
-            }
+        Buffered events are committed on exit, including when the block
+        raises, so every event that was logged reaches the database.
+        """
+        session = CustodySession(self, batch_size)
+        try:
+            yield session
+        finally:
+            session.flush()
+
+    def _compute_hmac(self, entry_dict: dict) -> str:
+        """Compute HMAC-SHA256 of entry fields."""
+        return _entry_hmac(self.secret_key, entry_dict)
+
+    def _load_checkpoints(self, conn: sqlite3.Connection) -> list[tuple]:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        if "custody_checkpoints" not in tables:
+            return []
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(custody_checkpoints)")}
+        confirmation = "confirmation" if "confirmation" in columns else "NULL"
+        return conn.execute(
+            f"SELECT entry_id, chain_hash, created, signature, verified_at, {confirmation} "
+            "FROM custody_checkpoints ORDER BY entry_id"
+        ).fetchall()
+
+    def verify_chain(self, incremental: bool = False, workers: int = 1) -> dict:
+        """Verify entry HMACs, chain links and checkpoint signatures.
+
+        Rows are streamed, never loaded all at once. The segments between
+        checkpoints are independent (each starts from a signed chain head),
+        so with *workers* > 1 (0 = one per CPU) they are verified in parallel
+        processes. With *incremental* the log is trusted up to the newest
+        checkpoint an earlier verification confirmed, provided its signature,
+        its HMAC-signed confirmation and the entry it points at are
+        unchanged; only later entries are re-verified. A clean run signs a
+        confirmation for each checkpoint it covered. Returns a report dict;
+        :meth:`verify_database` raises on tampering.
+        """
+        with self._lock:
+            conn = self._read_conn()
+            checkpoints = self._load_checkpoints(conn)
+            entries = conn.execute("SELECT COUNT(*) FROM custody_log").fetchone()[0]
+            head_of = {}
+            for entry_id, *_ in checkpoints:
+                row = conn.execute(
+                    "SELECT entry_hash FROM custody_log WHERE id = ?", (entry_id,)
+                ).fetchone()
+                head_of[entry_id] = row[0] if row else None
+
+        bad_checkpoints = [
+            entry_id
+            for entry_id, chain_hash, created, signature, *_ in checkpoints
+            if not hmac.compare_digest(
+                signature, _checkpoint_hmac(self.secret_key, entry_id, chain_hash, created)
+            )
+            or head_of[entry_id] != chain_hash
+        ]
+        valid = [cp for cp in checkpoints if cp[0] not in bad_checkpoints]
+
+        start_id, start_hash = 0, None
+        if incremental:
+            trusted = [cp for cp in valid if self._confirmed(cp)]
+            if trusted:
+                start_id, start_hash = trusted[-1][0], trusted[-1][1]
+
+        # Segments (after_id, through_id, prev_hash) split at valid checkpoints.
+        bounds = [(cp[0], cp[1]) for cp in valid if cp[0] > start_id]
+        segments = []
+        after_id, prev_hash = start_id, start_hash
+        for entry_id, chain_hash in bounds:
+            segments.append((after_id, entry_id, prev_hash))
+            after_id, prev_hash = entry_id, chain_hash
+        segments.append((after_id, None, prev_hash))
+
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        jobs = [(str(self.db_path), self.secret_key, *segment) for segment in segments]
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                results = list(pool.map(_verify_segment, *zip(*jobs)))
+        else:
+            results = [_verify_segment(*job) for job in jobs]
+
+        verified = sum(count for count, _, _ in results)
+        tampered_ids = sorted(row_id for _, ids, _ in results for row_id in ids)
+        clean = not tampered_ids and not bad_checkpoints
+        if clean and valid:
+            self._confirm_checkpoints([cp for cp in valid if cp[0] > start_id])
+
+        return {
+            "entries": entries,
+            "verified_entries": verified,
+            "tampered": len(tampered_ids) + len(bad_checkpoints),
+            "tampered_entries": tampered_ids,
+            "bad_checkpoints": bad_checkpoints,
+            "checkpoints": len(checkpoints),
+            "trusted_through": start_id,
+            "segments": len(segments),
+            "incremental": incremental,
+        }
 
-            computed_hash = self._compute_hmac(entry_dict)
+    def _confirmed(self, checkpoint: tuple) -> bool:
+        """True if an earlier clean verification signed this checkpoint's confirmation."""
+        entry_id, chain_hash, _, _, verified_at, confirmation = checkpoint
+        if verified_at is None or confirmation is None:
+            return False
+        return hmac.compare_digest(
+            confirmation, _confirmation_hmac(self.secret_key, entry_id, chain_hash, verified_at)
+        )
 
-            if computed_hash != stored_hash:
-                tampered += 1
+    def _confirm_checkpoints(self, checkpoints: list[tuple]) -> None:
+        if not checkpoints:
+            return
+        now = _utc_now_iso()
+        try:
+            with self._lock:
+                conn = self._write_conn()
+                with conn:
+                    conn.executemany(
+                        "UPDATE custody_checkpoints SET verified_at = ?, confirmation = ? "
+                        "WHERE entry_id = ?",
+                        [
+                            (now, _confirmation_hmac(self.secret_key, cp[0], cp[1], now), cp[0])
+                            for cp in checkpoints
+                        ],
+                    )
+        except sqlite3.OperationalError:
+            # A read-only case (e.g. on write-blocked media) still verifies;
+            # later incremental runs simply start from an older checkpoint.
+            return
+
+    def verify_database(self, incremental: bool = False, workers: int = 1) -> tuple[int, int]:
+        """Verify all entries in database for tampering.
+
+        Returns ``(entries, tampered)``; see :meth:`verify_chain` for
+        *incremental* and *workers*.
+        """
+        result = self.verify_chain(incremental=incremental, workers=workers)
+        total = result["entries"]
+        tampered = result["tampered"]
 
         if tampered > 0:
             raise CustodyError(
@@ -239,15 +792,11 @@ class CustodyDatabase:
         self, evidence_id: str, source_hash: str
     ) -> bool:
         """Verify evidence hash matches source device hash."""
-        conn = self._connect(read_only=True)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT details FROM custody_log WHERE evidence_id = ? AND event_type = 'ACQUIRE'",
-            (evidence_id,),
-        )
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._read_conn().execute(
+                "SELECT details FROM custody_log WHERE evidence_id = ? AND event_type = 'ACQUIRE'",
+                (evidence_id,),
+            ).fetchone()
 
         if not row:
             raise CustodyError(
@@ -268,31 +817,65 @@ class CustodyDatabase:
 
     def get_evidence_log(self, evidence_id: str) -> list[CustodyEntry]:
         """Get all custody events for an evidence item."""
-        conn = self._connect(read_only=True)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT event_type, evidence_id, operator, timestamp, details "
-            "FROM custody_log WHERE evidence_id = ? ORDER BY timestamp",
-            (evidence_id,),
-        )
-        rows = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            return list(iter_custody_events(self._read_conn(), evidence_id=evidence_id))
 
-        entries = []
-        for event_type, eid, operator, timestamp, details_json in rows:
-            details = json.loads(details_json)
-            entry = CustodyEntry(
+    def query_events(
+        self,
+        evidence_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Union[str, int, float, datetime, None] = None,
+        until: Union[str, int, float, datetime, None] = None,
+        limit: Optional[int] = 1000,
+        after: Optional[tuple[int, int]] = None,
+    ) -> tuple[list[CustodyEntry], Optional[tuple[int, int]]]:
+        """Filtered, keyset-paginated custody entries; see :func:`query_custody_events`."""
+        with self._lock:
+            return query_custody_events(
+                self._read_conn(),
+                evidence_id=evidence_id,
                 event_type=event_type,
-                evidence_id=eid,
-                operator=operator,
-                timestamp=timestamp,
-                details=details,
-                hash_sha256="",
+                since=since,
+                until=until,
+                limit=limit,
+                after=after,
             )
-            entries.append(entry)
 
-        return entries
+
+class CustodySession:
+    """Buffered event logger returned by :meth:`CustodyDatabase.session`."""
+
+    def __init__(self, database: CustodyDatabase, batch_size: int = 1000) -> None:
+        self.database = database
+        self.batch_size = max(batch_size, 1)
+        self.entries: list[CustodyEntry] = []
+        self._pending: list[dict] = []
+
+    def log_event(
+        self,
+        event_type: str,
+        evidence_id: str,
+        operator: str,
+        details: dict,
+    ) -> None:
+        """Queue an event (timestamped now); commits once a batch is full."""
+        self._pending.append(
+            {
+                "event_type": event_type,
+                "evidence_id": evidence_id,
+                "operator": operator,
+                "timestamp": _utc_now_iso(),
+                "details": details,
+            }
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit every queued event in one transaction."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.entries.extend(self.database.log_events(pending))
 
 
 def create_case_secret_key(case_dir: Path, case_name: Optional[str] = None) -> bytes:
@@ -332,6 +915,24 @@ def get_case_secret_key(
     return key
 
 
+def _wal_files(db_path: Path) -> tuple[Path, Path]:
+    return (
+        db_path.with_name(db_path.name + "-wal"),
+        db_path.with_name(db_path.name + "-shm"),
+    )
+
+
+def _checkpoint_wal(db_path: Path) -> None:
+    """Move committed WAL content into *db_path* so the file alone is complete."""
+    if not db_path.exists() or not _wal_files(db_path)[0].exists():
+        return
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+
 def rotate_case_secret_key(case_dir: Path, case_name: Optional[str] = None) -> Path:
     """Rotate a case HMAC key and re-sign all custody rows."""
     db_path = case_dir / "custody.db"
@@ -355,42 +956,27 @@ def rotate_case_secret_key(case_dir: Path, case_name: Optional[str] = None) -> P
 
     new_key = os.urandom(32)
     new_db_path = db_path.with_suffix(".db.new")
-    if new_db_path.exists():
-        new_db_path.unlink()
+    for stale in (new_db_path, *_wal_files(new_db_path)):
+        if stale.exists():
+            stale.unlink()
 
     new_db = CustodyDatabase(new_db_path, new_key)
-    conn = new_db._connect()
-    cursor = conn.cursor()
-
-    for event_type, evidence_id, operator, timestamp, details_json, verified in rows:
-        details = json.loads(details_json)
-        entry_dict = {
+    # Re-signing also chains entries written before hash chaining existed.
+    new_db.log_events(
+        {
             "event_type": event_type,
             "evidence_id": evidence_id,
             "operator": operator,
             "timestamp": timestamp,
-            "details": details,
+            "details": json.loads(details_json),
+            "verified": verified,
         }
-        entry_hash = new_db._compute_hmac(entry_dict)
-        cursor.execute(
-            """
-            INSERT INTO custody_log
-            (event_type, evidence_id, operator, timestamp, details, entry_hash, verified)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event_type,
-                evidence_id,
-                operator,
-                timestamp,
-                json.dumps(details),
-                entry_hash,
-                verified,
-            ),
-        )
-
-    conn.commit()
-    conn.close()
+        for event_type, evidence_id, operator, timestamp, details_json, verified in rows
+    )
+    # Fold the WAL into the file before it is renamed; a -wal left behind
+    # under the staging name would not follow it.
+    new_db.checkpoint()
+    new_db.close()
     _fsync_file(new_db_path)
 
     # Write the new key to a staging path first, then atomically replace both
@@ -403,6 +989,7 @@ def rotate_case_secret_key(case_dir: Path, case_name: Optional[str] = None) -> P
     # new_db_path (renamed to db_path) with new_key in key_staging_path – the
     # next startup call to get_case_secret_key() must detect and complete the
     # swap.  That detection is handled by the .new suffix naming convention.
+    _checkpoint_wal(db_path)
     os.replace(new_db_path, db_path)
     _fsync_file(db_path)
     os.replace(key_staging_path, key_path)
@@ -413,12 +1000,127 @@ def rotate_case_secret_key(case_dir: Path, case_name: Optional[str] = None) -> P
 # AES-256-GCM custody database encryption at rest
 # ─────────────────────────────────────────────────────────────────────────────
 
+# FRECE_ENC_V1 (read-only, legacy): magic, 32-byte salt, 12-byte nonce, then
+# the whole database as one AES-GCM message.
+#
+# FRECE_ENC_V2 (written by encrypt_custody_db): streamed in chunks.
+#   magic "FRECE_ENC_V2"
+#   u32 chunk_size  u32 log2(scrypt N)  u32 scrypt r  u32 scrypt p   (little-endian)
+#   32-byte salt  8-byte random nonce prefix
+#   records: AES-GCM(chunk) + 16-byte tag, one per chunk_size plaintext bytes
+# Chunk i uses nonce = prefix || u32be(i) and AAD = header || u64be(i) || u8 final,
+# so chunks cannot be reordered, moved between files or have their KDF
+# parameters altered. The last record is always shorter than a full one
+# (possibly just a tag) and is the only one sealed with final = 1, so
+# truncation at any point fails authentication or misses the final record.
 _ENCRYPT_MAGIC = b"FRECE_ENC_V1"
+_ENCRYPT_MAGIC_V2 = b"FRECE_ENC_V2"
 _SALT_LEN = 32
 _NONCE_LEN = 12
+_NONCE_PREFIX_LEN = 8
+_TAG_LEN = 16
+_V2_PARAMS = struct.Struct("<IIII")
+_ENC_CHUNK_SIZE = 1024 * 1024
+_SCRYPT_LOG2_N = 20
+_SCRYPT_R = 8
+_SCRYPT_P = 1
 
 
-def encrypt_custody_db(db_path: Path, passphrase: str) -> Path:
+def _require_crypto() -> None:
+    if not _CRYPTO_AVAILABLE:
+        raise CustodyError(
+            "cryptography package not installed",
+            remediation="pip install cryptography",
+        )
+
+
+def _derive_key(passphrase: str, salt: bytes, log2_n: int, r: int, p: int) -> bytes:
+    kdf = _Scrypt(salt=salt, length=32, n=2**log2_n, r=r, p=p)
+    key: bytes = kdf.derive(passphrase.encode("utf-8"))
+    return key
+
+
+def _unlock_key(
+    passphrase: Optional[str], salt: bytes, log2_n: int, r: int, p: int
+) -> tuple[bytes, Callable[[], None]]:
+    """Key for *salt*: from the session agent when it holds it, else via scrypt.
+
+    Also returns a callback that hands a freshly derived key to the agent;
+    callers invoke it only once the key has proven correct, so a mistyped
+    passphrase never replaces a good cached key.
+    """
+    identifier = keyagent.key_id(salt, log2_n, r, p)
+    key = keyagent.agent_key(identifier, passphrase)
+    if key is not None:
+        return key, lambda: None
+    if passphrase is None:
+        raise CustodyError(
+            "No passphrase given and the key is not unlocked in the agent",
+            remediation="Pass --passphrase (run `frece custody agent start` to keep it unlocked)",
+        )
+    key = _derive_key(passphrase, salt, log2_n, r, p)
+
+    def remember() -> None:
+        keyagent.remember_key(identifier, key, passphrase)
+
+    return key, remember
+
+
+def _unlocked_salt(enc_path: Path, passphrase: Optional[str]) -> Optional[bytes]:
+    """Salt of an existing V2 file whose key the agent holds, so re-encrypting skips scrypt."""
+    try:
+        with open(enc_path, "rb") as handle:
+            head = handle.read(len(_ENCRYPT_MAGIC_V2) + _V2_PARAMS.size + _SALT_LEN)
+    except OSError:
+        return None
+    if len(head) < len(_ENCRYPT_MAGIC_V2) + _V2_PARAMS.size + _SALT_LEN \
+            or not head.startswith(_ENCRYPT_MAGIC_V2):
+        return None
+    _, log2_n, r, p = _V2_PARAMS.unpack_from(head, len(_ENCRYPT_MAGIC_V2))
+    salt = head[-_SALT_LEN:]
+    if (log2_n, r, p) != (_SCRYPT_LOG2_N, _SCRYPT_R, _SCRYPT_P):
+        return None
+    if keyagent.agent_key(keyagent.key_id(salt, log2_n, r, p), passphrase) is None:
+        return None
+    return salt
+
+
+def _chunk_aad(header: bytes, index: int, final: bool) -> bytes:
+    return header + struct.pack(">QB", index, final)
+
+
+def _ordered_map(pool: ThreadPoolExecutor, fn, items: Iterable, window: int) -> Iterator:
+    """``pool.map`` that keeps at most *window* items in flight (constant memory)."""
+    inflight: deque = deque()
+    for item in items:
+        inflight.append(pool.submit(fn, *item))
+        if len(inflight) >= window:
+            yield inflight.popleft().result()
+    while inflight:
+        yield inflight.popleft().result()
+
+
+def _plaintext_chunks(handle, chunk_size: int) -> Iterator[tuple[int, bytes, bool]]:
+    """``(index, chunk, final)`` over *handle*; the final chunk is always short."""
+    index = 0
+    chunk = handle.read(chunk_size)
+    while len(chunk) == chunk_size:
+        yield index, chunk, False
+        index += 1
+        chunk = handle.read(chunk_size)
+    yield index, chunk, True
+
+
+def _staging_path(path: Path):
+    return path.with_name(path.name + ".tmp")
+
+
+def encrypt_custody_db(
+    db_path: Path,
+    passphrase: Optional[str],
+    chunk_size: int = _ENC_CHUNK_SIZE,
+    workers: int = 0,
+) -> Path:
     """Encrypt custody.db at rest using AES-256-GCM.
 
     The encrypted file is written alongside the database as
@@ -427,6 +1129,14 @@ def encrypt_custody_db(db_path: Path, passphrase: str) -> Path:
 
     Derives a 256-bit key from the passphrase using scrypt
     (N=2^20, r=8, p=1) so that brute-force is expensive even on GPUs.
+    The database is streamed in *chunk_size* chunks (FRECE_ENC_V2, see
+    above), sealed on *workers* threads (0 = one per CPU), so memory use
+    does not grow with the database.
+
+    With a running key agent (:mod:`frece.keyagent`) the derived key is
+    cached for the session; re-encrypting over an existing ``custody.db.enc``
+    whose key is unlocked keeps that file's salt and skips scrypt, and
+    *passphrase* may then be None.
 
     Args:
         db_path:    Path to the plaintext ``custody.db``.
@@ -438,85 +1148,175 @@ def encrypt_custody_db(db_path: Path, passphrase: str) -> Path:
     Raises:
         CustodyError: If cryptography is not installed.
     """
-    if not _CRYPTO_AVAILABLE:
-        raise CustodyError(
-            "cryptography package not installed",
-            remediation="pip install cryptography",
-        )
-
-    plaintext = db_path.read_bytes()
-    salt = os.urandom(_SALT_LEN)
-
-    # Derive 256-bit key via scrypt
-    kdf = _Scrypt(salt=salt, length=32, n=2**20, r=8, p=1)
-    key = kdf.derive(passphrase.encode("utf-8"))
-
-    nonce = os.urandom(_NONCE_LEN)
-    aesgcm = _AESGCM(key)
-    ciphertext = aesgcm.encrypt(nonce, plaintext, None)
+    _require_crypto()
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
 
+    _checkpoint_wal(db_path)
     enc_path = db_path.with_suffix(".db.enc")
-    with open(enc_path, "wb") as fh:
-        fh.write(_ENCRYPT_MAGIC)
-        fh.write(salt)      # 32 bytes
-        fh.write(nonce)     # 12 bytes
-        fh.write(ciphertext)  # variable (plaintext + 16-byte GCM tag)
-        fh.flush()
-        os.fsync(fh.fileno())
-
-    return enc_path
+    salt = _unlocked_salt(enc_path, passphrase) or os.urandom(_SALT_LEN)
+    prefix = os.urandom(_NONCE_PREFIX_LEN)
+    header = (
+        _ENCRYPT_MAGIC_V2
+        + _V2_PARAMS.pack(chunk_size, _SCRYPT_LOG2_N, _SCRYPT_R, _SCRYPT_P)
+        + salt
+        + prefix
+    )
+    key, remember = _unlock_key(passphrase, salt, _SCRYPT_LOG2_N, _SCRYPT_R, _SCRYPT_P)
+    remember()
+    aesgcm = _AESGCM(key)
 
+    def seal(index: int, chunk: bytes, final: bool) -> bytes:
+        nonce = prefix + index.to_bytes(4, "big")
+        sealed: bytes = aesgcm.encrypt(nonce, chunk, _chunk_aad(header, index, final))
+        return sealed
 
-def decrypt_custody_db(enc_path: Path, passphrase: str, output_path: Path | None = None) -> Path:
-    """Decrypt a ``custody.db.enc`` file back to plaintext SQLite.
-
-    Args:
-        enc_path:    Path to the ``.enc`` file.
-        passphrase:  Passphrase used during encryption.
-        output_path: Where to write the decrypted DB (default: same dir, ``custody.db``).
+    tmp_path = _staging_path(enc_path)
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    try:
+        with open(db_path, "rb") as src, open(tmp_path, "wb") as fh, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="frece-enc"
+        ) as pool:
+            fh.write(header)
+            for record in _ordered_map(
+                pool, seal, _plaintext_chunks(src, chunk_size), 2 * workers
+            ):
+                fh.write(record)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, enc_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_file(enc_path)
 
-    Returns:
-        Path to the decrypted database.
+    return enc_path
 
-    Raises:
-        CustodyError: If decryption fails (wrong passphrase or corrupted file).
-    """
-    if not _CRYPTO_AVAILABLE:
-        raise CustodyError(
-            "cryptography package not installed",
-            remediation="pip install cryptography",
-        )
 
+def _decrypt_v1(enc_path: Path, passphrase: Optional[str]) -> bytes:
     raw = enc_path.read_bytes()
-    magic_len = len(_ENCRYPT_MAGIC)
-    if not raw[:magic_len] == _ENCRYPT_MAGIC:
-        raise CustodyError(
-            f"Not a FRECE encrypted file: {enc_path}",
-            remediation="Ensure you are using a file created by frece custody encrypt",
-        )
-
-    pos = magic_len
+    pos = len(_ENCRYPT_MAGIC)
     salt = raw[pos: pos + _SALT_LEN]
     pos += _SALT_LEN
     nonce = raw[pos: pos + _NONCE_LEN]
     pos += _NONCE_LEN
     ciphertext = raw[pos:]
 
-    kdf = _Scrypt(salt=salt, length=32, n=2**20, r=8, p=1)
-    key = kdf.derive(passphrase.encode("utf-8"))
+    key, remember = _unlock_key(passphrase, salt, 20, 8, 1)
 
     try:
         aesgcm = _AESGCM(key)
-        plaintext = aesgcm.decrypt(nonce, ciphertext, None)
+        plaintext: bytes = aesgcm.decrypt(nonce, ciphertext, None)
     except Exception as exc:
         raise CustodyError(
             "Decryption failed — wrong passphrase or corrupted file",
             remediation="Verify the passphrase is correct",
         ) from exc
+    remember()
+    return plaintext
+
+
+def _decrypt_v2(handle, passphrase: Optional[str], out, workers: int) -> None:
+    params = handle.read(_V2_PARAMS.size)
+    salt = handle.read(_SALT_LEN)
+    prefix = handle.read(_NONCE_PREFIX_LEN)
+    if len(params) < _V2_PARAMS.size or len(salt) < _SALT_LEN or len(prefix) < _NONCE_PREFIX_LEN:
+        raise CustodyError(
+            "Encrypted custody file is truncated",
+            remediation="Restore the .enc file from a backup copy",
+        )
+    chunk_size, log2_n, r, p = _V2_PARAMS.unpack(params)
+    header = _ENCRYPT_MAGIC_V2 + params + salt + prefix
+    key, remember = _unlock_key(passphrase, salt, log2_n, r, p)
+    aesgcm = _AESGCM(key)
+    record_size = chunk_size + _TAG_LEN
+
+    def records() -> Iterator[tuple[int, bytes, bool]]:
+        index = 0
+        while record := handle.read(record_size):
+            final = len(record) < record_size
+            yield index, record, final
+            if final:
+                if handle.read(1):
+                    raise CustodyError(
+                        "Unexpected data after the final encrypted chunk",
+                        remediation="The file was altered; restore it from a backup copy",
+                    )
+                return
+            index += 1
+        raise CustodyError(
+            "Encrypted custody file is truncated (final chunk missing)",
+            remediation="Restore the .enc file from a backup copy",
+        )
+
+    def open_record(index: int, record: bytes, final: bool) -> bytes:
+        nonce = prefix + index.to_bytes(4, "big")
+        try:
+            opened: bytes = aesgcm.decrypt(nonce, record, _chunk_aad(header, index, final))
+            return opened
+        except Exception as exc:
+            raise CustodyError(
+                f"Decryption failed at chunk {index} — wrong passphrase or corrupted file",
+                remediation="Verify the passphrase is correct",
+            ) from exc
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frece-dec") as pool:
+        for chunk in _ordered_map(pool, open_record, records(), 2 * workers):
+            out.write(chunk)
+    remember()
+
+
+def decrypt_custody_db(
+    enc_path: Path,
+    passphrase: Optional[str],
+    output_path: Path | None = None,
+    workers: int = 0,
+) -> Path:
+    """Decrypt a ``custody.db.enc`` file back to plaintext SQLite.
+
+    Reads both formats: FRECE_ENC_V2 streams with constant memory on
+    *workers* threads (0 = one per CPU); legacy FRECE_ENC_V1 files are
+    decrypted in one piece. The output only appears once every chunk has
+    authenticated. A running key agent caches the derived key, as for
+    :func:`encrypt_custody_db`.
+
+    Args:
+        enc_path:    Path to the ``.enc`` file.
+        passphrase:  Passphrase used during encryption.
+        output_path: Where to write the decrypted DB (default: same dir, ``custody.db``).
+
+    Returns:
+        Path to the decrypted database.
+
+    Raises:
+        CustodyError: If decryption fails (wrong passphrase or corrupted file).
+    """
+    _require_crypto()
 
     if output_path is None:
         output_path = enc_path.parent / "custody.db"
+    output_path = Path(output_path)
+    tmp_path = _staging_path(output_path)
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
 
-    output_path.write_bytes(plaintext)
-    return output_path
+    with open(enc_path, "rb") as handle:
+        magic = handle.read(len(_ENCRYPT_MAGIC_V2))
+        if magic not in (_ENCRYPT_MAGIC, _ENCRYPT_MAGIC_V2):
+            raise CustodyError(
+                f"Not a FRECE encrypted file: {enc_path}",
+                remediation="Ensure you are using a file created by frece custody encrypt",
+            )
+        try:
+            with open(tmp_path, "wb") as out:
+                if magic == _ENCRYPT_MAGIC:
+                    out.write(_decrypt_v1(enc_path, passphrase))
+                else:
+                    _decrypt_v2(handle, passphrase, out, workers)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
+    return output_path
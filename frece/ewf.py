@@ -15,19 +15,42 @@ Usage in FRECE commands:
 
 The adapter transparently:
   1. Detects E01/EWF/AFF by file extension and magic bytes
-  2. Exports a raw stream via ewfexport --target=/tmp/frece_ewf_XXXX.raw
-  3. Returns the temporary raw path to the caller
+  2. Opens EWF-E01 segments with the native :class:`EwfImage` reader, which
+     parses the section and chunk tables and inflates chunks on demand, so
+     the carver can read the media without exporting it
+  3. Falls back to ewfexport --target=/tmp/frece_ewf_XXXX.raw for formats
+     the native reader does not parse (Ex01/EWF2, AFF), or when a caller
+     needs a filesystem path (Sleuth Kit)
   4. Cleans up the temp file when done (context manager)
+
+Every handle exposes the media as an :class:`~frece.imagesource.ImageSource`
+(``handle.source``); :func:`open_source` opens one directly.
 """
 
 from __future__ import annotations
 
+import bisect
+import io
+import os
 import re
 import shutil
+import struct
 import subprocess
 import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, ContextManager, Optional
+
+from frece.container import ContainerImage, is_container
+from frece.imagesource import ImageSource, SourceStream, open_raw_source, split_segments
+
+if TYPE_CHECKING:
+    from frece.export_cache import ExportCache
 
 
 # Magic bytes that identify EWF segments
@@ -47,7 +70,8 @@ def is_ewf_image(path: Path) -> bool:
     if path.suffix.lower() in EWF_EXTENSIONS:
         return True
     try:
-        magic = path.read_bytes()[:4]
+        with open(path, "rb") as handle:
+            magic = handle.read(4)
         return magic[:3] in (_EWF_MAGIC, _LEWA_MAGIC) or magic == _AFF_MAGIC
     except OSError:
         return False
@@ -102,6 +126,420 @@ def ewfinfo(image_path: Path) -> dict:
     return result
 
 
+# ── native EWF-E01 reader ────────────────────────────────────────────────────
+
+_EVF_SIGNATURE = b"EVF\x09\x0d\x0a\xff\x00"
+_FILE_HEADER_SIZE = 13
+_SECTION_DESCRIPTOR = struct.Struct("<16sQQ40xI")  # type, next, size, pad, adler32
+_TABLE_HEADER = struct.Struct("<I4xQ4xI")  # entries, base offset, adler32
+_COMPRESSED = 0x80000000
+_TABLE_CACHE = 32  # decoded offset tables kept in memory
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024  # decompressed chunks kept per image
+
+
+def _segment_path(first: Path, number: int) -> Path:
+    """Path of segment *number* (1-based): .E01 … .E99, then .EAA … .EZZ, .FAA …"""
+    ext = first.suffix
+    letter = ext[1:2] or "E"
+    if number < 100:
+        suffix = f"{letter}{number:02d}"
+    else:
+        n = number - 100
+        suffix = (
+            chr(ord(letter.upper()) + n // 676)
+            + chr(ord("A") + (n // 26) % 26)
+            + chr(ord("A") + n % 26)
+        )
+        if letter.islower():
+            suffix = suffix.lower()
+    return first.with_suffix("." + suffix)
+
+
+def ewf_segments(first: Path) -> list[Path]:
+    """Existing segment files of the EWF image whose first segment is *first*."""
+    first = Path(first)
+    if not re.fullmatch(r"\.[A-Za-z]\d\d", first.suffix):
+        return [first]
+    segments = [first]
+    while (segment := _segment_path(first, len(segments) + 1)).exists():
+        segments.append(segment)
+    return segments
+
+
+@dataclass
+class _ChunkTable:
+    """One ``table`` section: where its entries live and which chunks it maps."""
+
+    segment: int       # index into EwfImage._fds
+    entries_at: int    # file offset of the first uint32 entry
+    count: int
+    base_offset: int
+    data_end: int      # end of the chunk data region (bounds the last chunk)
+    first_chunk: int
+
+
+@dataclass
+class ChunkCacheStats:
+    """Counters for one image's chunk cache and inflate work."""
+
+    hits: int = 0              # served from the LRU cache
+    readahead_waits: int = 0   # joined a read-ahead inflate already in flight
+    misses: int = 0            # inflated on the caller's thread
+    evictions: int = 0
+    inflated_chunks: int = 0
+    inflated_bytes: int = 0
+    inflate_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        reads = self.hits + self.readahead_waits + self.misses
+        result = asdict(self)
+        result["inflate_seconds"] = round(self.inflate_seconds, 6)
+        result["hit_rate"] = round((reads - self.misses) / reads, 4) if reads else 0.0
+        result["inflate_mb_per_s"] = (
+            round(self.inflated_bytes / self.inflate_seconds / 1e6, 2)
+            if self.inflate_seconds else 0.0
+        )
+        return result
+
+
+class EwfImage(ImageSource):
+    """Random-access, read-only view of the media stored in an EWF-E01 image.
+
+    Every segment's section chain is walked once, and only the location of
+    each chunk offset table is kept. Tables are decoded when first needed,
+    and chunks are read with ``os.pread`` and inflated on demand.
+    :meth:`pread` and :meth:`open` give byte-addressed access to the media.
+
+    Inflated chunks are kept in an LRU cache of *cache_bytes*, so the
+    carver's repeated random reads around a hit do not inflate the same
+    chunk again. Sequential reads also inflate the following chunks ahead of
+    time on *readahead_workers* threads; zlib releases the GIL while it
+    works. ``0`` workers means one per CPU, and a negative count disables
+    read-ahead. :meth:`cache_stats` reports hit rates and inflate throughput.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        readahead_workers: int = 0,
+    ) -> None:
+        self.path = Path(path)
+        self.segments: list[Path] = []
+        self.chunk_size = 0
+        self.bytes_per_sector = 0
+        self.sector_count = 0
+        self.size = 0
+        self.chunk_count = 0
+        self._fds: list[int] = []
+        self._tables: list[_ChunkTable] = []
+        self._table_starts: list[int] = []
+        self._decoded: dict[int, tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[int, bytes] = OrderedDict()
+        self._cached_bytes = 0
+        self._pending: dict[int, Future] = {}
+        self._next_chunk = -1
+        self._stats = ChunkCacheStats()
+        self._workers = max(readahead_workers, 0)
+        if readahead_workers == 0:
+            self._workers = os.cpu_count() or 1
+        self._pool: Optional[ThreadPoolExecutor] = None
+        try:
+            self._open_segments()
+        except Exception:
+            self.close()
+            raise
+        self._readahead_depth = 2 * self._workers
+        # Always leave room for the read-ahead window plus the chunk being read.
+        self._cache_limit = max(cache_bytes, (self._readahead_depth + 1) * self.chunk_size)
+
+    # ── lifecycle ────────────────────────────────────────────────────
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+    # ── section walk ─────────────────────────────────────────────────
+    def _open_segments(self) -> None:
+        number = 1
+        while True:
+            segment = self.path if number == 1 else _segment_path(self.path, number)
+            if number > 1 and not segment.exists():
+                break
+            try:
+                fd = os.open(segment, os.O_RDONLY)
+            except OSError as exc:
+                raise EwfError(
+                    f"Cannot open EWF segment: {segment}",
+                    remediation="Verify every .E01/.E02/… segment is present and readable",
+                ) from exc
+            self._fds.append(fd)
+            self.segments.append(segment)
+            if self._walk_segment(len(self._fds) - 1, segment):
+                break
+            number += 1
+
+        if not self.chunk_size:
+            raise EwfError(
+                f"No volume section in {self.path}",
+                remediation="The image may be EWF2 (Ex01) or damaged; ewfexport is used instead",
+            )
+        if not self._tables:
+            raise EwfError(f"No chunk tables in {self.path}")
+        self.size = self.sector_count * self.bytes_per_sector
+        self.chunk_count = -(-self.size // self.chunk_size)
+
+    def _walk_segment(self, segment: int, path: Path) -> bool:
+        """Record this segment's volume info and tables; True at the ``done`` section."""
+        fd = self._fds[segment]
+        header = os.pread(fd, _FILE_HEADER_SIZE, 0)
+        if not header.startswith(_EVF_SIGNATURE):
+            raise EwfError(
+                f"Not an EWF-E01 segment: {path}",
+                remediation="Ex01/EWF2 and AFF images are exported with ewfexport instead",
+            )
+
+        offset = _FILE_HEADER_SIZE
+        sectors_end = 0
+        while True:
+            raw = os.pread(fd, _SECTION_DESCRIPTOR.size, offset)
+            if len(raw) < _SECTION_DESCRIPTOR.size:
+                raise EwfError(f"Truncated EWF section at {offset} in {path}")
+            kind, next_offset, size, checksum = _SECTION_DESCRIPTOR.unpack(raw)
+            if zlib.adler32(raw[:72]) != checksum:
+                raise EwfError(f"Corrupt EWF section descriptor at {offset} in {path}")
+            kind = kind.rstrip(b"\x00")
+            body = offset + _SECTION_DESCRIPTOR.size
+
+            if kind in (b"volume", b"disk") and not self.chunk_size:
+                self._parse_volume(os.pread(fd, 1052, body), size - _SECTION_DESCRIPTOR.size)
+            elif kind == b"sectors":
+                sectors_end = offset + size
+            elif kind == b"table":
+                self._add_table(segment, body, sectors_end or offset + size)
+            elif kind == b"done":
+                return True
+            elif kind == b"next":
+                return False
+
+            if next_offset <= offset:
+                return True
+            offset = next_offset
+
+    def _parse_volume(self, data: bytes, length: int) -> None:
+        _, sectors_per_chunk, bytes_per_sector = struct.unpack_from("<III", data, 4)
+        if length == 94:  # SMART (S01) volume: 32-bit sector count
+            (sector_count,) = struct.unpack_from("<I", data, 16)
+        else:
+            (sector_count,) = struct.unpack_from("<Q", data, 16)
+        if not sectors_per_chunk or not bytes_per_sector:
+            raise EwfError(f"Invalid EWF volume geometry in {self.path}")
+        self.bytes_per_sector = bytes_per_sector
+        self.sector_count = sector_count
+        self.chunk_size = sectors_per_chunk * bytes_per_sector
+
+    def _add_table(self, segment: int, body: int, data_end: int) -> None:
+        header = os.pread(self._fds[segment], _TABLE_HEADER.size, body)
+        count, base_offset, _ = _TABLE_HEADER.unpack(header)
+        first_chunk = 0
+        if self._tables:
+            first_chunk = self._tables[-1].first_chunk + self._tables[-1].count
+        self._tables.append(
+            _ChunkTable(
+                segment, body + _TABLE_HEADER.size, count, base_offset, data_end, first_chunk
+            )
+        )
+        self._table_starts.append(first_chunk)
+
+    # ── chunk access ─────────────────────────────────────────────────
+    def _entries(self, index: int) -> tuple[int, ...]:
+        entries = self._decoded.get(index)
+        if entries is None:
+            table = self._tables[index]
+            raw = os.pread(self._fds[table.segment], table.count * 4, table.entries_at)
+            entries = struct.unpack(f"<{table.count}I", raw)
+            if len(self._decoded) >= _TABLE_CACHE:
+                self._decoded.pop(next(iter(self._decoded)))
+            self._decoded[index] = entries
+        return entries
+
+    def _locate(self, number: int) -> tuple[int, int, int, bool]:
+        """(fd, start, end, compressed) of chunk *number*; caller holds the lock."""
+        index = bisect.bisect_right(self._table_starts, number) - 1
+        table = self._tables[index]
+        entries = self._entries(index)
+        position = number - table.first_chunk
+        entry = entries[position]
+        start = table.base_offset + (entry & ~_COMPRESSED)
+        if position + 1 < len(entries):
+            end = table.base_offset + (entries[position + 1] & ~_COMPRESSED)
+        else:
+            end = table.data_end
+        return self._fds[table.segment], start, end, bool(entry & _COMPRESSED)
+
+    def _inflate(self, number: int, fd: int, start: int, end: int, compressed: bool) -> bytes:
+        raw = os.pread(fd, max(end - start, 0), start)
+        expected = min(self.chunk_size, self.size - number * self.chunk_size)
+        started = time.perf_counter()
+        if compressed:
+            try:
+                data = zlib.decompressobj().decompress(raw, expected)
+            except zlib.error as exc:
+                raise EwfError(f"Corrupt compressed EWF chunk {number} in {self.path}") from exc
+        else:
+            data = raw[:expected]  # drop the trailing adler32
+        elapsed = time.perf_counter() - started
+        if len(data) < expected:
+            raise EwfError(f"Short EWF chunk {number} in {self.path}")
+        with self._lock:
+            self._stats.inflated_chunks += 1
+            self._stats.inflated_bytes += len(data)
+            self._stats.inflate_seconds += elapsed
+        return data
+
+    def _store(self, number: int, data: bytes) -> None:
+        """Insert a chunk into the LRU cache; caller holds the lock."""
+        if number in self._cache:
+            self._cache.move_to_end(number)
+            return
+        self._cache[number] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self._cache_limit and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+            self._stats.evictions += 1
+
+    def _prefetch(self, number: int) -> bytes:
+        with self._lock:
+            location = self._locate(number)
+        try:
+            data = self._inflate(number, *location)
+        except BaseException:
+            with self._lock:
+                self._pending.pop(number, None)
+            raise
+        with self._lock:
+            self._store(number, data)
+            self._pending.pop(number, None)
+        return data
+
+    def _read_ahead(self, first: int) -> None:
+        """Queue inflation of the chunks after a sequential read; caller holds the lock."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="frece-ewf"
+            )
+        last = min(first + self._readahead_depth, self.chunk_count)
+        for number in range(first, last):
+            if number not in self._cache and number not in self._pending:
+                self._pending[number] = self._pool.submit(self._prefetch, number)
+
+    def read_chunk(self, number: int) -> bytes:
+        """Return the decompressed bytes of media chunk *number*.
+
+        Chunks come from the LRU cache when possible. A read that continues
+        the previous one also queues the next chunks on the read-ahead pool.
+        """
+        with self._lock:
+            if self._fds and self._workers and number == self._next_chunk:
+                self._read_ahead(number + 1)
+            self._next_chunk = number + 1
+            data = self._cache.get(number)
+            if data is not None:
+                self._cache.move_to_end(number)
+                self._stats.hits += 1
+                return data
+            future = self._pending.get(number)
+            if future is not None:
+                self._stats.readahead_waits += 1
+            else:
+                self._stats.misses += 1
+                location = self._locate(number)
+
+        if future is not None:
+            inflated: bytes = future.result()
+            return inflated
+        data = self._inflate(number, *location)
+        with self._lock:
+            self._store(number, data)
+        return data
+
+    def cache_stats(self) -> dict:
+        """Chunk cache hit rates and inflate throughput, for sizing per host."""
+        with self._lock:
+            stats = self._stats.as_dict()
+            stats.update(
+                cache_limit_bytes=self._cache_limit,
+                cached_bytes=self._cached_bytes,
+                cached_chunks=len(self._cache),
+                readahead_workers=self._workers,
+            )
+        return stats
+
+    def pread(self, length: int, offset: int) -> bytes:
+        """Read up to *length* media bytes at *offset* (short only at the end)."""
+        if offset >= self.size or length <= 0:
+            return b""
+        length = min(length, self.size - offset)
+        pieces: list[bytes] = []
+        while length > 0:
+            number, within = divmod(offset, self.chunk_size)
+            piece = self.read_chunk(number)[within:within + length]
+            pieces.append(piece)
+            offset += len(piece)
+            length -= len(piece)
+        return b"".join(pieces)
+
+    def open(self) -> BinaryIO:
+        return io.BufferedReader(SourceStream(self), buffer_size=self.chunk_size)
+
+    def info(self) -> dict:
+        return {
+            "format": "EWF/E01",
+            "reader": "native",
+            "segments": len(self.segments),
+            "media_size_bytes": self.size,
+            "bytes_per_sector": self.bytes_per_sector,
+            "number_of_sectors": self.sector_count,
+            "chunk_size": self.chunk_size,
+        }
+
+
+def open_ewf(
+    path: Path, cache_bytes: int = DEFAULT_CACHE_BYTES, readahead_workers: int = 0
+) -> Optional[EwfImage]:
+    """Open *path* with the native reader, or None if it cannot parse it."""
+    try:
+        return EwfImage(path, cache_bytes=cache_bytes, readahead_workers=readahead_workers)
+    except (EwfError, OSError, struct.error):
+        return None
+
+
+def open_source(
+    path: Path, cache_bytes: int = DEFAULT_CACHE_BYTES, readahead_workers: int = 0
+) -> ImageSource:
+    """Open *path* as an :class:`ImageSource`: native E01, FRECE container,
+    split raw, or raw.
+
+    Raises :class:`EwfError` for EWF images the native reader cannot parse
+    (use :func:`open_image`, which falls back to ewfexport) and ``OSError``
+    when a raw segment cannot be opened.
+    """
+    path = Path(path)
+    if is_ewf_image(path):
+        try:
+            return EwfImage(path, cache_bytes=cache_bytes, readahead_workers=readahead_workers)
+        except struct.error as exc:
+            raise EwfError(f"Truncated EWF image: {path}") from exc
+    if is_container(path):
+        return ContainerImage(path)
+    return open_raw_source(path)
+
+
 class EwfReader:
     """Context manager that exports an EWF image to a raw temporary file.
 
@@ -110,7 +548,9 @@ class EwfReader:
         with EwfReader(Path("evidence.E01")) as raw_path:
             frece_carve(raw_path, output_dir)
 
-    The temporary file is deleted when the context exits.
+    The temporary file is deleted when the context exits. With an
+    :class:`~frece.export_cache.ExportCache` the export is kept and shared by
+    later commands instead; *metadata* (ewfinfo output) is checked on reuse.
     """
 
     def __init__(
@@ -118,14 +558,27 @@ class EwfReader:
         image_path: Path,
         chunk_size_mb: int = 64,
         show_progress: bool = False,
+        cache: Optional["ExportCache"] = None,
+        metadata: Optional[dict] = None,
     ) -> None:
         self.image_path = image_path
         self.chunk_size_mb = chunk_size_mb
         self.show_progress = show_progress
+        self._cache = cache
+        self._metadata = metadata
+        self._lease: Optional[ContextManager[Path]] = None
         self._tmp_dir: Optional[str] = None
         self._raw_path: Optional[Path] = None
 
     def __enter__(self) -> Path:
+        if self._cache is not None:
+            metadata = self._metadata if self._metadata is not None else ewfinfo(self.image_path)
+            self._lease = self._cache.lease(
+                self.image_path, ewf_segments(Path(self.image_path)), metadata, self._export
+            )
+            self._raw_path = self._lease.__enter__()
+            return self._raw_path
+
         self._tmp_dir = tempfile.mkdtemp(prefix="frece_ewf_")
         raw_path = Path(self._tmp_dir) / "evidence.raw"
 
@@ -133,7 +586,10 @@ class EwfReader:
         self._raw_path = raw_path
         return raw_path
 
-    def __exit__(self, *_: object) -> None:
+    def __exit__(self, *args: Any) -> None:
+        if self._lease is not None:
+            lease, self._lease = self._lease, None
+            lease.__exit__(*args)
         if self._tmp_dir:
             shutil.rmtree(self._tmp_dir, ignore_errors=True)
 
@@ -188,20 +644,36 @@ class EwfReader:
         return self._raw_path
 
 
-def open_image(image_path: Path, show_progress: bool = False) -> "ImageHandle":
+def open_image(
+    image_path: Path,
+    show_progress: bool = False,
+    cache_bytes: int = DEFAULT_CACHE_BYTES,
+    readahead_workers: int = 0,
+    export_cache: Optional["ExportCache"] = None,
+) -> "ImageHandle":
     """Open any forensic image format, returning a unified handle.
 
     For raw images (.dd, .img, .bin, etc.) the handle wraps the path directly.
-    For EWF/E01 images the handle exports to a temp raw file transparently.
+    FRECE containers (``frece acquire --format frc``) are read in place.
+    For EWF/E01 images ``handle.source`` is a native :class:`EwfImage` reader;
+    ``handle.raw_path`` still exports to a temp raw file, on first use, for
+    tools that need a path.
 
     Example::
 
         with open_image(Path("evidence.E01")) as handle:
-            raw_path = handle.raw_path
-            run_carve(raw_path, output_dir)
+            run_carve(handle.source, output_dir)
     """
     if is_ewf_image(image_path):
-        return EwfImageHandle(image_path, show_progress=show_progress)
+        return EwfImageHandle(
+            image_path,
+            show_progress=show_progress,
+            cache_bytes=cache_bytes,
+            readahead_workers=readahead_workers,
+            export_cache=export_cache,
+        )
+    if is_container(image_path):
+        return ContainerImageHandle(image_path)
     return RawImageHandle(image_path)
 
 
@@ -218,6 +690,11 @@ class ImageHandle:
     def raw_path(self) -> Path:
         raise NotImplementedError
 
+    @property
+    def source(self) -> ImageSource:
+        """The media as an :class:`ImageSource`, valid inside the context."""
+        raise NotImplementedError
+
     @property
     def image_info(self) -> dict:
         return {}
@@ -228,43 +705,159 @@ class RawImageHandle(ImageHandle):
 
     def __init__(self, path: Path) -> None:
         self._path = path
+        self._source: Optional[ImageSource] = None
+
+    def __exit__(self, *_: object) -> None:
+        if self._source is not None:
+            self._source.close()
+            self._source = None
 
     @property
     def raw_path(self) -> Path:
+        # Sleuth Kit opens the rest of a split set from its first segment
         return self._path
 
+    @property
+    def source(self) -> ImageSource:
+        if self._source is None:
+            self._source = open_raw_source(self._path)
+        return self._source
+
     @property
     def image_info(self) -> dict:
-        return {
-            "format": "raw",
+        segments = split_segments(self._path)
+        info = {
+            "format": "split-raw" if len(segments) > 1 else "raw",
             "image_path": str(self._path),
-            "size_bytes": self._path.stat().st_size if self._path.exists() else 0,
+            "size_bytes": sum(p.stat().st_size for p in segments if p.exists()),
         }
+        if len(segments) > 1:
+            info["segments"] = len(segments)
+        return info
+
+
+class ContainerImageHandle(ImageHandle):
+    """Handle for FRECE containers — read in place, expanded to raw on demand."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._image: Optional[ContainerImage] = None
+        self._tmp_dir: Optional[str] = None
+        self._raw: Optional[Path] = None
+
+    def __enter__(self) -> "ContainerImageHandle":
+        self._image = ContainerImage(self._path)
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        if self._image is not None:
+            self._image.close()
+            self._image = None
+        if self._tmp_dir:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+        self._raw = None
+
+    @property
+    def source(self) -> ImageSource:
+        if self._image is None:
+            raise EwfError("ContainerImageHandle not entered — use as context manager")
+        return self._image
+
+    @property
+    def raw_path(self) -> Path:
+        # Sleuth Kit needs a path: expand once, leaving zero chunks as holes
+        if self._raw is None:
+            source = self.source
+            self._tmp_dir = tempfile.mkdtemp(prefix="frece_frc_")
+            raw = Path(self._tmp_dir) / "evidence.raw"
+            with open(raw, "wb") as out:
+                for offset, data in source.iter_extents(skip_holes=True):
+                    out.seek(offset)
+                    out.write(data)
+                out.truncate(source.size)
+            self._raw = raw
+        return self._raw
+
+    @property
+    def image_info(self) -> dict:
+        return self.source.info() if self._image is not None else {}
 
 
 class EwfImageHandle(ImageHandle):
-    """Handle for EWF/E01 images — exports to temp raw on enter."""
+    """Handle for EWF/E01 images — native reader, or export to temp raw."""
 
-    def __init__(self, path: Path, show_progress: bool = False) -> None:
+    def __init__(
+        self,
+        path: Path,
+        show_progress: bool = False,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        readahead_workers: int = 0,
+        export_cache: Optional["ExportCache"] = None,
+    ) -> None:
         self._path = path
-        self._reader = EwfReader(path, show_progress=show_progress)
+        self._show_progress = show_progress
+        self._export_cache = export_cache
+        self._reader: Optional[EwfReader] = None
+        self._cache_bytes = cache_bytes
+        self._readahead_workers = readahead_workers
+        self._image: Optional[EwfImage] = None
         self._raw: Optional[Path] = None
+        self._exported: Optional[ImageSource] = None
+        self._entered = False
         self._info: dict = {}
 
     def __enter__(self) -> "EwfImageHandle":
-        # Gather metadata before export (fast)
         self._info = ewfinfo(self._path)
-        self._raw = self._reader.__enter__()
+        self._reader = EwfReader(
+            self._path,
+            show_progress=self._show_progress,
+            cache=self._export_cache,
+            metadata=self._info,
+        )
+        self._image = open_ewf(
+            self._path,
+            cache_bytes=self._cache_bytes,
+            readahead_workers=self._readahead_workers,
+        )
+        if self._image is not None:
+            for key, value in self._image.info().items():
+                self._info.setdefault(key, value)
+        else:
+            self._raw = self._reader.__enter__()
+        self._entered = True
         return self
 
     def __exit__(self, *args: object) -> None:
-        self._reader.__exit__(*args)
+        for source in (self._image, self._exported):
+            if source is not None:
+                source.close()
+        self._image = self._exported = None
+        if self._reader is not None:
+            self._reader.__exit__(*args)
         self._raw = None
+        self._entered = False
+
+    @property
+    def native(self) -> bool:
+        """True when the media is read in-process rather than exported."""
+        return self._image is not None
+
+    @property
+    def source(self) -> ImageSource:
+        if self._image is not None:
+            return self._image
+        if self._exported is None:
+            self._exported = open_raw_source(self.raw_path)
+        return self._exported
 
     @property
     def raw_path(self) -> Path:
-        if self._raw is None:
+        if not self._entered:
             raise EwfError("EwfImageHandle not entered — use as context manager")
+        if self._raw is None:
+            assert self._reader is not None  # set by __enter__
+            self._raw = self._reader.__enter__()
         return self._raw
 
     @property
@@ -0,0 +1,283 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Shared cache of raw images exported from EWF evidence with ewfexport.
+
+Sleuth Kit builds without libewf, and formats the native reader does not
+parse (Ex01, AFF), still need a raw export. Exporting a large E01 takes as
+long as reading the whole image, and before this cache every command paid
+that cost again and deleted the result on exit.
+
+Exports are content-addressed. The key is a SHA-256 over every segment's
+full SHA-256, so a renamed or copied image reuses its export and a change
+anywhere in any segment does not. Reading the compressed segments costs far
+less than exporting them. The cache fails closed. The ewfinfo metadata
+recorded with an export (media size, sector count, stored hashes) must equal
+the current metadata field for field on every reuse. Without ewfinfo
+metadata an image is never cached, and any difference rebuilds the entry.
+
+The cache is off by default. Entries live under ``<cache_dir>/exports``
+with a SQLite index once ``export_cache_gb`` is set. When a new export would
+take the cache over that capacity, the least recently used entries are
+evicted. An export larger than the whole capacity is used
+for the one command and then deleted, as before. Where ``fcntl`` is
+available, a shared lock is held on an entry while a command uses it and an
+exclusive lock while it is exported or removed. Concurrent commands over the
+same image therefore wait for a single export, and neither eviction, a stale
+entry's rebuild nor ``invalidate`` removes a file another command is using.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from .ewf import EwfError
+from .hash_cache import hash_path
+
+try:  # POSIX only; without it exports are still cached but not locked
+    import fcntl as _fcntl
+except ImportError:  # pragma: no cover - Windows
+    _fcntl = None  # type: ignore[assignment]
+
+# ewfinfo fields that must match for a cached export to be reused.
+VERIFIED_FIELDS = (
+    "media_size", "number_of_sectors", "bytes_per_sector", "md5_hash", "sha1_hash",
+)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def default_export_dir(cache_dir: Path) -> Path:
+    return Path(cache_dir) / "exports"
+
+
+def content_key(segments: list[Path]) -> str:
+    """Content address of an EWF image from its segments (see module docstring)."""
+    digest = hashlib.sha256()
+    for segment in segments:
+        digests, size = hash_path(segment, ("sha256",))
+        digest.update(f"{size}:{digests['sha256']}\n".encode())
+    return digest.hexdigest()
+
+
+def _verified(metadata: dict) -> dict:
+    return {key: str(metadata[key]) for key in VERIFIED_FIELDS if metadata.get(key)}
+
+
+class ExportCache:
+    """Content-addressed, size-bounded LRU store of ewfexport raw images."""
+
+    def __init__(self, root: Path, capacity_bytes: int) -> None:
+        self.root = Path(root)
+        self.capacity_bytes = capacity_bytes
+        self.db_path = self.root / "exports.db"
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+        except (OSError, sqlite3.Error) as exc:
+            raise EwfError(
+                f"Cannot open export cache: {self.db_path}",
+                remediation="Check cache_dir permissions or set export_cache_gb = 0",
+            ) from exc
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exports (
+                key TEXT PRIMARY KEY,
+                image TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                metadata TEXT NOT NULL,
+                created TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def _raw_path(self, key: str) -> Path:
+        return self.root / f"{key}.raw"
+
+    # ── locking ──────────────────────────────────────────────────────
+    def _lock(self, key: str, mode: int, blocking: bool = True) -> Optional[int]:
+        """Open and lock ``<key>.lock``; return its fd, or None if busy (non-blocking)."""
+        fd = os.open(self.root / f"{key}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        if _fcntl is None:
+            return fd
+        try:
+            _fcntl.flock(fd, mode if blocking else mode | _fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    # ── lookup / export ──────────────────────────────────────────────
+    def _lookup(
+        self, conn: sqlite3.Connection, key: str, metadata: dict, purge: bool
+    ) -> Optional[Path]:
+        """The entry's raw file if it is intact and its metadata matches exactly.
+
+        A stale entry is only removed with *purge*, which the caller passes
+        while it holds the entry's exclusive lock.
+        """
+        row = conn.execute(
+            "SELECT size, metadata FROM exports WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        raw_path = self._raw_path(key)
+        current = _verified(metadata)
+        try:
+            size_ok = raw_path.stat().st_size == row[0]
+        except OSError:
+            size_ok = False
+        if not current or json.loads(row[1]) != current or not size_ok:
+            if purge:
+                with conn:
+                    conn.execute("DELETE FROM exports WHERE key = ?", (key,))
+                raw_path.unlink(missing_ok=True)
+            return None
+        with conn:
+            conn.execute("UPDATE exports SET last_used = ? WHERE key = ?", (time.time(), key))
+        return raw_path
+
+    @contextmanager
+    def lease(
+        self,
+        image_path: Path,
+        segments: list[Path],
+        metadata: dict,
+        export: Callable[[Path], None],
+    ) -> Iterator[Path]:
+        """Yield a raw export of the image, exporting with *export* on a miss.
+
+        The entry is locked against eviction until the context exits.
+        """
+        key = content_key(segments)
+        conn = self._connect()
+        lock_fd = self._lock(key, _fcntl.LOCK_SH if _fcntl else 0)
+        assert lock_fd is not None  # a blocking lock always returns its fd
+        transient: Optional[Path] = None
+        try:
+            raw_path = self._lookup(conn, key, metadata, purge=_fcntl is None)
+            exclusive = raw_path is None and _fcntl is not None
+            if exclusive:
+                # upgrade: wait for other users and any exporter, then look again
+                _fcntl.flock(lock_fd, _fcntl.LOCK_EX)
+                raw_path = self._lookup(conn, key, metadata, purge=True)
+            if raw_path is None:
+                # ewfexport appends ".raw" to its target, so keep that suffix last
+                partial = self.root / f"{key}-{os.getpid()}.partial.raw"
+                try:
+                    export(partial)
+                except BaseException:
+                    partial.unlink(missing_ok=True)
+                    raise
+                size = partial.stat().st_size
+                if size > self.capacity_bytes or not _verified(metadata):
+                    transient = raw_path = partial
+                else:
+                    raw_path = self._raw_path(key)
+                    os.replace(partial, raw_path)
+                    now = time.time()
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO exports "
+                            "(key, image, size, metadata, created, last_used) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (key, str(Path(image_path).resolve()), size,
+                             json.dumps(_verified(metadata)), _utc_now_iso(), now),
+                        )
+                    self._evict(conn, keep=key)
+            if exclusive:
+                _fcntl.flock(lock_fd, _fcntl.LOCK_SH)
+            conn.close()  # not held while the caller reads the export
+            yield raw_path
+        finally:
+            conn.close()  # a no-op when already closed
+            if transient is not None:
+                transient.unlink(missing_ok=True)
+            os.close(lock_fd)
+
+    def _evict(self, conn: sqlite3.Connection, keep: str) -> None:
+        """Drop least recently used entries until the cache fits its capacity."""
+        rows = conn.execute("SELECT key, size FROM exports ORDER BY last_used").fetchall()
+        total = sum(size for _, size in rows)
+        for key, size in rows:
+            if total <= self.capacity_bytes:
+                break
+            if key == keep:
+                continue
+            lock_fd = self._lock(key, _fcntl.LOCK_EX if _fcntl else 0, blocking=False)
+            if lock_fd is None:
+                continue  # in use by another command
+            try:
+                self._raw_path(key).unlink(missing_ok=True)
+                with conn:
+                    conn.execute("DELETE FROM exports WHERE key = ?", (key,))
+                total -= size
+            finally:
+                os.close(lock_fd)
+
+    # ── maintenance ──────────────────────────────────────────────────
+    def list_exports(self) -> list[dict]:
+        """Describe every cached export, most recently used first."""
+        if not self.db_path.exists():
+            return []
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT key, image, size, created, last_used FROM exports "
+                "ORDER BY last_used DESC"
+            )
+            return [
+                {
+                    "key": key,
+                    "image": image,
+                    "size_bytes": size,
+                    "created": created,
+                    "last_used": datetime.fromtimestamp(last_used, timezone.utc)
+                    .isoformat()
+                    .replace("+00:00", "Z"),
+                }
+                for key, image, size, created, last_used in cursor
+            ]
+        finally:
+            conn.close()
+
+    def invalidate(self, image_path: Optional[Path] = None) -> int:
+        """Drop cached exports of one image path, or all of them (skipping leased ones)."""
+        if not self.db_path.exists():
+            return 0
+        conn = self._connect()
+        try:
+            if image_path is None:
+                rows = conn.execute("SELECT key FROM exports").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT key FROM exports WHERE image = ?",
+                    (str(Path(image_path).resolve()),),
+                ).fetchall()
+            removed = 0
+            for (key,) in rows:
+                lock_fd = self._lock(key, _fcntl.LOCK_EX if _fcntl else 0, blocking=False)
+                if lock_fd is None:
+                    continue  # in use by another command; left for a later clear
+                try:
+                    self._raw_path(key).unlink(missing_ok=True)
+                    with conn:
+                        conn.execute("DELETE FROM exports WHERE key = ?", (key,))
+                    removed += 1
+                finally:
+                    os.close(lock_fd)
+            return removed
+        finally:
+            conn.close()
@@ -0,0 +1,385 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Header-based file type detection shared by recovery, trash and classify.
+
+The signature table is compiled once at import time. It merges the carver's
+``SignatureDatabase.SIGNATURES`` with the recovery-specific header checks and
+groups them by their first two bytes, longest prefix first, so a lookup costs
+one dict probe plus a few ``startswith`` calls. A small offset-keyed table
+covers formats whose magic is not at byte 0, such as the ISO-BMFF ``ftyp``
+box and tar's ``ustar``. Container types (ZIP, RIFF, ftyp) are refined into
+sub-types by resolvers.
+
+Short magics of binary formats (four bytes or fewer, such as ``MZ``, ``BM``,
+``FILE`` or ``PAGE``) also occur at the start of ordinary text. A match on
+one of them only counts when a structural check of the header passes, or,
+for formats without one, when the header does not look like text. Otherwise
+libmagic decides, as it did before the table existed.
+
+libmagic is consulted only when no signature matches. Each thread reuses its
+own ``magic.Magic`` handle, because building one re-parses the magic database.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from frece.carver import SignatureDatabase
+
+try:  # python-magic is optional; the signature table needs no native library
+    import magic as _magic
+except ImportError:
+    _magic = None  # type: ignore[assignment]
+
+HEADER_BYTES = 4096  # bytes a caller should read to feed detect_file_type()
+
+# Recovery-specific checks; these win over SIGNATURES entries with the same prefix.
+_RECOVERY_SIGNATURES: dict[bytes, str] = {
+    b"L\x00\x00\x00": "lnk",
+    b"\xca\xfe\xba\xbe": "macho",
+    b"#!/": "script",
+    b"<!DOCTYPE html": "html",
+    b"<!doctype html": "html",
+    b"<!DOCTYPE HTML": "html",
+    b"<html": "html",
+    b"<HTML": "html",
+    b"Rar!\x1a\x07\x01": "rar",
+    b"ID3": "mp3",
+}
+
+# (offset, magic, type) for signatures that do not start at byte 0.
+_OFFSET_SIGNATURES: tuple[tuple[int, bytes, str], ...] = (
+    (4, b"ftyp", "ftyp"),
+    (257, b"ustar", "tar"),
+)
+
+# Formats whose genuine headers are text; their short prefixes are never weak.
+_TEXTUAL = frozenset({"script", "rtf", "pdf"})
+
+# Bytes that occur in text: printable ASCII, common controls and the
+# bytes >= 0x80 of UTF-8 sequences (checked by decoding).
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+
+_HEIC_BRANDS = (b"heic", b"heix", b"hevc", b"hevx", b"mif1", b"msf1", b"avif", b"avis")
+_QT_BRANDS = (b"qt  ", b"mqt ")
+_RIFF_FORMS = {b"WAVE": "wav", b"AVI ": "avi", b"WEBP": "webp"}
+
+# Canonical type → MIME, for callers that report MIME (trash listings).
+MIME_TYPES: dict[str, str] = {
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "bmp": "image/bmp",
+    "tiff": "image/tiff",
+    "webp": "image/webp",
+    "heic": "image/heic",
+    "psd": "image/vnd.adobe.photoshop",
+    "pdf": "application/pdf",
+    "rtf": "text/rtf",
+    "xml": "text/xml",
+    "html": "text/html",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "ole": "application/x-ole-storage",
+    "zip": "application/zip",
+    "7z": "application/x-7z-compressed",
+    "rar": "application/x-rar",
+    "gz": "application/gzip",
+    "bz2": "application/x-bzip2",
+    "xz": "application/x-xz",
+    "tar": "application/x-tar",
+    "mp3": "audio/mpeg",
+    "wav": "audio/x-wav",
+    "flac": "audio/flac",
+    "ogg": "audio/ogg",
+    "avi": "video/x-msvideo",
+    "mp4": "video/mp4",
+    "mov": "video/quicktime",
+    "mkv": "video/x-matroska",
+    "flv": "video/x-flv",
+    "pe": "application/x-dosexec",
+    "elf": "application/x-executable",
+    "macho": "application/x-mach-binary",
+    "sqlite": "application/vnd.sqlite3",
+    "pcap": "application/vnd.tcpdump.pcap",
+    "pcapng": "application/x-pcapng",
+    "eml": "message/rfc822",
+    "script": "text/x-shellscript",
+    "py": "text/x-script.python",
+    "plist": "application/x-bplist",
+}
+
+# libmagic description → canonical type: (any of, all of, type), checked in order.
+_MAGIC_DESCRIPTIONS: tuple[tuple[tuple[str, ...], tuple[str, ...], str], ...] = (
+    (("word 2007+", "wordprocessingml"), (), "docx"),
+    (("excel 2007+", "spreadsheetml"), (), "xlsx"),
+    (("powerpoint 2007+", "presentationml"), (), "pptx"),
+    (("jpeg", "jfif"), (), "jpeg"),
+    (("png image",), (), "png"),
+    (("pdf document",), (), "pdf"),
+    (("quicktime",), (), "mov"),
+    (("mp4", "iso media"), (), "mp4"),
+    (("sqlite 3.x database", "sqlite database"), (), "sqlite"),
+    (("pcap capture", "tcpdump"), (), "pcap"),
+    (("pcap-ng capture",), (), "pcapng"),
+    (("wave audio", "riff (little-endian)"), (), "wav"),
+    (("avi",), (), "avi"),
+    (("layer iii",), ("mpeg",), "mp3"),
+    (("flac audio",), (), "flac"),
+    (("ogg",), (), "ogg"),
+    (("pe32", "ms-dos executable"), (), "pe"),
+    (("executable", "shared object"), ("elf",), "elf"),
+    (("windows event log",), (), "evtx"),
+    (("ms windows shortcut",), (), "lnk"),
+    (("windows registry",), (), "reg"),
+    (("photoshop",), (), "psd"),
+    (("vmdk",), (), "vmdk"),
+    (("rich text", "rtf"), (), "rtf"),
+    (("xml",), (), "xml"),
+    (("html document",), (), "html"),
+    (("mail message", "rfc 822", "smtp mail"), (), "eml"),
+    (("mbox",), (), "mbox"),
+    (("python",), (), "py"),
+    (("shell script", "bash script"), (), "sh"),
+    (("perl script",), (), "pl"),
+    (("php script",), (), "php"),
+    (("gzip compressed",), (), "gz"),
+    (("bzip2 compressed",), (), "bz2"),
+    (("xz compressed",), (), "xz"),
+    (("zip archive",), (), "zip"),
+    (("7-zip archive",), (), "7z"),
+    (("rar archive",), (), "rar"),
+    (("tiff image",), (), "tiff"),
+    (("gif image",), (), "gif"),
+    (("bitmap image",), (), "bmp"),
+    (("matroska", "webm"), (), "mkv"),
+    (("flash video",), (), "flv"),
+    (("apple binary property",), (), "plist"),
+    (("mach-o",), (), "macho"),
+    (("csv", "comma-separated"), (), "csv"),
+    (("text",), (), "txt"),
+)
+
+
+# ── structural checks for weak magics ───────────────────────────────────────
+# Each returns True/False, or None when the header is too short to tell.
+
+def _check_mp3_frame(data: bytes) -> Optional[bool]:
+    if len(data) < 3:
+        return None
+    return (data[2] >> 4) not in (0, 15) and (data[2] >> 2) & 3 != 3
+
+
+def _check_id3(data: bytes) -> Optional[bool]:
+    return None if len(data) < 5 else data[3] in (2, 3, 4) and data[4] != 0xFF
+
+
+def _check_der(data: bytes) -> Optional[bool]:
+    return None if len(data) < 5 else data[4] in (0x02, 0x06, 0x30, 0x31, 0xA0)
+
+
+def _check_bmp(data: bytes) -> Optional[bool]:
+    if len(data) < 18:
+        return None
+    dib_size = int.from_bytes(data[14:18], "little")
+    return data[6:10] == b"\x00" * 4 and dib_size in (12, 40, 52, 56, 64, 108, 124)
+
+
+def _check_pe(data: bytes) -> Optional[bool]:
+    if len(data) < 0x40:
+        return None
+    pe_offset = int.from_bytes(data[0x3C:0x40], "little")
+    if pe_offset + 4 > len(data):
+        return None
+    return data[pe_offset:pe_offset + 4] == b"PE\x00\x00"
+
+
+def _check_aiff(data: bytes) -> Optional[bool]:
+    return None if len(data) < 12 else data[8:12] in (b"AIFF", b"AIFC")
+
+
+def _check_gzip(data: bytes) -> Optional[bool]:
+    return None if len(data) < 3 else data[2] == 8
+
+
+def _check_bzip2(data: bytes) -> Optional[bool]:
+    return None if len(data) < 4 else 0x31 <= data[3] <= 0x39
+
+
+_CHECKS: dict[bytes, Callable[[bytes], Optional[bool]]] = {
+    b"\xff\xfb": _check_mp3_frame,
+    b"\xff\xf3": _check_mp3_frame,
+    b"\xff\xf2": _check_mp3_frame,
+    b"ID3": _check_id3,
+    b"0\x82": _check_der,
+    b"BM": _check_bmp,
+    b"MZ": _check_pe,
+    b"FORM": _check_aiff,
+    b"\x1f\x8b": _check_gzip,
+    b"BZh": _check_bzip2,
+}
+
+
+def _looks_like_text(data: bytes) -> bool:
+    sample = data[:1024]
+    if not sample or sample.translate(None, _TEXT_BYTES):
+        return False
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        return exc.start >= len(sample) - 3  # a character cut off by the sample
+    return True
+
+
+def _plausible(prefix: bytes, data: bytes) -> bool:
+    """Whether a weak magic match is a real header rather than text."""
+    check = _CHECKS.get(prefix)
+    verdict = check(data) if check is not None else None
+    return verdict if verdict is not None else not _looks_like_text(data)
+
+
+_Entry = tuple[bytes, str, bool]  # (prefix, type, weak)
+
+
+def _compile(signatures: dict[bytes, str]) -> dict[bytes, tuple[_Entry, ...]]:
+    """Bucket signatures by their first two bytes, longest prefix first."""
+    buckets: dict[bytes, list[_Entry]] = {}
+    for prefix, file_type in signatures.items():
+        weak = len(prefix) <= 4 and file_type not in _TEXTUAL
+        buckets.setdefault(prefix[:2], []).append((prefix, file_type, weak))
+    return {
+        key: tuple(sorted(entries, key=lambda item: len(item[0]), reverse=True))
+        for key, entries in buckets.items()
+    }
+
+
+_DISPATCH = _compile({**SignatureDatabase.SIGNATURES, **_RECOVERY_SIGNATURES})
+
+
+# ── container resolvers ──────────────────────────────────────────────────────
+
+def _resolve_zip(data: bytes) -> str:
+    head = data[:HEADER_BYTES]
+    if b"word/" in head:
+        return "docx"
+    if b"xl/" in head:
+        return "xlsx"
+    if b"ppt/" in head:
+        return "pptx"
+    return "zip"
+
+
+def _resolve_riff(data: bytes) -> str:
+    return _RIFF_FORMS.get(data[8:12], "riff")
+
+
+def _resolve_ftyp(data: bytes) -> str:
+    start = data.find(b"ftyp")
+    brand = data[start + 4:start + 8]
+    brands = data[start + 4:start + 68]
+    if brand in _HEIC_BRANDS or any(b in brands for b in _HEIC_BRANDS):
+        return "heic"
+    if brand in _QT_BRANDS:
+        return "mov"
+    return "mp4"
+
+
+_RESOLVERS: dict[str, Callable[[bytes], str]] = {
+    "zip": _resolve_zip,
+    "riff": _resolve_riff,
+    "ftyp": _resolve_ftyp,
+}
+
+
+# ── lookup ───────────────────────────────────────────────────────────────────
+
+def match_signature(data: bytes) -> Optional[str]:
+    """Return the canonical type for *data*'s header, or None (no libmagic)."""
+    file_type = None
+    for prefix, candidate, weak in _DISPATCH.get(data[:2], ()):
+        if data.startswith(prefix) and (not weak or _plausible(prefix, data)):
+            file_type = candidate
+            break
+    if file_type is None:
+        for offset, signature, candidate in _OFFSET_SIGNATURES:
+            if data.startswith(signature, offset):
+                file_type = candidate
+                break
+    if file_type is None:
+        return None
+    resolver = _RESOLVERS.get(file_type)
+    return resolver(data) if resolver is not None else file_type
+
+
+_local = threading.local()
+
+
+def _magic_handle(mime: bool):
+    """This thread's reusable libmagic handle, or None if unavailable."""
+    if _magic is None:
+        return None
+    attr = "mime" if mime else "description"
+    handle = getattr(_local, attr, None)
+    if handle is None:
+        try:
+            handle = _magic.Magic(mime=mime)
+        except Exception:
+            return None
+        setattr(_local, attr, handle)
+    return handle
+
+
+def _magic_type(data: bytes) -> Optional[str]:
+    handle = _magic_handle(mime=False)
+    if handle is None:
+        return None
+    try:
+        detected = handle.from_buffer(data).lower()
+    except Exception:
+        return None
+    for any_of, all_of, file_type in _MAGIC_DESCRIPTIONS:
+        if any(needle in detected for needle in any_of) and all(
+            needle in detected for needle in all_of
+        ):
+            return file_type
+    return None
+
+
+def detect_file_type(data: bytes) -> str:
+    """Canonical FRECE type for a file's leading bytes; ``"bin"`` if unknown."""
+    if not data:
+        return "bin"
+    return match_signature(data) or _magic_type(data) or "bin"
+
+
+def _read_header(path: Path) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read(HEADER_BYTES)
+
+
+def detect_path_type(path: Path) -> str:
+    """:func:`detect_file_type` on the first :data:`HEADER_BYTES` of *path*."""
+    try:
+        return detect_file_type(_read_header(path))
+    except OSError:
+        return "bin"
+
+
+def detect_mime(path: Path) -> Optional[str]:
+    """MIME type of *path* from its header, falling back to libmagic; None if unknown."""
+    try:
+        data = _read_header(path)
+    except OSError:
+        return None
+    file_type = match_signature(data) if data else None
+    if file_type in MIME_TYPES:
+        return MIME_TYPES[file_type]
+    handle = _magic_handle(mime=True)
+    if handle is None:
+        return None
+    try:
+        return handle.from_buffer(data) or None
+    except Exception:
+        return None
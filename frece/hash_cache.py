@@ -0,0 +1,256 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Persistent cache of file digests for repeated, non-evidentiary re-checks.
+
+Re-listing a large trash store, re-hashing exported files, or checking a
+resumed recovery's outputs used to re-read every byte on every run. The cache
+stores digests in SQLite (``<cache_dir>/hashes.db``). Each digest is keyed by
+the file's ``(st_dev, st_ino, size, mtime_ns, algorithm)`` and also stores
+``ctime_ns``, which ordinary users cannot set back, so a file touched back
+to its old mtime is still re-hashed. A digest is only stored when the file's
+identity is the same before and after hashing, so a file modified while it
+was read is never cached. Only regular files are cached; devices always
+hash in full.
+
+With ``strict=True`` every lookup misses, so everything is re-read from the
+media as chain of custody requires. The fresh digests still refresh the
+cache. ``frece hash`` is strict unless ``--use-cache`` is given, because
+silent storage corruption leaves the file identity unchanged. Setting
+``hash_cache_strict`` in the config makes every user strict. Acquisition
+never consults the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import stat
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .errors import FreceError
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1024 * 1024
+# Legacy evidence-integrity checksums, not security primitives.
+_LEGACY = frozenset({"md5", "sha1"})
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def default_hash_cache_path(cache_dir: Path) -> Path:
+    return Path(cache_dir) / "hashes.db"
+
+
+def _same_file(a: os.stat_result, b: os.stat_result) -> bool:
+    return (a.st_dev, a.st_ino, a.st_size, a.st_mtime_ns, a.st_ctime_ns) == (
+        b.st_dev, b.st_ino, b.st_size, b.st_mtime_ns, b.st_ctime_ns
+    )
+
+
+def hash_path(
+    path: Path, algorithms: Iterable[str] = ("sha256",)
+) -> tuple[dict[str, str], int]:
+    """Hash *path* with every algorithm in one read; return ``(digests, size)``."""
+    hashers = {
+        name: hashlib.new(name, usedforsecurity=name not in _LEGACY) for name in algorithms
+    }
+    size = 0
+    with open(path, "rb") as handle:
+        while chunk := handle.read(_CHUNK):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+            size += len(chunk)
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}, size
+
+
+class HashCache:
+    """SQLite-backed digest cache keyed by file identity (see module docstring).
+
+    One connection is shared by all threads of the process and guarded by a
+    lock. The database runs in WAL mode with ``synchronous=NORMAL``, so an
+    insert costs no fsync.
+    """
+
+    def __init__(self, db_path: Path, strict: bool = False) -> None:
+        self.db_path = Path(db_path)
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hashes (
+                    dev INTEGER NOT NULL,
+                    ino INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    ctime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    hashed TEXT NOT NULL,
+                    PRIMARY KEY (dev, ino, size, mtime_ns, algorithm)
+                )
+                """
+            )
+        except (OSError, sqlite3.Error) as exc:
+            raise FreceError(
+                f"Cannot open hash cache: {self.db_path}",
+                remediation="Check cache_dir permissions or set hash_cache = false",
+            ) from exc
+        self._conn = conn
+        return conn
+
+    def _broken(self) -> FreceError:
+        return FreceError(
+            f"Hash cache is unreadable: {self.db_path}",
+            remediation="Run `frece cache clear --hashes` or set hash_cache = false",
+        )
+
+    def disable(self, exc: FreceError) -> None:
+        """Stop consulting a broken cache; later lookups miss and stores are skipped."""
+        if not self._disabled:
+            logger.warning(
+                "%s (%s); hashing files directly. %s",
+                exc.message, exc.__cause__, exc.remediation,
+            )
+        self._disabled = True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    # ── lookup / store ───────────────────────────────────────────────
+    @staticmethod
+    def identity(path: Path) -> Optional[os.stat_result]:
+        """``stat`` of *path* if it is a regular file that may be cached."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st if stat.S_ISREG(st.st_mode) else None
+
+    def get(self, st: os.stat_result, algorithms: Iterable[str]) -> Optional[dict[str, str]]:
+        """Cached digests for every algorithm, or None (always None when strict)."""
+        found: Optional[dict[str, str]] = None if self.strict or self._disabled else {}
+        with self._lock:
+            if found is not None:
+                conn = self._connection()
+                for algorithm in algorithms:
+                    try:
+                        row = conn.execute(
+                            "SELECT digest, ctime_ns FROM hashes WHERE dev = ? AND ino = ? "
+                            "AND size = ? AND mtime_ns = ? AND algorithm = ?",
+                            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm),
+                        ).fetchone()
+                    except sqlite3.Error as exc:
+                        raise self._broken() from exc
+                    if row is None or row[1] != st.st_ctime_ns:
+                        found = None
+                        break
+                    found[algorithm] = row[0]
+            if found is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return found
+
+    def put(self, path: Path, st: os.stat_result, digests: dict[str, str]) -> bool:
+        """Store *digests* taken while *path* had identity *st*, if it still does."""
+        if self._disabled:
+            return False
+        after = self.identity(path)
+        if after is None or not _same_file(st, after):
+            return False
+        now = _utc_now_iso()
+        with self._lock:
+            conn = self._connection()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO hashes (dev, ino, size, mtime_ns, algorithm, "
+                        "ctime_ns, digest, path, hashed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm,
+                             st.st_ctime_ns, digest, str(Path(path).resolve()), now)
+                            for algorithm, digest in digests.items()
+                        ],
+                    )
+            except sqlite3.Error as exc:
+                raise self._broken() from exc
+        return True
+
+    def digest(self, path: Path, algorithm: str = "sha256") -> tuple[str, int]:
+        """``(digest, size)`` of *path*, from the cache when it is unchanged.
+
+        A cache that cannot be opened or queried is disabled with a warning and
+        the file is hashed directly. Raises ``OSError`` when the file cannot be
+        read.
+        """
+        st = self.identity(path)
+        if st is not None:
+            try:
+                cached = self.get(st, (algorithm,))
+            except FreceError as exc:
+                self.disable(exc)
+                cached = None
+            if cached is not None:
+                return cached[algorithm], st.st_size
+        digests, size = hash_path(path, (algorithm,))
+        if st is not None:
+            try:
+                self.put(path, st, digests)
+            except FreceError as exc:
+                self.disable(exc)
+        return digests[algorithm], size
+
+    # ── maintenance ──────────────────────────────────────────────────
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "strict": self.strict,
+        }
+
+    def invalidate(self, path: Optional[Path] = None) -> int:
+        """Drop cached digests for one path, or all of them."""
+        if not self.db_path.exists():
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if path is None:
+                    cursor = conn.execute("DELETE FROM hashes")
+                else:
+                    cursor = conn.execute(
+                        "DELETE FROM hashes WHERE path = ?", (str(Path(path).resolve()),)
+                    )
+            return cursor.rowcount
@@ -0,0 +1,260 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Random-access views of evidence media, independent of how it is stored.
+
+An :class:`ImageSource` is the logical byte stream of an image: its ``size``,
+positional reads (``pread``/``readinto``), sequential iteration in extents,
+and an optional map of holes (ranges known to read as zeros without being
+stored). Consumers such as the carver and the FAT walker read through this
+interface, so split raw sets (``.001``, ``.002`` …) and multi-segment E01
+images are used in place, without first concatenating them into one file.
+
+Implementations:
+  * :class:`RawImageSource`       — a single raw file (``.dd``, ``.img`` …)
+  * :class:`SplitRawImageSource`  — numbered raw segments read as one image
+  * :class:`frece.ewf.EwfImage`   — EWF-E01 segments, inflated on demand
+  * :class:`frece.container.ContainerImage` — FRECE chunk-compressed containers
+
+Use :func:`frece.ewf.open_source` to pick the right one for a path.
+"""
+
+from __future__ import annotations
+
+import bisect
+import io
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+EXTENT_SIZE = 4 * 1024 * 1024  # default block for iter_extents()
+
+_SPLIT_SUFFIX = re.compile(r"^\.(\d{3,})$")
+
+
+def split_segments(first: Path) -> list[Path]:
+    """All segments of a split raw set starting at *first* (``x.001``, ``x.002`` …).
+
+    Numbering keeps the width of *first*'s suffix and stops at the first
+    missing number. A path without a numeric suffix is a set of one.
+    """
+    first = Path(first)
+    match = _SPLIT_SUFFIX.match(first.suffix)
+    if match is None:
+        return [first]
+    width = len(match.group(1))
+    number = int(match.group(1))
+    segments = [first]
+    while True:
+        number += 1
+        candidate = first.with_suffix(f".{number:0{width}d}")
+        if not candidate.is_file():
+            return segments
+        segments.append(candidate)
+
+
+class ImageSource:
+    """Base class for random-access, read-only image media.
+
+    Subclasses set ``path``, ``segments`` and ``size`` and implement
+    :meth:`pread`. Everything else has a default built on it.
+    """
+
+    path: Path
+    segments: list[Path]
+    size: int = 0
+
+    # ── lifecycle ────────────────────────────────────────────────────
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ImageSource":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    # ── reads ────────────────────────────────────────────────────────
+    def pread(self, length: int, offset: int) -> bytes:
+        """Read up to *length* bytes at *offset* (short only at the end)."""
+        raise NotImplementedError
+
+    def readinto(self, buffer, offset: int) -> int:
+        """Fill *buffer* from *offset*; return the number of bytes read."""
+        view = memoryview(buffer).cast("B")
+        data = self.pread(len(view), offset)
+        view[:len(data)] = data
+        return len(data)
+
+    def holes(self) -> list[tuple[int, int]]:
+        """Sorted ``(offset, length)`` ranges that read as zeros; empty if unknown."""
+        return []
+
+    def iter_extents(
+        self, block_size: int = EXTENT_SIZE, skip_holes: bool = False
+    ) -> Iterator[tuple[int, bytes]]:
+        """Yield ``(offset, data)`` blocks in order, covering the whole media.
+
+        With *skip_holes*, ranges from :meth:`holes` are left out, so the
+        offsets then have gaps.
+        """
+        gaps = self.holes() if skip_holes else []
+        offset = 0
+        index = 0
+        while offset < self.size:
+            while index < len(gaps) and gaps[index][0] + gaps[index][1] <= offset:
+                index += 1
+            if index < len(gaps) and gaps[index][0] <= offset:
+                offset = gaps[index][0] + gaps[index][1]
+                continue
+            end = min(offset + block_size, self.size)
+            if index < len(gaps):
+                end = min(end, gaps[index][0])
+            data = self.pread(end - offset, offset)
+            if not data:
+                return
+            yield offset, data
+            offset += len(data)
+
+    def open(self) -> BinaryIO:
+        """An independent, seekable, buffered file object over the media."""
+        return io.BufferedReader(SourceStream(self), buffer_size=1024 * 1024)
+
+    def info(self) -> dict:
+        return {
+            "image_path": str(self.path),
+            "segments": len(self.segments),
+            "media_size_bytes": self.size,
+        }
+
+
+class SourceStream(io.RawIOBase):
+    """Raw seekable stream over an :class:`ImageSource` (wrap in BufferedReader)."""
+
+    def __init__(self, source: ImageSource) -> None:
+        self._source = source
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._source.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        count = self._source.readinto(buffer, self._position)
+        self._position += count
+        return count
+
+
+def _pread_full(fd: int, length: int, offset: int) -> bytes:
+    """``os.pread`` that retries short reads until *length* bytes or EOF."""
+    pieces: list[bytes] = []
+    while length > 0:
+        chunk = os.pread(fd, length, offset)
+        if not chunk:
+            break
+        pieces.append(chunk)
+        offset += len(chunk)
+        length -= len(chunk)
+    return b"".join(pieces)
+
+
+class RawImageSource(ImageSource):
+    """A single raw image file (or block device)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.segments = [self.path]
+        self._fd = os.open(self.path, os.O_RDONLY)
+        try:
+            self.size = os.lseek(self._fd, 0, os.SEEK_END)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def pread(self, length: int, offset: int) -> bytes:
+        if length <= 0 or offset >= self.size:
+            return b""
+        return _pread_full(self._fd, length, offset)
+
+    def open(self) -> BinaryIO:
+        return open(self.path, "rb")
+
+    def info(self) -> dict:
+        return {"format": "raw", **super().info()}
+
+
+class SplitRawImageSource(ImageSource):
+    """Numbered raw segments (``.001``, ``.002`` …) read as one image."""
+
+    def __init__(self, first: Path, segments: Optional[list[Path]] = None) -> None:
+        self.path = Path(first)
+        self.segments = segments or split_segments(self.path)
+        self._fds: list[int] = []
+        self._starts: list[int] = []
+        size = 0
+        try:
+            for segment in self.segments:
+                fd = os.open(segment, os.O_RDONLY)
+                self._fds.append(fd)
+                self._starts.append(size)
+                size += os.fstat(fd).st_size
+        except OSError:
+            self.close()
+            raise
+        self.size = size
+
+    def close(self) -> None:
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+    def pread(self, length: int, offset: int) -> bytes:
+        if length <= 0 or offset >= self.size:
+            return b""
+        length = min(length, self.size - offset)
+        pieces: list[bytes] = []
+        index = bisect.bisect_right(self._starts, offset) - 1
+        while length > 0 and index < len(self._fds):
+            piece = _pread_full(self._fds[index], length, offset - self._starts[index])
+            pieces.append(piece)
+            offset += len(piece)
+            length -= len(piece)
+            index += 1
+        return b"".join(pieces)
+
+    def info(self) -> dict:
+        return {"format": "split-raw", **super().info()}
+
+
+def open_raw_source(path: Path) -> ImageSource:
+    """Open a raw image, as a split set when *path* is its numbered first segment.
+
+    Raises ``OSError`` when a segment cannot be opened.
+    """
+    path = Path(path)
+    segments = split_segments(path)
+    if len(segments) > 1:
+        return SplitRawImageSource(path, segments)
+    return RawImageSource(path)
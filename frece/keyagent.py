@@ -0,0 +1,324 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Session agent that keeps derived custody encryption keys unlocked.
+
+Deriving the custody encryption key runs scrypt at N=2^20, r=8, which costs
+about 1 GiB of memory and more than a second of CPU. A script that decrypts,
+appends to and re-encrypts ``custody.db`` used to pay that on every step.
+``frece custody agent start`` runs a small background process that holds the
+derived keys in memory for ``custody_agent_ttl`` seconds (15 minutes by
+default). Later ``frece custody`` commands in the session ask it for the key
+before running the KDF. The on-disk format does not change.
+
+Keys are indexed by the salt and KDF parameters in the encrypted file's
+header. When a passphrase is given, it is still checked against the cached
+key (``HMAC(key, passphrase)``), so a different passphrase falls back to a
+real derivation instead of silently reusing the old key. Without a
+passphrase the agent's key is used as is, as with ssh-agent.
+
+The agent listens on a Unix socket (``FRECE_AGENT_SOCK``, or ``frece/agent.sock``
+under ``$XDG_RUNTIME_DIR`` or a per-user temp directory). The directory is
+0700 and the socket 0600. Both sides check each other: the server checks the
+client's uid with ``SO_PEERCRED``, and the client only talks to a socket
+whose directory and socket it owns with those modes (``lstat``, so symlinks
+are refused), served by a process of its own uid where ``SO_PEERCRED``
+exists. A socket another user pre-created under ``/tmp`` therefore never
+sees a key, and a key offered by one is never used. The protocol is one JSON
+request line and one JSON reply line per connection. When no trusted agent
+is running, every lookup misses and custody commands derive keys exactly as
+before.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .errors import CustodyError
+
+SOCKET_ENV = "FRECE_AGENT_SOCK"
+DEFAULT_TTL = 900
+AGENT_SUPPORTED = hasattr(socket, "AF_UNIX")
+_TIMEOUT = 5.0
+_MAX_REQUEST = 64 * 1024
+
+
+def default_socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "frece" / "agent.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(tempfile.gettempdir()) / f"frece-{uid}" / "agent.sock"
+
+
+def key_id(salt: bytes, *params: int) -> str:
+    """Agent index for a key: the file's salt plus its KDF parameters."""
+    return ":".join([salt.hex(), *(str(param) for param in params)])
+
+
+def _passphrase_check(key: bytes, passphrase: str) -> str:
+    return hmac.new(key, b"frece-agent:" + passphrase.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _peer_is_self(conn: socket.socket) -> bool:
+    """True when the process at the other end of *conn* runs as our uid."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True  # the ownership and mode checks on the socket still apply
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return bool(uid == os.getuid())
+
+
+def _owned_private(path: Path, kind: Callable[[int], bool]) -> bool:
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return kind(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _trusted_socket(path: Path) -> bool:
+    """The socket and its directory are ours and private (0700 / 0600)."""
+    return _owned_private(path.parent, stat.S_ISDIR) and _owned_private(path, stat.S_ISSOCK)
+
+
+# ── client ───────────────────────────────────────────────────────────
+def _request(message: dict, socket_path: Optional[Path] = None) -> Optional[dict]:
+    """Send one request; None when no trusted agent is listening."""
+    if not AGENT_SUPPORTED:
+        return None
+    path = Path(socket_path or default_socket_path())
+    if not _trusted_socket(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(_TIMEOUT)
+            conn.connect(str(path))
+            if not _peer_is_self(conn):
+                return None
+            conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reader:
+                line = reader.readline(_MAX_REQUEST)
+    except OSError:
+        return None  # stale socket: behave as if no agent runs
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def agent_key(
+    identifier: str, passphrase: Optional[str] = None, socket_path: Optional[Path] = None
+) -> Optional[bytes]:
+    """Unlocked key for *identifier*, or None (no agent, expired, or wrong passphrase)."""
+    reply = _request({"op": "get", "id": identifier}, socket_path)
+    if not reply or not reply.get("ok"):
+        return None
+    check = reply.get("check")
+    key_hex = reply.get("key")
+    if not isinstance(check, str) or not isinstance(key_hex, str):
+        return None
+    try:
+        key = bytes.fromhex(key_hex)
+    except ValueError:
+        return None
+    if len(key) != 32:
+        return None
+    if passphrase is not None and not hmac.compare_digest(
+        check, _passphrase_check(key, passphrase)
+    ):
+        return None
+    return key
+
+
+def remember_key(
+    identifier: str, key: bytes, passphrase: str, socket_path: Optional[Path] = None
+) -> bool:
+    """Hand a freshly derived key to the agent; False when none is running."""
+    reply = _request(
+        {
+            "op": "put",
+            "id": identifier,
+            "key": key.hex(),
+            "check": _passphrase_check(key, passphrase),
+        },
+        socket_path,
+    )
+    return bool(reply and reply.get("ok"))
+
+
+def agent_status(socket_path: Optional[Path] = None) -> Optional[dict]:
+    return _request({"op": "status"}, socket_path)
+
+
+def stop_agent(socket_path: Optional[Path] = None) -> bool:
+    reply = _request({"op": "stop"}, socket_path)
+    return bool(reply and reply.get("ok"))
+
+
+def start_agent(ttl: int = DEFAULT_TTL, socket_path: Optional[Path] = None) -> dict:
+    """Start a background agent (or return the status of the running one)."""
+    if not AGENT_SUPPORTED:
+        raise CustodyError(
+            "The key agent needs Unix domain sockets",
+            remediation="Pass --passphrase to each frece custody command instead",
+        )
+    path = Path(socket_path or default_socket_path())
+    status = agent_status(path)
+    if status:
+        return status
+    subprocess.Popen(  # nosec B603 — our own interpreter and module
+        [sys.executable, "-m", "frece.keyagent", "--socket", str(path), "--ttl", str(ttl)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+    deadline = time.monotonic() + _TIMEOUT
+    while time.monotonic() < deadline:
+        status = agent_status(path)
+        if status:
+            return status
+        time.sleep(0.05)
+    raise CustodyError(
+        f"Key agent did not start on {path}",
+        remediation=f"Check that {path.parent} is writable, or set {SOCKET_ENV}",
+    )
+
+
+# ── server ───────────────────────────────────────────────────────────
+class _Handler(socketserver.StreamRequestHandler):
+    server: "KeyAgentServer"
+
+    def handle(self) -> None:
+        if not self.server.peer_allowed(self.connection):
+            return
+        try:
+            request = json.loads(self.rfile.readline(_MAX_REQUEST))
+            reply = self.server.dispatch(request)
+        except (ValueError, KeyError, TypeError):
+            reply = {"ok": False, "error": "bad request"}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class KeyAgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Holds unlocked keys for *ttl* seconds; see the module docstring."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, ttl: int = DEFAULT_TTL) -> None:
+        self.socket_path = Path(socket_path)
+        self.ttl = ttl
+        self.started = time.time()
+        self._keys: dict[str, tuple[bytearray, str, float]] = {}
+        self._lock = threading.Lock()
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        os.chmod(self.socket_path.parent, 0o700)
+        if self.socket_path.exists():
+            if agent_status(self.socket_path):
+                raise CustodyError(
+                    f"A key agent is already running on {self.socket_path}",
+                    remediation="Use `frece custody agent stop` first",
+                )
+            self.socket_path.unlink()
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+
+    @staticmethod
+    def peer_allowed(conn: socket.socket) -> bool:
+        return _peer_is_self(conn)
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for identifier, (key, _, expires) in list(self._keys.items()):
+            if expires <= now:
+                key[:] = bytes(len(key))
+                del self._keys[identifier]
+
+    def dispatch(self, request: dict) -> dict:
+        op = request["op"]
+        with self._lock:
+            self._purge()
+            if op == "get":
+                entry = self._keys.get(request["id"])
+                if entry is None:
+                    return {"ok": False}
+                return {"ok": True, "key": bytes(entry[0]).hex(), "check": entry[1]}
+            if op == "put":
+                self._keys[request["id"]] = (
+                    bytearray.fromhex(request["key"]),
+                    request["check"],
+                    time.monotonic() + self.ttl,
+                )
+                return {"ok": True}
+            if op == "status":
+                return {
+                    "ok": True,
+                    "pid": os.getpid(),
+                    "socket": str(self.socket_path),
+                    "ttl": self.ttl,
+                    "keys": len(self._keys),
+                    "uptime": round(time.time() - self.started, 1),
+                }
+            if op == "stop":
+                self.forget()
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def forget(self) -> None:
+        for key, _, _ in self._keys.values():
+            key[:] = bytes(len(key))
+        self._keys.clear()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self._lock:
+            self.forget()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def run_agent(socket_path: Path, ttl: int = DEFAULT_TTL) -> None:
+    """Serve in the foreground until stopped (``stop`` request or SIGTERM)."""
+    server = KeyAgentServer(socket_path, ttl)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m frece.keyagent")
+    parser.add_argument("--socket", type=Path, default=None)
+    parser.add_argument("--ttl", type=int, default=DEFAULT_TTL)
+    args = parser.parse_args(argv)
+    run_agent(args.socket or default_socket_path(), args.ttl)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
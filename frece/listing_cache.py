@@ -0,0 +1,295 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""On-disk cache of parsed fls listings.
+
+A recursive ``fls`` walk over a large volume can take most of an hour, and
+``frece scan``, ``frece scan --mactime``, ``frece recover`` and
+``frece trash list --image`` each need one.  The cache stores the *parsed*
+entries in SQLite, keyed by the image's resolved path, size, mtime and the
+partition offset plus the listing variant (``deleted``, ``mactime``,
+``paths``), so the second command over the same image replays rows instead of
+re-walking the filesystem.
+
+Rows are staged in short batches while the walk runs, and the staged listing
+replaces the old one only once the walk finishes; an interrupted or failed
+walk leaves no partial entry.  A cache that cannot be read or written is
+skipped with a warning rather than failing the command.  Any change to the
+image's size or mtime makes the old listing stale and it is replaced on next
+use.  Live block devices are never cached.  ``frece cache clear`` invalidates
+explicitly.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import sqlite3
+import stat
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from .errors import RecoveryError
+
+# Row layout shared with ``recovery.ScannedEntry`` (same field order).
+ROW_FIELDS = (
+    "inode", "inode_token", "entry_type", "name", "allocated",
+    "size", "mtime", "atime", "ctime", "crtime",
+)
+_BATCH = 5000
+# A listing still being walked: its variant carries this suffix and a unique
+# token, and its entry_count stays _STAGED until it is swapped in.
+_STAGING = "#staging-"
+_STAGED = -1
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def default_cache_path(cache_dir: Path) -> Path:
+    return Path(cache_dir) / "listings.db"
+
+
+class ListingCache:
+    """SQLite-backed store of fls listings keyed by image identity and offset."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+        except (OSError, sqlite3.Error) as exc:
+            raise RecoveryError(
+                f"Cannot open listing cache: {self.db_path}",
+                remediation="Check cache_dir permissions or run `frece cache clear`",
+            ) from exc
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS listings (
+                    id INTEGER PRIMARY KEY,
+                    image TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    variant TEXT NOT NULL,
+                    entry_count INTEGER NOT NULL,
+                    created TEXT NOT NULL,
+                    UNIQUE (image, offset, variant)
+                );
+                CREATE TABLE IF NOT EXISTS entries (
+                    listing_id INTEGER NOT NULL REFERENCES listings(id) ON DELETE CASCADE,
+                    seq INTEGER NOT NULL,
+                    inode INTEGER, inode_token TEXT, entry_type TEXT, name TEXT,
+                    allocated INTEGER, size INTEGER,
+                    mtime INTEGER, atime INTEGER, ctime INTEGER, crtime INTEGER,
+                    PRIMARY KEY (listing_id, seq)
+                ) WITHOUT ROWID;
+                """
+            )
+        except sqlite3.Error as exc:
+            conn.close()
+            raise self._broken() from exc
+        return conn
+
+    @staticmethod
+    def _identity(image_path: Path) -> Optional[tuple[str, int, int]]:
+        """(resolved path, size, mtime_ns) for a regular file, else None."""
+        try:
+            resolved = Path(image_path).resolve()
+            info = os.stat(resolved)
+        except OSError:
+            return None
+        if not stat.S_ISREG(info.st_mode):
+            return None  # live devices change underneath us — never cache
+        return str(resolved), info.st_size, info.st_mtime_ns
+
+    def rows(
+        self,
+        image_path: Path,
+        offset: int,
+        variant: str,
+        build: Callable[[], Iterable[tuple]],
+    ) -> Iterator[tuple]:
+        """Yield cached rows for the listing, or run *build* and cache its rows.
+
+        Rows are tuples in :data:`ROW_FIELDS` order. When *build* runs, each
+        row is yielded as soon as it is produced and written to a staging
+        listing in short batches; the staging listing replaces the old one
+        only after *build* is exhausted. A cache that cannot be read or
+        written is skipped with a warning.
+        """
+        identity = self._identity(image_path)
+        if identity is None:
+            yield from build()
+            return
+
+        image, size, mtime_ns = identity
+        try:
+            conn = self._connect()
+        except RecoveryError as exc:
+            self._warn(exc)
+            yield from build()
+            return
+        try:
+            try:
+                row = conn.execute(
+                    "SELECT id, size, mtime_ns FROM listings "
+                    "WHERE image = ? AND offset = ? AND variant = ?",
+                    (image, offset, variant),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                self._warn(exc)
+                yield from build()
+                return
+            if row is not None and (row[1], row[2]) == (size, mtime_ns):
+                replayed = 0
+                try:
+                    cursor = conn.execute(
+                        f"SELECT {', '.join(ROW_FIELDS)} FROM entries "
+                        "WHERE listing_id = ? ORDER BY seq",
+                        (row[0],),
+                    )
+                    for cached in cursor:
+                        yield cached[:4] + (bool(cached[4]),) + cached[5:]
+                        replayed += 1
+                except sqlite3.Error as exc:
+                    # The walk yields rows in the cached order; skip what was
+                    # already replayed.
+                    self._warn(exc)
+                    yield from itertools.islice(build(), replayed, None)
+                return
+
+            yield from self._build_into(conn, image, size, mtime_ns, offset, variant, build)
+        finally:
+            conn.close()
+
+    def _build_into(
+        self,
+        conn: sqlite3.Connection,
+        image: str,
+        size: int,
+        mtime_ns: int,
+        offset: int,
+        variant: str,
+        build: Callable[[], Iterable[tuple]],
+    ) -> Iterator[tuple]:
+        """Yield *build*'s rows while staging them, then swap the listing in."""
+        placeholders = ", ".join("?" for _ in range(len(ROW_FIELDS) + 2))
+        insert = (
+            f"INSERT INTO entries (listing_id, seq, {', '.join(ROW_FIELDS)}) "
+            f"VALUES ({placeholders})"
+        )
+        staging_id: Optional[int] = None
+        try:
+            with conn:
+                staging_id = conn.execute(
+                    "INSERT INTO listings "
+                    "(image, size, mtime_ns, offset, variant, entry_count, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (image, size, mtime_ns, offset, f"{variant}{_STAGING}{uuid.uuid4().hex}",
+                     _STAGED, _utc_now_iso()),
+                ).lastrowid
+        except sqlite3.Error as exc:
+            self._warn(exc)
+
+        caching = staging_id is not None
+        committed = False
+        batch: list[tuple] = []
+        count = 0
+        try:
+            for built in build():
+                if caching:
+                    batch.append((staging_id, count) + tuple(built))
+                    if len(batch) >= _BATCH:
+                        caching = self._write_batch(conn, insert, batch)
+                        batch.clear()
+                count += 1
+                yield built
+            if caching and self._write_batch(conn, insert, batch):
+                try:
+                    with conn:
+                        conn.execute(
+                            "DELETE FROM listings "
+                            "WHERE image = ? AND offset = ? AND variant = ?",
+                            (image, offset, variant),
+                        )
+                        conn.execute(
+                            "UPDATE listings SET variant = ?, entry_count = ?, created = ? "
+                            "WHERE id = ?",
+                            (variant, count, _utc_now_iso(), staging_id),
+                        )
+                    committed = True
+                except sqlite3.Error as exc:
+                    self._warn(exc)
+        finally:
+            # A failed, abandoned or uncacheable walk leaves no listing behind.
+            if staging_id is not None and not committed:
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM listings WHERE id = ?", (staging_id,))
+                except sqlite3.Error:
+                    pass
+
+    def _write_batch(self, conn: sqlite3.Connection, insert: str, batch: list[tuple]) -> bool:
+        """Commit one batch of staged entries; False (caching stops) on error."""
+        try:
+            with conn:
+                conn.executemany(insert, batch)
+        except sqlite3.Error as exc:
+            self._warn(exc)
+            return False
+        return True
+
+    def _warn(self, exc: Exception) -> None:
+        cause = exc.__cause__ if isinstance(exc, RecoveryError) and exc.__cause__ else exc
+        logger.warning(
+            "Listing cache %s unavailable (%s); walking without it", self.db_path, cause
+        )
+
+    def _broken(self) -> RecoveryError:
+        return RecoveryError(
+            f"Listing cache is unavailable: {self.db_path}",
+            remediation="Retry once other frece commands finish, or run `frece cache clear`",
+        )
+
+    def list_listings(self) -> list[dict]:
+        """Describe every cached listing (for ``frece cache list``)."""
+        if not self.db_path.exists():
+            return []
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT image, offset, variant, entry_count, size, created "
+                "FROM listings WHERE entry_count >= 0 ORDER BY image, offset, variant"
+            )
+            keys = ("image", "offset", "variant", "entries", "image_size", "created")
+            return [dict(zip(keys, row)) for row in cursor]
+        finally:
+            conn.close()
+
+    def invalidate(self, image_path: Optional[Path] = None) -> int:
+        """Drop cached listings for one image (all offsets), or all of them."""
+        if not self.db_path.exists():
+            return 0
+        conn = self._connect()
+        try:
+            with conn:
+                if image_path is None:
+                    removed = conn.execute("DELETE FROM listings").rowcount
+                else:
+                    image = str(Path(image_path).resolve())
+                    removed = conn.execute(
+                        "DELETE FROM listings WHERE image = ?", (image,)
+                    ).rowcount
+            conn.execute("VACUUM")
+            return removed
+        finally:
+            conn.close()
@@ -24,10 +24,12 @@ import struct
 import re
 import sqlite3
 import zipfile
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .timecodec import epoch_to_iso, filetimes_to_iso, pdf_date_to_iso
+
 
 class MetadataError(Exception):
     """Raised when metadata extraction fails for a specific type."""
@@ -277,11 +279,7 @@ def _pdf(path: Path) -> dict[str, Any]:
 
 def _decode_pdf_string(s: str) -> str:
     # Handle PDF date format: D:YYYYMMDDHHmmSSOHH'mm
-    m = re.match(r"D:(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})", s)
-    if m:
-        y, mo, d, h, mn, sec = m.groups()
-        return f"{y}-{mo}-{d}T{h}:{mn}:{sec}Z"
-    return s.strip()
+    return pdf_date_to_iso(s) or s.strip()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -308,11 +306,7 @@ def _pe(path: Path) -> dict[str, Any]:
 
     compile_ts = struct.unpack_from("<I", data, pe_offset + 8)[0]
     if compile_ts > 0:
-        try:
-            dt = datetime.fromtimestamp(compile_ts, tz=timezone.utc)
-            result["compile_timestamp"] = dt.isoformat().replace("+00:00", "Z")
-        except (OSError, OverflowError):
-            result["compile_timestamp"] = f"0x{compile_ts:08x}"
+        result["compile_timestamp"] = epoch_to_iso(compile_ts) or f"0x{compile_ts:08x}"
 
     characteristics = struct.unpack_from("<H", data, pe_offset + 22)[0]
     result["is_dll"] = bool(characteristics & 0x2000)
@@ -590,13 +584,9 @@ def _pcap(path: Path) -> dict[str, Any]:
     result["protocols"] = protocols
 
     if first_ts:
-        result["first_packet"] = datetime.fromtimestamp(
-            first_ts, tz=timezone.utc
-        ).isoformat().replace("+00:00", "Z")
+        result["first_packet"] = epoch_to_iso(first_ts)
     if last_ts:
-        result["last_packet"] = datetime.fromtimestamp(
-            last_ts, tz=timezone.utc
-        ).isoformat().replace("+00:00", "Z")
+        result["last_packet"] = epoch_to_iso(last_ts)
 
     return result
 
@@ -658,22 +648,10 @@ def _lnk(path: Path) -> dict[str, Any]:
         raise MetadataError("Invalid LNK header")
 
     # Timestamps at offsets 28, 36, 44 (FILETIME = 100ns intervals from 1601-01-01)
-    def filetime_to_iso(offset: int) -> str:
-        try:
-            ft = struct.unpack_from("<Q", data, offset)[0]
-            if ft == 0:
-                return ""
-            # Convert Windows FILETIME to Unix epoch
-            unix_ts = (ft - 116444736000000000) / 10_000_000
-            return datetime.fromtimestamp(
-                unix_ts, tz=timezone.utc
-            ).isoformat().replace("+00:00", "Z")
-        except (struct.error, OSError, OverflowError):
-            return ""
-
-    result["creation_time"] = filetime_to_iso(28)
-    result["access_time"] = filetime_to_iso(36)
-    result["write_time"] = filetime_to_iso(44)
+    created, accessed, written = filetimes_to_iso(struct.unpack_from("<3Q", data, 28))
+    result["creation_time"] = created
+    result["access_time"] = accessed
+    result["write_time"] = written
 
     # File size and attributes
     result["target_file_size"] = struct.unpack_from("<I", data, 52)[0]
@@ -9,13 +9,19 @@ from pathlib import Path
 from typing import Callable, Any, Optional
 
 from frece.errors import FreceError
+from frece.hash_cache import HashCache
 
 
 class ParallelProcessor:
     """Execute operations in parallel with smart executor selection."""
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        hash_cache: Optional[HashCache] = None,
+    ):
         self.logger = logger or logging.getLogger(__name__)
+        self.hash_cache = hash_cache
 
     def hash_files_parallel(
         self,
@@ -140,6 +146,8 @@ class ParallelProcessor:
         Returns:
             SHA256 hex digest.
         """
+        if self.hash_cache is not None:
+            return self.hash_cache.digest(file_path, "sha256")[0]
         sha256 = hashlib.sha256()
 
         with open(file_path, "rb") as f:
@@ -2,11 +2,11 @@
 """Partition table discovery using mmls."""
 
 import re
-import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
 from frece.errors import RecoveryError
+from frece.toolrunner import get_runner
 
 
 @dataclass
@@ -25,12 +25,7 @@ def list_partitions(image_path: Path) -> list[Partition]:
     try:
         # "mmls" is a standard Sleuth Kit tool expected on PATH.
         # Partial path is intentional for operator PATH flexibility.
-        result = subprocess.run(  # nosec B603 B607
-            ["mmls", str(image_path)],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = get_runner().run(["mmls", str(image_path)])  # nosec B603 B607
     except FileNotFoundError as exc:
         raise RecoveryError(
             "Tool not found: mmls",
@@ -0,0 +1,237 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Piecewise SHA-256 manifests and Merkle roots for acquired images.
+
+A whole-image digest only says *whether* an image changed. Checking it means
+one sequential re-read on one core, and a mismatch does not say *where* the
+image changed. During acquisition FRECE therefore also hashes the stream in
+fixed-size pieces (``piece_size_mb``, 256 MiB by default) and writes them to
+``<image>.pieces.json`` next to the image, together with the traditional
+full SHA-256/MD5.
+
+Piece digests are plain SHA-256 over the byte range, so any piece can be
+checked independently with standard tools. The manifest also records a
+Merkle root over the pieces: a node is ``SHA-256(0x01 || left || right)``
+and an unpaired node moves up a level unchanged. The root is a single value
+that commits to every piece, suitable for the custody log.
+
+:func:`verify_pieces` re-hashes the pieces in parallel (positional reads
+release the GIL, as does hashlib) and reports the exact byte ranges that no
+longer match.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+from .errors import AcquisitionError, FreceError
+from .ewf import EwfError, open_source
+from .imagesource import ImageSource
+
+MANIFEST_SUFFIX = ".pieces.json"
+MANIFEST_VERSION = 1
+DEFAULT_PIECE_SIZE = 256 * 1024 * 1024
+_READ_SIZE = 8 * 1024 * 1024  # bytes read per pread while verifying a piece
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def manifest_path_for(image_path: Path) -> Path:
+    image_path = Path(image_path)
+    return image_path.with_name(image_path.name + MANIFEST_SUFFIX)
+
+
+def merkle_root(digests: list[str]) -> str:
+    """Merkle root (hex) over hex piece digests; SHA-256 of nothing if empty."""
+    level = [bytes.fromhex(digest) for digest in digests]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        paired = [
+            hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest()
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+class PieceHasher:
+    """Stream consumer that SHA-256s consecutive *piece_size* byte ranges.
+
+    Feed it with :meth:`update` (it works as a :class:`~frece.pipeline.CopyPipeline`
+    sink) and call :meth:`finish` once the stream ends.
+    """
+
+    def __init__(self, piece_size: int = DEFAULT_PIECE_SIZE) -> None:
+        if piece_size <= 0:
+            raise ValueError("piece_size must be positive")
+        self.piece_size = piece_size
+        self.digests: list[str] = []
+        self.size = 0
+        self._current = hashlib.sha256()
+        self._filled = 0
+
+    def update(self, data) -> None:
+        view = memoryview(data).cast("B")
+        while view:
+            take = min(len(view), self.piece_size - self._filled)
+            self._current.update(view[:take])
+            self._filled += take
+            self.size += take
+            view = view[take:]
+            if self._filled == self.piece_size:
+                self.digests.append(self._current.hexdigest())
+                self._current = hashlib.sha256()
+                self._filled = 0
+
+    def finish(self) -> list[str]:
+        """Close the trailing partial piece and return every piece digest."""
+        if self._filled:
+            self.digests.append(self._current.hexdigest())
+            self._current = hashlib.sha256()
+            self._filled = 0
+        return self.digests
+
+    def manifest(self, image: Path, digests: Optional[dict] = None, **extra) -> dict:
+        """JSON-ready piece manifest for *image* (call after :meth:`finish`)."""
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "image": str(image),
+            "created": _utc_now_iso(),
+            "size_bytes": self.size,
+            "piece_size": self.piece_size,
+            "piece_algorithm": "sha256",
+            "merkle_root": merkle_root(self.digests),
+            **(digests or {}),
+            **extra,
+            "pieces": list(self.digests),
+        }
+        return manifest
+
+
+def write_piece_manifest(manifest: dict, path: Path) -> Path:
+    """Write *manifest* atomically to *path*."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def load_piece_manifest(path: Path) -> dict:
+    try:
+        manifest: dict = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise AcquisitionError(
+            f"Cannot read piece manifest: {path}",
+            remediation="Pass the manifest to --verify-pieces, or re-acquire the source",
+        ) from exc
+    if manifest.get("version") != MANIFEST_VERSION or "pieces" not in manifest:
+        raise AcquisitionError(
+            f"Unsupported piece manifest: {path}",
+            remediation="Regenerate the manifest with this FRECE version",
+        )
+    return manifest
+
+
+def _hash_range(source: ImageSource, offset: int, length: int) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    done = 0
+    while done < length:
+        data = source.pread(min(_READ_SIZE, length - done), offset + done)
+        if not data:
+            break
+        digest.update(data)
+        done += len(data)
+    return digest.hexdigest(), done
+
+
+def verify_pieces(
+    image: Union[Path, ImageSource],
+    manifest: dict,
+    workers: int = 0,
+) -> dict:
+    """Re-hash every piece of *image* in parallel and report mismatching ranges.
+
+    *workers* defaults to one per CPU. The report lists each corrupted piece
+    with its byte range, expected and actual digests, and whether the
+    image's size and recomputed Merkle root still match the manifest. A
+    piece that cannot be read or decompressed is reported as corrupted with
+    the error instead of aborting the run.
+    """
+    owned = not isinstance(image, ImageSource)
+    if isinstance(image, ImageSource):
+        source: ImageSource = image
+    else:
+        try:
+            source = open_source(Path(image))
+        except (OSError, EwfError) as exc:
+            raise AcquisitionError(
+                f"Cannot open image: {image}",
+                remediation="Verify the image path",
+            ) from exc
+
+    piece_size = int(manifest["piece_size"])
+    expected = list(manifest["pieces"])
+    expected_size = int(manifest["size_bytes"])
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+    def check(index: int) -> tuple[int, str, int, str]:
+        offset = index * piece_size
+        length = max(min(piece_size, expected_size - offset), 0)
+        try:
+            actual, read = _hash_range(source, offset, length)
+        except (OSError, FreceError, EwfError, zlib.error) as exc:
+            error = exc.message if isinstance(exc, FreceError) else str(exc)
+            return index, "", 0, error or type(exc).__name__
+        return index, actual, read, ""
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frece-verify") as pool:
+            results = sorted(pool.map(check, range(len(expected))))
+        actual_size = source.size
+    finally:
+        if owned:
+            source.close()
+
+    actual_digests = [actual for _, actual, _, _ in results]
+    corrupted = []
+    for index, actual, read, error in results:
+        if actual != expected[index]:
+            offset = index * piece_size
+            piece = {
+                "piece": index,
+                "offset": offset,
+                "length": min(piece_size, expected_size - offset),
+                "bytes_read": read,
+                "expected": expected[index],
+                "actual": actual,
+            }
+            if error:
+                piece["error"] = error
+            corrupted.append(piece)
+
+    # An unreadable piece has no digest, so the root cannot be recomputed.
+    root = merkle_root(actual_digests) if all(actual_digests) else None
+    return {
+        "image": str(image),
+        "pieces": len(expected),
+        "piece_size": piece_size,
+        "verified": not corrupted and actual_size == expected_size
+        and root == manifest.get("merkle_root"),
+        "size_ok": actual_size == expected_size,
+        "merkle_root_ok": root == manifest.get("merkle_root"),
+        "corrupted": corrupted,
+        "workers": workers,
+        "timestamp": _utc_now_iso(),
+    }
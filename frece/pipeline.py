@@ -0,0 +1,236 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Overlapped read → write → hash pipeline for acquisition and hashing.
+
+Imaging used to read a chunk, write it, then feed it to SHA-256 and MD5 one
+after the other on a single thread, so throughput was capped by the sum of
+all four stages. Here every stage runs on its own thread:
+
+* one **reader** fills buffers taken from a fixed ring (no per-chunk
+  allocation) with ``readinto``;
+* one **writer** (optional) writes each filled buffer to the destination;
+* one **hasher per algorithm** feeds the same buffer to its hash object.
+
+``hashlib`` and file I/O release the GIL on large buffers, so the stages
+really run in parallel and the slowest stage (usually the disk) sets the
+pace. A buffer goes back to the ring once the writer and every hasher have
+consumed it, and the ring depth bounds memory use. Each stage records the
+bytes it handled and the time it was busy, and the result reports MB/s per
+stage, which shows where the bottleneck is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Protocol
+
+# Legacy evidence-integrity checksums, not security primitives.
+LEGACY_ALGORITHMS = frozenset({"md5", "sha1"})
+DEFAULT_DEPTH = 4  # buffers in the ring
+_MIN_BUFFER = 1024 * 1024
+
+
+class _Writer(Protocol):
+    """A destination such as a binary file or a ``ContainerWriter``."""
+
+    def write(self, data: memoryview, /) -> object: ...
+
+
+def new_hasher(algorithm: str):
+    """``hashlib`` object for *algorithm*; ValueError if unsupported."""
+    if algorithm.lower() in LEGACY_ALGORITHMS:
+        return hashlib.new(algorithm, usedforsecurity=False)
+    return hashlib.new(algorithm)
+
+
+def ring_buffer_size(chunk_size: int, ram_budget: int, depth: int = DEFAULT_DEPTH) -> int:
+    """Buffer size that keeps a *depth*-deep ring within *ram_budget*."""
+    return max(_MIN_BUFFER, min(chunk_size, ram_budget // max(depth, 1)))
+
+
+@dataclass
+class StageStats:
+    """Bytes handled and busy time for one pipeline stage."""
+
+    name: str
+    bytes: int = 0
+    busy_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "bytes": self.bytes,
+            "busy_seconds": round(self.busy_seconds, 6),
+            "mb_per_s": (
+                round(self.bytes / self.busy_seconds / 1e6, 2) if self.busy_seconds else 0.0
+            ),
+        }
+
+
+@dataclass
+class PipelineResult:
+    """Digests, byte count and per-stage throughput of one pipeline run."""
+
+    bytes_processed: int
+    digests: dict[str, str]
+    elapsed_seconds: float
+    stages: list[StageStats] = field(default_factory=list)
+
+    def throughput(self) -> dict:
+        """JSON-ready throughput report: overall MB/s plus one entry per stage."""
+        overall = (
+            round(self.bytes_processed / self.elapsed_seconds / 1e6, 2)
+            if self.elapsed_seconds else 0.0
+        )
+        return {
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "mb_per_s": overall,
+            "stages": {stage.name: stage.as_dict() for stage in self.stages},
+        }
+
+
+class CopyPipeline:
+    """Copy and/or hash a byte stream with overlapped read, write and hash stages.
+
+    Args:
+        algorithms: hashlib names; each gets its own thread.
+        buffer_size: size of each ring buffer.
+        depth: number of ring buffers in flight.
+    """
+
+    def __init__(
+        self,
+        algorithms: tuple[str, ...] = ("sha256",),
+        buffer_size: int = 8 * 1024 * 1024,
+        depth: int = DEFAULT_DEPTH,
+    ) -> None:
+        self.algorithms = tuple(algorithms)
+        for algorithm in self.algorithms:
+            new_hasher(algorithm)  # fail fast on unsupported names
+        self.buffer_size = buffer_size
+        self.depth = max(depth, 2)
+
+    def run(
+        self,
+        readinto: Callable[[memoryview], int],
+        dst: Optional[_Writer] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        sinks: Optional[dict[str, Callable[[memoryview], object]]] = None,
+    ) -> PipelineResult:
+        """Pump *readinto* until it returns 0, writing to *dst* and hashing.
+
+        *readinto* fills the view it is given and returns the byte count, as
+        ``RawIOBase.readinto`` does. *progress* is called from the reader
+        thread with the running byte total. *sinks* adds named stages that
+        each receive every buffer in order on their own thread, e.g. a
+        :class:`frece.pieces.PieceHasher`. The first exception raised by any
+        stage is re-raised here once every thread has stopped.
+        """
+        buffers = [bytearray(self.buffer_size) for _ in range(self.depth)]
+        free: queue.Queue[int] = queue.Queue()
+        for index in range(self.depth):
+            free.put(index)
+
+        hashers = {algorithm: new_hasher(algorithm) for algorithm in self.algorithms}
+        consumers: list[tuple[str, Callable[[memoryview], object]]] = []
+        if dst is not None:
+            consumers.append(("write", dst.write))
+        for algorithm, hasher in hashers.items():
+            consumers.append((algorithm, hasher.update))
+        consumers.extend((sinks or {}).items())
+
+        inboxes: list[queue.Queue] = [queue.Queue() for _ in consumers]
+        pending = [0] * self.depth
+        pending_lock = threading.Lock()
+        failed = threading.Event()
+        errors: list[BaseException] = []
+        reader_stats = StageStats("read")
+        stats = [StageStats(name) for name, _ in consumers]
+        total = 0
+
+        def release(index: int) -> None:
+            with pending_lock:
+                pending[index] -= 1
+                done = pending[index] == 0
+            if done:
+                free.put(index)
+
+        def fail(exc: BaseException) -> None:
+            if not failed.is_set():
+                errors.append(exc)
+                failed.set()
+            free.put(-1)  # wake the reader if it is waiting for a buffer
+
+        def reader() -> None:
+            nonlocal total
+            try:
+                while not failed.is_set():
+                    index = free.get()
+                    if index < 0 or failed.is_set():
+                        break
+                    view = memoryview(buffers[index])
+                    started = time.perf_counter()
+                    count = readinto(view)
+                    reader_stats.busy_seconds += time.perf_counter() - started
+                    if not count:
+                        break
+                    reader_stats.bytes += count
+                    total += count
+                    with pending_lock:
+                        pending[index] = len(consumers)
+                    if not consumers:
+                        free.put(index)
+                    for inbox in inboxes:
+                        inbox.put((index, count))
+                    if progress is not None:
+                        progress(total)
+            except BaseException as exc:  # surfaced by run()
+                fail(exc)
+            finally:
+                for inbox in inboxes:
+                    inbox.put(None)
+
+        def consumer(inbox: queue.Queue, action, stage: StageStats) -> None:
+            while True:
+                item = inbox.get()
+                if item is None:
+                    return
+                index, count = item
+                try:
+                    if not failed.is_set():
+                        started = time.perf_counter()
+                        action(memoryview(buffers[index])[:count])
+                        stage.busy_seconds += time.perf_counter() - started
+                        stage.bytes += count
+                except BaseException as exc:
+                    fail(exc)
+                finally:
+                    release(index)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=reader, name="frece-pipe-read", daemon=True)]
+        for (name, action), inbox, stage in zip(consumers, inboxes, stats):
+            threads.append(
+                threading.Thread(
+                    target=consumer,
+                    args=(inbox, action, stage),
+                    name=f"frece-pipe-{name}",
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if errors:
+            raise errors[0]
+        return PipelineResult(
+            bytes_processed=total,
+            digests={name: hasher.hexdigest() for name, hasher in hashers.items()},
+            elapsed_seconds=elapsed,
+            stages=[reader_stats, *stats],
+        )
@@ -1,28 +1,29 @@
 # Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
-"""Deleted file recovery using The Sleuth Kit tools."""
+"""Deleted file recovery using The Sleuth Kit tools (native for FAT/exFAT)."""
 
+import bisect
 import hashlib
 import json
 import logging
 import os
 import re
 import subprocess
-import threading
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, astuple, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Callable, Generator, Iterable, Iterator, Optional
 
-from frece.classifier import classify_file
+from frece.classifier import PRIORITY_ORDER, classify_file, predict_priority
 from frece.metadata import extract as extract_metadata
 from frece.scoring import score_artifact
 from frece.config import Config
 from frece.errors import RecoveryError
-
-try:
-    import magic as magic_module
-except ImportError:
-    magic_module = None  # type: ignore[assignment]
+from frece.fat import FatEntry, FatVolume, open_fat_volume
+from frece.filetype import HEADER_BYTES, detect_file_type
+from frece.hash_cache import HashCache
+from frece.listing_cache import ListingCache
+from frece.timecodec import iso_to_epoch
+from frece.toolrunner import get_runner
 
 
 def _utc_now_iso() -> str:
@@ -76,18 +77,65 @@ class RecoveredFile:
             self.artifact_metadata = {}
 
 
+class BadSectorIndex:
+    """Sorted, merged bad byte ranges from a ddrescue mapfile.
+
+    Only ranges flagged bad are kept; overlapping and adjacent ranges are
+    coalesced so every query is a bisect over two parallel lists —
+    O(log ranges) per extent instead of a scan of the whole mapfile.
+    """
+
+    def __init__(self, ranges: Iterable[tuple[int, int]] = ()) -> None:
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end in sorted(r for r in ranges if r[1] > r[0]):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts = starts
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self._starts, self._ends)
+
+    def overlaps(self, start_offset: int, end_offset: int) -> bool:
+        """True if the half-open range [start, end) touches any bad range."""
+        index = bisect.bisect_right(self._starts, start_offset) - 1
+        if index >= 0 and self._ends[index] > start_offset:
+            return True
+        index += 1
+        return index < len(self._starts) and self._starts[index] < end_offset
+
+    def bad_subranges(self, start_offset: int, end_offset: int) -> list[tuple[int, int]]:
+        """Return the bad parts of [start, end), clipped to the extent."""
+        subranges: list[tuple[int, int]] = []
+        index = max(bisect.bisect_right(self._starts, start_offset) - 1, 0)
+        while index < len(self._starts) and self._starts[index] < end_offset:
+            low = max(self._starts[index], start_offset)
+            high = min(self._ends[index], end_offset)
+            if low < high:
+                subranges.append((low, high))
+            index += 1
+        return subranges
+
+
 class DdrescueMapParser:
     """Parse ddrescue mapfile to identify bad sectors."""
 
     BAD_SECTOR_FLAG = "-"
 
     @staticmethod
-    def load_mapfile(mapfile_path: Path) -> list[tuple[int, int, str]]:
-        """Load ddrescue mapfile and return byte ranges with status flags."""
-        sectors: list[tuple[int, int, str]] = []
+    def load_mapfile(mapfile_path: Path) -> BadSectorIndex:
+        """Load a ddrescue mapfile into an index of its bad byte ranges."""
+        bad_ranges: list[tuple[int, int]] = []
 
         if not mapfile_path.exists():
-            return sectors
+            return BadSectorIndex()
 
         try:
             with open(mapfile_path, "r", encoding="utf-8") as handle:
@@ -97,12 +145,11 @@ class DdrescueMapParser:
                         continue
 
                     parts = line.split()
-                    if len(parts) >= 3:
+                    if len(parts) >= 3 and parts[2] == DdrescueMapParser.BAD_SECTOR_FLAG:
                         try:
                             offset = int(parts[0], 16)
                             size = int(parts[1], 16)
-                            status = parts[2]
-                            sectors.append((offset, offset + size, status))
+                            bad_ranges.append((offset, offset + size))
                         except ValueError:
                             pass
         except OSError as exc:
@@ -111,29 +158,114 @@ class DdrescueMapParser:
                 remediation="Verify the ddrescue mapfile path and permissions",
             ) from exc
 
-        return sectors
+        return BadSectorIndex(bad_ranges)
 
     @staticmethod
-    def is_bad_sector(mapfile: list[tuple[int, int, str]], offset: int) -> bool:
+    def _as_index(mapfile: BadSectorIndex | list[tuple[int, int, str]]) -> BadSectorIndex:
+        """Accept a raw ``(start, end, status)`` list for backwards compatibility."""
+        if isinstance(mapfile, BadSectorIndex):
+            return mapfile
+        return BadSectorIndex(
+            (start, end)
+            for start, end, status in mapfile
+            if status == DdrescueMapParser.BAD_SECTOR_FLAG
+        )
+
+    @staticmethod
+    def is_bad_sector(mapfile: BadSectorIndex | list[tuple[int, int, str]], offset: int) -> bool:
         """Check if offset falls inside a bad range in the mapfile."""
         return DdrescueMapParser.overlaps_bad_sector(mapfile, offset, offset + 1)
 
     @staticmethod
     def overlaps_bad_sector(
-        mapfile: list[tuple[int, int, str]],
+        mapfile: BadSectorIndex | list[tuple[int, int, str]],
         start_offset: int,
         end_offset: int,
     ) -> bool:
         """Check if a byte range overlaps any bad ddrescue range."""
-        for range_start, range_end, status in mapfile:
-            if (
-                status == DdrescueMapParser.BAD_SECTOR_FLAG
-                and start_offset < range_end
-                and end_offset > range_start
-            ):
-                return True
-        return False
+        return DdrescueMapParser._as_index(mapfile).overlaps(start_offset, end_offset)
+
+    @staticmethod
+    def bad_subranges(
+        mapfile: BadSectorIndex | list[tuple[int, int, str]],
+        start_offset: int,
+        end_offset: int,
+    ) -> list[tuple[int, int]]:
+        """Return the unreadable sub-ranges of a byte range."""
+        return DdrescueMapParser._as_index(mapfile).bad_subranges(start_offset, end_offset)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-inode completion journal (resumable recovery)
+# ─────────────────────────────────────────────────────────────────────────────
+
+JOURNAL_NAME = "recovery_journal.jsonl"
+
+
+class RecoveryJournal:
+    """Append-only JSONL journal of per-inode outcomes in the output directory.
+
+    Every completed or failed inode is appended and fsynced as soon as it is
+    processed, so an interrupted run loses at most the inode in flight. A
+    truncated final line (crash mid-write) is ignored on load.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self.path = Path(output_dir) / JOURNAL_NAME
+
+    def load(self) -> dict[int, dict]:
+        """Return the latest journal record per inode."""
+        records: dict[int, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                        records[int(record["inode"])] = record
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            raise RecoveryError(
+                f"Cannot read recovery journal: {self.path}",
+                remediation="Check output directory permissions, or rerun without --resume",
+            ) from exc
+        return records
+
+    def reset(self) -> None:
+        """Start a fresh journal for a non-resumed run."""
+        self.path.unlink(missing_ok=True)
+
+    def record_recovered(self, recovered: RecoveredFile) -> None:
+        self._append(
+            {
+                "inode": recovered.inode,
+                "status": "recovered",
+                "sha256": recovered.sha256,
+                "output_path": recovered.output_path,
+                "file": asdict(recovered),
+            }
+        )
 
+    def record_skipped(self, inode: int) -> None:
+        self._append({"inode": inode, "status": "skipped"})
+
+    def record_failed(self, inode: int, reason: str) -> None:
+        self._append({"inode": inode, "status": "failed", "reason": reason})
+
+    def _append(self, record: dict) -> None:
+        record["timestamp"] = _utc_now_iso()
+        try:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        except OSError as exc:
+            raise RecoveryError(
+                f"Cannot append to recovery journal: {self.path}",
+                remediation="Check output directory permissions and disk space",
+            ) from exc
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -257,10 +389,14 @@ class DeletedFileRecovery:
         logger: Optional[logging.Logger] = None,
         config: Config | None = None,
         timeout: int | None = None,
+        listing_cache: ListingCache | None = None,
+        hash_cache: HashCache | None = None,
     ):
         self.logger = logger or logging.getLogger(__name__)
         self.config = config or Config()
         self.timeout = timeout or 0
+        self.listing_cache = listing_cache
+        self.hash_cache = hash_cache  # only for re-checking outputs on --resume
 
     def recover_deleted(
         self,
@@ -271,13 +407,68 @@ class DeletedFileRecovery:
         verify: bool = False,
         inodes: list[int] | None = None,
         file_types: list[str] | None = None,
+        resume: bool = False,
+        prioritize: bool = False,
     ) -> list[RecoveredFile]:
-        """Recover deleted files listed by fls and extracted with icat."""
+        """Recover deleted files listed by fls and extracted with icat.
+
+        FAT12/16/32 and exFAT volumes are listed and extracted natively
+        (see :mod:`frece.fat`) unless ``config.native_fat`` is disabled.
+
+        Each inode outcome is appended to ``recovery_journal.jsonl`` in
+        *output_dir*. With ``resume=True`` inodes the journal marks as
+        recovered are skipped, provided their output file still exists and
+        still matches the journaled SHA-256; everything else is retried.
+
+        With ``prioritize=True`` entries are extracted tier by tier
+        (CRITICAL, HIGH, MEDIUM, LOW, as estimated from name, path and size)
+        and ``recovery_manifest.json`` is rewritten after each tier, so the
+        most valuable artifacts are available before the volume is finished.
+        """
         image_path = Path(image_path)
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        deleted_entries = self._list_deleted_entries(image_path, image_offset)
+        volume = self._open_native_volume(image_path, image_offset)
+        try:
+            return self._recover_entries(
+                image_path,
+                output_dir,
+                volume,
+                image_offset=image_offset,
+                mapfile_path=mapfile_path,
+                verify=verify,
+                inodes=inodes,
+                file_types=file_types,
+                resume=resume,
+                prioritize=prioritize,
+            )
+        finally:
+            if volume is not None:
+                volume.close()
+
+    def _recover_entries(
+        self,
+        image_path: Path,
+        output_dir: Path,
+        volume: Optional[FatVolume],
+        image_offset: int = 0,
+        mapfile_path: Path | None = None,
+        verify: bool = False,
+        inodes: list[int] | None = None,
+        file_types: list[str] | None = None,
+        resume: bool = False,
+        prioritize: bool = False,
+    ) -> list[RecoveredFile]:
+        """Extract every listed deleted entry with the native or Sleuth Kit backend."""
+        native_entries: dict[int, FatEntry] = {}
+        if volume is not None:
+            for fat_entry in volume.iter_entries(deleted_only=True):
+                if not fat_entry.is_dir:
+                    native_entries.setdefault(fat_entry.inode, fat_entry)
+            deleted_entries = [self._scanned_from_fat(e) for e in native_entries.values()]
+        else:
+            deleted_entries = self._list_deleted_entries(image_path, image_offset)
         if inodes is not None:
             inodes_set = set(inodes)
             deleted_entries = [entry for entry in deleted_entries if entry.inode in inodes_set]
@@ -290,58 +481,167 @@ class DeletedFileRecovery:
                 for file_type in file_types
             }
 
-        mapfile = DdrescueMapParser.load_mapfile(mapfile_path) if mapfile_path else []
+        mapfile = (
+            DdrescueMapParser.load_mapfile(mapfile_path) if mapfile_path else BadSectorIndex()
+        )
 
         recovered_files: list[RecoveredFile] = []
         failed_inodes: list[dict] = []
 
-        for entry in deleted_entries:
-            try:
-                recovered = self._extract_inode(
-                    image_path,
-                    entry.inode,
-                    output_dir,
-                    image_offset=image_offset,
-                    mapfile=mapfile,
-                    verify=verify,
-                    allowed_types=allowed_types,
-                    original_name=entry.name,
-                )
-                if recovered is not None:
-                    recovered_files.append(recovered)
-            except RecoveryError as exc:
-                failed_inodes.append({"inode": entry.inode, "reason": exc.message})
-                self.logger.warning(
-                    json.dumps(
-                        {
-                            "event": "INODE_SKIP",
-                            "inode": entry.inode,
-                            "reason": exc.message,
-                            "timestamp": _utc_now_iso(),
-                        }
+        journal = RecoveryJournal(output_dir)
+        journaled = journal.load() if resume else {}
+        if not resume:
+            journal.reset()
+
+        tiers: list[tuple[Optional[str], list[ScannedEntry]]]
+        if prioritize:
+            tiers = list(self._schedule_entries(deleted_entries))
+        else:
+            tiers = [(None, deleted_entries)]
+        completed_tiers: list[str] = []
+
+        for tier, tier_entries in tiers:
+            for entry in tier_entries:
+                previous = self._resumable_record(journaled.get(entry.inode))
+                if previous is not None:
+                    recovered_files.append(previous)
+                    continue
+                try:
+                    if volume is not None:
+                        recovered = self._extract_native(
+                            volume,
+                            native_entries[entry.inode],
+                            output_dir,
+                            mapfile=mapfile,
+                            verify=verify,
+                            allowed_types=allowed_types,
+                        )
+                    else:
+                        recovered = self._extract_inode(
+                            image_path,
+                            entry.inode,
+                            output_dir,
+                            image_offset=image_offset,
+                            mapfile=mapfile,
+                            verify=verify,
+                            allowed_types=allowed_types,
+                            original_name=entry.name,
+                        )
+                    if recovered is not None:
+                        recovered_files.append(recovered)
+                        journal.record_recovered(recovered)
+                    else:
+                        journal.record_skipped(entry.inode)
+                except RecoveryError as exc:
+                    failed_inodes.append({"inode": entry.inode, "reason": exc.message})
+                    journal.record_failed(entry.inode, exc.message)
+                    self.logger.warning(
+                        json.dumps(
+                            {
+                                "event": "INODE_SKIP",
+                                "inode": entry.inode,
+                                "reason": exc.message,
+                                "timestamp": _utc_now_iso(),
+                            }
+                        )
                     )
-                )
-            except Exception as exc:  # pragma: no cover - defensive guardrail
-                failed_inodes.append({"inode": entry.inode, "reason": str(exc)})
-                self.logger.warning(
+                except Exception as exc:  # pragma: no cover - defensive guardrail
+                    failed_inodes.append({"inode": entry.inode, "reason": str(exc)})
+                    journal.record_failed(entry.inode, str(exc))
+                    self.logger.warning(
+                        json.dumps(
+                            {
+                                "event": "INODE_SKIP",
+                                "inode": entry.inode,
+                                "reason": str(exc),
+                                "timestamp": _utc_now_iso(),
+                            }
+                        )
+                    )
+
+            if tier is not None:
+                completed_tiers.append(tier)
+                self.logger.info(
                     json.dumps(
                         {
-                            "event": "INODE_SKIP",
-                            "inode": entry.inode,
-                            "reason": str(exc),
+                            "event": "PRIORITY_TIER_DONE",
+                            "tier": tier,
+                            "entries": len(tier_entries),
+                            "recovered_total": len(recovered_files),
                             "timestamp": _utc_now_iso(),
                         }
                     )
                 )
+                if len(completed_tiers) < len(tiers):
+                    self.export_recovery_manifest(
+                        image_path,
+                        output_dir,
+                        recovered_files,
+                        failed_inodes,
+                        completed_tiers=completed_tiers,
+                        complete=False,
+                    )
 
         self.export_recovery_manifest(
             image_path,
             output_dir,
             recovered_files,
             failed_inodes,
+            completed_tiers=completed_tiers if prioritize else None,
         )
         return recovered_files
 
+    @staticmethod
+    def _schedule_entries(
+        entries: list[ScannedEntry],
+    ) -> list[tuple[str, list[ScannedEntry]]]:
+        """Group entries into non-empty priority tiers, most urgent first.
+
+        Within a tier smaller files go first so more evidence lands sooner;
+        otherwise listing order is kept.
+        """
+        tiers: dict[str, list[ScannedEntry]] = {tier: [] for tier in PRIORITY_ORDER}
+        for entry in entries:
+            tiers[predict_priority(entry.name, entry.size)].append(entry)
+        return [
+            (tier, sorted(members, key=lambda entry: entry.size))
+            for tier, members in tiers.items()
+            if members
+        ]
+
+    def _resumable_record(self, record: Optional[dict]) -> Optional[RecoveredFile]:
+        """Return the journaled result if its output is still present and intact."""
+        if not record or record.get("status") != "recovered":
+            return None
+        output_path = Path(record.get("output_path", ""))
+        if not output_path.is_file():
+            return None
+        try:
+            if self.hash_cache is not None:
+                sha256, _ = self.hash_cache.digest(output_path, "sha256")
+            else:
+                sha256, _ = self._hash_file(output_path)
+        except (OSError, RecoveryError):
+            return None
+        if sha256 != record.get("sha256"):
+            return None
+        try:
+            recovered = RecoveredFile(**record["file"])
+        except (KeyError, TypeError):
+            return None
+
+        self.logger.info(
+            json.dumps(
+                {
+                    "event": "INODE_RESUMED",
+                    "inode": recovered.inode,
+                    "output_file": str(output_path),
+                    "timestamp": _utc_now_iso(),
+                }
+            )
+        )
+        return recovered
+
     def scan_deleted(
         self,
         image_path: Path,
@@ -349,7 +649,14 @@ class DeletedFileRecovery:
     ) -> list[ScannedEntry]:
         """List deleted files using fls without extracting anything."""
         image_path = Path(image_path)
-        entries = self._list_deleted_entries(image_path, image_offset)
+        volume = self._open_native_volume(image_path, image_offset)
+        if volume is not None:
+            with volume:
+                entries = [
+                    self._scanned_from_fat(e) for e in volume.iter_entries(deleted_only=True)
+                ]
+        else:
+            entries = self._list_deleted_entries(image_path, image_offset)
 
         self.logger.info(
             json.dumps(
@@ -387,11 +694,26 @@ class DeletedFileRecovery:
         entries: list[ScannedEntry] = []
         seen_inodes: set[int] = set()
 
-        for line in self._iter_fls_mactime(image_path, image_offset):
-            entry = self._parse_mactime_line(line, deleted_only=deleted_only)
-            if entry is not None and entry.inode not in seen_inodes:
-                seen_inodes.add(entry.inode)
-                entries.append(entry)
+        volume = self._open_native_volume(image_path, image_offset)
+        if volume is not None:
+            with volume:
+                entries = [
+                    self._scanned_from_fat(e)
+                    for e in volume.iter_entries(deleted_only=deleted_only)
+                ]
+        else:
+            def _build() -> Iterator[ScannedEntry]:
+                for line in self._iter_fls_mactime(image_path, image_offset):
+                    parsed = self._parse_mactime_line(line, deleted_only=False)
+                    if parsed is not None:
+                        yield parsed
+
+            for entry in self._cached_listing(image_path, image_offset, "mactime", _build):
+                if deleted_only and entry.allocated:
+                    continue
+                if entry.inode not in seen_inodes:
+                    seen_inodes.add(entry.inode)
+                    entries.append(entry)
 
         self.logger.info(
             json.dumps(
@@ -405,19 +727,77 @@ class DeletedFileRecovery:
         )
         return entries
 
+    def _open_native_volume(self, image_path: Path, image_offset: int) -> Optional[FatVolume]:
+        """Open a FAT/exFAT volume for native walking, or None to use The Sleuth Kit."""
+        if not self.config.native_fat:
+            return None
+        volume = open_fat_volume(image_path, image_offset)
+        if volume is not None:
+            self.logger.info(
+                json.dumps(
+                    {
+                        "event": "NATIVE_FS",
+                        "image": str(image_path),
+                        "filesystem": volume.fs_type,
+                        "timestamp": _utc_now_iso(),
+                    }
+                )
+            )
+        return volume
+
+    @staticmethod
+    def _scanned_from_fat(entry: FatEntry) -> ScannedEntry:
+        """Map a native FAT directory entry onto the fls-shaped ScannedEntry."""
+        return ScannedEntry(
+            inode=entry.inode,
+            inode_token=str(entry.inode),
+            entry_type="d" if entry.is_dir else "r",
+            name=entry.path,
+            allocated=not entry.deleted,
+            size=entry.size,
+            mtime=entry.mtime,
+            atime=entry.atime,
+            crtime=entry.crtime,
+        )
+
     def _list_deleted_entries(self, image_path: Path, image_offset: int = 0) -> list[ScannedEntry]:
         """List deleted entries from a filesystem image using streamed fls output."""
         entries: list[ScannedEntry] = []
         seen_inodes: set[int] = set()
 
-        for line in self._iter_fls_lines(image_path, image_offset):
-            entry = self._parse_fls_line(line)
-            if entry is not None and entry.inode not in seen_inodes:
+        def _build() -> Iterator[ScannedEntry]:
+            for line in self._iter_fls_lines(image_path, image_offset):
+                parsed = self._parse_fls_line(line)
+                if parsed is not None:
+                    yield parsed
+
+        for entry in self._cached_listing(image_path, image_offset, "deleted", _build):
+            if entry.inode not in seen_inodes:
                 seen_inodes.add(entry.inode)
                 entries.append(entry)
 
         return entries
 
+    def _cached_listing(
+        self,
+        image_path: Path,
+        image_offset: int,
+        variant: str,
+        build: Callable[[], Iterable[ScannedEntry]],
+    ) -> Iterator[ScannedEntry]:
+        """Replay a cached fls listing, or walk with *build* and cache the result."""
+        if self.listing_cache is None:
+            yield from build()
+            return
+        rows = self.listing_cache.rows(
+            image_path,
+            image_offset,
+            variant,
+            lambda: (astuple(entry) for entry in build()),
+        )
+        for row in rows:
+            yield ScannedEntry(*row)
+
     def _iter_fls_lines(self, image_path: Path, image_offset: int) -> Generator[str, None, None]:
         """Yield fls output lines without buffering the full output."""
         command = ["fls", "-r", "-d"]
@@ -426,15 +806,8 @@ class DeletedFileRecovery:
         command.append(str(image_path))
 
         timeout = self._command_timeout("fls")
-        timed_out = False
-
         try:
-            proc = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
+            stream = get_runner().stream(command, timeout=timeout)
         except FileNotFoundError as exc:
             raise RecoveryError(
                 "Tool not found: fls",
@@ -446,34 +819,18 @@ class DeletedFileRecovery:
                 remediation="Verify image path and permissions",
             ) from exc
 
-        def _kill_process() -> None:
-            nonlocal timed_out
-            timed_out = True
-            proc.kill()
-
-        timer = threading.Timer(timeout, _kill_process) if timeout > 0 else None
-        if timer is not None:
-            timer.start()
-
-        try:
-            assert proc.stdout is not None
-            for line in proc.stdout:
-                yield line
-            proc.wait()
-        finally:
-            if timer is not None:
-                timer.cancel()
+        with stream:
+            yield from stream
 
-        stderr_text = proc.stderr.read().strip() if proc.stderr is not None else ""
-        if timed_out:
+        if stream.timed_out:
             raise RecoveryError(
                 "fls timed out",
                 remediation="Increase --timeout or config max_fls_timeout.",
             )
 
-        if proc.returncode != 0:
+        if stream.returncode != 0:
             raise RecoveryError(
-                f"fls failed: {stderr_text}",
+                f"fls failed: {stream.stderr.strip()}",
                 remediation="Check image format and filesystem offset",
             )
 
@@ -520,12 +877,8 @@ class DeletedFileRecovery:
         command.append(str(image_path))
 
         try:
-            proc = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                errors="replace",
+            stream = get_runner().stream(
+                command, timeout=self._command_timeout("fls"), errors="replace"
             )
         except FileNotFoundError as exc:
             raise RecoveryError(
@@ -533,13 +886,14 @@ class DeletedFileRecovery:
                 remediation="Install The Sleuth Kit: apt-get install sleuthkit",
             ) from exc
 
-        assert proc.stdout is not None
-        try:
-            for line in proc.stdout:
-                yield line
-        finally:
-            proc.stdout.close()
-            proc.wait()
+        with stream:
+            yield from stream
+
+        if stream.timed_out:
+            raise RecoveryError(
+                "fls timed out",
+                remediation="Increase --timeout or config max_fls_timeout.",
+            )
 
     def _parse_mactime_line(
         self, line: str, deleted_only: bool = True
@@ -599,7 +953,7 @@ class DeletedFileRecovery:
             inode_token=parts[2],
             entry_type=entry_type,
             name=name or f"inode-{inode}",
-            allocated=False,  # we're reading deleted entries
+            allocated=not is_deleted,
             size=size,
             mtime=mtime,
             atime=atime,
@@ -613,28 +967,17 @@ class DeletedFileRecovery:
         inode: int,
         output_dir: Path,
         image_offset: int = 0,
-        mapfile: Optional[list[tuple[int, int, str]]] = None,
+        mapfile: Optional[BadSectorIndex] = None,
         verify: bool = False,
         allowed_types: Optional[set[str]] = None,
         original_name: Optional[str] = None,
     ) -> Optional[RecoveredFile]:
         """Extract one inode with icat, detect type, and write to disk."""
-        if mapfile and self._inode_touches_bad_sectors(
-            image_path,
-            inode,
-            image_offset,
-            mapfile,
-        ):
-            self.logger.warning(
-                json.dumps(
-                    {
-                        "event": "SECTOR_BAD",
-                        "inode": inode,
-                        "timestamp": _utc_now_iso(),
-                    }
-                )
-            )
-            return None
+        if mapfile:
+            bad_ranges = self._inode_bad_ranges(image_path, inode, image_offset, mapfile)
+            if bad_ranges:
+                self._log_bad_sectors(inode, bad_ranges)
+                return None
 
         command = ["icat"]
         if image_offset:
@@ -652,6 +995,91 @@ class DeletedFileRecovery:
             timeout=self._command_timeout("icat"),
         )
 
+        return self._finalize_extracted(
+            tmp_path,
+            output_dir,
+            inode,
+            verify=verify,
+            allowed_types=allowed_types,
+            original_name=original_name,
+            extract_event={
+                "event": "ICAT",
+                "returncode": 0,
+                "stderr": stderr_bytes.decode("utf-8", errors="ignore").strip(),
+            },
+            mac_times=None,
+            image_path=image_path,
+            image_offset=image_offset,
+        )
+
+    def _extract_native(
+        self,
+        volume: FatVolume,
+        entry: FatEntry,
+        output_dir: Path,
+        mapfile: Optional[BadSectorIndex] = None,
+        verify: bool = False,
+        allowed_types: Optional[set[str]] = None,
+    ) -> Optional[RecoveredFile]:
+        """Extract one FAT/exFAT entry with direct reads instead of icat."""
+        if mapfile:
+            bad_ranges = [
+                bad
+                for start, end in volume.extents(entry)
+                for bad in mapfile.bad_subranges(start, end)
+            ]
+            if bad_ranges:
+                self._log_bad_sectors(entry.inode, bad_ranges)
+                return None
+
+        tmp_path = output_dir / f".inode_{entry.inode}.tmp"
+        digest = volume.extract(entry, tmp_path)
+        return self._finalize_extracted(
+            tmp_path,
+            output_dir,
+            entry.inode,
+            verify=verify,
+            allowed_types=allowed_types,
+            original_name=entry.name,
+            extract_event={"event": "NATIVE_EXTRACT", "filesystem": volume.fs_type},
+            mac_times=(entry.mtime, entry.atime, 0, entry.crtime),
+            digest=digest,
+        )
+
+    def _log_bad_sectors(self, inode: int, bad_ranges: list[tuple[int, int]]) -> None:
+        """Record which byte ranges of an inode fall on unreadable sectors."""
+        self.logger.warning(
+            json.dumps(
+                {
+                    "event": "SECTOR_BAD",
+                    "inode": inode,
+                    "bad_bytes": sum(end - start for start, end in bad_ranges),
+                    "bad_ranges": [[start, end] for start, end in bad_ranges[:32]],
+                    "timestamp": _utc_now_iso(),
+                }
+            )
+        )
+
+    def _finalize_extracted(
+        self,
+        tmp_path: Path,
+        output_dir: Path,
+        inode: int,
+        verify: bool,
+        allowed_types: Optional[set[str]],
+        original_name: Optional[str],
+        extract_event: dict,
+        mac_times: Optional[tuple[int, int, int, int]],
+        image_path: Optional[Path] = None,
+        image_offset: int = 0,
+        digest: Optional[tuple[str, int]] = None,
+    ) -> Optional[RecoveredFile]:
+        """Type, hash, place and enrich an extracted temp file.
+
+        ``mac_times`` is resolved through istat when the backend did not
+        already provide it; ``digest`` skips re-hashing a file the backend
+        hashed while writing.
+        """
         file_type = self._detect_file_type_from_path(tmp_path)
         normalized_type = file_type.lower()
         if allowed_types is not None and normalized_type not in allowed_types:
@@ -661,7 +1089,7 @@ class DeletedFileRecovery:
             tmp_path.unlink(missing_ok=True)
             return None
 
-        sha256, size = self._hash_file(tmp_path)
+        sha256, size = digest if digest is not None else self._hash_file(tmp_path)
         final_path = self._output_path_for_inode(output_dir, inode, file_type, original_name)
 
         try:
@@ -676,12 +1104,10 @@ class DeletedFileRecovery:
         self.logger.info(
             json.dumps(
                 {
-                    "event": "ICAT",
+                    **extract_event,
                     "inode": inode,
-                    "returncode": 0,
                     "bytes_written": size,
                     "timestamp": _utc_now_iso(),
-                    "stderr": stderr_bytes.decode("utf-8", errors="ignore").strip(),
                 }
             )
         )
@@ -702,8 +1128,10 @@ class DeletedFileRecovery:
         except Exception:
             pass
 
-        # MAC times from istat
-        mtime, atime, ctime, crtime = self._get_mac_times(image_path, inode, image_offset)
+        # MAC times from istat unless the backend already knows them
+        if mac_times is None and image_path is not None:
+            mac_times = self._get_mac_times(image_path, inode, image_offset)
+        mtime, atime, ctime, crtime = mac_times or (0, 0, 0, 0)
 
         # Deep metadata extraction
         artifact_meta: dict = {}
@@ -769,44 +1197,31 @@ class DeletedFileRecovery:
         timeout: int,
     ) -> bytes:
         """Run a command and stream stdout directly into output_path."""
-        timed_out = False
-
         try:
             with output_path.open("wb") as out_handle:
                 try:
-                    proc = subprocess.Popen(
-                        command,
-                        stdout=out_handle,
-                        stderr=subprocess.PIPE,
-                    )
+                    result = get_runner().run_to_file(command, out_handle, timeout=timeout)
                 except FileNotFoundError as exc:
                     raise RecoveryError(
                         f"Tool not found: {tool_name}",
                         remediation=not_found_remediation,
                     ) from exc
+                except subprocess.TimeoutExpired as exc:
+                    raise RecoveryError(
+                        f"{tool_name} timed out",
+                        remediation="Increase --timeout or config timeouts.",
+                    ) from exc
                 except OSError as exc:
                     raise RecoveryError(
                         run_failure_message,
                         remediation=run_failure_remediation,
                     ) from exc
 
-                def _kill_process() -> None:
-                    nonlocal timed_out
-                    timed_out = True
-                    proc.kill()
-
-                timer = threading.Timer(timeout, _kill_process) if timeout > 0 else None
-                if timer is not None:
-                    timer.start()
-
-                try:
-                    _, stderr_bytes = proc.communicate()
-                finally:
-                    if timer is not None:
-                        timer.cancel()
-
                 out_handle.flush()
                 os.fsync(out_handle.fileno())
+        except RecoveryError:
+            output_path.unlink(missing_ok=True)
+            raise
         except OSError as exc:
             output_path.unlink(missing_ok=True)
             raise RecoveryError(
@@ -814,22 +1229,15 @@ class DeletedFileRecovery:
                 remediation="Check output directory permissions and disk space",
             ) from exc
 
-        if timed_out:
-            output_path.unlink(missing_ok=True)
-            raise RecoveryError(
-                f"{tool_name} timed out",
-                remediation="Increase --timeout or config timeouts.",
-            )
-
-        if proc.returncode != 0:
+        if result.returncode != 0:
             output_path.unlink(missing_ok=True)
-            stderr_text = (stderr_bytes or b"").decode("utf-8", errors="ignore").strip()
+            stderr_text = (result.stderr or b"").decode("utf-8", errors="ignore").strip()
             raise RecoveryError(
                 f"{tool_name} failed",
                 remediation=stderr_text or run_failure_remediation,
             )
 
-        return stderr_bytes or b""
+        return result.stderr or b""
 
     def _command_timeout(self, tool_name: str) -> int:
         """Resolve the active timeout for a recovery subprocess."""
@@ -848,60 +1256,38 @@ class DeletedFileRecovery:
         run_failure_remediation: str,
         timeout: int,
     ) -> str:
-        """Run a text command with an optional externally managed timeout."""
-        timed_out = False
-
+        """Run a text command with an optional timeout."""
         try:
-            proc = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
+            result = get_runner().run(command, timeout=timeout)
         except FileNotFoundError as exc:
             raise RecoveryError(
                 f"Tool not found: {tool_name}",
                 remediation=not_found_remediation,
             ) from exc
+        except subprocess.TimeoutExpired as exc:
+            raise RecoveryError(
+                f"{tool_name} timed out",
+                remediation="Increase --timeout or config timeouts.",
+            ) from exc
         except OSError as exc:
             raise RecoveryError(
                 run_failure_message,
                 remediation=run_failure_remediation,
             ) from exc
 
-        def _kill_process() -> None:
-            nonlocal timed_out
-            timed_out = True
-            proc.kill()
-
-        timer = threading.Timer(timeout, _kill_process) if timeout > 0 else None
-        if timer is not None:
-            timer.start()
-
-        try:
-            stdout_text, stderr_text = proc.communicate()
-        finally:
-            if timer is not None:
-                timer.cancel()
-
-        if timed_out:
-            raise RecoveryError(
-                f"{tool_name} timed out",
-                remediation="Increase --timeout or config timeouts.",
-            )
-
-        if proc.returncode != 0:
+        if result.returncode != 0:
             raise RecoveryError(
                 f"{tool_name} failed for {command[-1]}",
-                remediation=stderr_text.strip() or run_failure_remediation,
+                remediation=result.stderr.strip() or run_failure_remediation,
             )
 
-        return stdout_text
+        stdout: str = result.stdout
+        return stdout
 
     def _detect_file_type_from_path(self, file_path: Path) -> str:
         """Detect file type from the leading bytes of a recovered file."""
         with file_path.open("rb") as handle:
-            return self._detect_file_type(handle.read(4096))
+            return self._detect_file_type(handle.read(HEADER_BYTES))
 
     def _hash_file(self, file_path: Path) -> tuple[str, int]:
         """Stream-hash a file from disk."""
@@ -922,207 +1308,12 @@ class DeletedFileRecovery:
         return hasher.hexdigest(), size
 
     def _detect_file_type(self, data: bytes) -> str:
-        """Detect file type using python-magic + comprehensive header scan.
+        """Detect file type from leading bytes (see :mod:`frece.filetype`).
 
-        Covers all 88 FRECE carving types plus common text formats.
-        Falls back to header bytes if python-magic is unavailable.
+        Covers all 88 FRECE carving types plus common text formats; libmagic
+        is only consulted when no header signature matches.
         """
-        if not data:
-            return "bin"
-
-        if magic_module is not None:
-            try:
-                detected = magic_module.from_buffer(data, mime=False).lower()
-                if "word 2007+" in detected or "wordprocessingml" in detected:
-                    return "docx"
-                if "excel 2007+" in detected or "spreadsheetml" in detected:
-                    return "xlsx"
-                if "powerpoint 2007+" in detected or "presentationml" in detected:
-                    return "pptx"
-                if "jpeg" in detected or "jfif" in detected:
-                    return "jpeg"
-                if "png image" in detected:
-                    return "png"
-                if "pdf document" in detected:
-                    return "pdf"
-                if "quicktime" in detected:
-                    return "mov"
-                if "mp4" in detected or "iso media" in detected:
-                    return "mp4"
-                if "sqlite 3.x database" in detected or "sqlite database" in detected:
-                    return "sqlite"
-                if "pcap capture" in detected or "tcpdump" in detected:
-                    return "pcap"
-                if "pcap-ng capture" in detected:
-                    return "pcapng"
-                if "wave audio" in detected or "riff (little-endian)" in detected:
-                    return "wav"
-                if "avi" in detected:
-                    return "avi"
-                if "mpeg" in detected and "layer iii" in detected:
-                    return "mp3"
-                if "flac audio" in detected:
-                    return "flac"
-                if "ogg" in detected:
-                    return "ogg"
-                if "pe32" in detected or "ms-dos executable" in detected:
-                    return "pe"
-                if "elf" in detected and ("executable" in detected or "shared object" in detected):
-                    return "elf"
-                if "windows event log" in detected:
-                    return "evtx"
-                if "ms windows shortcut" in detected:
-                    return "lnk"
-                if "windows registry" in detected:
-                    return "reg"
-                if "photoshop" in detected:
-                    return "psd"
-                if "vmdk" in detected:
-                    return "vmdk"
-                if "rich text" in detected or "rtf" in detected:
-                    return "rtf"
-                if "xml" in detected:
-                    return "xml"
-                if "html document" in detected:
-                    return "html"
-                if "mail message" in detected or "rfc 822" in detected or "smtp mail" in detected:
-                    return "eml"
-                if "mbox" in detected:
-                    return "mbox"
-                if "python" in detected:
-                    return "py"
-                if "shell script" in detected or "bash script" in detected:
-                    return "sh"
-                if "perl script" in detected:
-                    return "pl"
-                if "php script" in detected:
-                    return "php"
-                if "gzip compressed" in detected:
-                    return "gz"
-                if "bzip2 compressed" in detected:
-                    return "bz2"
-                if "xz compressed" in detected:
-                    return "xz"
-                if "zip archive" in detected:
-                    return "zip"
-                if "7-zip archive" in detected:
-                    return "7z"
-                if "rar archive" in detected:
-                    return "rar"
-                if "tiff image" in detected:
-                    return "tiff"
-                if "gif image" in detected:
-                    return "gif"
-                if "bitmap image" in detected:
-                    return "bmp"
-                if "matroska" in detected or "webm" in detected:
-                    return "mkv"
-                if "flash video" in detected:
-                    return "flv"
-                if "apple binary property" in detected:
-                    return "plist"
-                if "mach-o" in detected:
-                    return "macho"
-                if "csv" in detected or "comma-separated" in detected:
-                    return "csv"
-                if "ascii text" in detected or "utf-8 unicode text" in detected:
-                    return "txt"
-                if "text" in detected:
-                    return "txt"
-            except Exception:
-                pass
-
-        # Header-byte fallback (no python-magic needed)
-        if data[:3] == b"\xff\xd8\xff":
-            return "jpeg"
-        if data[:8] == b"\x89PNG\r\n\x1a\n":
-            return "png"
-        if data[:4] == b"%PDF":
-            return "pdf"
-        if data[:16] == b"SQLite format 3\x00":
-            return "sqlite"
-        if data[:8] in (b"\xd4\xc3\xb2\xa1", b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d"):
-            return "pcap"
-        if data[:4] == b"\x0a\x0d\x0d\x0a":
-            return "pcapng"
-        if data[:2] == b"MZ":
-            return "pe"
-        if data[:4] == b"\x7fELF":
-            return "elf"
-        if data[:8] == b"ElfFile\x00":
-            return "evtx"
-        if data[:4] == b"L\x00\x00\x00":
-            return "lnk"
-        if data[:4] == b"regf":
-            return "reg"
-        if data[:4] == b"8BPS":
-            return "psd"
-        if data[:4] == b"SCCA":
-            return "prefetch"
-        if data[:4] in (b"\xca\xfe\xba\xbe", b"\xcf\xfa\xed\xfe", b"\xce\xfa\xed\xfe"):
-            return "macho"
-        if data[:4] == b"PK\x03\x04":
-            if b"word/" in data[:4096]:
-                return "docx"
-            if b"xl/" in data[:4096]:
-                return "xlsx"
-            if b"ppt/" in data[:4096]:
-                return "pptx"
-            return "zip"
-        if data[:6] == b"7z\xbc\xaf\x27\x1c":
-            return "7z"
-        if data[:7] in (b"Rar!\x1a\x07\x00", b"Rar!\x1a\x07\x01"):
-            return "rar"
-        if data[:2] == b"\x1f\x8b":
-            return "gz"
-        if data[:3] == b"BZh":
-            return "bz2"
-        if data[:6] == b"\xfd7zXZ\x00":
-            return "xz"
-        if len(data) >= 12 and data[4:8] == b"ftyp":
-            return "mov" if data[8:12] == b"qt  " else "mp4"
-        if data[:4] == b"RIFF":
-            if len(data) >= 12:
-                if data[8:12] == b"WAVE":
-                    return "wav"
-                if data[8:12] == b"AVI ":
-                    return "avi"
-                if data[8:12] == b"WEBP":
-                    return "webp"
-        if data[:4] == b"fLaC":
-            return "flac"
-        if data[:4] == b"OggS":
-            return "ogg"
-        if data[:3] in (b"ID3", b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
-            return "mp3"
-        if data[:8] in (b"II*\x00", b"MM\x00*"):
-            return "tiff"
-        if data[:6] in (b"GIF87a", b"GIF89a"):
-            return "gif"
-        if data[:2] == b"BM":
-            return "bmp"
-        if data[:4] == b"{\\rtf":
-            return "rtf"
-        if data[:5] == b"<?xml":
-            return "xml"
-        if data[:15].lower() in (b"<!doctype html>", b"<!doctype html "):
-            return "html"
-        if data[:6].lower() in (b"<html>", b"<html "):
-            return "html"
-        eml_headers = (b"From ", b"Return-Path:", b"Received:")
-        if any(data.startswith(h) for h in eml_headers):
-            return "eml"
-        if data.startswith(b"#!/"):
-            return "script"
-        if data.startswith(b"bplist"):
-            return "plist"
-        if data[:4] == b"\x1a\x45\xdf\xa3":
-            return "mkv"
-        if data[:4] in (b"FLV\x01",):
-            return "flv"
-        if data[:3] == b"ID3" or data[:2] == b"\xff\xfb":
-            return "mp3"
-        return "bin"
+        return detect_file_type(data)
 
     def verify_recovered(self, output_path: Path, expected_sha256: str) -> bool:
         """Re-read a recovered file and verify the stored hash."""
@@ -1161,8 +1352,14 @@ class DeletedFileRecovery:
         output_dir: Path,
         recovered_files: list[RecoveredFile],
         failed_inodes: list[dict] | None = None,
+        completed_tiers: list[str] | None = None,
+        complete: bool = True,
     ) -> Path:
-        """Write a JSON manifest describing recovered inodes."""
+        """Write a JSON manifest describing recovered inodes.
+
+        The manifest is replaced atomically, so a partial manifest written
+        between priority tiers can be read while recovery continues.
+        """
         manifest = {
             "source": str(source_path),
             "timestamp": _utc_now_iso(),
@@ -1171,13 +1368,18 @@ class DeletedFileRecovery:
             "failed_inodes": failed_inodes or [],
             "recovered_files": [asdict(recovered_file) for recovered_file in recovered_files],
         }
+        if completed_tiers is not None:
+            manifest["complete"] = complete
+            manifest["completed_tiers"] = list(completed_tiers)
 
         manifest_path = output_dir / "recovery_manifest.json"
+        tmp_path = manifest_path.with_suffix(".json.tmp")
         try:
-            with open(manifest_path, "w", encoding="utf-8") as handle:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
                 json.dump(manifest, handle, indent=2)
                 handle.flush()
                 os.fsync(handle.fileno())
+            os.replace(tmp_path, manifest_path)
         except OSError as exc:
             raise RecoveryError(
                 f"Cannot write recovery manifest: {manifest_path}",
@@ -1202,13 +1404,7 @@ class DeletedFileRecovery:
         command.extend([str(image_path), str(inode)])
 
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False,
-            )
+            result = get_runner().run(command, timeout=30)
             return self._parse_istat_mac_times(result.stdout)
         except Exception:
             return (0, 0, 0, 0)
@@ -1259,27 +1455,16 @@ class DeletedFileRecovery:
           2026-05-31 03:02:03.563617652 (UTC)    ← ext4 nanoseconds
           2024-03-15 14:23:11 (UTC)              ← no sub-seconds
         """
-        from datetime import timezone as _tz
-
-        ts_str = ts_str.strip()
         # Strip timezone annotation e.g. " (UTC)"
-        ts_str = re.sub(r"\s*\([^)]*\)\s*$", "", ts_str).strip()
-        # Truncate sub-seconds to microseconds (Python datetime max precision)
-        ts_str = re.sub(r"(\.\d{6})\d+", r"\1", ts_str)
-
-        for fmt in (
-            "%Y-%m-%d %H:%M:%S.%f",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S.%f",
-            "%Y-%m-%dT%H:%M:%S",
-            "%b %d %Y %H:%M:%S",
-        ):
-            try:
-                dt = datetime.strptime(ts_str.strip(), fmt).replace(tzinfo=_tz.utc)
-                return int(dt.timestamp())
-            except ValueError:
-                continue
-        return 0
+        ts_str = re.sub(r"\s*\([^)]*\)\s*$", "", ts_str.strip())
+        epoch = iso_to_epoch(ts_str)
+        if epoch:
+            return epoch
+        try:
+            dt = datetime.strptime(ts_str, "%b %d %Y %H:%M:%S").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return 0
+        return int(dt.timestamp())
 
     def _output_path_for_inode(
         self,
@@ -1339,21 +1524,31 @@ class DeletedFileRecovery:
         image_path: Path,
         inode: int,
         image_offset: int,
-        mapfile: list[tuple[int, int, str]],
+        mapfile: BadSectorIndex,
     ) -> bool:
         """Resolve inode extents with istat and check them against bad ranges."""
+        return bool(self._inode_bad_ranges(image_path, inode, image_offset, mapfile))
+
+    def _inode_bad_ranges(
+        self,
+        image_path: Path,
+        inode: int,
+        image_offset: int,
+        mapfile: BadSectorIndex,
+    ) -> list[tuple[int, int]]:
+        """Return the image byte ranges of an inode that fall on bad sectors."""
         block_size, block_ranges = self._get_inode_block_ranges(
             image_path, inode, image_offset
         )
         image_base = image_offset * 512
+        bad_ranges: list[tuple[int, int]] = []
 
         for block_start, block_end in block_ranges:
             byte_start = image_base + (block_start * block_size)
             byte_end = image_base + (block_end * block_size)
-            if DdrescueMapParser.overlaps_bad_sector(mapfile, byte_start, byte_end):
-                return True
+            bad_ranges.extend(mapfile.bad_subranges(byte_start, byte_end))
 
-        return False
+        return bad_ranges
 
     def _get_inode_block_ranges(
         self,
@@ -8,6 +8,7 @@ from typing import Any, Optional
 
 import re as _sandbox_re
 from frece.errors import SandboxError
+from frece.toolrunner import get_runner
 
 
 class InputValidator:
@@ -178,13 +179,7 @@ class SandboxedExecutor:
             )
 
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False,
-            )
+            result = get_runner().run(command, timeout=timeout)
 
             self.logger.info(
                 f"Command executed: {' '.join(command)}, "
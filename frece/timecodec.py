@@ -0,0 +1,220 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Shared UTC timestamp conversions for the timeline, recovery and metadata parsers.
+
+Every parser used to convert timestamps its own way: ``strptime`` with up
+to three formats per call, a ``datetime`` per epoch just to format it, and
+float FILETIME arithmetic. On large timelines that cost showed up in every
+profile. This module converts between ISO-8601 strings, Unix epochs
+(seconds or microseconds), Windows FILETIMEs, packed calendar fields and
+PDF dates using integer civil-calendar arithmetic. No ``datetime`` object is
+created on the common paths.
+
+* ISO strings of the shape ``YYYY-MM-DD[T ]HH:MM:SS[.fff…][Z|+00:00]`` are
+  sliced directly. Anything else goes to :meth:`datetime.fromisoformat`
+  (naive values are taken as UTC).
+* Formatting matches ``datetime.isoformat()`` with ``Z`` for UTC: the
+  fraction is omitted when it is zero, and digits below a microsecond are
+  truncated when parsing.
+* Scalar conversions are memoized (mactime bodies repeat the same times
+  many times), and the ``*s_to_*`` batch functions convert whole sequences.
+
+By FRECE convention a zero epoch or FILETIME means "unset" and formats as
+``""``. Values outside years 1–9999 also format as ``""``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+FILETIME_UNIX_EPOCH = 116_444_736_000_000_000  # 1970-01-01 in 100 ns ticks since 1601
+_US = 1_000_000
+_DAY = 86_400
+_CACHE_SIZE = 1 << 16
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MONTH_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_UTC_SUFFIXES = frozenset({"", "Z", "z", "+00:00", "+0000", "-00:00"})
+
+
+# ── calendar arithmetic ──────────────────────────────────────────────
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date (out-of-range days roll over)."""
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146_097 + doe - 719_468
+
+
+def civil_from_days(days: int) -> tuple[int, int, int]:
+    """``(year, month, day)`` for a count of days since 1970-01-01."""
+    days += 719_468
+    era = days // 146_097
+    doe = days - era * 146_097
+    yoe = (doe - doe // 1460 + doe // 36_524 - doe // 146_096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+    return yoe + era * 400 + (month <= 2), month, day
+
+
+def civil_to_epoch(
+    year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0
+) -> int:
+    """Unix epoch seconds for UTC calendar fields, like :func:`calendar.timegm`."""
+    return days_from_civil(year, month, day) * _DAY + hour * 3600 + minute * 60 + second
+
+
+# ── formatting ───────────────────────────────────────────────────────
+@lru_cache(maxsize=_CACHE_SIZE)
+def _date_prefix(days: int) -> str:
+    """``"YYYY-MM-DDT"`` for a day number; ``""`` outside years 1–9999."""
+    year, month, day = civil_from_days(days)
+    if not 1 <= year <= 9999:
+        return ""
+    return f"{year:04d}-{month:02d}-{day:02d}T"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def epoch_us_to_iso(epoch_us: int) -> str:
+    """ISO-8601 UTC string for microseconds since the epoch (``""`` for 0)."""
+    if not epoch_us:
+        return ""
+    seconds, micro = divmod(epoch_us, _US)
+    days, secs = divmod(seconds, _DAY)
+    prefix = _date_prefix(days)
+    if not prefix:
+        return ""
+    hour, rem = divmod(secs, 3600)
+    minute, second = divmod(rem, 60)
+    if micro:
+        return f"{prefix}{hour:02d}:{minute:02d}:{second:02d}.{micro:06d}Z"
+    return f"{prefix}{hour:02d}:{minute:02d}:{second:02d}Z"
+
+
+def epoch_to_iso(epoch: Union[int, float]) -> str:
+    """ISO-8601 UTC string for Unix epoch seconds (``""`` for 0 or out of range)."""
+    if isinstance(epoch, int):
+        return epoch_us_to_iso(epoch * _US)
+    return epoch_us_to_iso(round(epoch * _US))
+
+
+def filetime_to_epoch_us(filetime: int) -> int:
+    """Microseconds since the Unix epoch for a Windows FILETIME."""
+    return (filetime - FILETIME_UNIX_EPOCH) // 10
+
+
+def filetime_to_iso(filetime: int) -> str:
+    """ISO-8601 UTC string for a Windows FILETIME (``""`` for 0 or out of range)."""
+    if not filetime:
+        return ""
+    return epoch_us_to_iso(filetime_to_epoch_us(filetime))
+
+
+# ── parsing ──────────────────────────────────────────────────────────
+def _fast_iso_us(text: str) -> Optional[int]:
+    """Slice a plain UTC timestamp; None when it needs the general parser."""
+    if len(text) < 19 or text[4] != "-" or text[7] != "-" or text[10] not in "T " \
+            or text[13] != ":" or text[16] != ":":
+        return None
+    digits = text[0:4] + text[5:7] + text[8:10] + text[11:13] + text[14:16] + text[17:19]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    tail = text[19:]
+    micro = 0
+    if tail[:1] == ".":
+        fraction = tail[1:]
+        end = len(fraction) - len(fraction.lstrip("0123456789"))
+        if not end:
+            return None
+        micro = int(fraction[:min(end, 6)].ljust(6, "0"))
+        tail = fraction[end:]
+    if tail not in _UTC_SUFFIXES:
+        return None
+    year, month, day = int(digits[0:4]), int(digits[4:6]), int(digits[6:8])
+    hour, minute, second = int(digits[8:10]), int(digits[10:12]), int(digits[12:14])
+    if not (1 <= month <= 12 and hour < 24 and minute < 60 and second < 60):
+        return None  # the general parser raises the ValueError
+    leap = month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if not 1 <= day <= _MONTH_DAYS[month] + leap:
+        return None
+    return civil_to_epoch(year, month, day, hour, minute, second) * _US + micro
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def iso_to_epoch_us(text: str) -> int:
+    """Microseconds since the epoch for an ISO-8601 string; raises ``ValueError``.
+
+    A value without a UTC offset is taken as UTC.
+    """
+    text = text.strip()
+    fast = _fast_iso_us(text)
+    if fast is not None:
+        return fast
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(microseconds=1)
+
+
+def iso_to_epoch(text: Optional[str], default: int = 0) -> int:
+    """Unix epoch seconds for an ISO-8601 string, or *default* when unparseable."""
+    if not text:
+        return default
+    try:
+        return iso_to_epoch_us(text) // _US
+    except ValueError:
+        return default
+
+
+def pdf_date_to_iso(text: str) -> Optional[str]:
+    """ISO-8601 UTC string for a PDF date (``D:YYYYMMDDHHmmSSOHH'mm'``), else None.
+
+    At least the year is required; missing fields default as in the PDF
+    specification and the optional offset is applied.
+    """
+    text = text.strip()
+    if not text.startswith("D:"):
+        return None
+    text = text[2:]
+    end = len(text) - len(text.lstrip("0123456789"))
+    if end < 4 or end % 2:
+        return None
+    digits = text[:end] + "0101000000"[end - 4:]
+    fields = [int(digits[i:i + 2]) for i in range(4, 14, 2)]
+    month, day, hour, minute, second = fields
+    if not (1 <= month <= 12 and 1 <= day <= 31 and hour < 24 and minute < 60 and second < 60):
+        return None
+    epoch = civil_to_epoch(int(digits[:4]), month, day, hour, minute, second)
+    zone = text[end:].replace("'", "")
+    if zone[:1] in ("+", "-") and zone[1:3].isdigit():
+        offset = int(zone[1:3]) * 3600 + (int(zone[3:5]) * 60 if zone[3:5].isdigit() else 0)
+        epoch -= offset if zone[0] == "+" else -offset
+    return epoch_to_iso(epoch) or None
+
+
+# ── batches ──────────────────────────────────────────────────────────
+def epochs_to_iso(epochs: Iterable[Union[int, float]]) -> list[str]:
+    """:func:`epoch_to_iso` over a sequence (e.g. an ``array('q')`` column)."""
+    return list(map(epoch_to_iso, epochs))
+
+
+def isos_to_epochs(values: Iterable[Optional[str]], default: int = 0) -> array:
+    """:func:`iso_to_epoch` over a sequence, as an ``array('q')``."""
+    return array("q", (iso_to_epoch(value, default) for value in values))
+
+
+def filetimes_to_iso(filetimes: Iterable[int]) -> list[str]:
+    """:func:`filetime_to_iso` over a sequence."""
+    return list(map(filetime_to_iso, filetimes))
+
+
+def clear_cache() -> None:
+    """Drop the memoized conversions (they hold up to 65,536 entries each)."""
+    _date_prefix.cache_clear()
+    epoch_us_to_iso.cache_clear()
+    iso_to_epoch_us.cache_clear()
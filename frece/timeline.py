@@ -8,16 +8,30 @@ Aggregates MAC (Modified/Accessed/Created) times from:
   - custody.db event timestamps
 
 Outputs sorted chronological event streams for triage and court presentation.
+Sources are parsed lazily and sorted externally: once the buffered events
+exceed a memory budget they are spilled to disk as sorted runs and k-way
+merged, and the result is written to the output one event at a time.
 """
 
 import csv
+import fnmatch
+import heapq
 import io
 import json
 import sqlite3
-from dataclasses import asdict, dataclass
+import sys
+import tempfile
+from array import array
+from dataclasses import asdict, astuple, dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO, Union
+
+from frece.custody import iter_custody_events
+from frece.hash_cache import hash_path
+from frece.timecodec import epoch_to_iso, iso_to_epoch, iso_to_epoch_us
+
+DEFAULT_MEMORY_MB = 256  # events buffered before a sorted run is spilled to disk
 
 
 @dataclass
@@ -35,31 +49,15 @@ class TimelineEvent:
     notes: str               # extra context
 
 
-def _epoch_to_iso(epoch: int) -> str:
-    """Convert a Unix epoch int to a UTC ISO-8601 string."""
-    if epoch == 0:
-        return ""
-    try:
-        return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
-    except (OSError, OverflowError, ValueError):
-        return ""
-
-
-def _iso_to_epoch(iso: str) -> int:
-    """Parse an ISO-8601 string to Unix epoch seconds."""
-    if not iso:
-        return 0
-    iso = iso.rstrip("Z")
-    for fmt in (
-        "%Y-%m-%dT%H:%M:%S.%f",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M",
-    ):
-        try:
-            return int(datetime.strptime(iso, fmt).replace(tzinfo=timezone.utc).timestamp())
-        except ValueError:
-            continue
-    return 0
+_FIELDS = [f.name for f in fields(TimelineEvent)]
+_INSERT_EVENT = (
+    f"INSERT INTO events (source_id, seq, {', '.join(_FIELDS)}) "
+    f"VALUES ({', '.join('?' * (len(_FIELDS) + 2))})"
+)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
 # ──────────────────────────────────────────────────────────────────────────────────────────
@@ -102,7 +100,7 @@ def _events_from_mactime_line(line: str) -> list[TimelineEvent]:
             continue
         if epoch == 0:
             continue
-        iso = _epoch_to_iso(epoch)
+        iso = epoch_to_iso(epoch)
         if not iso:
             continue
         events.append(
@@ -132,7 +130,7 @@ def _events_from_recovery_manifest(manifest_path: Path) -> list[TimelineEvent]:
     for rec in data.get("recovered_files", []):
         # Recovery timestamp
         ts = rec.get("timestamp") or rec.get("recovery_timestamp") or ""
-        epoch = _iso_to_epoch(ts)
+        epoch = iso_to_epoch(ts)
         if ts:
             events.append(
                 TimelineEvent(
@@ -151,7 +149,7 @@ def _events_from_recovery_manifest(manifest_path: Path) -> list[TimelineEvent]:
         for mac_key in ("mtime", "atime", "ctime", "crtime"):
             epoch_val = rec.get(mac_key, 0)
             if epoch_val:
-                iso = _epoch_to_iso(int(epoch_val))
+                iso = epoch_to_iso(int(epoch_val))
                 if iso:
                     events.append(
                         TimelineEvent(
@@ -177,7 +175,7 @@ def _events_from_carve_manifest(manifest_path: Path) -> list[TimelineEvent]:
         return []
 
     ts = data.get("timestamp", "")
-    epoch = _iso_to_epoch(ts)
+    epoch = iso_to_epoch(ts)
     events: list[TimelineEvent] = []
 
     for carved in data.get("carved_files", []):
@@ -200,58 +198,541 @@ def _events_from_carve_manifest(manifest_path: Path) -> list[TimelineEvent]:
     return events
 
 
+def _iter_events_from_custody_db(db_path: Path) -> Iterator[TimelineEvent]:
+    """Yield timeline events from a FRECE custody database, page by page."""
+    if not db_path.exists():
+        return
+
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return
+    try:
+        for entry in iter_custody_events(conn):
+            details = entry.details if isinstance(entry.details, dict) else {}
+            notes = f"operator={entry.operator} evidence_id={entry.evidence_id}"
+            if details:
+                notes += " " + " ".join(f"{k}={v}" for k, v in list(details.items())[:3])
+            yield TimelineEvent(
+                timestamp=entry.timestamp,
+                timestamp_epoch=entry.timestamp_us // 1_000_000,
+                event_source="custody",
+                event_type=entry.event_type.lower(),
+                artifact_path=entry.evidence_id,
+                artifact_type="custody_event",
+                size_bytes=0,
+                inode=None,
+                notes=notes,
+            )
+    except sqlite3.Error:
+        return
+    finally:
+        conn.close()
+
+
 def _events_from_custody_db(  # noqa: E501
     db_path: Path,
     secret_key: Optional[bytes] = None,
 ) -> list[TimelineEvent]:
     """Extract timeline events from a FRECE custody database."""
-    if not db_path.exists():
-        return []
+    return list(_iter_events_from_custody_db(db_path))
 
-    events: list[TimelineEvent] = []
+
+def _iter_mactime_file(mactime_file: Path) -> Iterator[TimelineEvent]:
+    """Parse a body file line by line instead of reading it whole."""
+    with mactime_file.open(encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            yield from _events_from_mactime_line(line)
+
+
+# ──────────────────────────────────────────────────────────────────────────────────────────
+# Columnar event batches
+# ──────────────────────────────────────────────────────────────────────────────────────────
+
+_NONE = -(2**63)  # inode sentinel for None
+_DERIVED = -1  # timestamp column: the ISO string is rebuilt from the epoch
+_STRING_OVERHEAD = 104  # dict slot, list pointer and hash of one interned string
+
+
+class _StringTable:
+    """Append-only intern table: each distinct string is stored once."""
+
+    __slots__ = ("strings", "_index", "nbytes")
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._index: dict[str, int] = {}
+        self.nbytes = 0
+
+    def code(self, value: str) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.strings)
+            self.strings.append(value)
+            self.nbytes += sys.getsizeof(value) + _STRING_OVERHEAD
+        return code
+
+
+class EventBatch:
+    """Timeline events stored column by column.
+
+    A list of :class:`TimelineEvent` objects costs several hundred bytes per
+    event, and a mactime line yields up to four events that repeat the same
+    path and size. A batch keeps epochs, sizes and inodes in ``array('q')``
+    columns, paths, notes and non-canonical timestamps as indexes into one
+    interned string table, and source, type and artifact type as 16-bit codes.
+    A timestamp that equals ``epoch_to_iso(epoch)`` (every filesystem event)
+    is not stored at all. A large timeline takes about a tenth of the memory.
+
+    Indexing and iteration return ordinary :class:`TimelineEvent` objects, so
+    the exporters accept a batch in place of a list.
+    """
+
+    __slots__ = (
+        "epochs", "sizes", "inodes", "timestamps", "paths", "notes",
+        "sources", "types", "artifact_types", "_strings", "_codes",
+    )
+    _COLUMNS = (
+        "epochs", "sizes", "inodes", "timestamps", "paths", "notes",
+        "sources", "types", "artifact_types",
+    )
+
+    def __init__(self, events: Iterable[TimelineEvent] = ()) -> None:
+        self.epochs = array("q")
+        self.sizes = array("q")
+        self.inodes = array("q")
+        self.timestamps = array("q")
+        self.paths = array("I")
+        self.notes = array("I")
+        self.sources = array("H")
+        self.types = array("H")
+        self.artifact_types = array("H")
+        self._strings = _StringTable()
+        self._codes = _StringTable()
+        self.extend(events)
+
+    def append(self, event: TimelineEvent) -> None:
+        epoch = event.timestamp_epoch
+        self.epochs.append(epoch)
+        self.sizes.append(event.size_bytes or 0)
+        self.inodes.append(_NONE if event.inode is None else event.inode)
+        self.timestamps.append(
+            _DERIVED if event.timestamp == epoch_to_iso(epoch)
+            else self._strings.code(event.timestamp)
+        )
+        self.paths.append(self._strings.code(event.artifact_path))
+        self.notes.append(self._strings.code(event.notes))
+        self.sources.append(self._codes.code(event.event_source))
+        self.types.append(self._codes.code(event.event_type))
+        self.artifact_types.append(self._codes.code(event.artifact_type))
+
+    def extend(self, events: Iterable[TimelineEvent]) -> None:
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def __getitem__(self, i: int) -> TimelineEvent:
+        strings, codes = self._strings.strings, self._codes.strings
+        epoch, size, inode, ts = self.epochs[i], self.sizes[i], self.inodes[i], self.timestamps[i]
+        return TimelineEvent(
+            timestamp=epoch_to_iso(epoch) if ts == _DERIVED else strings[ts],
+            timestamp_epoch=epoch,
+            event_source=codes[self.sources[i]],
+            event_type=codes[self.types[i]],
+            artifact_path=strings[self.paths[i]],
+            artifact_type=codes[self.artifact_types[i]],
+            size_bytes=size,
+            inode=None if inode == _NONE else inode,
+            notes=strings[self.notes[i]],
+        )
+
+    def __iter__(self) -> Iterator[TimelineEvent]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def argsort(self) -> list[int]:
+        """Row order by ``(epoch, event_source)``; ties keep insertion order."""
+        codes = self._codes.strings
+        rank = [0] * len(codes)
+        for position, code in enumerate(sorted(range(len(codes)), key=codes.__getitem__)):
+            rank[code] = position
+        shift = len(codes).bit_length()
+        epochs, sources = self.epochs, self.sources
+        return sorted(range(len(self)), key=lambda i: (epochs[i] << shift) | rank[sources[i]])
+
+    def sort(self) -> None:
+        """Reorder every column in place by :meth:`argsort`."""
+        order = self.argsort()
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, map(column.__getitem__, order)))
+
+    def nbytes(self) -> int:
+        """Approximate resident size of the columns and string tables."""
+        columns: int = sum(len(getattr(self, name)) * getattr(self, name).itemsize
+                           for name in self._COLUMNS)
+        return columns + self._strings.nbytes + self._codes.nbytes
+
+
+# ──────────────────────────────────────────────────────────────────────────────────────────
+# External-memory sort
+# ──────────────────────────────────────────────────────────────────────────────────────────
+
+def _sort_key(event: TimelineEvent) -> tuple[int, str]:
+    return (event.timestamp_epoch, event.event_source)
+
+
+def _spill_run(batch: EventBatch, directory: Path, number: int) -> Path:
+    batch.sort()
+    path = directory / f"run-{number:05d}.jsonl"
+    with path.open("w", encoding="utf-8") as handle:
+        for event in batch:
+            handle.write(json.dumps(astuple(event), ensure_ascii=False))
+            handle.write("\n")
+    return path
+
+
+def _read_run(path: Path) -> Iterator[TimelineEvent]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            yield TimelineEvent(*json.loads(line))
+
+
+def sort_events(
+    events: Iterable[TimelineEvent],
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    spill_dir: Optional[Path] = None,
+) -> Iterator[TimelineEvent]:
+    """Yield *events* sorted oldest → newest using at most about *memory_mb*.
+
+    Events are buffered in an :class:`EventBatch` until its
+    :meth:`~EventBatch.nbytes` reaches the budget, then sorted and
+    written to a temporary run file (under *spill_dir*, default the system
+    temp dir). The runs are k-way merged with :func:`heapq.merge`. Ties keep
+    their input order, so the result equals a stable in-memory sort. Run
+    files are deleted once the merge finishes or the generator is closed.
+    """
+    budget = max(memory_mb, 1) * 1024 * 1024
+    buffer = EventBatch()
+    with tempfile.TemporaryDirectory(prefix="frece-timeline-", dir=spill_dir) as tmp:
+        runs: list[Path] = []
+        for event in events:
+            buffer.append(event)
+            if buffer.nbytes() >= budget:
+                runs.append(_spill_run(buffer, Path(tmp), len(runs)))
+                buffer = EventBatch()
+        buffer.sort()
+        if not runs:
+            yield from buffer
+            return
+        streams = [_read_run(run) for run in runs]
+        streams.append(iter(buffer))
+        yield from heapq.merge(*streams, key=_sort_key)
+
+
+# ──────────────────────────────────────────────────────────────────────────────────────────
+# Sources and the persistent case index
+# ──────────────────────────────────────────────────────────────────────────────────────────
+
+# Discovery order doubles as the tie-break order of equal (time, source) events.
+_SOURCE_KINDS = ("mactime", "recovery", "carve", "custody")
+_SOURCE_PARSERS: dict[str, Callable[[Path], Iterable[TimelineEvent]]] = {
+    "mactime": _iter_mactime_file,
+    "recovery": _events_from_recovery_manifest,
+    "carve": _events_from_carve_manifest,
+    "custody": _iter_events_from_custody_db,
+}
+_INDEX_BATCH = 5000
+
+
+def _discover_sources(
+    case_dir: Path, mactime_file: Optional[Path] = None
+) -> list[tuple[str, Path]]:
+    sources: list[tuple[str, Path]] = []
+    if mactime_file and mactime_file.exists():
+        sources.append(("mactime", mactime_file))
+    sources += [("recovery", p) for p in sorted(case_dir.rglob("recovery_manifest.json"))]
+    sources += [("carve", p) for p in sorted(case_dir.rglob("carve_manifest.json"))]
+    if (case_dir / "custody.db").exists():
+        sources.append(("custody", case_dir / "custody.db"))
+    return sources
+
+
+def _source_fingerprint(kind: str, path: Path) -> str:
+    """Cheap change detector: size and mtime, or the chain head for custody.db.
+
+    custody.db runs in WAL mode, so its own mtime does not move on every
+    commit; its row count and newest entry hash do.
+    """
+    if kind == "custody":
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            count, head = conn.execute(
+                "SELECT COUNT(*), (SELECT entry_hash FROM custody_log ORDER BY id DESC LIMIT 1) "
+                "FROM custody_log"
+            ).fetchone()
+        finally:
+            conn.close()
+        return f"custody:{count}:{head}"
+    st = path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def parse_when(value: Union[str, int, float, None]) -> Optional[int]:
+    """Epoch seconds for an ISO-8601 timestamp or epoch number (None passes through)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if value.lstrip("-").isdigit():
+        return int(value)
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT event_type, evidence_id, operator, timestamp, details"
-            " FROM custody_log ORDER BY id"
+        return iso_to_epoch_us(value) // 1_000_000
+    except ValueError as exc:
+        raise ValueError(f"invalid time {value!r}; use ISO-8601 or epoch seconds") from exc
+
+
+def filter_events(
+    events: Iterable[TimelineEvent],
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    sources: Optional[Iterable[str]] = None,
+    types: Optional[Iterable[str]] = None,
+    path_glob: Optional[str] = None,
+) -> Iterator[TimelineEvent]:
+    """The same filters as :meth:`TimelineIndex.query`, over an event stream."""
+    sources = set(sources) if sources else None
+    types = set(types) if types else None
+    for event in events:
+        if since is not None and event.timestamp_epoch < since:
+            continue
+        if until is not None and event.timestamp_epoch >= until:
+            continue
+        if sources is not None and event.event_source not in sources:
+            continue
+        if types is not None and event.event_type not in types:
+            continue
+        if path_glob is not None and not fnmatch.fnmatchcase(event.artifact_path, path_glob):
+            continue
+        yield event
+
+
+def default_index_path(case_dir: Path) -> Path:
+    return Path(case_dir) / "timeline.db"
+
+
+class TimelineIndex:
+    """Per-case SQLite store of parsed timeline events (``<case>/timeline.db``).
+
+    :meth:`refresh` re-parses only sources that are new or changed. A source
+    whose size or mtime moved but whose SHA-256 did not (a touched file) is
+    not re-parsed. Sources that disappeared are dropped. Each source is
+    replaced in its own transaction. Only the body file passed to the current
+    call with ``--mactime-file`` is indexed. :meth:`query` answers
+    time-window, source, type and path-glob filters from the
+    ``(timestamp_epoch)`` indexes, without touching the sources.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL UNIQUE,
+                rank INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                sha256 TEXT,
+                events INTEGER NOT NULL,
+                indexed TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                source_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                timestamp_epoch INTEGER NOT NULL,
+                event_source TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                artifact_path TEXT NOT NULL,
+                artifact_type TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                inode INTEGER,
+                notes TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_time
+                ON events (timestamp_epoch, event_source);
+            CREATE INDEX IF NOT EXISTS idx_events_source_time
+                ON events (event_source, timestamp_epoch);
+            CREATE INDEX IF NOT EXISTS idx_events_type_time
+                ON events (event_type, timestamp_epoch);
+            CREATE INDEX IF NOT EXISTS idx_events_owner ON events (source_id);
+            """
         )
-        for event_type, evidence_id, operator, timestamp, details_json in cursor.fetchall():
-            epoch = _iso_to_epoch(timestamp)
-            try:
-                details = json.loads(details_json) if details_json else {}
-            except Exception:
-                details = {}
-            notes = f"operator={operator} evidence_id={evidence_id}"
-            if details:
-                notes += " " + " ".join(f"{k}={v}" for k, v in list(details.items())[:3])
-            events.append(
-                TimelineEvent(
-                    timestamp=timestamp,
-                    timestamp_epoch=epoch,
-                    event_source="custody",
-                    event_type=event_type.lower(),
-                    artifact_path=evidence_id,
-                    artifact_type="custody_event",
-                    size_bytes=0,
-                    inode=None,
-                    notes=notes,
-                )
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "TimelineIndex":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def refresh(self, case_dir: Path, mactime_file: Optional[Path] = None) -> dict:
+        """Bring the index up to date with *case_dir*; return what changed."""
+        conn = self._connection()
+        case_dir = Path(case_dir).resolve()
+        mactime_file = Path(mactime_file).resolve() if mactime_file else None
+        known = {
+            path: (source_id, kind, fingerprint, digest)
+            for source_id, kind, path, fingerprint, digest in conn.execute(
+                "SELECT id, kind, path, fingerprint, sha256 FROM sources"
+            )
+        }
+        # Only the body file passed to this call is indexed; one indexed by an
+        # earlier call is dropped, so results match a --no-index build.
+        sources = _discover_sources(case_dir, mactime_file)
+
+        stats = {"sources": len(sources), "reindexed": 0, "unchanged": 0, "removed": 0}
+        current = set()
+        for kind, path in sources:
+            key = str(path)
+            current.add(key)
+            fingerprint = _source_fingerprint(kind, path)
+            previous = known.get(key)
+            if previous and previous[2] == fingerprint:
+                stats["unchanged"] += 1
+                continue
+            digest = hash_path(path)[0]["sha256"] if kind != "custody" else None
+            if previous and digest is not None and previous[3] == digest:
+                with conn:
+                    conn.execute(
+                        "UPDATE sources SET fingerprint = ? WHERE id = ?",
+                        (fingerprint, previous[0]),
+                    )
+                stats["unchanged"] += 1
+                continue
+            self._index_source(conn, kind, path, fingerprint, digest, previous)
+            stats["reindexed"] += 1
+
+        for key, (source_id, _, _, _) in known.items():
+            if key not in current:
+                with conn:
+                    conn.execute("DELETE FROM events WHERE source_id = ?", (source_id,))
+                    conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+                stats["removed"] += 1
+        return stats
+
+    def _index_source(self, conn, kind, path, fingerprint, digest, previous) -> None:
+        with conn:
+            if previous:
+                source_id = previous[0]
+                conn.execute("DELETE FROM events WHERE source_id = ?", (source_id,))
+            else:
+                source_id = conn.execute(
+                    "INSERT INTO sources (kind, path, rank, fingerprint, events, indexed) "
+                    "VALUES (?, ?, ?, '', 0, '')",
+                    (kind, str(path), _SOURCE_KINDS.index(kind)),
+                ).lastrowid
+            count = 0
+            batch: list[tuple] = []
+            for event in _SOURCE_PARSERS[kind](path):
+                batch.append((source_id, count, *astuple(event)))
+                count += 1
+                if len(batch) >= _INDEX_BATCH:
+                    conn.executemany(_INSERT_EVENT, batch)
+                    batch.clear()
+            conn.executemany(_INSERT_EVENT, batch)
+            conn.execute(
+                "UPDATE sources SET fingerprint = ?, sha256 = ?, events = ?, indexed = ? "
+                "WHERE id = ?",
+                (fingerprint, digest, count, _utc_now_iso(), source_id),
             )
-        conn.close()
-    except Exception:
-        pass
 
-    return events
+    def query(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        sources: Optional[Iterable[str]] = None,
+        types: Optional[Iterable[str]] = None,
+        path_glob: Optional[str] = None,
+    ) -> Iterator[TimelineEvent]:
+        """Sorted events in ``since <= epoch < until`` matching every filter.
+
+        *sources* and *types* are sets of accepted ``event_source`` /
+        ``event_type`` values; *path_glob* is a case-sensitive glob on
+        ``artifact_path``. Rows are streamed from the database.
+        """
+        clauses: list[str] = []
+        params: list = []
+        if since is not None:
+            clauses.append("e.timestamp_epoch >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("e.timestamp_epoch < ?")
+            params.append(until)
+        for column, values in (("event_source", sources), ("event_type", types)):
+            if values:
+                values = list(values)
+                clauses.append(f"e.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if path_glob is not None:
+            clauses.append("e.artifact_path GLOB ?")
+            params.append(path_glob)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._connection().execute(
+            f"SELECT {', '.join('e.' + name for name in _FIELDS)} "
+            f"FROM events e JOIN sources s ON s.id = e.source_id {where} "
+            "ORDER BY e.timestamp_epoch, e.event_source, s.rank, s.path, e.seq",
+            params,
+        )
+        for row in cursor:
+            yield TimelineEvent(*row)
 
 
 # ──────────────────────────────────────────────────────────────────────────────────────────
 # Public API
 # ──────────────────────────────────────────────────────────────────────────────────────────
 
+def iter_timeline_events(
+    case_dir: Path,
+    mactime_file: Optional[Path] = None,
+) -> Iterator[TimelineEvent]:
+    """Yield the (unsorted) events of every timeline source, lazily."""
+    for kind, path in _discover_sources(case_dir, mactime_file):
+        yield from _SOURCE_PARSERS[kind](path)
+
+
+def stream_timeline(
+    case_dir: Path,
+    mactime_file: Optional[Path] = None,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    spill_dir: Optional[Path] = None,
+) -> Iterator[TimelineEvent]:
+    """Sorted timeline for a case, produced with bounded memory (see :func:`sort_events`)."""
+    return sort_events(iter_timeline_events(case_dir, mactime_file), memory_mb, spill_dir)
+
+
 def build_timeline(
     case_dir: Path,
     mactime_file: Optional[Path] = None,
+    use_index: bool = True,
 ) -> list[TimelineEvent]:
     """Synthesise a sorted timeline for a case directory.
 
@@ -259,70 +740,89 @@ def build_timeline(
     custody.db inside case_dir.  If a mactime_file (from fls -m output) is
     provided it is merged in as well.
 
-    Returns events sorted oldest → newest.
+    With *use_index* the case's :class:`TimelineIndex` is refreshed and
+    read; if it cannot be written (read-only case) the sources are parsed
+    directly. Returns events sorted oldest → newest. Use
+    :meth:`TimelineIndex.query` or :func:`stream_timeline` with
+    :func:`write_events` for timelines too large to hold in memory.
     """
-    events: list[TimelineEvent] = []
-
-    # Mactime body file
-    if mactime_file and mactime_file.exists():
-        for line in mactime_file.read_text(encoding="utf-8", errors="replace").splitlines():
-            events.extend(_events_from_mactime_line(line))
-
-    # Recovery manifests
-    for manifest_path in sorted(case_dir.rglob("recovery_manifest.json")):
-        events.extend(_events_from_recovery_manifest(manifest_path))
-
-    # Carve manifests
-    for manifest_path in sorted(case_dir.rglob("carve_manifest.json")):
-        events.extend(_events_from_carve_manifest(manifest_path))
+    if use_index:
+        try:
+            with TimelineIndex(default_index_path(case_dir)) as index:
+                index.refresh(case_dir, mactime_file)
+                return list(index.query())
+        except (OSError, sqlite3.OperationalError):
+            pass
+    return list(stream_timeline(case_dir, mactime_file))
 
-    # Custody DB
-    db_path = case_dir / "custody.db"
-    events.extend(_events_from_custody_db(db_path))
 
-    # Sort by epoch, then by source for stability
-    events.sort(key=lambda e: (e.timestamp_epoch, e.event_source))
+def write_events(events: Iterable[TimelineEvent], handle: TextIO, fmt: str = "json") -> int:
+    """Write *events* to *handle* as ``json``, ``csv`` or ``text``, one at a time.
 
-    return events
+    Returns the number of events written. The output is identical to
+    :func:`events_to_json`, :func:`events_to_csv` and :func:`events_to_text`.
+    """
+    count = 0
+    if fmt == "json":
+        for event in events:
+            item = json.dumps(asdict(event), indent=2, ensure_ascii=False)
+            handle.write(("[\n  " if count == 0 else ",\n  ") + item.replace("\n", "\n  "))
+            count += 1
+        handle.write("\n]" if count else "[]")
+    elif fmt == "csv":
+        writer = csv.writer(handle)
+        for event in events:
+            if count == 0:
+                writer.writerow(_FIELDS)
+            writer.writerow(astuple(event))
+            count += 1
+    elif fmt == "text":
+        for event in events:
+            if count == 0:
+                handle.write(_TEXT_HEADER)
+            handle.write(_text_line(event))
+            count += 1
+        if count == 0:
+            handle.write("No timeline events found.\n")
+    else:
+        raise ValueError(f"unknown timeline format: {fmt}")
+    return count
+
+
+def _render(events: Iterable[TimelineEvent], fmt: str) -> str:
+    buf = io.StringIO()
+    write_events(events, buf, fmt)
+    return buf.getvalue()
 
 
-def events_to_json(events: list[TimelineEvent]) -> str:
+def events_to_json(events: Iterable[TimelineEvent]) -> str:
     """Serialise timeline events to a JSON string."""
-    return json.dumps(
-        [asdict(e) for e in events],
-        indent=2,
-        ensure_ascii=False,
-    )
+    return _render(events, "json")
 
 
-def events_to_csv(events: list[TimelineEvent]) -> str:
+def events_to_csv(events: Iterable[TimelineEvent]) -> str:
     """Serialise timeline events to a CSV string."""
-    buf = io.StringIO()
-    if not events:
-        return ""
-    fieldnames = list(asdict(events[0]).keys())
-    writer = csv.DictWriter(buf, fieldnames=fieldnames)
-    writer.writeheader()
-    for event in events:
-        writer.writerow(asdict(event))
-    return buf.getvalue()
+    return _render(events, "csv")
 
 
-def events_to_text(events: list[TimelineEvent]) -> str:
+def events_to_text(events: Iterable[TimelineEvent]) -> str:
     """Human-readable table suitable for terminal output."""
-    if not events:
-        return "No timeline events found.\n"
-    lines = [
-        f"{'TIMESTAMP':<28} {'SOURCE':<12} {'TYPE':<16} {'ARTIFACT':<40} {'CATEGORY':<12} SIZE",
-        "-" * 120,
-    ]
-    for e in events:
-        ts = e.timestamp[:26] if e.timestamp else "(no time)"
-        artifact = e.artifact_path
-        if len(artifact) > 40:
-            artifact = "…" + artifact[-38:]
-        lines.append(
-            f"{ts:<28} {e.event_source:<12} {e.event_type:<16} "
-            f"{artifact:<40} {e.artifact_type:<12} {e.size_bytes}"
-        )
-    return "\n".join(lines) + "\n"
+    return _render(events, "text")
+
+
+_TEXT_HEADER = (
+    f"{'TIMESTAMP':<28} {'SOURCE':<12} {'TYPE':<16} {'ARTIFACT':<40} {'CATEGORY':<12} SIZE\n"
+    + "-" * 120
+    + "\n"
+)
+
+
+def _text_line(e: TimelineEvent) -> str:
+    ts = e.timestamp[:26] if e.timestamp else "(no time)"
+    artifact = e.artifact_path
+    if len(artifact) > 40:
+        artifact = "…" + artifact[-38:]
+    return (
+        f"{ts:<28} {e.event_source:<12} {e.event_type:<16} "
+        f"{artifact:<40} {e.artifact_type:<12} {e.size_bytes}\n"
+    )
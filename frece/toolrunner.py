@@ -0,0 +1,447 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Shared asyncio runner for external tools (Sleuth Kit, fsstat, sandboxed commands).
+
+Every child process FRECE starts goes through one :class:`ToolRunner`. The
+runner owns a private event loop on a daemon thread, so synchronous callers,
+including generators that stream ``fls`` output, can use it from any thread.
+
+* The number of live child processes is capped process-wide
+  (``max_tool_processes`` in ``config.toml``; default: CPU count).
+* stdout is streamed in chunks with back-pressure rather than buffered.
+* Each call has its own timeout, enforced by killing the child.
+* Closing a stream early kills its child (cancellation).
+* Per-tool metrics are kept: spawn latency, time queued for a slot, run
+  time and exit status.
+
+Failures surface in subprocess terms so each call site keeps its own
+messages. A missing tool raises ``FileNotFoundError``, any other spawn
+failure raises ``OSError``, and a timeout raises
+``subprocess.TimeoutExpired``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import codecs
+import concurrent.futures
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Coroutine, Iterator, Optional
+
+_READ_CHUNK = 64 * 1024
+_STREAM_DEPTH = 16  # stdout chunks buffered ahead of a slow consumer
+_MIN_PROCESSES = 2  # a streaming fls walk plus one icat must always fit
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def default_process_limit() -> int:
+    return max(_MIN_PROCESSES, os.cpu_count() or 1)
+
+
+@dataclass
+class ToolStats:
+    """Counters for one tool, keyed by executable basename."""
+
+    spawned: int = 0
+    not_found: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    exit_codes: Counter = field(default_factory=Counter)
+    spawn_latency_total: float = 0.0
+    spawn_latency_max: float = 0.0
+    queue_wait_total: float = 0.0
+    run_time_total: float = 0.0
+
+    def as_dict(self) -> dict:
+        spawned = self.spawned or 1
+        return {
+            "spawned": self.spawned,
+            "not_found": self.not_found,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "exit_codes": {str(code): n for code, n in sorted(self.exit_codes.items())},
+            "spawn_latency_ms_avg": round(self.spawn_latency_total / spawned * 1000, 3),
+            "spawn_latency_ms_max": round(self.spawn_latency_max * 1000, 3),
+            "queue_wait_ms_total": round(self.queue_wait_total * 1000, 3),
+            "run_time_s_total": round(self.run_time_total, 3),
+        }
+
+
+class _Watchdog:
+    """Kill a child once its timeout elapses (0 = unlimited)."""
+
+    def __init__(self, proc: asyncio.subprocess.Process, timeout: float) -> None:
+        self.proc = proc
+        self.fired = False
+        self._handle = (
+            asyncio.get_running_loop().call_later(timeout, self._fire) if timeout else None
+        )
+
+    def _fire(self) -> None:
+        self.fired = True
+        _kill(self.proc)
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+
+
+def _kill(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+class ToolStream:
+    """Text lines of a running tool's stdout.
+
+    Iterate for lines, then read :attr:`returncode`, :attr:`stderr` and
+    :attr:`timed_out`. Use it as a context manager so an abandoned iteration
+    kills the child.
+    """
+
+    def __init__(self, runner: "ToolRunner", command: list[str], errors: str) -> None:
+        self.command = command
+        self.returncode: Optional[int] = None
+        self.stderr = ""
+        self.timed_out = False
+        self._runner = runner
+        self._errors = errors
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_DEPTH)
+        self._done = threading.Event()
+        self._pump: Optional[concurrent.futures.Future] = None
+
+    def __iter__(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors=self._errors)
+        pending = ""
+        while True:
+            chunk = self._runner._call(self._queue.get())
+            if chunk is None:
+                break
+            lines = (pending + decoder.decode(chunk)).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+        self._done.wait()
+        if self._pump is not None:
+            self._pump.result()
+
+    def close(self) -> None:
+        """Kill the child if it is still running and wait until it is reaped."""
+        if self._pump is not None and not self._pump.done():
+            self._pump.cancel()
+        self._done.wait()
+
+    def __enter__(self) -> "ToolStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ToolRunner:
+    """Run external tools on a private event loop under a global process cap."""
+
+    def __init__(self, max_processes: int = 0) -> None:
+        self._limit = max(_MIN_PROCESSES, max_processes or default_process_limit())
+        self._live = 0
+        self._peak = 0
+        self._slots = asyncio.Condition()
+        self._stats: dict[str, ToolStats] = {}
+        self._stats_lock = threading.Lock()
+        self._procs: set[asyncio.subprocess.Process] = set()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="frece-toolrunner", daemon=True
+        )
+        self._thread.start()
+
+    # ── public API ───────────────────────────────────────────────────
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def set_limit(self, max_processes: int) -> None:
+        """Change the process cap; 0 restores the CPU-count default."""
+        self._call(self._set_limit(max(_MIN_PROCESSES, max_processes or default_process_limit())))
+
+    def run(
+        self,
+        command: list[str],
+        timeout: float = 0,
+        input: Optional[bytes] = None,
+        text: bool = True,
+        errors: str = "strict",
+    ) -> subprocess.CompletedProcess:
+        """Run *command* to completion and capture stdout and stderr."""
+        result: subprocess.CompletedProcess = self._call(
+            self._run(command, subprocess.PIPE, timeout, input, text, errors)
+        )
+        return result
+
+    def run_to_file(
+        self, command: list[str], handle: IO[bytes], timeout: float = 0
+    ) -> subprocess.CompletedProcess:
+        """Run *command* with stdout written straight to the open file *handle*.
+
+        ``stdout`` of the result is ``None``; ``stderr`` is bytes.
+        """
+        result: subprocess.CompletedProcess = self._call(
+            self._run(command, handle, timeout, None, False, "strict")
+        )
+        return result
+
+    def stream(
+        self, command: list[str], timeout: float = 0, errors: str = "strict"
+    ) -> ToolStream:
+        """Start *command* and return a :class:`ToolStream` over its stdout."""
+        stream = ToolStream(self, command, errors)
+        proc, spawned = self._call(
+            self._start(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        )
+        stream._pump = asyncio.run_coroutine_threadsafe(
+            self._pump_stream(stream, proc, spawned, timeout), self._loop
+        )
+        return stream
+
+    def metrics(self) -> dict:
+        """Snapshot of process-cap usage and per-tool counters."""
+        with self._stats_lock:
+            tools = {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
+        return {"limit": self._limit, "live": self._live, "peak": self._peak, "tools": tools}
+
+    def close(self) -> None:
+        """Kill any live children and stop the loop thread."""
+        if not self._loop.is_running():
+            return
+
+        async def _kill_all() -> None:
+            for proc in list(self._procs):
+                _kill(proc)
+
+        try:
+            self._call(_kill_all())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    # ── loop-side implementation ─────────────────────────────────────
+    def _call(self, coro: Coroutine) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()  # e.g. KeyboardInterrupt: the task kills its child
+            raise
+
+    async def _spawn(self, command: list[str], **kwargs: Any) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(*command, **kwargs)
+
+    async def _set_limit(self, limit: int) -> None:
+        async with self._slots:
+            self._limit = limit
+            self._slots.notify_all()
+
+    def _tool_stats(self, command: list[str]) -> ToolStats:
+        name = Path(command[0]).name
+        with self._stats_lock:
+            return self._stats.setdefault(name, ToolStats())
+
+    async def _start(
+        self, command: list[str], **kwargs: Any
+    ) -> tuple[asyncio.subprocess.Process, float]:
+        stats = self._tool_stats(command)
+        queued = time.perf_counter()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._live < self._limit)
+            self._live += 1
+            self._peak = max(self._peak, self._live)
+        started = time.perf_counter()
+        kwargs.setdefault("stdin", subprocess.DEVNULL)
+        try:
+            proc = await self._spawn(command, **kwargs)
+        except BaseException as exc:
+            if isinstance(exc, FileNotFoundError):
+                with self._stats_lock:
+                    stats.not_found += 1
+            await self._release()
+            raise
+        spawned = time.perf_counter()
+        self._procs.add(proc)
+        with self._stats_lock:
+            stats.spawned += 1
+            stats.queue_wait_total += started - queued
+            stats.spawn_latency_total += spawned - started
+            stats.spawn_latency_max = max(stats.spawn_latency_max, spawned - started)
+        return proc, spawned
+
+    async def _release(self) -> None:
+        async with self._slots:
+            self._live -= 1
+            self._slots.notify()
+
+    async def _finish(
+        self,
+        command: list[str],
+        proc: asyncio.subprocess.Process,
+        spawned: float,
+        timed_out: bool,
+        cancelled: bool,
+    ) -> None:
+        runtime = time.perf_counter() - spawned
+        self._procs.discard(proc)
+        stats = self._tool_stats(command)
+        with self._stats_lock:
+            stats.exit_codes[proc.returncode] += 1
+            stats.run_time_total += runtime
+            stats.timeouts += int(timed_out)
+            stats.cancelled += int(cancelled)
+        await self._release()
+        logger.debug(
+            json.dumps(
+                {
+                    "event": "TOOL_EXIT",
+                    "tool": Path(command[0]).name,
+                    "returncode": proc.returncode,
+                    "timed_out": timed_out,
+                    "cancelled": cancelled,
+                    "run_time_s": round(runtime, 3),
+                    "timestamp": _utc_now_iso(),
+                }
+            )
+        )
+
+    async def _run(
+        self,
+        command: list[str],
+        stdout: Any,
+        timeout: float,
+        input: Optional[bytes],
+        text: bool,
+        errors: str,
+    ) -> subprocess.CompletedProcess:
+        proc, spawned = await self._start(
+            command,
+            stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+            stdout=stdout,
+            stderr=subprocess.PIPE,
+        )
+        watchdog = _Watchdog(proc, timeout)
+        cancelled = False
+        try:
+            out, err = await proc.communicate(input)
+        except asyncio.CancelledError:
+            cancelled = True
+            _kill(proc)
+            await proc.wait()
+            raise
+        finally:
+            watchdog.cancel()
+            await self._finish(command, proc, spawned, watchdog.fired, cancelled)
+
+        returncode = await proc.wait()  # already reaped; typed as int
+        if text:
+            out_text = out.decode("utf-8", errors) if out is not None else None
+            err_text = err.decode("utf-8", errors)
+            if watchdog.fired:
+                raise subprocess.TimeoutExpired(command, timeout, output=out_text, stderr=err_text)
+            return subprocess.CompletedProcess(command, returncode, out_text, err_text)
+        if watchdog.fired:
+            raise subprocess.TimeoutExpired(command, timeout, output=out, stderr=err)
+        return subprocess.CompletedProcess(command, returncode, out, err)
+
+    async def _pump_stream(
+        self,
+        stream: ToolStream,
+        proc: asyncio.subprocess.Process,
+        spawned: float,
+        timeout: float,
+    ) -> None:
+        assert proc.stdout is not None and proc.stderr is not None
+        watchdog = _Watchdog(proc, timeout)
+        stderr_task = asyncio.ensure_future(proc.stderr.read())
+        cancelled = False
+        try:
+            try:
+                while True:
+                    chunk = await proc.stdout.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    await stream._queue.put(chunk)
+                await proc.wait()
+            except asyncio.CancelledError:
+                cancelled = True
+                _kill(proc)
+                await proc.wait()
+                raise
+            finally:
+                watchdog.cancel()
+                stream.stderr = (await stderr_task).decode("utf-8", "replace")
+                stream.returncode = proc.returncode
+                stream.timed_out = watchdog.fired
+                await self._finish(stream.command, proc, spawned, watchdog.fired, cancelled)
+                if not cancelled:
+                    # A consumer that stopped reading leaves the queue full;
+                    # close() then cancels this put and the outer finally
+                    # still releases it.
+                    await stream._queue.put(None)
+        finally:
+            stream._done.set()
+
+
+# ── process-wide runner ──────────────────────────────────────────────────────
+
+_runner: Optional[ToolRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> ToolRunner:
+    """Return the process-wide :class:`ToolRunner`, starting it on first use."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ToolRunner()
+        return _runner
+
+
+def configure_runner(max_processes: int) -> ToolRunner:
+    """Apply the ``max_tool_processes`` setting to the process-wide runner."""
+    runner = get_runner()
+    runner.set_limit(max_processes)
+    return runner
+
+
+def _shutdown() -> None:
+    if _runner is not None:
+        _runner.close()
+
+
+def _reset_after_fork() -> None:
+    # the loop thread does not survive fork(); a child starts its own runner
+    global _runner, _runner_lock
+    _runner = None
+    _runner_lock = threading.Lock()
+
+
+atexit.register(_shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
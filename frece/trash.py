@@ -28,19 +28,19 @@ import shutil
 import struct
 import subprocess
 from dataclasses import asdict, dataclass, field
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
 from urllib.parse import unquote
 
+from .config import Config
 from .errors import RecoveryError
-
-try:  # python-magic is a declared dependency, but degrade gracefully.
-    import magic as _magic
-except Exception:  # pragma: no cover - defensive
-    _magic = None  # type: ignore[assignment]
-
-_WINDOWS_EPOCH = datetime(1601, 1, 1, tzinfo=timezone.utc)
+from .fat import open_fat_volume
+from .filetype import detect_mime
+from .hash_cache import HashCache
+from .listing_cache import ListingCache
+from .timecodec import epoch_to_iso, filetime_to_iso
+from .toolrunner import get_runner
 
 
 def _utc_now_iso() -> str:
@@ -97,22 +97,12 @@ def _trash_root_of(rel_path: str) -> Optional[str]:
 
 def _filetime_to_iso(filetime: int) -> Optional[str]:
     """Convert a Windows FILETIME (100 ns ticks since 1601) to an ISO string."""
-    if not filetime:
-        return None
-    try:
-        moment = _WINDOWS_EPOCH + timedelta(microseconds=filetime / 10)
-    except (OverflowError, OSError, ValueError):
-        return None
-    return moment.isoformat().replace("+00:00", "Z")
+    return filetime_to_iso(filetime) or None
 
 
 def _mtime_to_iso(path: Path) -> Optional[str]:
     try:
-        return (
-            datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
-            .isoformat()
-            .replace("+00:00", "Z")
-        )
+        return epoch_to_iso(path.stat().st_mtime) or None
     except OSError:
         return None
 
@@ -183,8 +173,17 @@ def parse_windows_index(data: bytes) -> Optional[dict]:
 class TrashRecovery:
     """Discover, list, and restore files from any supported trash store."""
 
-    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        config: Optional[Config] = None,
+        listing_cache: Optional[ListingCache] = None,
+        hash_cache: Optional[HashCache] = None,
+    ) -> None:
         self.logger = logger or logging.getLogger("frece.trash")
+        self.config = config or Config()
+        self.listing_cache = listing_cache
+        self.hash_cache = hash_cache
 
     # ── classification ───────────────────────────────────────────────
     @staticmethod
@@ -283,8 +282,7 @@ class TrashRecovery:
         return list(dict.fromkeys(dirs))
 
     # ── helpers ──────────────────────────────────────────────────────
-    @staticmethod
-    def _hash_and_size(path: Path) -> tuple[str, int]:
+    def _hash_and_size(self, path: Path) -> tuple[str, int]:
         """Return (sha256, size) for a file, or ("", recursive_size) for a dir."""
         if path.is_dir():
             total = 0
@@ -295,6 +293,11 @@ class TrashRecovery:
                     except OSError:
                         pass
             return "", total
+        if self.hash_cache is not None:
+            try:
+                return self.hash_cache.digest(path, "sha256")
+            except OSError:
+                return "", 0
         sha = hashlib.sha256()
         size = 0
         try:
@@ -310,11 +313,9 @@ class TrashRecovery:
     def _detect_type(path: Path) -> str:
         if path.is_dir():
             return "directory"
-        if _magic is not None:
-            try:
-                return _magic.from_file(str(path), mime=True) or "application/octet-stream"
-            except Exception:
-                pass
+        mime = detect_mime(path)
+        if mime:
+            return mime
         return path.suffix.lstrip(".").lower() or "unknown"
 
     def _entry(self, content: Path, **kwargs) -> TrashedFile:
@@ -512,33 +513,64 @@ class TrashRecovery:
             )
 
     def _fls_walk(self, image: Path, offset: int, timeout: int):
-        """Yield (inode_token, path) for every file in *image* via ``fls -F -r -p``."""
+        """Yield (inode_token, path) for every file in *image* via ``fls -F -r -p``.
+
+        Output is streamed line by line rather than buffered, so memory stays
+        flat on volumes with millions of entries.
+        """
         command = ["fls", "-F", "-r", "-p"]
         if offset:
             command += ["-o", str(offset)]
         command += [str(image)]
         try:
-            proc = subprocess.run(
-                command, capture_output=True, text=True, timeout=(timeout or None), check=False
-            )
-        except subprocess.TimeoutExpired as exc:
+            stream = get_runner().stream(command, timeout=timeout, errors="replace")
+        except OSError as exc:
+            raise RecoveryError(
+                f"Failed to run fls on {image}",
+                remediation="Install The Sleuth Kit: apt-get install sleuthkit",
+            ) from exc
+
+        with stream:
+            for line in stream:
+                parsed = self._parse_fls_path_line(line.rstrip("\n"))
+                if parsed is not None:
+                    yield parsed
+        if stream.timed_out:
             raise RecoveryError(
                 "fls timed out walking the image",
                 remediation="Increase --timeout or verify the image is readable",
-            ) from exc
-        for line in proc.stdout.splitlines():
-            if "\t" not in line:
-                continue
-            meta, path = line.split("\t", 1)
-            fields = meta.split()
-            if not fields:
-                continue
-            idx = 1
-            if idx < len(fields) and fields[idx] == "*":  # '*' marks a deleted entry
-                idx += 1
-            if idx >= len(fields):
-                continue
-            yield fields[idx].rstrip(":"), path
+            )
+
+    @staticmethod
+    def _parse_fls_path_line(line: str) -> Optional[tuple[str, str]]:
+        """Parse one ``fls -F -r -p`` line into (inode_token, path)."""
+        if "\t" not in line:
+            return None
+        meta, path = line.split("\t", 1)
+        fields = meta.split()
+        if not fields:
+            return None
+        idx = 1
+        if idx < len(fields) and fields[idx] == "*":  # '*' marks a deleted entry
+            idx += 1
+        if idx >= len(fields):
+            return None
+        return fields[idx].rstrip(":"), path
+
+    def _cached_fls_walk(self, image: Path, offset: int, timeout: int):
+        """:meth:`_fls_walk` through the listing cache when one is configured."""
+        if self.listing_cache is None:
+            yield from self._fls_walk(image, offset, timeout)
+            return
+
+        def _build():
+            for token, path in self._fls_walk(image, offset, timeout):
+                head = token.split("-")[0]
+                inode = int(head) if head.isdigit() else 0
+                yield (inode, token, "r", path, True, 0, 0, 0, 0, 0)
+
+        for row in self.listing_cache.rows(image, offset, "paths", _build):
+            yield row[1], row[3]
 
     def _icat_to_file(
         self, image: Path, offset: int, token: str, dest: Path, timeout: int
@@ -549,10 +581,7 @@ class TrashRecovery:
         command += [str(image), token]
         try:
             with open(dest, "wb") as handle:
-                proc = subprocess.run(
-                    command, stdout=handle, stderr=subprocess.PIPE,
-                    timeout=(timeout or None), check=False,
-                )
+                proc = get_runner().run_to_file(command, handle, timeout=timeout)
             return proc.returncode == 0
         except (subprocess.TimeoutExpired, OSError) as exc:
             self.logger.warning("icat failed for %s: %s", token, exc)
@@ -564,17 +593,53 @@ class TrashRecovery:
         """Extract every trash store from a raw/NTFS/ext image to *staging_dir*.
 
         Uses The Sleuth Kit (no mount) so a `.dd`/raw image of a Windows, Linux,
-        or macOS-ish volume can be triaged directly. Returns the staged trash
-        directories, ready for :meth:`list_trashed`.
+        or macOS-ish volume can be triaged directly; FAT/exFAT volumes are read
+        natively and need no Sleuth Kit install unless ``config.native_fat`` is
+        disabled. Returns the staged trash directories, ready for
+        :meth:`list_trashed`.
         """
-        self._require_sleuthkit()
         image = Path(image)
         staging_dir = Path(staging_dir)
+
+        volume = open_fat_volume(image, offset) if self.config.native_fat else None
+        if volume is not None:
+            with volume:
+                files = {
+                    str(entry.inode): entry
+                    for entry in volume.iter_entries()
+                    if not entry.is_dir
+                }
+
+                def _native_to_file(token: str, dest: Path) -> bool:
+                    try:
+                        volume.extract(files[token], dest)
+                    except RecoveryError as exc:
+                        self.logger.warning("FAT extraction failed for %s: %s", token, exc)
+                        return False
+                    return True
+
+                walk = ((token, entry.path) for token, entry in files.items())
+                return self._stage_trash(walk, _native_to_file, staging_dir)
+
+        self._require_sleuthkit()
+        return self._stage_trash(
+            self._cached_fls_walk(image, offset, timeout),
+            lambda token, dest: self._icat_to_file(image, offset, token, dest, timeout),
+            staging_dir,
+        )
+
+    def _stage_trash(
+        self,
+        walk: Iterable[tuple[str, str]],
+        extract: Callable[[str, Path], bool],
+        staging_dir: Path,
+    ) -> list[Path]:
+        """Copy every walked file that lives in a trash store into *staging_dir*."""
         staging_real = os.path.realpath(staging_dir)
         roots: list[Path] = []
         seen: set[str] = set()
 
-        for token, rel in self._fls_walk(image, offset, timeout):
+        for token, rel in walk:
             root_rel = _trash_root_of(rel)
             if root_rel is None or _has_traversal(rel):
                 continue
@@ -587,7 +652,7 @@ class TrashRecovery:
             except (OSError, ValueError):
                 pass
             dest.parent.mkdir(parents=True, exist_ok=True)
-            if self._icat_to_file(image, offset, token, dest, timeout):
+            if extract(token, dest):
                 staged_root = staging_dir / root_rel
                 if str(staged_root) not in seen:
                     seen.add(str(staged_root))
@@ -18,6 +18,8 @@ def _clean_custody_globals(monkeypatch):
     are fully isolated regardless of execution order.
     """
     monkeypatch.delenv("FRECE_KEY_STORE", raising=False)
+    # Never talk to a custody key agent the developer may have running.
+    monkeypatch.setenv("FRECE_AGENT_SOCK", str(Path(tempfile.gettempdir()) / "frece-no-agent"))
 
     import frece.custody as _custody
     monkeypatch.setattr(_custody, "_key_store_warning_shown", False)
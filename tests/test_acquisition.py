@@ -1,12 +1,14 @@
 """Tests for evidence acquisition."""
 
 import hashlib
+import json
 import os
 from pathlib import Path
 
 import pytest
 
 from frece.acquisition import EvidenceAcquisition, WriteBlockChecker
+from frece.config import Config
 from frece.errors import AcquisitionError
 
 
@@ -240,3 +242,65 @@ class TestEvidenceAcquisition:
     def test_hash_file_missing_raises(self, acq, temp_dir):
         with pytest.raises(AcquisitionError):
             acq.hash_file(temp_dir / "nonexistent.dd")
+
+
+class TestStreamingFileAcquisition:
+    """Streaming logical acquisition: scandir walk, batching, group commit, JSONL log."""
+
+    @pytest.fixture
+    def tree(self, temp_dir):
+        root = temp_dir / "share"
+        for n in range(150):
+            path = root / f"d{n % 7}" / f"sub{n % 3}" / f"f{n}.txt"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(f"file {n}".encode())
+        big = root / "big.bin"
+        big.write_bytes(os.urandom(300 * 1024))
+        return root
+
+    def _acq(self, temp_dir, **overrides):
+        return EvidenceAcquisition(config=Config(case_root=temp_dir / "cases", **overrides))
+
+    @pytest.mark.parametrize("durability", ["file", "group"])
+    def test_tree_with_small_and_large_files(self, temp_dir, tree, durability):
+        acq = self._acq(temp_dir, acquire_workers=2, acquire_durability=durability)
+        out = temp_dir / "out"
+
+        result = acq.acquire_files([tree], out, recursive=True)
+
+        assert len(result["acquired"]) == 151 and not result["failed"]
+        big = result["acquired"][str(tree / "big.bin")]
+        assert big["sha256"] == hashlib.sha256((tree / "big.bin").read_bytes()).hexdigest()
+        assert big["size_bytes"] == 300 * 1024
+        small = result["acquired"][str(tree / "d3" / "sub1" / "f10.txt")]
+        assert Path(small["output_file"]).read_bytes() == b"file 10"
+        assert not list(out.glob(".acquiring_*"))
+
+    def test_jsonl_log_without_collecting(self, temp_dir, tree):
+        acq = self._acq(temp_dir, acquire_workers=1)
+        log = temp_dir / "results.jsonl"
+
+        result = acq.acquire_files(
+            [tree, temp_dir / "missing"], temp_dir / "out",
+            recursive=True, result_log=log, collect=False,
+        )
+
+        assert result["acquired"] == {}
+        assert list(result["failed"]) == [str(temp_dir / "missing")]
+        records = [json.loads(line) for line in log.read_text().splitlines()]
+        assert len(records) == 152
+        assert sum("error" in record for record in records) == 1
+        assert {record["source"] for record in records if "sha256" in record} == {
+            str(path) for path in tree.rglob("*") if path.is_file()
+        }
+
+    def test_default_log_location(self, temp_dir):
+        source = temp_dir / "a.txt"
+        source.write_bytes(b"a")
+        self._acq(temp_dir).acquire_files([source], temp_dir / "out")
+        assert (temp_dir / "out" / "acquisition.jsonl").exists()
+
+    def test_unknown_durability_mode(self, temp_dir):
+        acq = self._acq(temp_dir, acquire_durability="never")
+        with pytest.raises(AcquisitionError):
+            acq.acquire_files([], temp_dir / "out")
@@ -36,3 +36,10 @@ def test_load_config_max_video_size(tmp_path):
     cfg_file.write_text('[tool.frece]\nmax_video_size = 1073741824\n')
     cfg = load_config(cfg_file)
     assert cfg.max_video_size == 1073741824
+
+def test_load_config_ewf_cache(tmp_path):
+    cfg_file = tmp_path / "config.toml"
+    cfg_file.write_text('[tool.frece]\newf_cache_mb = 1024\newf_readahead_workers = 4\n')
+    cfg = load_config(cfg_file)
+    assert cfg.ewf_cache_mb == 1024
+    assert cfg.ewf_readahead_workers == 4
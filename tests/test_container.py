@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the seekable compressed acquisition container (frece.container)."""
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from frece.acquisition import EvidenceAcquisition
+from frece.config import Config
+from frece.container import ContainerImage, ContainerWriter, is_container
+from frece.errors import AcquisitionError
+from frece.ewf import open_image, open_source
+from frece.pieces import load_piece_manifest, verify_pieces
+
+CHUNK = 4096
+# text and random data, then zeros up to three whole zero chunks, then a short tail
+_HEAD = b"frece " * 1400 + os.urandom(CHUNK + 10)
+DATA = _HEAD + bytes(-len(_HEAD) % CHUNK + 3 * CHUNK) + os.urandom(777)
+
+
+def _container(tmp_path, data=DATA, workers=2):
+    path = tmp_path / "disk.frc"
+    with open(path, "wb") as out:
+        writer = ContainerWriter(out, chunk_size=CHUNK, workers=workers)
+        for start in range(0, len(data), 1500):
+            writer.write(memoryview(data)[start:start + 1500])
+        writer.finish({"sha256": hashlib.sha256(data).hexdigest()})
+    return path, writer
+
+
+class TestContainer:
+    def test_round_trip_and_random_access(self, tmp_path):
+        path, writer = _container(tmp_path)
+        assert is_container(path)
+        with ContainerImage(path) as image:
+            assert image.size == len(DATA)
+            assert image.pread(len(DATA), 0) == DATA
+            for offset, length in ((0, 1), (CHUNK - 3, 10), (9000, 5000), (len(DATA) - 5, 50)):
+                assert image.pread(length, offset) == DATA[offset:offset + length]
+            assert image.metadata["sha256"] == hashlib.sha256(DATA).hexdigest()
+            assert image.info()["format"] == "frc"
+
+    def test_zero_chunks_are_sparse_holes(self, tmp_path):
+        path, writer = _container(tmp_path)
+        assert writer.zero_chunks == 3
+        with ContainerImage(path) as image:
+            holes = image.holes()
+            assert len(holes) == 1
+            offset, length = holes[0]
+            assert length == 3 * CHUNK
+            assert DATA[offset:offset + length] == bytes(length)
+            rebuilt = bytearray(len(DATA))
+            for start, data in image.iter_extents(skip_holes=True):
+                rebuilt[start:start + len(data)] = data
+            assert bytes(rebuilt) == DATA
+
+    def test_empty_disk_costs_almost_nothing(self, tmp_path):
+        path, writer = _container(tmp_path, data=bytes(64 * CHUNK))
+        assert path.stat().st_size < 2048
+        assert writer.stored_bytes == path.stat().st_size
+        with ContainerImage(path) as image:
+            assert image.holes() == [(0, 64 * CHUNK)]
+
+    def test_incompressible_chunks_stored(self, tmp_path):
+        data = os.urandom(5 * CHUNK)
+        path, _ = _container(tmp_path, data=data)
+        with ContainerImage(path) as image:
+            assert image.pread(len(data), 0) == data
+
+    def test_damaged_index_rejected(self, tmp_path):
+        path, _ = _container(tmp_path)
+        raw = bytearray(path.read_bytes())
+        raw[-200] ^= 0xFF  # inside the index or metadata
+        path.write_bytes(bytes(raw[:-1]))  # and drop the footer's last byte
+        with pytest.raises(AcquisitionError):
+            ContainerImage(path)
+
+    def test_damaged_chunk_raises_acquisition_error(self, tmp_path):
+        path, _ = _container(tmp_path)
+        with ContainerImage(path) as image:
+            offset, length, _ = image._entry(0)
+        with open(path, "r+b") as handle:
+            handle.seek(offset)
+            handle.write(bytes(length))  # not a zlib stream any more
+        with ContainerImage(path) as image, pytest.raises(AcquisitionError, match="chunk 0"):
+            image.pread(10, 0)
+
+    def test_open_image_and_source(self, tmp_path):
+        path, _ = _container(tmp_path)
+        with open_source(path) as source:
+            assert isinstance(source, ContainerImage)
+        with open_image(path) as handle:
+            assert handle.source.pread(100, 9000) == DATA[9000:9100]
+            assert handle.image_info["format"] == "frc"
+            assert handle.raw_path.read_bytes() == DATA
+
+
+def test_acquire_device_frc_hashes_logical_stream(tmp_path):
+    source = tmp_path / "disk.raw"
+    payload = os.urandom(100_000) + bytes(4 * 1024 * 1024)
+    source.write_bytes(payload)
+    output = tmp_path / "out.frc"
+    config = Config(case_root=tmp_path / "cases", piece_size_mb=1)
+    metadata = EvidenceAcquisition(config=config).acquire_device(
+        str(source), output, writeblock_required=False, force_no_writeblock=True,
+        output_format="frc",
+    )
+
+    assert metadata["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert metadata["format"] == "frc"
+    assert metadata["sparse_chunks"] >= 3
+    assert output.stat().st_size < len(payload) // 10
+    with ContainerImage(output) as image:
+        assert image.pread(len(payload), 0) == payload
+    assert verify_pieces(output, load_piece_manifest(metadata["piece_manifest"]))["verified"]
+
+
+def test_unknown_output_format(tmp_path):
+    source = tmp_path / "disk.raw"
+    source.write_bytes(b"x")
+    with pytest.raises(AcquisitionError):
+        EvidenceAcquisition(config=Config(case_root=tmp_path)).acquire_device(
+            str(source), tmp_path / "o", writeblock_required=False, output_format="e01"
+        )
+
+
+def test_writer_accepts_bytesio():
+    out = io.BytesIO()
+    writer = ContainerWriter(out, chunk_size=CHUNK, workers=1)
+    writer.write(b"abc")
+    writer.finish()
+    assert out.getvalue().startswith(b"FRECEC")
@@ -6,10 +6,14 @@ import sqlite3
 
 import pytest
 
+from frece import custody
 from frece.custody import (
+    GENESIS_HASH,
+    SCHEMA_VERSION,
     CustodyDatabase,
     create_case_secret_key,
     get_case_secret_key,
+    query_custody_events,
     rotate_case_secret_key,
 )
 from frece.errors import CustodyError
@@ -279,3 +283,327 @@ class TestCustodyDatabase:
                     operator="analyst1",
                     details={},
                 )
+
+    def test_database_uses_wal_and_reuses_connection(self, custody_db):
+        """Repeated logging reuses one write connection in WAL mode."""
+        for n in range(3):
+            custody_db.log_event("CARVE", f"EV{n}", "analyst1", {"n": n})
+
+        writer = custody_db._writer
+        custody_db.log_event("CARVE", "EV9", "analyst1", {})
+
+        assert custody_db._writer is writer
+        assert writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert custody_db.verify_database() == (4, 0)
+
+    def test_log_events_signs_each_entry(self, custody_db, secret_key):
+        """Batched events each carry their own HMAC and verify like single ones."""
+        entries = custody_db.log_events(
+            {"event_type": "CARVE", "evidence_id": "EV001", "operator": "analyst1",
+             "details": {"n": n}}
+            for n in range(50)
+        )
+
+        assert len({entry.hash_sha256 for entry in entries}) == 50
+        assert custody_db.verify_database() == (50, 0)
+        assert len(custody_db.get_evidence_log("EV001")) == 50
+
+    def test_session_flushes_batches_and_on_exit(self, custody_db):
+        """A session commits every full batch, and the remainder on exit."""
+        with custody_db.session(batch_size=4) as session:
+            for n in range(10):
+                session.log_event("CARVE", "EV001", "analyst1", {"n": n})
+            assert len(custody_db.get_evidence_log("EV001")) == 8
+
+        assert len(session.entries) == 10
+        assert custody_db.verify_database() == (10, 0)
+
+    def test_close_then_checkpointed_file_is_complete(self, custody_db):
+        """After checkpoint and close the main file holds every committed row."""
+        custody_db.log_event("ACQUIRE", "EV001", "analyst1", {"source": "/dev/sda"})
+        custody_db.checkpoint()
+        custody_db.close()
+
+        copy = custody_db.db_path.with_name("copy.db")
+        copy.write_bytes(custody_db.db_path.read_bytes())
+        conn = sqlite3.connect(copy)
+        assert conn.execute("SELECT COUNT(*) FROM custody_log").fetchone()[0] == 1
+        conn.close()
+
+
+class TestCustodyHashChain:
+    """Hash chaining, signed checkpoints and incremental verification."""
+
+    @pytest.fixture
+    def chained_db(self, temp_dir):
+        db = CustodyDatabase(
+            temp_dir / "custody.db", hashlib.sha256(b"chain").digest(), checkpoint_interval=10
+        )
+        db.log_events(
+            {"event_type": "CARVE", "evidence_id": "EV001", "operator": "analyst1",
+             "details": {"n": n}}
+            for n in range(35)
+        )
+        return db
+
+    def _tamper(self, db, sql, params=()):
+        conn = sqlite3.connect(db.db_path)
+        conn.execute(sql, params)
+        conn.commit()
+        conn.close()
+
+    def test_entries_link_to_previous_hash(self, chained_db):
+        conn = sqlite3.connect(chained_db.db_path)
+        rows = conn.execute("SELECT entry_hash, prev_hash FROM custody_log ORDER BY id").fetchall()
+        checkpoints = conn.execute("SELECT entry_id FROM custody_checkpoints").fetchall()
+        conn.close()
+
+        assert rows[0][1] == GENESIS_HASH
+        assert all(rows[i][1] == rows[i - 1][0] for i in range(1, len(rows)))
+        assert [cp[0] for cp in checkpoints] == [10, 20, 30]
+
+    def test_deleted_entry_breaks_chain(self, chained_db):
+        self._tamper(chained_db, "DELETE FROM custody_log WHERE id = 15")
+
+        result = chained_db.verify_chain()
+
+        assert result["tampered_entries"] == [16]
+        with pytest.raises(CustodyError, match="tampered"):
+            chained_db.verify_database()
+
+    def test_forged_checkpoint_is_rejected(self, chained_db):
+        self._tamper(
+            chained_db,
+            "UPDATE custody_checkpoints SET chain_hash = ? WHERE entry_id = 20",
+            ("f" * 64,),
+        )
+
+        assert chained_db.verify_chain()["bad_checkpoints"] == [20]
+
+    def test_parallel_segments_match_sequential(self, chained_db):
+        sequential = chained_db.verify_chain(workers=1)
+        parallel = chained_db.verify_chain(workers=4)
+
+        assert sequential["segments"] == parallel["segments"] == 4
+        assert parallel["verified_entries"] == sequential["verified_entries"] == 35
+        assert parallel["tampered"] == 0
+
+        self._tamper(chained_db, "UPDATE custody_log SET operator = 'x' WHERE id = 25")
+        assert chained_db.verify_chain(workers=4)["tampered_entries"] == [25]
+
+    def test_incremental_verifies_only_new_entries(self, chained_db):
+        first = chained_db.verify_chain(incremental=True)
+        assert first["trusted_through"] == 0
+        assert first["verified_entries"] == 35
+
+        chained_db.log_event("EXPORT", "EV001", "analyst1", {})
+        second = chained_db.verify_chain(incremental=True)
+
+        assert second["trusted_through"] == 30
+        assert second["verified_entries"] == 6
+        assert second["entries"] == 36
+        assert chained_db.verify_database(incremental=True) == (36, 0)
+
+    def test_incremental_detects_rewritten_checkpoint_entry(self, chained_db):
+        chained_db.verify_chain()
+        self._tamper(chained_db, "UPDATE custody_log SET entry_hash = 'x' WHERE id = 30")
+
+        assert 30 in chained_db.verify_chain(incremental=True)["bad_checkpoints"]
+
+    def test_forged_confirmation_is_ignored(self, chained_db):
+        self._tamper(chained_db, "UPDATE custody_log SET details = '{}' WHERE id = 5")
+        self._tamper(
+            chained_db,
+            "UPDATE custody_checkpoints SET verified_at = '2025-01-01T00:00:00Z', "
+            "confirmation = 'f' || substr(signature, 2)",
+        )
+
+        result = chained_db.verify_chain(incremental=True)
+
+        assert result["trusted_through"] == 0
+        assert result["tampered_entries"] == [5]
+
+    def test_legacy_rows_verify_and_chain_continues(self, temp_dir):
+        key = hashlib.sha256(b"legacy").digest()
+        db_path = temp_dir / "custody.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE custody_log (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "event_type TEXT NOT NULL, evidence_id TEXT NOT NULL, operator TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, details TEXT NOT NULL, entry_hash TEXT NOT NULL, "
+            "verified INTEGER DEFAULT 0)"
+        )
+        legacy = CustodyDatabase(db_path, key, initialize=False)
+        entry = {"event_type": "ACQUIRE", "evidence_id": "EV001", "operator": "a",
+                 "timestamp": "2025-01-01T00:00:00Z", "details": {}}
+        conn.execute(
+            "INSERT INTO custody_log (event_type, evidence_id, operator, timestamp, details, "
+            "entry_hash) VALUES (?, ?, ?, ?, ?, ?)",
+            ("ACQUIRE", "EV001", "a", entry["timestamp"], "{}", legacy._compute_hmac(entry)),
+        )
+        conn.commit()
+        conn.close()
+
+        assert legacy.verify_database() == (1, 0)
+        legacy.log_event("CARVE", "EV001", "a", {})
+        assert legacy.verify_database() == (2, 0)
+
+
+class TestCustodyQueries:
+    """Schema migrations, indexes and the paginated query API."""
+
+    @pytest.fixture
+    def populated_db(self, temp_dir):
+        db = CustodyDatabase(temp_dir / "custody.db", hashlib.sha256(b"query").digest())
+        db.log_events(
+            {
+                "event_type": "ACQUIRE" if n % 5 == 0 else "CARVE",
+                "evidence_id": f"EV{n % 3}",
+                "operator": "analyst1",
+                "timestamp": f"2025-01-01T00:{n:02d}:00Z",
+                "details": {"n": n},
+            }
+            for n in range(30)
+        )
+        return db
+
+    def test_new_database_is_at_current_schema(self, populated_db):
+        conn = sqlite3.connect(populated_db.db_path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        indexes = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_custody%'"
+        )}
+        conn.close()
+
+        assert version == SCHEMA_VERSION
+        assert {"idx_custody_evidence", "idx_custody_type", "idx_custody_time"} <= indexes
+
+    def test_evidence_lookup_uses_index(self, populated_db):
+        conn = sqlite3.connect(populated_db.db_path)
+        plan = " ".join(
+            str(row[-1]) for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM custody_log WHERE evidence_id = ? "
+                "ORDER BY ts_epoch_us, id",
+                ("EV1",),
+            )
+        )
+        conn.close()
+
+        assert "idx_custody_evidence" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_query_filters_and_time_window(self, populated_db):
+        entries, cursor = populated_db.query_events(
+            evidence_id="EV0",
+            event_type="ACQUIRE",
+            since="2025-01-01T00:10:00Z",
+            until="2025-01-01T00:25:00Z",
+        )
+
+        assert [entry.details["n"] for entry in entries] == [15]
+        assert cursor is None
+
+    def test_keyset_pagination_covers_every_entry_once(self, populated_db):
+        seen = []
+        after = None
+        while True:
+            page, after = populated_db.query_events(limit=7, after=after)
+            seen.extend(entry.details["n"] for entry in page)
+            if after is None:
+                break
+
+        assert seen == list(range(30))
+
+    def test_legacy_database_is_migrated_and_backfilled(self, temp_dir):
+        key = hashlib.sha256(b"legacy").digest()
+        db_path = temp_dir / "custody.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE custody_log (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "event_type TEXT NOT NULL, evidence_id TEXT NOT NULL, operator TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, details TEXT NOT NULL, entry_hash TEXT NOT NULL, "
+            "verified INTEGER DEFAULT 0)"
+        )
+        conn.execute(
+            "INSERT INTO custody_log (event_type, evidence_id, operator, timestamp, details, "
+            "entry_hash) VALUES ('ACQUIRE', 'EV001', 'a', '2025-03-01T12:00:00.500000Z', "
+            "'{}', 'x')"
+        )
+        conn.commit()
+        conn.close()
+
+        # The unmigrated file answers queries by scanning.
+        ro = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        assert len(query_custody_events(ro, since="2025-03-01T12:00:00Z")[0]) == 1
+        ro.close()
+
+        db = CustodyDatabase(db_path, key, initialize=False)
+        entries = db.get_evidence_log("EV001")
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("SELECT ts_epoch_us FROM custody_log").fetchone()[0] == (
+            1740830400500000
+        )
+        conn.close()
+        assert entries[0].timestamp_us == 1740830400500000
+
+
+class TestCustodyEncryption:
+    """Chunked FRECE_ENC_V2 encryption and legacy V1 decryption."""
+
+    @pytest.fixture(autouse=True)
+    def fast_kdf(self, monkeypatch):
+        pytest.importorskip("cryptography")
+        monkeypatch.setattr(custody, "_SCRYPT_LOG2_N", 14)
+
+    @pytest.mark.parametrize("size", [0, 100, 4096, 3 * 4096, 10_000])
+    def test_round_trip(self, temp_dir, size):
+        db_path = temp_dir / "custody.db"
+        payload = os.urandom(size)
+        db_path.write_bytes(payload)
+
+        enc = custody.encrypt_custody_db(db_path, "pw", chunk_size=4096, workers=3)
+        out = custody.decrypt_custody_db(enc, "pw", output_path=temp_dir / "out.db", workers=2)
+
+        assert enc.read_bytes().startswith(b"FRECE_ENC_V2")
+        assert out.read_bytes() == payload
+
+    def test_truncation_reordering_and_wrong_passphrase_fail(self, temp_dir):
+        db_path = temp_dir / "custody.db"
+        db_path.write_bytes(os.urandom(3 * 4096 + 10))
+        enc = custody.encrypt_custody_db(db_path, "pw", chunk_size=4096)
+        raw = enc.read_bytes()
+        header = len(raw) - 3 * (4096 + 16) - (10 + 16)
+        record = 4096 + 16
+        first, second = raw[header:header + record], raw[header + record:header + 2 * record]
+
+        variants = [
+            raw[:header + 3 * record],  # cut exactly at a chunk boundary
+            raw[:-1],
+            raw + b"\0",
+            raw[:header] + second + first + raw[header + 2 * record:],
+        ]
+        out = temp_dir / "out.db"
+        for variant in variants:
+            enc.write_bytes(variant)
+            with pytest.raises(CustodyError):
+                custody.decrypt_custody_db(enc, "pw", output_path=out)
+            assert not out.exists()
+
+        enc.write_bytes(raw)
+        with pytest.raises(CustodyError):
+            custody.decrypt_custody_db(enc, "wrong", output_path=out)
+
+    def test_v1_files_still_decrypt(self, temp_dir):
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+        salt, nonce = os.urandom(32), os.urandom(12)
+        key = Scrypt(salt=salt, length=32, n=2**20, r=8, p=1).derive(b"pw")
+        enc = temp_dir / "custody.db.enc"
+        enc.write_bytes(
+            b"FRECE_ENC_V1" + salt + nonce + AESGCM(key).encrypt(nonce, b"legacy", None)
+        )
+
+        assert custody.decrypt_custody_db(enc, "pw").read_bytes() == b"legacy"
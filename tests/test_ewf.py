@@ -0,0 +1,195 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the native EWF-E01 reader (frece.ewf)."""
+
+import io
+import struct
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from frece.carver import StreamingCarver
+from frece.ewf import EwfImage, EwfImageHandle, is_ewf_image, open_ewf, open_image
+from frece.imagesource import RawImageSource
+
+SECTOR = 512
+SECTORS_PER_CHUNK = 8
+CHUNK = SECTOR * SECTORS_PER_CHUNK
+
+
+def _section(kind: bytes, offset: int, size: int, next_offset: int | None = None) -> bytes:
+    head = struct.pack(
+        "<16sQQ40x", kind, offset + size if next_offset is None else next_offset, size
+    )
+    return head + struct.pack("<I", zlib.adler32(head))
+
+
+def _segment(number, chunks, media_sectors, last):
+    """One E01 segment holding *chunks*; chunks alternate compressed/stored."""
+    out = bytearray(b"EVF\x09\x0d\x0a\xff\x00\x01" + struct.pack("<HH", number, 0))
+    if number == 1:
+        header = zlib.compress(b"1\nmain\nc\tn\na\tb\n")
+        out += _section(b"header", len(out), 76 + len(header)) + header
+        volume = bytearray(1052)
+        geometry = (len(chunks), SECTORS_PER_CHUNK, SECTOR, media_sectors)
+        struct.pack_into("<IIIQ", volume, 4, *geometry)
+        out += _section(b"volume", len(out), 76 + len(volume)) + volume
+
+    payload = bytearray()
+    offsets = []
+    data_start = len(out) + 76
+    for index, chunk in enumerate(chunks):
+        offsets.append(data_start + len(payload))
+        if index % 2 == 0:
+            offsets[-1] |= 0x80000000
+            payload += zlib.compress(chunk)
+        else:
+            payload += chunk + struct.pack("<I", zlib.adler32(chunk))
+    out += _section(b"sectors", len(out), 76 + len(payload)) + payload
+
+    entries = struct.pack(f"<{len(offsets)}I", *offsets)
+    table_head = struct.pack("<I4xQ4x", len(offsets), 0)
+    table = (
+        table_head + struct.pack("<I", zlib.adler32(table_head))
+        + entries + struct.pack("<I", zlib.adler32(entries))
+    )
+    for kind in (b"table", b"table2"):
+        out += _section(kind, len(out), 76 + len(table)) + table
+    out += _section(b"done" if last else b"next", len(out), 76, next_offset=len(out))
+    return bytes(out)
+
+
+def write_e01(path, media, chunks_per_segment=None):
+    """Write *media* as an E01 image at *path* (plus .E02… if split)."""
+    chunks = [media[i:i + CHUNK] for i in range(0, len(media), CHUNK)]
+    per_segment = chunks_per_segment or len(chunks)
+    groups = [chunks[i:i + per_segment] for i in range(0, len(chunks), per_segment)]
+    for number, group in enumerate(groups, start=1):
+        segment = path.with_suffix(f".E{number:02d}")
+        segment.write_bytes(
+            _segment(number, group, len(media) // SECTOR, number == len(groups))
+        )
+    return path
+
+
+@pytest.fixture
+def media():
+    # 11.5 chunks of position-dependent bytes: the last chunk is partial
+    sectors = 23 * SECTORS_PER_CHUNK // 2
+    blocks = (struct.pack("<I", i) * (SECTOR // 4) for i in range(sectors))
+    return b"".join(blocks)
+
+
+class TestEwfImage:
+    def test_reads_geometry_and_media(self, tmp_path, media):
+        image_path = write_e01(tmp_path / "evidence.E01", media)
+        with EwfImage(image_path) as image:
+            assert image.size == len(media)
+            assert image.chunk_size == CHUNK
+            assert image.pread(len(media) + 100, 0) == media
+
+    def test_pread_spans_chunks(self, tmp_path, media):
+        with EwfImage(write_e01(tmp_path / "evidence.E01", media)) as image:
+            spans = ((CHUNK - 7, 20), (3 * CHUNK + 1, 2 * CHUNK), (len(media) - 5, 50))
+            for offset, length in spans:
+                assert image.pread(length, offset) == media[offset:offset + length]
+            assert image.pread(10, len(media)) == b""
+
+    def test_open_is_seekable_file_object(self, tmp_path, media):
+        with EwfImage(write_e01(tmp_path / "evidence.E01", media)) as image:
+            with image.open() as handle:
+                handle.seek(5000)
+                assert handle.read(100) == media[5000:5100]
+                handle.seek(-10, io.SEEK_END)
+                assert handle.read() == media[-10:]
+                assert handle.tell() == len(media)
+
+    def test_multi_segment_image(self, tmp_path, media):
+        image_path = write_e01(tmp_path / "split.E01", media, chunks_per_segment=5)
+        assert (tmp_path / "split.E03").exists()
+        with EwfImage(image_path) as image:
+            assert len(image.segments) == 3
+            assert image.pread(len(media), 0) == media
+
+    def test_garbage_is_not_opened(self, tmp_path):
+        bogus = tmp_path / "bogus.E01"
+        bogus.write_bytes(b"EVF\x09" + b"\x00" * 200)
+        assert is_ewf_image(bogus)
+        assert open_ewf(bogus) is None
+
+    def test_corrupt_descriptor_is_rejected(self, tmp_path, media):
+        image_path = write_e01(tmp_path / "evidence.E01", media)
+        data = bytearray(image_path.read_bytes())
+        data[13] ^= 0xFF  # first section type byte; checksum no longer matches
+        image_path.write_bytes(bytes(data))
+        assert open_ewf(image_path) is None
+
+
+class TestChunkCache:
+    def test_random_rereads_hit_the_cache(self, tmp_path, media):
+        image_path = write_e01(tmp_path / "evidence.E01", media)
+        with EwfImage(image_path, readahead_workers=-1) as image:
+            for _ in range(3):
+                assert image.pread(100, 5 * CHUNK + 10) == media[5 * CHUNK + 10:5 * CHUNK + 110]
+                assert image.pread(100, 2 * CHUNK) == media[2 * CHUNK:2 * CHUNK + 100]
+            stats = image.cache_stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 4
+        assert stats["inflated_chunks"] == 2
+        assert stats["hit_rate"] == round(4 / 6, 4)
+
+    def test_lru_evicts_oldest_chunk(self, tmp_path, media):
+        image_path = write_e01(tmp_path / "evidence.E01", media)
+        with EwfImage(image_path, cache_bytes=2 * CHUNK, readahead_workers=-1) as image:
+            for number in (0, 1, 0, 2, 0, 1):
+                image.read_chunk(number)
+            stats = image.cache_stats()
+        # 1 is evicted by 2 (0 was touched more recently) and inflated again
+        assert stats["misses"] == 4
+        assert stats["evictions"] == 2
+        assert stats["cached_chunks"] == 2
+
+    def test_sequential_read_inflates_ahead(self, tmp_path, media):
+        image_path = write_e01(tmp_path / "evidence.E01", media)
+        with EwfImage(image_path, readahead_workers=2) as image:
+            with image.open() as handle:
+                assert handle.read() == media
+            stats = image.cache_stats()
+        assert stats["inflated_chunks"] == image.chunk_count
+        assert stats["misses"] < image.chunk_count
+        assert stats["inflate_mb_per_s"] > 0
+
+
+class TestNativeCarving:
+    def test_carver_reads_ewf_without_export(self, tmp_path, sample_jpeg_data):
+        media = bytearray(8 * CHUNK)
+        media[CHUNK - 20:CHUNK - 20 + len(sample_jpeg_data)] = sample_jpeg_data
+        image_path = write_e01(tmp_path / "evidence.E01", bytes(media), chunks_per_segment=3)
+
+        with patch("frece.ewf.EwfReader._export") as export:
+            with open_image(image_path) as handle:
+                assert isinstance(handle, EwfImageHandle)
+                assert handle.native
+                assert handle.image_info["reader"] == "native"
+                manifest = StreamingCarver(chunk_size=CHUNK).carve(
+                    handle.source, tmp_path / "carved", verify=False
+                )
+        export.assert_not_called()
+
+        jpeg = next(f for f in manifest.carved_files if f.file_type == "jpeg")
+        assert jpeg.offset == CHUNK - 20
+        assert manifest.source == str(image_path)
+        carved = tmp_path / "carved" / f"{jpeg.offset:016x}_jpeg"
+        assert carved.read_bytes() == sample_jpeg_data
+
+    def test_unparsed_image_falls_back_to_export(self, tmp_path):
+        bogus = tmp_path / "bogus.E01"
+        bogus.write_bytes(b"EVF\x09" + b"\x00" * 200)
+        exported = tmp_path / "x.raw"
+        exported.write_bytes(b"raw media")
+        with patch("frece.ewf.EwfReader.__enter__", return_value=exported) as export:
+            with open_image(bogus) as handle:
+                assert not handle.native
+                assert isinstance(handle.source, RawImageSource)
+                assert handle.source.pread(3, 4) == b"med"
+        export.assert_called_once()
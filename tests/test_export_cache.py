@@ -0,0 +1,170 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the shared ewfexport cache (frece.export_cache)."""
+
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from frece.ewf import ewf_segments, open_image
+from frece.export_cache import ExportCache, content_key
+
+META = {"media_size": "1000", "md5_hash": "ab" * 16}
+
+
+def _image(directory, name, payload):
+    path = directory / name
+    path.write_bytes(b"EVF\x09" + payload)
+    return path
+
+
+class _Exporter:
+    """Stand-in for ewfexport: writes *size* bytes and counts calls."""
+
+    def __init__(self, size=1000):
+        self.size = size
+        self.calls = 0
+
+    def __call__(self, output_path):
+        self.calls += 1
+        output_path.write_bytes(b"R" * self.size)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExportCache(tmp_path / "exports", capacity_bytes=2500)
+
+
+class TestExportCache:
+    def test_second_lease_reuses_export(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        export = _Exporter()
+        with cache.lease(image, [image], META, export) as first:
+            assert first.read_bytes() == b"R" * 1000
+        with cache.lease(image, [image], META, export) as second:
+            assert second == first
+        assert export.calls == 1
+        assert [entry["image"] for entry in cache.list_exports()] == [str(image.resolve())]
+
+    def test_key_follows_content_not_path(self, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        copy = tmp_path / "copy.E01"
+        shutil.copy(image, copy)
+        assert content_key([image]) == content_key([copy])
+        copy.write_bytes(b"EVF\x09two")
+        assert content_key([image]) != content_key([copy])
+
+    def test_key_covers_the_middle_of_a_segment(self, tmp_path):
+        image = _image(tmp_path, "a.E01", b"\x00" * (4 * 1024 * 1024))
+        before = content_key([image])
+        with open(image, "r+b") as handle:
+            handle.seek(2 * 1024 * 1024)
+            handle.write(b"\x01")
+        assert content_key([image]) != before
+
+    def test_missing_metadata_fails_closed(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        export = _Exporter()
+        with cache.lease(image, [image], META, export):
+            pass
+        with cache.lease(image, [image], {"media_size": "1000"}, export):
+            pass
+        with cache.lease(image, [image], {}, export) as raw_path:
+            assert raw_path.exists()
+        assert not raw_path.exists()  # without metadata the export is not kept
+        assert export.calls == 3
+
+    def test_metadata_mismatch_reexports(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        export = _Exporter()
+        with cache.lease(image, [image], META, export):
+            pass
+        with cache.lease(image, [image], {**META, "md5_hash": "cd" * 16}, export):
+            pass
+        assert export.calls == 2
+
+    def test_truncated_export_is_rebuilt(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        export = _Exporter()
+        with cache.lease(image, [image], META, export) as raw_path:
+            pass
+        raw_path.write_bytes(b"R" * 10)
+        with cache.lease(image, [image], META, export) as raw_path:
+            assert raw_path.stat().st_size == 1000
+        assert export.calls == 2
+
+    def test_lru_eviction_keeps_recent_and_leased(self, cache, tmp_path):
+        images = [_image(tmp_path, f"{n}.E01", n.encode()) for n in "abcd"]
+        export = _Exporter()
+        for image in images[:2]:
+            with cache.lease(image, [image], META, export):
+                pass
+        with cache.lease(images[0], [images[0]], META, export):  # a is now most recent
+            with cache.lease(images[2], [images[2]], META, export):
+                pass
+            with cache.lease(images[3], [images[3]], META, export):
+                pass  # over capacity: b is evicted, a is leased
+        cached = {entry["image"] for entry in cache.list_exports()}
+        assert str(images[1].resolve()) not in cached
+        assert str(images[0].resolve()) in cached
+        assert sum(entry["size_bytes"] for entry in cache.list_exports()) <= 3000
+
+    def test_export_larger_than_capacity_is_transient(self, cache, tmp_path):
+        image = _image(tmp_path, "big.E01", b"big")
+        with cache.lease(image, [image], META, _Exporter(size=5000)) as raw_path:
+            assert raw_path.stat().st_size == 5000
+        assert not raw_path.exists()
+        assert cache.list_exports() == []
+
+    def test_failed_export_leaves_nothing(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+
+        def failing(output_path):
+            output_path.write_bytes(b"partial")
+            raise RuntimeError("ewfexport died")
+
+        with pytest.raises(RuntimeError):
+            with cache.lease(image, [image], META, failing):
+                pass
+        assert cache.list_exports() == []
+        assert not list(cache.root.glob("*.raw"))
+
+    def test_leased_entry_is_not_removed_by_others(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        export = _Exporter()
+        with cache.lease(image, [image], META, export) as raw_path:
+            assert cache.invalidate(image) == 0
+            conn = cache._connect()
+            stale = {**META, "md5_hash": "cd" * 16}
+            assert cache._lookup(conn, content_key([image]), stale, purge=False) is None
+            conn.close()
+            assert raw_path.exists()
+        assert cache.invalidate(image) == 1
+
+    def test_invalidate(self, cache, tmp_path):
+        image = _image(tmp_path, "a.E01", b"one")
+        with cache.lease(image, [image], META, _Exporter()) as raw_path:
+            pass
+        assert cache.invalidate(image) == 1
+        assert not raw_path.exists()
+        assert cache.invalidate() == 0
+
+
+def test_ewf_segments_lists_existing_segments(tmp_path):
+    for suffix in ("E01", "E02", "E03"):
+        (tmp_path / f"disk.{suffix}").write_bytes(b"")
+    assert [p.suffix for p in ewf_segments(tmp_path / "disk.E01")] == [".E01", ".E02", ".E03"]
+    assert ewf_segments(tmp_path / "disk.Ex01") == [tmp_path / "disk.Ex01"]
+
+
+def test_open_image_shares_one_export(cache, tmp_path):
+    image = _image(tmp_path, "evidence.E01", b"\x00" * 200)  # not parseable natively
+    export = _Exporter()
+    with patch("frece.ewf.EwfReader._export", side_effect=lambda path: export(path)), \
+            patch("frece.ewf.ewfinfo", return_value=dict(META)):
+        for _ in range(2):
+            with open_image(image, export_cache=cache) as handle:
+                assert not handle.native
+                assert handle.raw_path.parent == cache.root
+                assert handle.source.size == 1000
+    assert export.calls == 1
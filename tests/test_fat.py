@@ -0,0 +1,374 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the native FAT/exFAT walker (frece.fat)."""
+
+import hashlib
+import struct
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from frece.config import Config
+from frece.errors import RecoveryError
+from frece.fat import FIRST_INODE, _lfn_checksum, open_fat_volume
+from frece.recovery import DeletedFileRecovery
+from frece.trash import TrashRecovery
+
+BPS = 512
+DATE_2024_03_15 = ((2024 - 1980) << 9) | (3 << 5) | 15
+TIME_14_23_10 = (14 << 11) | (23 << 5) | 5
+
+
+# ── image builders ────────────────────────────────────────────────────────────
+
+
+def _sfn(name11: bytes, attr: int, cluster: int, size: int, deleted: bool = False) -> bytes:
+    raw = bytearray(32)
+    raw[0:11] = name11
+    if deleted:
+        raw[0] = 0xE5
+    raw[11] = attr
+    struct.pack_into("<HH", raw, 14, TIME_14_23_10, DATE_2024_03_15)
+    struct.pack_into("<H", raw, 18, DATE_2024_03_15)
+    struct.pack_into("<H", raw, 20, cluster >> 16)
+    struct.pack_into("<HH", raw, 22, TIME_14_23_10, DATE_2024_03_15)
+    struct.pack_into("<HI", raw, 26, cluster & 0xFFFF, size)
+    return bytes(raw)
+
+
+def _lfn(long_name: str, name11: bytes, deleted: bool = False) -> bytes:
+    units = long_name.encode("utf-16-le") + b"\x00\x00"
+    units += b"\xff" * (-len(units) % 26)
+    pieces = [units[i : i + 26] for i in range(0, len(units), 26)]
+    checksum = _lfn_checksum(name11)
+    slots = []
+    for seq, piece in enumerate(pieces, start=1):
+        raw = bytearray(32)
+        raw[0] = 0xE5 if deleted else seq | (0x40 if seq == len(pieces) else 0)
+        raw[1:11] = piece[0:10]
+        raw[11] = 0x0F
+        raw[13] = checksum
+        raw[14:26] = piece[10:22]
+        raw[28:32] = piece[22:26]
+        slots.append(bytes(raw))
+    return b"".join(reversed(slots))
+
+
+def _dot_entries(cluster: int, parent: int) -> bytes:
+    return _sfn(b".          ", 0x10, cluster, 0) + _sfn(b"..         ", 0x10, parent, 0)
+
+
+class _FatBuilder:
+    """Assemble a FAT12/FAT16 image with a fixed root directory region."""
+
+    def __init__(self, total_sectors: int, bits: int) -> None:
+        self.bits = bits
+        self.total_sectors = total_sectors
+        self.reserved, self.num_fats, self.root_entries = 1, 2, 512
+        self.fat_sectors = ((total_sectors + 2) * bits // 8 + BPS - 1) // BPS + 1
+        self.root_offset = (self.reserved + self.num_fats * self.fat_sectors) * BPS
+        self.data_offset = self.root_offset + self.root_entries * 32
+        self.fat: dict[int, int] = {0: 0xFFF8, 1: 0xFFFF}
+        self.root = b""
+        self.clusters: dict[int, bytes] = {}
+
+    def chain(self, clusters: list[int]) -> None:
+        eoc = 0xFFF if self.bits == 12 else 0xFFFF
+        for current, nxt in zip(clusters, clusters[1:] + [eoc]):
+            self.fat[current] = nxt
+
+    def write(self, path: Path) -> Path:
+        boot = bytearray(BPS)
+        boot[0:3] = b"\xeb\x3c\x90"
+        boot[3:11] = b"MSWIN4.1"
+        struct.pack_into(
+            "<HBHBHH", boot, 11, BPS, 1, self.reserved, self.num_fats,
+            self.root_entries, self.total_sectors,
+        )
+        struct.pack_into("<H", boot, 22, self.fat_sectors)
+        boot[510:512] = b"\x55\xaa"
+
+        fat = bytearray(self.fat_sectors * BPS)
+        for cluster, value in self.fat.items():
+            if self.bits == 16:
+                struct.pack_into("<H", fat, cluster * 2, value & 0xFFFF)
+            else:
+                offset = cluster + cluster // 2
+                current = fat[offset] | (fat[offset + 1] << 8)
+                if cluster & 1:
+                    current = (current & 0x000F) | ((value & 0xFFF) << 4)
+                else:
+                    current = (current & 0xF000) | (value & 0xFFF)
+                fat[offset], fat[offset + 1] = current & 0xFF, current >> 8
+
+        with open(path, "wb") as handle:
+            handle.truncate(self.total_sectors * BPS)
+            handle.write(boot)
+            for copy in range(self.num_fats):
+                handle.seek((self.reserved + copy * self.fat_sectors) * BPS)
+                handle.write(fat)
+            handle.seek(self.root_offset)
+            handle.write(self.root)
+            for cluster, data in self.clusters.items():
+                handle.seek(self.data_offset + (cluster - 2) * BPS)
+                handle.write(data)
+        return path
+
+
+def _payload(tag: bytes, size: int) -> bytes:
+    return (tag * (size // len(tag) + 1))[:size]
+
+
+@pytest.fixture
+def fat16_image(tmp_path):
+    builder = _FatBuilder(total_sectors=8192, bits=16)
+    keep = _payload(b"keep-me ", 600)
+    photo = b"\xff\xd8\xff\xe0" + _payload(b"JPEGDATA", 1096)
+    secret = b"%PDF-1.4\n" + _payload(b"pdf ", 91)
+    info = struct.pack("<QQQI", 2, 12, 133_000_000_000_000_000, 7) + "C:\\a.txt".encode(
+        "utf-16-le"
+    )
+
+    builder.root = b"".join(
+        [
+            _sfn(b"KEEP    TXT", 0x20, 2, len(keep)),
+            _lfn("Long Name Photo.jpg", b"LONGNA~1JPG", deleted=True),
+            _sfn(b"LONGNA~1JPG", 0x20, 10, len(photo), deleted=True),
+            _sfn(b"DOCS       ", 0x10, 20, 0),
+            _lfn("$RECYCLE.BIN", b"$RECYC~1BIN"),
+            _sfn(b"$RECYC~1BIN", 0x16, 40, 0),
+        ]
+    )
+    builder.chain([2, 3])
+    builder.clusters[2], builder.clusters[3] = keep[:512], keep[512:]
+    for index in range(3):  # deleted: chain zeroed, content contiguous
+        builder.clusters[10 + index] = photo[index * 512 : (index + 1) * 512]
+    builder.chain([20])
+    builder.clusters[20] = _dot_entries(20, 0) + _sfn(
+        b"SECRET  PDF", 0x20, 30, len(secret), deleted=True
+    )
+    builder.clusters[30] = secret
+    builder.chain([40])
+    builder.clusters[40] = _dot_entries(40, 0) + _sfn(b"S-1-5-21   ", 0x10, 41, 0)
+    builder.chain([41])
+    builder.clusters[41] = _dot_entries(41, 40) + b"".join(
+        [
+            _sfn(b"$IABC   TXT", 0x20, 42, len(info)),
+            _sfn(b"$RABC   TXT", 0x20, 43, 12),
+        ]
+    )
+    builder.chain([42])
+    builder.chain([43])
+    builder.clusters[42] = info
+    builder.clusters[43] = b"hello world\n"
+    image = builder.write(tmp_path / "usb.img")
+    return image, {"keep": keep, "photo": photo, "secret": secret}
+
+
+def _exfat_entry_set(name: str, cluster: int, size: int, deleted: bool, no_chain: bool) -> bytes:
+    in_use = 0 if deleted else 0x80
+    name_units = name.encode("utf-16-le")
+    name_slots = [name_units[i : i + 30] for i in range(0, len(name_units), 30)]
+    primary = bytearray(32)
+    primary[0] = 0x05 | in_use
+    primary[1] = 1 + len(name_slots)
+    struct.pack_into("<H", primary, 4, 0x20)
+    stamp = (DATE_2024_03_15 << 16) | TIME_14_23_10
+    struct.pack_into("<III", primary, 8, stamp, stamp, stamp)
+    primary[23] = 0x80 | 4  # modified at UTC+01:00
+    stream = bytearray(32)
+    stream[0] = 0x40 | in_use
+    stream[1] = 0x01 | (0x02 if no_chain else 0)
+    stream[3] = len(name)
+    struct.pack_into("<Q", stream, 8, size)
+    struct.pack_into("<IQ", stream, 20, cluster, size)
+    names = b""
+    for chunk in name_slots:
+        slot = bytearray(32)
+        slot[0] = 0x41 | in_use
+        slot[2 : 2 + len(chunk)] = chunk
+        names += bytes(slot)
+    return bytes(primary) + bytes(stream) + names
+
+
+@pytest.fixture
+def exfat_image(tmp_path):
+    fat_offset, fat_length, heap_offset, cluster_count = 24, 8, 32, 200
+    boot = bytearray(BPS)
+    boot[0:3] = b"\xeb\x76\x90"
+    boot[3:11] = b"EXFAT   "
+    struct.pack_into("<IIIII", boot, 80, fat_offset, fat_length, heap_offset, cluster_count, 2)
+    boot[108], boot[109], boot[110] = 9, 0, 1
+    boot[510:512] = b"\x55\xaa"
+
+    fat = bytearray(fat_length * BPS)
+    struct.pack_into("<III", fat, 0, 0xFFFFFFF8, 0xFFFFFFFF, 0xFFFFFFFF)  # root = cluster 2
+    struct.pack_into("<I", fat, 8 * 4, 9)
+    struct.pack_into("<I", fat, 9 * 4, 0xFFFFFFFF)
+
+    photo = b"\xff\xd8\xff\xe1" + _payload(b"EXIF", 996)
+    note = _payload(b"note ", 700)
+    root = _exfat_entry_set("holiday photo.jpg", 5, len(photo), True, True)
+    root += _exfat_entry_set("note.txt", 8, len(note), False, False)
+
+    image = tmp_path / "sd.img"
+    with open(image, "wb") as handle:
+        handle.truncate((heap_offset + cluster_count) * BPS)
+        handle.write(boot)
+        handle.seek(fat_offset * BPS)
+        handle.write(fat)
+        handle.seek(heap_offset * BPS)
+        handle.write(root)
+        handle.seek((heap_offset + 3) * BPS)
+        handle.write(photo)
+        handle.seek((heap_offset + 6) * BPS)
+        handle.write(note)
+    return image, {"photo": photo, "note": note}
+
+
+# ── walker ────────────────────────────────────────────────────────────────────
+
+
+def test_probe_rejects_non_fat(tmp_path):
+    image = tmp_path / "zeros.img"
+    image.write_bytes(b"\x00" * 4096)
+    assert open_fat_volume(image) is None
+    assert open_fat_volume(tmp_path / "missing.img") is None
+
+
+def test_fat16_walk_lists_deleted_entries_with_long_names(fat16_image):
+    image, _ = fat16_image
+    with open_fat_volume(image) as volume:
+        assert volume.fs_type == "FAT16"
+        entries = {entry.path: entry for entry in volume.iter_entries()}
+
+    assert entries["KEEP.TXT"].deleted is False
+    photo = entries["Long Name Photo.jpg"]
+    assert photo.deleted is True
+    assert photo.inode == FIRST_INODE + 3  # KEEP.TXT + two LFN slots precede it
+    assert entries["DOCS/_ECRET.PDF"].deleted is True
+    assert entries["$RECYCLE.BIN/S-1-5-21/$RABC.TXT"].size == 12
+    assert photo.mtime == 1710512590  # 2024-03-15 14:23:10 UTC
+
+
+def test_deleted_only_filter(fat16_image):
+    image, _ = fat16_image
+    with open_fat_volume(image) as volume:
+        names = {entry.name for entry in volume.iter_entries(deleted_only=True)}
+    assert names == {"Long Name Photo.jpg", "_ECRET.PDF"}
+
+
+def test_extract_reads_contiguous_runs(fat16_image, tmp_path):
+    image, payloads = fat16_image
+    with open_fat_volume(image) as volume:
+        entries = {entry.name: entry for entry in volume.iter_entries()}
+        sha, size = volume.extract(entries["Long Name Photo.jpg"], tmp_path / "photo.jpg")
+        assert volume.extents(entries["Long Name Photo.jpg"]) == [
+            (volume.data_offset + 8 * BPS, volume.data_offset + 8 * BPS + len(payloads["photo"]))
+        ]
+        volume.extract(entries["KEEP.TXT"], tmp_path / "keep.txt")
+
+    assert (tmp_path / "photo.jpg").read_bytes() == payloads["photo"]
+    assert sha == hashlib.sha256(payloads["photo"]).hexdigest()
+    assert size == len(payloads["photo"])
+    assert (tmp_path / "keep.txt").read_bytes() == payloads["keep"]
+
+
+def test_split_image_is_walked_in_place(fat16_image, tmp_path):
+    image, payloads = fat16_image
+    data = image.read_bytes()
+    third = len(data) // 3 + 7  # segment boundaries fall mid-sector
+    for number, start in enumerate(range(0, len(data), third), start=1):
+        (tmp_path / f"split.{number:03d}").write_bytes(data[start:start + third])
+
+    with open_fat_volume(tmp_path / "split.001") as volume:
+        entries = {entry.name: entry for entry in volume.iter_entries()}
+        volume.extract(entries["Long Name Photo.jpg"], tmp_path / "photo.jpg")
+    assert (tmp_path / "photo.jpg").read_bytes() == payloads["photo"]
+
+
+def test_fat12_table_decoding(tmp_path):
+    builder = _FatBuilder(total_sectors=2048, bits=12)
+    data = _payload(b"twelve ", 1500)
+    builder.root = _sfn(b"DATA    BIN", 0x20, 3, len(data))
+    builder.chain([3, 5, 6])
+    builder.clusters.update({3: data[:512], 5: data[512:1024], 6: data[1024:]})
+    image = builder.write(tmp_path / "floppy.img")
+
+    with open_fat_volume(image) as volume:
+        assert volume.fs_type == "FAT12"
+        (entry,) = list(volume.iter_entries())
+        assert volume.entry_runs(entry) == [
+            (volume.data_offset + BPS, 512),
+            (volume.data_offset + 3 * BPS, 988),
+        ]
+        volume.extract(entry, tmp_path / "out.bin")
+    assert (tmp_path / "out.bin").read_bytes() == data
+
+
+def test_exfat_deleted_entry_set(exfat_image, tmp_path):
+    image, payloads = exfat_image
+    with open_fat_volume(image) as volume:
+        assert volume.fs_type == "exFAT"
+        entries = {entry.name: entry for entry in volume.iter_entries()}
+        photo = entries["holiday photo.jpg"]
+        assert photo.deleted and photo.contiguous
+        assert photo.mtime == 1710512590 - 3600  # local +01:00 → UTC
+        volume.extract(photo, tmp_path / "photo.jpg")
+        volume.extract(entries["note.txt"], tmp_path / "note.txt")
+
+    assert (tmp_path / "photo.jpg").read_bytes() == payloads["photo"]
+    assert (tmp_path / "note.txt").read_bytes() == payloads["note"]
+
+
+# ── integration ───────────────────────────────────────────────────────────────
+
+
+def test_recover_deleted_uses_native_walker(fat16_image, tmp_path):
+    image, payloads = fat16_image
+    out = tmp_path / "recovered"
+    with patch("frece.toolrunner.ToolRunner._spawn", side_effect=AssertionError("no fls/icat")):
+        recovered = DeletedFileRecovery().recover_deleted(image, out)
+
+    by_name = {item.original_name: item for item in recovered}
+    assert set(by_name) == {"Long Name Photo.jpg", "_ECRET.PDF"}
+    assert by_name["Long Name Photo.jpg"].file_type == "jpeg"
+    assert by_name["Long Name Photo.jpg"].sha256 == hashlib.sha256(payloads["photo"]).hexdigest()
+    assert Path(by_name["_ECRET.PDF"].output_path).read_bytes() == payloads["secret"]
+    assert (out / "recovery_manifest.json").exists()
+
+
+def test_recover_native_skips_bad_sectors(fat16_image, tmp_path):
+    image, _ = fat16_image
+    with open_fat_volume(image) as volume:
+        bad_start = volume.data_offset + 8 * BPS
+    mapfile = tmp_path / "rescue.map"
+    mapfile.write_text(f"0x{bad_start:x} 0x200 -\n", encoding="utf-8")
+
+    recovered = DeletedFileRecovery().recover_deleted(image, tmp_path / "out", mapfile_path=mapfile)
+    assert [item.original_name for item in recovered] == ["_ECRET.PDF"]
+
+
+def test_scan_deleted_native(fat16_image):
+    image, _ = fat16_image
+    entries = DeletedFileRecovery().scan_deleted(image)
+    assert {entry.name for entry in entries} == {"Long Name Photo.jpg", "DOCS/_ECRET.PDF"}
+    assert all(not entry.allocated for entry in entries)
+
+
+def test_extract_trash_from_fat_image_without_sleuthkit(fat16_image, tmp_path):
+    image, _ = fat16_image
+    tr = TrashRecovery()
+    with patch("frece.trash.shutil.which", return_value=None):
+        roots = tr.extract_trash_from_image(image, tmp_path / "staging")
+
+    assert roots == [tmp_path / "staging" / "$RECYCLE.BIN" / "S-1-5-21"]
+    assert (roots[0] / "$RABC.TXT").read_bytes() == b"hello world\n"
+
+
+def test_extract_trash_honors_native_fat_off(fat16_image, tmp_path):
+    image, _ = fat16_image
+    tr = TrashRecovery(config=Config(native_fat=False))
+    with patch("frece.trash.shutil.which", return_value=None), \
+            pytest.raises(RecoveryError, match="Sleuth Kit"):
+        tr.extract_trash_from_image(image, tmp_path / "staging")
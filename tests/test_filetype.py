@@ -0,0 +1,128 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the compiled header dispatch table (frece.filetype)."""
+
+import struct
+
+import pytest
+
+from frece import filetype
+from frece.filetype import detect_file_type, detect_mime, detect_path_type, match_signature
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF", "jpeg"),
+        (b"\x89PNG\r\n\x1a\n" + b"\x00" * 8, "png"),
+        (b"%PDF-1.7\n", "pdf"),
+        (b"SQLite format 3\x00" + b"\x00" * 16, "sqlite"),
+        (b"\xd4\xc3\xb2\xa1\x02\x00\x04\x00", "pcap"),
+        (b"II*\x00\x08\x00\x00\x00", "tiff"),
+        (b"MZ\x90\x00", "pe"),
+        (b"\x7fELF\x02\x01\x01", "elf"),
+        (b"ElfFile\x00", "evtx"),
+        (b"L\x00\x00\x00\x01\x14\x02\x00", "lnk"),
+        (b"\xca\xfe\xba\xbe", "macho"),
+        (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "ole"),
+        (b"Rar!\x1a\x07\x01\x00", "rar"),
+        (b"#!/bin/sh\n", "script"),
+        (b"#!/usr/bin/env python3\n", "py"),
+        (b"<!doctype html>", "html"),
+        (b"From - Mon Jan 1", "mbox"),
+        (b"From alice@example.org", "eml"),
+    ],
+)
+def test_header_signatures(header, expected):
+    assert detect_file_type(header) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        b"PAGE 1 of 3",
+        b"FILE: notes",
+        b"FORM 1040 instructions",
+        b"BMW quarterly report, all figures in EUR",
+        b"MZ is my initials",
+        b"MAC address list",
+        b"0\x82 not a certificate",
+        b"\xff\xfb\xff text",
+    ],
+)
+def test_text_with_short_binary_magic_is_not_misclassified(text, monkeypatch):
+    monkeypatch.setattr(filetype, "_magic", None)
+    assert match_signature(text) is None
+    assert detect_file_type(text) == "bin"
+
+
+def test_weak_magics_with_valid_structure_still_match():
+    bmp = b"BM" + struct.pack("<IHHI", 70, 0, 0, 54) + struct.pack("<I", 40) + b"\x00" * 40
+    pe = b"MZ" + b"\x00" * 0x3A + struct.pack("<I", 0x40) + b"PE\x00\x00"
+    assert match_signature(bmp) == "bmp"
+    assert match_signature(pe) == "pe"
+    assert match_signature(b"FORM\x00\x00\x10\x00AIFF") == "aiff"
+    assert match_signature(b"\xff\xfb\x90\x64") == "mp3"
+
+
+def test_longest_prefix_wins():
+    assert match_signature(b"Rar!\x1a\x07\x00") == "rar"
+    assert match_signature(b"#!/usr/bin/perl\n") == "pl"
+
+
+@pytest.mark.parametrize(
+    "form, expected", [(b"WAVE", "wav"), (b"AVI ", "avi"), (b"WEBP", "webp"), (b"XXXX", "riff")]
+)
+def test_riff_resolver(form, expected):
+    assert detect_file_type(b"RIFF" + struct.pack("<I", 100) + form) == expected
+
+
+@pytest.mark.parametrize(
+    "brand, expected", [(b"qt  ", "mov"), (b"isom", "mp4"), (b"heic", "heic"), (b"abcd", "mp4")]
+)
+def test_ftyp_resolver_at_offset(brand, expected):
+    # box size 0x10 is not one of the carver's fixed ftyp prefixes
+    assert detect_file_type(b"\x00\x00\x00\x10ftyp" + brand + b"\x00" * 8) == expected
+
+
+def test_zip_resolver(sample_docx_data):
+    assert detect_file_type(sample_docx_data) == "docx"
+    assert detect_file_type(b"PK\x03\x04" + b"\x00" * 26 + b"notes.txt") == "zip"
+
+
+def test_tar_offset_signature():
+    header = b"file.txt".ljust(257, b"\x00") + b"ustar\x0000"
+    assert detect_file_type(header) == "tar"
+
+
+def test_unknown_without_libmagic(monkeypatch):
+    monkeypatch.setattr(filetype, "_magic", None)
+    assert detect_file_type(b"plain words, nothing else") == "bin"
+    assert detect_file_type(b"") == "bin"
+
+
+def test_libmagic_handle_is_reused_per_thread(monkeypatch):
+    created = []
+
+    class FakeMagic:
+        def __init__(self, mime=False):
+            created.append(mime)
+
+        def from_buffer(self, data):
+            return "ASCII text"
+
+    monkeypatch.setattr(filetype, "_magic", type("M", (), {"Magic": FakeMagic}))
+    monkeypatch.setattr(filetype, "_local", filetype.threading.local())
+    assert detect_file_type(b"hello") == "txt"
+    assert detect_file_type(b"world") == "txt"
+    assert detect_file_type(b"%PDF-1.4") == "pdf"  # table hit: no libmagic call
+    assert created == [False]
+
+
+def test_path_helpers(tmp_path, monkeypatch):
+    monkeypatch.setattr(filetype, "_magic", None)
+    image = tmp_path / "x"
+    image.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+    assert detect_path_type(image) == "png"
+    assert detect_mime(image) == "image/png"
+    assert detect_path_type(tmp_path / "missing") == "bin"
+    assert detect_mime(tmp_path / "missing") is None
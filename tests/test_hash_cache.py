@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the persistent digest cache (frece.hash_cache)."""
+
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from frece.acquisition import EvidenceAcquisition
+from frece.config import Config
+from frece.errors import FreceError
+from frece.hash_cache import HashCache
+from frece.parallel import ParallelProcessor
+from frece.trash import TrashRecovery
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with HashCache(tmp_path / "cache" / "hashes.db") as hash_cache:
+        yield hash_cache
+
+
+def _evidence(tmp_path, data=b"evidence " * 1000):
+    path = tmp_path / "evidence.bin"
+    path.write_bytes(data)
+    return path
+
+
+class TestHashCache:
+    def test_second_digest_is_served_from_cache(self, cache, tmp_path):
+        path = _evidence(tmp_path)
+        expected = hashlib.sha256(path.read_bytes()).hexdigest()
+        assert cache.digest(path) == (expected, 9000)
+        with patch("frece.hash_cache.hash_path", side_effect=AssertionError("re-read")):
+            assert cache.digest(path) == (expected, 9000)
+        assert cache.stats()["hits"] == 1
+
+    def test_modified_file_is_rehashed(self, cache, tmp_path):
+        path = _evidence(tmp_path)
+        cache.digest(path)
+        path.write_bytes(b"tampered")
+        assert cache.digest(path)[0] == hashlib.sha256(b"tampered").hexdigest()
+
+    def test_restored_mtime_still_misses(self, cache, tmp_path):
+        path = _evidence(tmp_path)
+        st = os.stat(path)
+        cache.digest(path)
+        path.write_bytes(b"x" * 9000)  # same size
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert cache.digest(path)[0] == hashlib.sha256(b"x" * 9000).hexdigest()
+
+    def test_strict_always_rereads(self, tmp_path):
+        path = _evidence(tmp_path)
+        db = tmp_path / "hashes.db"
+        with HashCache(db) as warm:
+            warm.digest(path)
+        with HashCache(db, strict=True) as strict:
+            strict.digest(path)
+            assert strict.stats() == {"hits": 0, "misses": 1, "hit_rate": 0.0, "strict": True}
+
+    def test_invalidate(self, cache, tmp_path):
+        path = _evidence(tmp_path)
+        cache.digest(path)
+        assert cache.invalidate(path) == 1
+        assert cache.invalidate() == 0
+
+
+    def test_broken_database_falls_back_to_hashing(self, tmp_path):
+        db = tmp_path / "hashes.db"
+        path = _evidence(tmp_path)
+        with HashCache(db) as cache:
+            expected = cache.digest(path)
+        db.write_bytes(b"not a database" * 100)
+        with HashCache(db) as cache:
+            st = cache.identity(path)
+            with pytest.raises(FreceError):
+                cache.get(st, ("sha256",))
+            assert cache.digest(path) == expected
+            assert cache.digest(path) == expected
+            assert cache.get(st, ("sha256",)) is None  # disabled after the failure
+
+
+class TestCacheUsers:
+    def test_hash_file_reports_cached(self, cache, tmp_path):
+        path = _evidence(tmp_path)
+        acquisition = EvidenceAcquisition(config=Config(case_root=tmp_path), hash_cache=cache)
+        first = acquisition.hash_file(path, algorithms=("sha256", "md5"))
+        second = acquisition.hash_file(path, algorithms=("sha256", "md5"))
+        assert not first["cached"] and second["cached"]
+        assert second["md5"] == first["md5"] == hashlib.md5(path.read_bytes()).hexdigest()
+        assert second["size_bytes"] == 9000
+        # an algorithm never cached forces a full read
+        assert not acquisition.hash_file(path, algorithms=("sha1",))["cached"]
+
+    def test_parallel_hashing_uses_cache(self, cache, tmp_path):
+        files = []
+        for n in range(5):
+            path = tmp_path / f"f{n}"
+            path.write_bytes(bytes([n]) * 100)
+            files.append(path)
+        processor = ParallelProcessor(hash_cache=cache)
+        first = processor.hash_files_parallel(files, max_workers=3)
+        second = processor.hash_files_parallel(files, max_workers=3)
+        assert first == second
+        assert cache.stats()["hits"] == 5
+
+    def test_trash_hash_and_size_uses_cache(self, cache, tmp_path):
+        path = _evidence(tmp_path)
+        trash = TrashRecovery(hash_cache=cache)
+        assert trash._hash_and_size(path) == trash._hash_and_size(path)
+        assert cache.stats()["hits"] == 1
+
+    def test_hash_command_rereads_unless_use_cache(self, tmp_path, capsys):
+        import json
+
+        from frece.cli import main
+
+        path = _evidence(tmp_path)
+        config = Config(case_root=tmp_path, cache_dir=tmp_path / "cache")
+        results = []
+        with patch("frece.cli.load_config", return_value=config):
+            for extra in ([], [], ["--use-cache"]):
+                assert main(["hash", str(path), *extra]) == 0
+                results.append(json.loads(capsys.readouterr().out))
+        assert [result["cached"] for result in results] == [False, False, True]
+
+    def test_broken_cache_does_not_abort_trash_listing(self, tmp_path):
+        db = tmp_path / "hashes.db"
+        db.write_bytes(b"not a database" * 100)
+        path = _evidence(tmp_path)
+        with HashCache(db) as cache:
+            trash = TrashRecovery(hash_cache=cache)
+            data = path.read_bytes()
+            assert trash._hash_and_size(path) == (hashlib.sha256(data).hexdigest(), len(data))
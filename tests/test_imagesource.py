@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the ImageSource abstraction (frece.imagesource)."""
+
+import io
+
+import pytest
+
+from frece.acquisition import EvidenceAcquisition
+from frece.carver import StreamingCarver
+from frece.ewf import open_image, open_source
+from frece.imagesource import (
+    ImageSource,
+    RawImageSource,
+    SplitRawImageSource,
+    open_raw_source,
+    split_segments,
+)
+
+
+def _write_split(directory, data, segment_size, stem="disk"):
+    for number, start in enumerate(range(0, len(data), segment_size), start=1):
+        (directory / f"{stem}.{number:03d}").write_bytes(data[start:start + segment_size])
+    return directory / f"{stem}.001"
+
+
+@pytest.fixture
+def media():
+    return bytes(range(256)) * 40  # 10 KiB
+
+
+class _Sparse(ImageSource):
+    """In-memory source whose zero runs are declared as holes."""
+
+    def __init__(self, data, holes):
+        self.path = "sparse"
+        self.segments = []
+        self.size = len(data)
+        self._data = data
+        self._holes = holes
+
+    def pread(self, length, offset):
+        return self._data[offset:offset + max(length, 0)]
+
+    def holes(self):
+        return self._holes
+
+
+class TestSplitSegments:
+    def test_discovers_consecutive_segments(self, tmp_path, media):
+        first = _write_split(tmp_path, media, 4096)
+        (tmp_path / "disk.005").write_bytes(b"orphan")  # gap after .003
+        assert [p.name for p in split_segments(first)] == ["disk.001", "disk.002", "disk.003"]
+
+    def test_plain_path_is_one_segment(self, tmp_path):
+        assert split_segments(tmp_path / "disk.dd") == [tmp_path / "disk.dd"]
+
+
+class TestRawSources:
+    def test_raw_pread_and_size(self, tmp_path, media):
+        path = tmp_path / "disk.dd"
+        path.write_bytes(media)
+        with open_raw_source(path) as source:
+            assert isinstance(source, RawImageSource)
+            assert source.size == len(media)
+            assert source.pread(10, 250) == media[250:260]
+            assert source.pread(10, len(media)) == b""
+
+    def test_split_reads_across_segments(self, tmp_path, media):
+        first = _write_split(tmp_path, media, 3000)
+        with open_raw_source(first) as source:
+            assert isinstance(source, SplitRawImageSource)
+            assert source.size == len(media)
+            assert source.pread(100, 2950) == media[2950:3050]
+            assert source.pread(len(media), 0) == media
+            buffer = bytearray(6500)
+            assert source.readinto(buffer, 2000) == 6500
+            assert bytes(buffer) == media[2000:8500]
+
+    def test_open_gives_seekable_stream(self, tmp_path, media):
+        with open_raw_source(_write_split(tmp_path, media, 1000)) as source:
+            with source.open() as handle:
+                handle.seek(2995)
+                assert handle.read(10) == media[2995:3005]
+                handle.seek(-4, io.SEEK_END)
+                assert handle.read() == media[-4:]
+
+    def test_iter_extents_covers_media(self, tmp_path, media):
+        with open_raw_source(_write_split(tmp_path, media, 3000)) as source:
+            extents = list(source.iter_extents(block_size=4096))
+        assert [offset for offset, _ in extents] == [0, 4096, 8192]
+        assert b"".join(data for _, data in extents) == media
+
+    def test_iter_extents_skips_holes(self):
+        data = b"A" * 100 + b"\x00" * 300 + b"B" * 50
+        source = _Sparse(data, [(100, 300)])
+        extents = list(source.iter_extents(block_size=64, skip_holes=True))
+        assert b"".join(d for _, d in extents) == b"A" * 100 + b"B" * 50
+        assert [offset for offset, _ in extents] == [0, 64, 400]
+        assert b"".join(d for _, d in source.iter_extents(block_size=64)) == data
+
+
+class TestConsumers:
+    def test_open_image_source_for_split_raw(self, tmp_path, media):
+        first = _write_split(tmp_path, media, 4000)
+        with open_image(first) as handle:
+            assert handle.image_info["format"] == "split-raw"
+            assert handle.image_info["size_bytes"] == len(media)
+            assert handle.source.size == len(media)
+            assert handle.raw_path == first
+
+    def test_carve_split_image_in_place(self, tmp_path, sample_jpeg_data):
+        data = b"\x00" * 4090 + sample_jpeg_data + b"\x00" * 4000
+        first = _write_split(tmp_path, data, 4096)
+        with open_source(first) as source:
+            manifest = StreamingCarver(chunk_size=4096).carve(
+                source, tmp_path / "carved", verify=False
+            )
+        jpeg = next(f for f in manifest.carved_files if f.file_type == "jpeg")
+        assert jpeg.offset == 4090
+        carved = tmp_path / "carved" / f"{jpeg.offset:016x}_jpeg"
+        assert carved.read_bytes() == sample_jpeg_data
+
+    def test_hash_file_hashes_logical_media(self, tmp_path, media):
+        whole = tmp_path / "whole.dd"
+        whole.write_bytes(media)
+        first = _write_split(tmp_path, media, 3000)
+        acquisition = EvidenceAcquisition()
+        with open_source(first) as source:
+            split = acquisition.hash_file(source, algorithms=("sha256",))
+        assert split["sha256"] == acquisition.hash_file(whole, algorithms=("sha256",))["sha256"]
+        assert split["size_bytes"] == len(media)
+        assert split["source"] == str(first)
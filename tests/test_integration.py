@@ -282,7 +282,7 @@ class TestIntegration:
         img.write_bytes(b"\x00" * 512)
 
         monkeypatch.setattr(
-            "frece.recovery.subprocess.Popen",
+            "frece.toolrunner.ToolRunner._spawn",
             lambda *args, **kwargs: (_ for _ in ()).throw(FileNotFoundError()),
         )
 
@@ -0,0 +1,140 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the custody key agent (frece.keyagent)."""
+
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from frece import custody, keyagent
+
+pytestmark = pytest.mark.skipif(not keyagent.AGENT_SUPPORTED, reason="needs AF_UNIX")
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    # Unix socket paths are limited to ~100 bytes, so avoid pytest's long tmp_path.
+    base = Path(tempfile.mkdtemp(prefix="fa"))
+    path = base / "agent" / "agent.sock"
+    monkeypatch.setenv(keyagent.SOCKET_ENV, str(path))
+    yield path
+    shutil.rmtree(base, ignore_errors=True)
+
+
+@pytest.fixture
+def agent(socket_path):
+    server = keyagent.KeyAgentServer(socket_path, ttl=60)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def test_no_agent_means_every_lookup_misses(socket_path):
+    assert keyagent.agent_key("x") is None
+    assert keyagent.remember_key("x", b"k" * 32, "pw") is False
+    assert keyagent.agent_status() is None
+
+
+def test_socket_and_directory_are_private(agent, socket_path):
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(socket_path.parent).st_mode) == 0o700
+
+
+def test_remembered_key_is_returned_and_passphrase_checked(agent):
+    key = os.urandom(32)
+    identifier = keyagent.key_id(b"salt", 20, 8, 1)
+
+    assert keyagent.remember_key(identifier, key, "correct horse")
+    assert keyagent.agent_key(identifier) == key
+    assert keyagent.agent_key(identifier, "correct horse") == key
+    assert keyagent.agent_key(identifier, "wrong") is None
+    assert keyagent.agent_status()["keys"] == 1
+
+
+@pytest.mark.parametrize("target, mode", [("dir", 0o755), ("socket", 0o666)])
+def test_client_refuses_agent_that_is_not_private(agent, socket_path, target, mode):
+    identifier = keyagent.key_id(b"salt", 20, 8, 1)
+    keyagent.remember_key(identifier, os.urandom(32), "pw")
+    os.chmod(socket_path.parent if target == "dir" else socket_path, mode)
+
+    assert keyagent.agent_key(identifier) is None
+    assert keyagent.remember_key(identifier, os.urandom(32), "pw") is False
+    assert agent.dispatch({"op": "status"})["keys"] == 1
+
+
+def test_client_refuses_symlinked_socket(agent, socket_path, monkeypatch):
+    link = socket_path.parent / "link.sock"
+    link.symlink_to(socket_path)
+    monkeypatch.setenv(keyagent.SOCKET_ENV, str(link))
+
+    assert keyagent.agent_status() is None
+
+
+def test_malformed_reply_is_a_miss(monkeypatch):
+    monkeypatch.setattr(keyagent, "_request", lambda *a: {"ok": True, "key": "00" * 32})
+    assert keyagent.agent_key("x") is None
+    monkeypatch.setattr(keyagent, "_request", lambda *a: {"ok": True, "key": "zz", "check": ""})
+    assert keyagent.agent_key("x") is None
+
+
+def test_keys_expire_after_ttl(agent):
+    agent.ttl = 0.1
+    identifier = keyagent.key_id(b"salt", 20, 8, 1)
+    keyagent.remember_key(identifier, os.urandom(32), "pw")
+
+    time.sleep(0.2)
+
+    assert keyagent.agent_key(identifier) is None
+    assert keyagent.agent_status()["keys"] == 0
+
+
+def test_stop_removes_socket(socket_path):
+    server = keyagent.KeyAgentServer(socket_path, ttl=60)
+    thread = threading.Thread(target=keyagent.KeyAgentServer.serve_forever, args=(server,))
+    thread.start()
+
+    assert keyagent.stop_agent()
+    thread.join(timeout=5)
+    server.server_close()
+
+    assert not socket_path.exists()
+    assert keyagent.agent_status() is None
+
+
+def test_start_agent_runs_background_process(socket_path):
+    status = keyagent.start_agent(ttl=30)
+    try:
+        assert status["ttl"] == 30
+        assert keyagent.start_agent(ttl=30)["pid"] == status["pid"]
+    finally:
+        assert keyagent.stop_agent()
+
+
+def test_custody_reencrypt_skips_kdf_with_agent(agent, temp_dir, monkeypatch):
+    pytest.importorskip("cryptography")
+    monkeypatch.setattr(custody, "_SCRYPT_LOG2_N", 14)
+    db_path = temp_dir / "custody.db"
+    db_path.write_bytes(b"first")
+    enc = custody.encrypt_custody_db(db_path, "pw")
+
+    derivations = []
+    real_derive = custody._derive_key
+    monkeypatch.setattr(
+        custody, "_derive_key", lambda *a: derivations.append(a) or real_derive(*a)
+    )
+    db_path.write_bytes(b"first+appended")
+    custody.encrypt_custody_db(db_path, None)
+    out = custody.decrypt_custody_db(enc, None, output_path=temp_dir / "out.db")
+
+    assert out.read_bytes() == b"first+appended"
+    assert derivations == []
+    with pytest.raises(custody.CustodyError):
+        custody.decrypt_custody_db(enc, "wrong", output_path=temp_dir / "bad.db")
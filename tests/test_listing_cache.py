@@ -0,0 +1,176 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the cached fls listings (frece.listing_cache)."""
+
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from frece.errors import RecoveryError
+from frece.listing_cache import ListingCache
+from frece.recovery import DeletedFileRecovery
+from frece.trash import TrashRecovery
+
+FLS_SAMPLE = [
+    "r/r * 12345:\tDELETED_FILE.jpg",
+    "r/r * 67890:\tpasswords.txt",
+    "d/d * 111:\tdeleted_folder",
+]
+
+BODY_SAMPLE = [
+    "0|/docs/report.pdf|100-128-1|r/rrw-r--r--|0|0|2048|1700000000|1700000100|1700000200|0",
+    "0|/docs/old.doc (deleted)|101-128-1|r/rrw-r--r--|0|0|512|1600000000|1600000100|0|0",
+]
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "evidence.dd"
+    path.write_bytes(b"\x00" * 4096)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ListingCache(tmp_path / "cache" / "listings.db")
+
+
+def _rows(count):
+    return [(i, str(i), "r", f"file{i}", False, i, 0, 0, 0, 0) for i in range(count)]
+
+
+class TestListingCache:
+    def test_second_read_replays_without_building(self, cache, image):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return iter(_rows(3))
+
+        first = list(cache.rows(image, 0, "deleted", build))
+        second = list(cache.rows(image, 0, "deleted", build))
+
+        assert first == second == _rows(3)
+        assert len(calls) == 1
+
+    def test_key_includes_offset_and_variant(self, cache, image):
+        list(cache.rows(image, 0, "deleted", lambda: iter(_rows(1))))
+        assert list(cache.rows(image, 2048, "deleted", lambda: iter(_rows(2)))) == _rows(2)
+        assert list(cache.rows(image, 0, "mactime", lambda: iter(_rows(3)))) == _rows(3)
+
+    def test_modified_image_is_rewalked(self, cache, image):
+        list(cache.rows(image, 0, "deleted", lambda: iter(_rows(1))))
+        stat = image.stat()
+        os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert list(cache.rows(image, 0, "deleted", lambda: iter(_rows(2)))) == _rows(2)
+        assert cache.list_listings()[0]["entries"] == 2
+
+    def test_failed_walk_is_not_cached(self, cache, image):
+        def failing():
+            yield _rows(1)[0]
+            raise RecoveryError("fls failed")
+
+        with pytest.raises(RecoveryError):
+            list(cache.rows(image, 0, "deleted", failing))
+        assert cache.list_listings() == []
+
+    def test_abandoned_walk_is_not_cached(self, cache, image):
+        rows = cache.rows(image, 0, "deleted", lambda: iter(_rows(10)))
+        next(rows)
+        rows.close()
+        assert cache.list_listings() == []
+
+    def test_cache_is_writable_during_a_walk(self, cache, image, tmp_path):
+        other = tmp_path / "other.dd"
+        other.write_bytes(b"\x01" * 10)
+        rows = cache.rows(image, 0, "deleted", lambda: iter(_rows(10)))
+        next(rows)
+        # A second command caching its own listing must not wait on the walk.
+        list(ListingCache(cache.db_path).rows(other, 0, "deleted", lambda: iter(_rows(1))))
+        assert list(rows) == _rows(10)[1:]
+        assert sorted(item["entries"] for item in cache.list_listings()) == [1, 10]
+
+    def test_broken_cache_falls_back_to_walking(self, cache, image, caplog):
+        cache.db_path.parent.mkdir(parents=True)
+        cache.db_path.write_bytes(b"not a database" * 100)
+        assert list(cache.rows(image, 0, "deleted", lambda: iter(_rows(3)))) == _rows(3)
+        assert "walking without it" in caplog.text
+
+    def test_walk_is_staged_in_batches(self, cache, image):
+        with patch("frece.listing_cache._BATCH", 2):
+            rows = cache.rows(image, 0, "deleted", lambda: iter(_rows(7)))
+            for _ in range(5):
+                next(rows)
+            conn = sqlite3.connect(cache.db_path)
+            staged = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            conn.close()
+            assert staged == 4
+            assert cache.list_listings() == []  # not visible until swapped in
+            assert list(rows) == _rows(7)[5:]
+        assert [item["entries"] for item in cache.list_listings()] == [7]
+        assert list(cache.rows(image, 0, "deleted", lambda: iter([]))) == _rows(7)
+
+    def test_invalidate_one_image(self, cache, image, tmp_path):
+        other = tmp_path / "other.dd"
+        other.write_bytes(b"\x01" * 10)
+        list(cache.rows(image, 0, "deleted", lambda: iter(_rows(1))))
+        list(cache.rows(other, 0, "deleted", lambda: iter(_rows(1))))
+
+        assert cache.invalidate(image) == 1
+        assert [item["image"] for item in cache.list_listings()] == [str(other.resolve())]
+        assert cache.invalidate() == 1
+
+    def test_missing_image_bypasses_cache(self, cache, tmp_path):
+        rows = list(cache.rows(tmp_path / "gone.dd", 0, "deleted", lambda: iter(_rows(2))))
+        assert rows == _rows(2)
+        assert not cache.db_path.exists()
+
+
+class TestRecoveryUsesCache:
+    def test_scan_deleted_walks_once(self, cache, image):
+        recovery = DeletedFileRecovery(listing_cache=cache)
+        with patch.object(
+            recovery, "_iter_fls_lines", side_effect=lambda *_: iter(FLS_SAMPLE)
+        ) as walk:
+            first = recovery.scan_deleted(image)
+            second = recovery.scan_deleted(image)
+
+        assert walk.call_count == 1
+        assert first == second
+        assert {entry.name for entry in second} == {
+            "DELETED_FILE.jpg", "passwords.txt", "deleted_folder",
+        }
+
+    def test_mactime_listing_serves_deleted_and_all(self, cache, image):
+        recovery = DeletedFileRecovery(listing_cache=cache)
+        with patch.object(
+            recovery, "_iter_fls_mactime", side_effect=lambda *_: iter(BODY_SAMPLE)
+        ) as walk:
+            deleted = recovery.scan_mactime(image)
+            everything = recovery.scan_mactime(image, deleted_only=False)
+
+        assert walk.call_count == 1
+        assert [entry.name for entry in deleted] == ["docs/old.doc"]
+        assert [entry.allocated for entry in everything] == [True, False]
+
+
+class TestTrashWalk:
+    def test_parse_fls_path_line(self):
+        parse = TrashRecovery._parse_fls_path_line
+        assert parse("r/r 64-128-2:\t$Recycle.Bin/S-1/$IAB.txt") == (
+            "64-128-2", "$Recycle.Bin/S-1/$IAB.txt",
+        )
+        assert parse("r/r * 70:\t.Trash-1000/files/a.txt") == ("70", ".Trash-1000/files/a.txt")
+        assert parse("no tab here") is None
+
+    def test_cached_walk_replays_paths(self, cache, image):
+        tr = TrashRecovery(listing_cache=cache)
+        walked = [("64-128-2", "$Recycle.Bin/S-1/$IAB.txt")]
+        with patch.object(tr, "_fls_walk", side_effect=lambda *_: iter(walked)) as walk:
+            first = list(tr._cached_fls_walk(image, 0, 0))
+            second = list(tr._cached_fls_walk(image, 0, 0))
+
+        assert walk.call_count == 1
+        assert first == second == walked
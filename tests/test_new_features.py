@@ -11,6 +11,7 @@ from frece.classifier import (
     classify_file,
     shannon_entropy,
     entropy_label,
+    predict_priority,
 )
 from frece.timeline import (
     _events_from_carve_manifest,
@@ -141,6 +142,27 @@ class TestClassifyBytes:
         assert result.possibly_encrypted is False
 
 
+class TestPredictPriority:
+    def test_executable_extension_is_critical(self):
+        assert predict_priority("tools/dropper.exe") == "CRITICAL"
+
+    def test_database_and_email_are_high(self):
+        assert predict_priority("profile/History.sqlite3") == "HIGH"
+        assert predict_priority("mail/archive.pst") == "HIGH"
+
+    def test_user_documents_are_promoted(self):
+        assert predict_priority("Windows/notes.docx") == "MEDIUM"
+        assert predict_priority("Users/alice/Documents/notes.docx") == "HIGH"
+
+    def test_cache_paths_and_huge_files_are_demoted(self):
+        assert predict_priority("Users/alice/AppData/Local/Temp/x.sqlite") == "MEDIUM"
+        assert predict_priority("backup.pst", size=1 << 30) == "MEDIUM"
+
+    def test_unknown_extension_is_low(self):
+        assert predict_priority("$MFT") == "LOW"
+        assert predict_priority("movie.mkv") == "LOW"
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # timeline.py
 # ─────────────────────────────────────────────────────────────────────────────
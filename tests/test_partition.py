@@ -16,7 +16,7 @@ def test_list_partitions_parses_mmls_output(temp_dir):
         "001:  000:000  0002048  0004095  0002048  Linux (0x83)\n"
     )
 
-    with patch("frece.partition.subprocess.run") as mock_run:
+    with patch("frece.toolrunner.ToolRunner.run") as mock_run:
         mock_run.return_value = MagicMock(returncode=0, stdout=sample_output, stderr="")
         partitions = list_partitions(temp_dir / "disk.dd")
 
@@ -26,6 +26,6 @@ def test_list_partitions_parses_mmls_output(temp_dir):
 
 
 def test_list_partitions_missing_tool_raises(temp_dir):
-    with patch("frece.partition.subprocess.run", side_effect=FileNotFoundError()):
+    with patch("frece.toolrunner.ToolRunner.run", side_effect=FileNotFoundError()):
         with pytest.raises(RecoveryError, match="mmls"):
             list_partitions(temp_dir / "disk.dd")
@@ -0,0 +1,162 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for piece manifests and parallel piece verification (frece.pieces)."""
+
+import hashlib
+import io
+import json
+import os
+
+import pytest
+
+from frece.acquisition import EvidenceAcquisition
+from frece.cli import main
+from frece.config import Config
+from frece.container import ContainerImage, ContainerWriter
+from frece.errors import AcquisitionError
+from frece.imagesource import open_raw_source
+from frece.pieces import (
+    PieceHasher,
+    load_piece_manifest,
+    manifest_path_for,
+    merkle_root,
+    verify_pieces,
+    write_piece_manifest,
+)
+from frece.pipeline import CopyPipeline
+
+PIECE = 4096
+DATA = os.urandom(5 * PIECE + 100)
+
+
+def _manifest(tmp_path, data=DATA):
+    image = tmp_path / "disk.img"
+    image.write_bytes(data)
+    hasher = PieceHasher(PIECE)
+    hasher.update(data)
+    hasher.finish()
+    path = write_piece_manifest(hasher.manifest(image), manifest_path_for(image))
+    return image, path
+
+
+class TestPieceHasher:
+    def test_pieces_match_ranges_regardless_of_buffering(self):
+        hasher = PieceHasher(PIECE)
+        for start in range(0, len(DATA), 1000):
+            hasher.update(DATA[start:start + 1000])
+        digests = hasher.finish()
+        assert len(digests) == 6
+        assert digests[0] == hashlib.sha256(DATA[:PIECE]).hexdigest()
+        assert digests[-1] == hashlib.sha256(DATA[5 * PIECE:]).hexdigest()
+        assert hasher.size == len(DATA)
+
+    def test_as_pipeline_sink(self):
+        hasher = PieceHasher(PIECE)
+        result = CopyPipeline(buffer_size=3000).run(
+            io.BytesIO(DATA).readinto, sinks={"pieces": hasher.update}
+        )
+        reference = PieceHasher(PIECE)
+        reference.update(DATA)
+        assert hasher.finish() == reference.finish()
+        assert result.throughput()["stages"]["pieces"]["bytes"] == len(DATA)
+
+    def test_merkle_root(self):
+        leaves = [hashlib.sha256(bytes([n])).hexdigest() for n in range(3)]
+        node = hashlib.sha256(
+            b"\x01" + bytes.fromhex(leaves[0]) + bytes.fromhex(leaves[1])
+        ).digest()
+        expected = hashlib.sha256(b"\x01" + node + bytes.fromhex(leaves[2])).hexdigest()
+        assert merkle_root(leaves) == expected
+        assert merkle_root(leaves[:1]) == leaves[0]
+        assert merkle_root([]) == hashlib.sha256(b"").hexdigest()
+
+
+class TestVerifyPieces:
+    def test_intact_image_verifies(self, tmp_path):
+        image, path = _manifest(tmp_path)
+        report = verify_pieces(image, load_piece_manifest(path), workers=3)
+        assert report["verified"] and report["merkle_root_ok"] and report["size_ok"]
+        assert report["corrupted"] == []
+
+    def test_reports_exact_corrupted_ranges(self, tmp_path):
+        image, path = _manifest(tmp_path)
+        damaged = bytearray(DATA)
+        damaged[PIECE + 7] ^= 0xFF
+        damaged[5 * PIECE + 1] ^= 0xFF
+        image.write_bytes(bytes(damaged))
+
+        report = verify_pieces(image, load_piece_manifest(path))
+        assert not report["verified"]
+        assert not report["merkle_root_ok"]
+        assert [(c["piece"], c["offset"], c["length"]) for c in report["corrupted"]] == [
+            (1, PIECE, PIECE),
+            (5, 5 * PIECE, 100),
+        ]
+
+    def test_truncated_image(self, tmp_path):
+        image, path = _manifest(tmp_path)
+        image.write_bytes(DATA[: 2 * PIECE])
+        report = verify_pieces(image, load_piece_manifest(path))
+        assert not report["size_ok"]
+        assert [c["piece"] for c in report["corrupted"]] == [2, 3, 4, 5]
+        assert report["corrupted"][0]["bytes_read"] == 0
+
+    def test_accepts_split_image_source(self, tmp_path):
+        image, path = _manifest(tmp_path)
+        (tmp_path / "split.001").write_bytes(DATA[:10000])
+        (tmp_path / "split.002").write_bytes(DATA[10000:])
+        with open_raw_source(tmp_path / "split.001") as source:
+            assert verify_pieces(source, load_piece_manifest(path))["verified"]
+
+    def test_unreadable_container_chunk_is_reported_per_piece(self, tmp_path):
+        data = b"frece " * (PIECE * 4 // 6)
+        _, path = _manifest(tmp_path, data)
+        container = tmp_path / "disk.frc"
+        with open(container, "wb") as out:
+            writer = ContainerWriter(out, chunk_size=PIECE)
+            writer.write(data)
+            writer.finish({})
+        with ContainerImage(container) as image:
+            offset, length, _ = image._entry(2)
+        with open(container, "r+b") as handle:
+            handle.seek(offset)
+            handle.write(bytes(length))
+
+        report = verify_pieces(container, load_piece_manifest(path))
+        assert not report["verified"]
+        assert [c["piece"] for c in report["corrupted"]] == [2]
+        assert "chunk 2" in report["corrupted"][0]["error"]
+        assert report["size_ok"] and not report["merkle_root_ok"]
+
+    def test_bad_manifest(self, tmp_path):
+        bad = tmp_path / "x.pieces.json"
+        bad.write_text(json.dumps({"version": 99}))
+        with pytest.raises(AcquisitionError):
+            load_piece_manifest(bad)
+        with pytest.raises(AcquisitionError):
+            load_piece_manifest(tmp_path / "missing.json")
+
+
+def test_acquire_device_writes_piece_manifest(tmp_path):
+    source = tmp_path / "disk.raw"
+    source.write_bytes(DATA)
+    output = tmp_path / "out.img"
+    config = Config(case_root=tmp_path / "cases", piece_size_mb=1)
+    metadata = EvidenceAcquisition(config=config).acquire_device(
+        str(source), output, writeblock_required=False, force_no_writeblock=True
+    )
+
+    manifest = load_piece_manifest(metadata["piece_manifest"])
+    assert manifest["sha256"] == hashlib.sha256(DATA).hexdigest()
+    assert manifest["merkle_root"] == metadata["merkle_root"]
+    assert manifest["pieces"] == [hashlib.sha256(DATA).hexdigest()]
+    assert verify_pieces(output, manifest)["verified"]
+
+
+def test_cli_verify_pieces_exit_code(tmp_path, capsys):
+    image, _ = _manifest(tmp_path)
+    assert main(["--no-banner", "hash", str(image), "--verify-pieces"]) == 0
+    capsys.readouterr()
+    image.write_bytes(b"\x00" * len(DATA))
+    assert main(["--no-banner", "hash", str(image), "--verify-pieces", "--workers", "2"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert len(report["corrupted"]) == 6
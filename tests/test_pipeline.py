@@ -0,0 +1,100 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the overlapped read/write/hash pipeline (frece.pipeline)."""
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from frece.acquisition import EvidenceAcquisition
+from frece.pipeline import CopyPipeline, ring_buffer_size
+
+DATA = os.urandom(3 * 65536 + 123)
+
+
+def _reader(data: bytes):
+    return io.BytesIO(data).readinto
+
+
+class TestCopyPipeline:
+    def test_copies_and_hashes_across_many_buffers(self):
+        dst = io.BytesIO()
+        pipeline = CopyPipeline(algorithms=("sha256", "md5", "sha1"), buffer_size=4096, depth=3)
+        result = pipeline.run(_reader(DATA), dst)
+
+        assert dst.getvalue() == DATA
+        assert result.bytes_processed == len(DATA)
+        for algorithm in ("sha256", "md5", "sha1"):
+            assert result.digests[algorithm] == hashlib.new(algorithm, DATA).hexdigest()
+
+    def test_hash_only_and_reusable(self):
+        pipeline = CopyPipeline(algorithms=("sha256",), buffer_size=1000)
+        first = pipeline.run(_reader(DATA))
+        second = pipeline.run(_reader(DATA))
+        assert first.digests == second.digests == {"sha256": hashlib.sha256(DATA).hexdigest()}
+
+    def test_empty_input(self):
+        result = CopyPipeline(algorithms=("md5",)).run(_reader(b""), io.BytesIO())
+        assert result.bytes_processed == 0
+        assert result.digests["md5"] == hashlib.md5(b"").hexdigest()
+
+    def test_throughput_reports_every_stage(self):
+        result = CopyPipeline(algorithms=("sha256", "md5"), buffer_size=8192).run(
+            _reader(DATA), io.BytesIO()
+        )
+        report = result.throughput()
+        assert set(report["stages"]) == {"read", "write", "sha256", "md5"}
+        assert all(stage["bytes"] == len(DATA) for stage in report["stages"].values())
+        assert report["mb_per_s"] > 0
+
+    def test_progress_sees_running_total(self):
+        seen = []
+        CopyPipeline(buffer_size=65536).run(_reader(DATA), progress=seen.append)
+        assert seen == sorted(seen)
+        assert seen[-1] == len(DATA)
+
+    def test_writer_failure_is_raised(self):
+        class FullDisk(io.BytesIO):
+            def write(self, data):
+                raise OSError(28, "No space left on device")
+
+        with pytest.raises(OSError, match="No space left"):
+            CopyPipeline(buffer_size=4096, depth=2).run(_reader(DATA), FullDisk())
+
+    def test_reader_failure_is_raised(self):
+        calls = []
+
+        def flaky(view):
+            calls.append(1)
+            if len(calls) == 3:
+                raise OSError(5, "Input/output error")
+            view[:10] = b"x" * 10
+            return 10
+
+        with pytest.raises(OSError, match="Input/output"):
+            CopyPipeline(buffer_size=4096).run(flaky, io.BytesIO())
+
+    def test_unsupported_algorithm(self):
+        with pytest.raises(ValueError):
+            CopyPipeline(algorithms=("nope",))
+
+    def test_ring_buffer_size_respects_budget(self):
+        assert ring_buffer_size(64 << 20, 64 << 20, depth=4) == 16 << 20
+        assert ring_buffer_size(2 << 20, 64 << 20) == 2 << 20
+        assert ring_buffer_size(64 << 20, 1024) == 1 << 20  # floor
+
+
+def test_acquire_device_reports_stage_throughput(tmp_path):
+    source = tmp_path / "disk.raw"
+    source.write_bytes(DATA)
+    output = tmp_path / "out.img"
+    metadata = EvidenceAcquisition().acquire_device(
+        str(source), output, writeblock_required=False, force_no_writeblock=True
+    )
+
+    assert output.read_bytes() == DATA
+    assert metadata["md5"] == hashlib.md5(DATA).hexdigest()
+    assert set(metadata["throughput"]["stages"]) == {
+        "read", "write", "sha256", "md5", "pieces"
+    }
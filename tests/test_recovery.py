@@ -1,12 +1,20 @@
 """Tests for DeletedFileRecovery scan + recover workflow."""
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+import sys
+from unittest.mock import patch
 
 import pytest
 
 from frece.errors import RecoveryError
-from frece.recovery import DeletedFileRecovery, RecoveredFile, ScannedEntry
+from frece.recovery import (
+    BadSectorIndex,
+    DdrescueMapParser,
+    DeletedFileRecovery,
+    RecoveredFile,
+    ScannedEntry,
+)
 
 
 FLS_SAMPLE = (
@@ -62,19 +70,17 @@ class TestScanDeleted:
         assert inodes[222] is True
 
     def test_scan_fls_not_found_raises(self, recovery, temp_dir):
-        with patch("frece.recovery.subprocess.Popen", side_effect=FileNotFoundError()):
+        with patch("frece.toolrunner.ToolRunner._spawn", side_effect=FileNotFoundError()):
             with pytest.raises(RecoveryError, match="fls"):
                 recovery.scan_deleted(temp_dir / "image.dd")
 
     def test_scan_fls_failure_raises(self, recovery, temp_dir):
-        fake_proc = MagicMock()
-        fake_proc.stdout = iter(())
-        fake_proc.stderr.read.return_value = "cannot open image"
-        fake_proc.returncode = 1
-        fake_proc.wait.return_value = 1
-
-        with patch("frece.recovery.subprocess.Popen", return_value=fake_proc):
-            with pytest.raises(RecoveryError):
+        async def failing_fls(command, **kwargs):
+            script = "import sys; sys.stderr.write('cannot open image'); sys.exit(1)"
+            return await asyncio.create_subprocess_exec(sys.executable, "-c", script, **kwargs)
+
+        with patch("frece.toolrunner.ToolRunner._spawn", side_effect=failing_fls):
+            with pytest.raises(RecoveryError, match="cannot open image"):
                 recovery.scan_deleted(temp_dir / "image.dd")
 
     def test_scan_deduplicates_inodes(self, recovery, temp_dir):
@@ -251,3 +257,189 @@ class TestRecoverDeleted:
         )
 
         assert output_path.name == "deleted_photo.jpg"
+
+
+class TestBadSectorIndex:
+    MAPFILE = (
+        "# Mapfile. Created by GNU ddrescue version 1.27\n"
+        "# current_pos  current_status  current_pass\n"
+        "0x00010000     +               1\n"
+        "#      pos        size  status\n"
+        "0x00000000  0x00001000  +\n"
+        "0x00001000  0x00000200  -\n"
+        "0x00001200  0x00000200  -\n"
+        "0x00001400  0x00002000  +\n"
+        "0x00003400  0x00000400  /\n"
+        "0x00003800  0x00000200  -\n"
+    )
+
+    @pytest.fixture
+    def index(self, temp_dir):
+        mapfile = temp_dir / "rescue.map"
+        mapfile.write_text(self.MAPFILE, encoding="utf-8")
+        return DdrescueMapParser.load_mapfile(mapfile)
+
+    def test_keeps_only_bad_ranges_merged(self, index):
+        assert list(index) == [(0x1000, 0x1400), (0x3800, 0x3A00)]
+
+    def test_overlap_queries(self, index):
+        assert index.overlaps(0x0, 0x1001)
+        assert not index.overlaps(0x0, 0x1000)
+        assert index.overlaps(0x13FF, 0x2000)
+        assert not index.overlaps(0x1400, 0x3800)
+        assert DdrescueMapParser.is_bad_sector(index, 0x3900)
+        assert not DdrescueMapParser.is_bad_sector(index, 0x3A00)
+
+    def test_bad_subranges_are_clipped(self, index):
+        assert index.bad_subranges(0x1200, 0x3900) == [(0x1200, 0x1400), (0x3800, 0x3900)]
+        assert index.bad_subranges(0x2000, 0x3000) == []
+
+    def test_legacy_list_input_still_supported(self):
+        legacy = [(0, 10, "+"), (10, 20, "-")]
+        assert DdrescueMapParser.overlaps_bad_sector(legacy, 15, 16)
+        assert not DdrescueMapParser.overlaps_bad_sector(legacy, 0, 10)
+
+    def test_missing_mapfile_is_empty(self, temp_dir):
+        index = DdrescueMapParser.load_mapfile(temp_dir / "nope.map")
+        assert isinstance(index, BadSectorIndex)
+        assert not index
+
+
+class TestRecoveryJournal:
+    @pytest.fixture
+    def recovery(self):
+        return DeletedFileRecovery()
+
+    @staticmethod
+    def _entries(*inodes):
+        return [
+            ScannedEntry(
+                inode=inode, inode_token=str(inode), entry_type="r",
+                name=f"{inode}.txt", allocated=False,
+            )
+            for inode in inodes
+        ]
+
+    @staticmethod
+    def _writing_extract(calls):
+        import hashlib
+
+        def fake_extract(image_path, inode, output_dir, **kwargs):
+            calls.append(inode)
+            if inode == 3:
+                raise RecoveryError("icat timed out", remediation="retry")
+            output = output_dir / f"{inode}.txt"
+            output.write_bytes(f"inode {inode}".encode())
+            return RecoveredFile(
+                inode=inode,
+                size=output.stat().st_size,
+                file_type="txt",
+                sha256=hashlib.sha256(output.read_bytes()).hexdigest(),
+                output_path=str(output),
+            )
+
+        return fake_extract
+
+    def test_journal_records_every_inode(self, recovery, temp_dir):
+        calls = []
+        with patch.object(recovery, "_list_deleted_entries", return_value=self._entries(1, 2, 3)):
+            with patch.object(recovery, "_extract_inode", side_effect=self._writing_extract(calls)):
+                recovery.recover_deleted(temp_dir / "img.dd", temp_dir / "out")
+
+        lines = (temp_dir / "out" / "recovery_journal.jsonl").read_text().splitlines()
+        statuses = {json.loads(line)["inode"]: json.loads(line)["status"] for line in lines}
+        assert statuses == {1: "recovered", 2: "recovered", 3: "failed"}
+
+    def test_resume_skips_intact_outputs_and_retries_the_rest(self, recovery, temp_dir):
+        first, second = [], []
+        entries = self._entries(1, 2, 3)
+        with patch.object(recovery, "_list_deleted_entries", return_value=entries):
+            with patch.object(recovery, "_extract_inode", side_effect=self._writing_extract(first)):
+                recovery.recover_deleted(temp_dir / "img.dd", temp_dir / "out")
+            (temp_dir / "out" / "2.txt").write_bytes(b"tampered")
+            with patch.object(
+                recovery, "_extract_inode", side_effect=self._writing_extract(second)
+            ):
+                results = recovery.recover_deleted(
+                    temp_dir / "img.dd", temp_dir / "out", resume=True
+                )
+
+        assert first == [1, 2, 3]
+        assert second == [2, 3]  # 1 is intact; 2 no longer matches its hash; 3 failed
+        assert sorted(item.inode for item in results) == [1, 2]
+        manifest = json.loads((temp_dir / "out" / "recovery_manifest.json").read_text())
+        assert manifest["recovered_count"] == 2
+
+    def test_fresh_run_resets_journal(self, recovery, temp_dir):
+        calls = []
+        out = temp_dir / "out"
+        out.mkdir()
+        (out / "recovery_journal.jsonl").write_text('{"inode": 1, "status": "recovered"}\n')
+        with patch.object(recovery, "_list_deleted_entries", return_value=self._entries(1)):
+            with patch.object(recovery, "_extract_inode", side_effect=self._writing_extract(calls)):
+                recovery.recover_deleted(temp_dir / "img.dd", out)
+
+        assert calls == [1]
+        assert len((out / "recovery_journal.jsonl").read_text().splitlines()) == 1
+
+    def test_truncated_journal_line_is_ignored(self, temp_dir):
+        from frece.recovery import RecoveryJournal
+
+        journal = RecoveryJournal(temp_dir)
+        journal.record_skipped(7)
+        with open(journal.path, "a", encoding="utf-8") as handle:
+            handle.write('{"inode": 8, "sta')
+        assert list(journal.load()) == [7]
+
+
+class TestPrioritizedRecovery:
+    @pytest.fixture
+    def recovery(self):
+        return DeletedFileRecovery()
+
+    def test_schedule_orders_tiers_then_size(self):
+        entries = [
+            ScannedEntry(1, "1", "r", "clip.mp4", False, size=10),
+            ScannedEntry(2, "2", "r", "big.exe", False, size=500),
+            ScannedEntry(3, "3", "r", "mail.pst", False, size=50),
+            ScannedEntry(4, "4", "r", "small.exe", False, size=5),
+        ]
+        tiers = DeletedFileRecovery._schedule_entries(entries)
+        assert [(tier, [e.inode for e in members]) for tier, members in tiers] == [
+            ("CRITICAL", [4, 2]),
+            ("HIGH", [3]),
+            ("LOW", [1]),
+        ]
+
+    def test_prioritized_run_writes_manifest_per_tier(self, recovery, temp_dir):
+        entries = [
+            ScannedEntry(1, "1", "r", "clip.mp4", False),
+            ScannedEntry(2, "2", "r", "tool.exe", False),
+        ]
+        extracted, manifests = [], []
+        real_export = recovery.export_recovery_manifest
+
+        def fake_extract(image_path, inode, output_dir, **kwargs):
+            extracted.append(inode)
+            return RecoveredFile(
+                inode=inode, size=1, file_type="bin", sha256="c" * 64,
+                output_path=str(output_dir / f"{inode}.bin"),
+            )
+
+        def spy_export(*args, **kwargs):
+            path = real_export(*args, **kwargs)
+            manifests.append(json.loads(path.read_text()))
+            return path
+
+        with patch.object(recovery, "_list_deleted_entries", return_value=entries):
+            with patch.object(recovery, "_extract_inode", side_effect=fake_extract):
+                with patch.object(recovery, "export_recovery_manifest", side_effect=spy_export):
+                    recovery.recover_deleted(
+                        temp_dir / "img.dd", temp_dir / "out", prioritize=True
+                    )
+
+        assert extracted == [2, 1]
+        assert [(m["complete"], m["completed_tiers"], m["recovered_count"]) for m in manifests] == [
+            (False, ["CRITICAL"], 1),
+            (True, ["CRITICAL", "LOW"], 2),
+        ]
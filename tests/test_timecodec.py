@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the shared timestamp codec (frece.timecodec)."""
+
+import calendar
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from frece import timecodec
+from frece.timecodec import (
+    civil_to_epoch,
+    epoch_to_iso,
+    epoch_us_to_iso,
+    epochs_to_iso,
+    filetime_to_iso,
+    filetimes_to_iso,
+    iso_to_epoch,
+    iso_to_epoch_us,
+    isos_to_epochs,
+    pdf_date_to_iso,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_matches_datetime_across_the_calendar():
+    rng = random.Random(5)
+    for _ in range(20_000):
+        us = rng.randrange(-62_135_596_800_000_000 + 1, 253_402_300_799_000_000)
+        expected = (_EPOCH + timedelta(microseconds=us)).isoformat().replace("+00:00", "Z")
+        assert epoch_us_to_iso(us) == expected
+        assert iso_to_epoch_us(expected) == us
+        assert iso_to_epoch_us(expected.replace("T", " ").rstrip("Z")) == us
+
+
+def test_parsing_falls_back_to_fromisoformat():
+    assert iso_to_epoch("2025-06-01T12:00") == 1_748_779_200
+    assert iso_to_epoch("2025-06-01T14:00:00+02:00") == 1_748_779_200
+    assert iso_to_epoch("2025-06-01T12:00:00.123456789Z") == 1_748_779_200
+    assert iso_to_epoch("2024-02-29T00:00:00Z") == 1_709_164_800
+    assert iso_to_epoch("2023-02-29T00:00:00Z", default=-1) == -1
+    assert iso_to_epoch("not a time") == 0
+    assert iso_to_epoch(None) == 0
+    with pytest.raises(ValueError):
+        iso_to_epoch_us("2025-13-01T00:00:00Z")
+
+
+def test_zero_and_out_of_range_format_as_empty():
+    assert epoch_to_iso(0) == ""
+    assert epoch_to_iso(1.5) == "1970-01-01T00:00:01.500000Z"
+    assert epoch_to_iso(10**12) == ""
+    assert filetime_to_iso(0) == ""
+
+
+def test_filetime_uses_integer_ticks():
+    ticks = 132_514_128_000_000_000 + 1_234_567
+    assert filetime_to_iso(ticks) == "2020-12-02T20:00:00.123456Z"
+    assert filetimes_to_iso([0, ticks]) == ["", "2020-12-02T20:00:00.123456Z"]
+
+
+def test_civil_to_epoch_matches_timegm_including_rollover():
+    rng = random.Random(9)
+    for _ in range(5_000):
+        fields = (rng.randrange(1980, 2108), rng.randrange(1, 13), rng.randrange(1, 32),
+                  rng.randrange(24), rng.randrange(60), rng.randrange(62))
+        assert civil_to_epoch(*fields) == calendar.timegm(fields + (0, 0, 0))
+
+
+def test_pdf_dates():
+    assert pdf_date_to_iso("D:20240102030405Z") == "2024-01-02T03:04:05Z"
+    assert pdf_date_to_iso("D:20240102030405+01'00'") == "2024-01-02T02:04:05Z"
+    assert pdf_date_to_iso("D:20240102030405-05'30") == "2024-01-02T08:34:05Z"
+    assert pdf_date_to_iso("D:2024") == "2024-01-01T00:00:00Z"
+    assert pdf_date_to_iso("D:20241302") is None
+    assert pdf_date_to_iso("2024 annual report") is None
+
+
+def test_batches_and_cache():
+    timecodec.clear_cache()
+    values = ["2025-01-01T00:00:00Z", "", "garbage", "2025-01-01T00:00:00Z"]
+    assert list(isos_to_epochs(values, default=-1)) == [1_735_689_600, -1, -1, 1_735_689_600]
+    assert iso_to_epoch_us.cache_info().hits >= 1
+    assert epochs_to_iso([1_735_689_600, 0]) == ["2025-01-01T00:00:00Z", ""]
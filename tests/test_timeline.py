@@ -0,0 +1,326 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the streaming timeline and the case timeline index (frece.timeline)."""
+
+import io
+import json
+import os
+import random
+import tracemalloc
+from unittest.mock import patch
+
+from frece import timeline
+from frece.timeline import (
+    EventBatch,
+    TimelineEvent,
+    TimelineIndex,
+    default_index_path,
+    events_to_csv,
+    events_to_text,
+    filter_events,
+    sort_events,
+    stream_timeline,
+    write_events,
+)
+
+
+def _event(epoch, source="filesystem", path="f"):
+    return TimelineEvent(
+        timestamp=f"t{epoch}",
+        timestamp_epoch=epoch,
+        event_source=source,
+        event_type="modified",
+        artifact_path=path,
+        artifact_type="file",
+        size_bytes=epoch,
+        inode=None,
+        notes="",
+    )
+
+
+def _body_file(path, count, seed=7):
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8") as handle:
+        for n in range(count):
+            t = rng.randrange(1_000_000, 2_000_000)
+            handle.write(f"0|/dir/file{n}|{n}|r/rrw-r--r--|0|0|{n}|{t}|{t + 1}|0|0\n")
+
+
+def test_spilled_sort_matches_stable_in_memory_sort(tmp_path):
+    rng = random.Random(1)
+    events = [
+        _event(rng.randrange(50), rng.choice(["custody", "filesystem"]), path=str(n))
+        for n in range(3000)
+    ]
+    spills = []
+    real_spill = timeline._spill_run
+
+    def counting_spill(*args):
+        spills.append(args[2])
+        return real_spill(*args)
+
+    with patch.object(timeline.EventBatch, "nbytes", lambda self: len(self) * 1024), \
+            patch.object(timeline, "_spill_run", side_effect=counting_spill):
+        merged = list(sort_events(iter(events), memory_mb=1, spill_dir=tmp_path))
+
+    assert len(spills) == 2
+    assert merged == sorted(events, key=lambda e: (e.timestamp_epoch, e.event_source))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_timeline_parses_body_file_lazily(tmp_path):
+    body = tmp_path / "body.txt"
+    _body_file(body, 500)
+    case_dir = tmp_path / "case"
+    case_dir.mkdir()
+
+    with patch.object(timeline.EventBatch, "nbytes", lambda self: len(self) * 64 * 1024):
+        events = list(stream_timeline(case_dir, mactime_file=body, memory_mb=1))
+
+    epochs = [event.timestamp_epoch for event in events]
+    assert len(events) == 1000  # atime and mtime per line
+    assert epochs == sorted(epochs)
+    assert events == timeline.build_timeline(case_dir, mactime_file=body)
+
+
+def test_event_batch_round_trips_and_sorts(tmp_path):
+    body = tmp_path / "body.txt"
+    _body_file(body, 300)
+    rng = random.Random(3)
+    events = list(timeline._iter_mactime_file(body))
+    events += [_event(rng.randrange(1_000_000, 2_000_000), "custody", path=str(n))
+               for n in range(200)]
+    events.append(TimelineEvent("", 0, "carving", "carved", "offset:0", "jpeg", 0, None, ""))
+    rng.shuffle(events)
+
+    batch = EventBatch(events)
+
+    assert len(batch) == len(events)
+    assert list(batch) == events
+    expected = sorted(events, key=lambda e: (e.timestamp_epoch, e.event_source))
+    assert [batch[i] for i in batch.argsort()] == expected
+    batch.sort()
+    assert list(batch) == expected
+    assert events_to_csv(batch) == events_to_csv(expected)
+    assert events_to_text(batch) == events_to_text(expected)
+
+
+def test_event_batch_is_smaller_than_event_objects(tmp_path):
+    body = tmp_path / "body.txt"
+    with body.open("w", encoding="utf-8") as handle:
+        for n in range(5000):
+            t = 1_700_000_000 + n
+            handle.write(f"0|/home/user/documents/report-{n}.docx|{n}|r/rrw-r--r--|0|0|"
+                         f"{n * 10}|{t}|{t + 1}|{t + 2}|{t + 3}\n")
+
+    tracemalloc.start()
+    try:
+        events = list(timeline._iter_mactime_file(body))
+        as_objects = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    batch = EventBatch(events)
+
+    # Every path is unique here; with repeated paths the ratio is far larger.
+    assert batch.nbytes() * 3 <= as_objects
+    assert list(batch) == events
+
+
+def test_write_events_streams_every_format():
+    events = [_event(1), _event(2, path="a" * 60)]
+
+    for fmt, render in (("csv", events_to_csv), ("text", events_to_text)):
+        buf = io.StringIO()
+        assert write_events(iter(events), buf, fmt) == 2
+        assert buf.getvalue() == render(events)
+
+    buf = io.StringIO()
+    write_events(iter(events), buf, "json")
+    assert [item["timestamp_epoch"] for item in json.loads(buf.getvalue())] == [1, 2]
+
+    empty = io.StringIO()
+    assert write_events(iter([]), empty, "json") == 0
+    assert empty.getvalue() == "[]"
+
+
+def test_timeline_command_streams_to_file(tmp_path):
+    from frece.cli import main
+
+    case_root = tmp_path / "cases"
+    (case_root / "TL").mkdir(parents=True)
+    body = tmp_path / "body.txt"
+    _body_file(body, 50)
+    out = tmp_path / "timeline.csv"
+
+    rc = main([
+        "timeline", "TL", "--root", str(case_root), "--format", "csv",
+        "--mactime-file", str(body), "--memory-mb", "1", "--output", str(out),
+    ])
+
+    assert rc == 0
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 101
+
+
+def _case_with_manifests(tmp_path):
+    case_dir = tmp_path / "case"
+    case_dir.mkdir()
+    (case_dir / "carve_manifest.json").write_text(json.dumps({
+        "source": "/dev/sda",
+        "timestamp": "2025-06-01T12:00:00Z",
+        "carved_files": [
+            {"file_type": "jpeg", "offset": 0, "size": 10},
+            {"file_type": "pdf", "offset": 512, "size": 20},
+        ],
+    }))
+    return case_dir
+
+
+def test_index_matches_parsed_timeline_and_filters(tmp_path):
+    case_dir = _case_with_manifests(tmp_path)
+    body = tmp_path / "body.txt"
+    _body_file(body, 200)
+
+    with TimelineIndex(default_index_path(case_dir)) as index:
+        index.refresh(case_dir, body)
+        indexed = list(index.query())
+        window = list(index.query(since=1_200_000, until=1_300_000, types=["modified"]))
+        carved = list(index.query(sources=["carving"], path_glob="offset:5*"))
+
+    parsed = list(stream_timeline(case_dir, mactime_file=body))
+    assert indexed == parsed
+    assert window == list(
+        filter_events(parsed, since=1_200_000, until=1_300_000, types=["modified"])
+    )
+    assert window and all(1_200_000 <= e.timestamp_epoch < 1_300_000 for e in window)
+    assert [e.artifact_type for e in carved] == ["pdf"]
+
+
+def test_refresh_reparses_only_changed_sources(tmp_path):
+    case_dir = _case_with_manifests(tmp_path)
+    body = tmp_path / "body.txt"
+    _body_file(body, 20)
+
+    with TimelineIndex(default_index_path(case_dir)) as index:
+        first = index.refresh(case_dir, body)
+        second = index.refresh(case_dir, body)
+        os.utime(body, ns=(1, 1))  # touched, same content
+        third = index.refresh(case_dir, body)
+        _body_file(body, 30, seed=9)
+        fourth = index.refresh(case_dir, body)
+        (case_dir / "carve_manifest.json").unlink()
+        fifth = index.refresh(case_dir, body)
+        events = list(index.query())
+
+    assert first["reindexed"] == 2
+    assert second == {"sources": 2, "reindexed": 0, "unchanged": 2, "removed": 0}
+    assert third["reindexed"] == 0
+    assert fourth["reindexed"] == 1
+    assert fifth["removed"] == 1
+    assert len(events) == 60
+
+
+def test_body_file_from_an_earlier_run_is_dropped(tmp_path):
+    case_dir = _case_with_manifests(tmp_path)
+    body = tmp_path / "body.txt"
+    _body_file(body, 20)
+
+    with TimelineIndex(default_index_path(case_dir)) as index:
+        index.refresh(case_dir, body)
+        stats = index.refresh(case_dir)
+        indexed = list(index.query())
+
+    assert stats["removed"] == 1
+    assert indexed == list(stream_timeline(case_dir))
+    assert not any(e.event_source == "filesystem" for e in indexed)
+
+
+def test_index_picks_up_new_custody_entries(tmp_path):
+    from frece.custody import CustodyDatabase
+
+    case_dir = _case_with_manifests(tmp_path)
+    db = CustodyDatabase(case_dir / "custody.db", b"k" * 32)
+    db.log_event("ACQUIRE", "EV1", "analyst", {})
+
+    with TimelineIndex(default_index_path(case_dir)) as index:
+        index.refresh(case_dir)
+        db.log_event("EXAMINE", "EV1", "analyst", {})
+        stats = index.refresh(case_dir)
+        custody = list(index.query(sources=["custody"]))
+
+    assert stats["reindexed"] == 1
+    assert [e.event_type for e in custody] == ["acquire", "examine"]
+
+
+def test_damaged_custody_rows_do_not_hide_the_rest(tmp_path):
+    import sqlite3
+
+    from frece.custody import CustodyDatabase
+
+    case_dir = tmp_path / "case"
+    case_dir.mkdir()
+    db = CustodyDatabase(case_dir / "custody.db", b"k" * 32)
+    for event in ("ACQUIRE", "EXAMINE", "EXPORT"):
+        db.log_event(event, "EV1", "analyst", {"step": event})
+    conn = sqlite3.connect(case_dir / "custody.db")
+    with conn:
+        conn.execute(
+            "UPDATE custody_log SET timestamp = 'garbage', details = '{bad' "
+            "WHERE event_type = 'EXAMINE'"
+        )
+    indexed = [e.event_type for e in stream_timeline(case_dir)]
+    with conn:  # an unmigrated copy without the time column
+        for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '%ts_epoch_us%'"
+        ).fetchall():
+            conn.execute(f"DROP INDEX {name}")
+        conn.execute("ALTER TABLE custody_log DROP COLUMN ts_epoch_us")
+    conn.close()
+    scanned = list(stream_timeline(case_dir))
+
+    assert sorted(indexed) == ["acquire", "examine", "export"]
+    assert [e.event_type for e in scanned] == ["examine", "acquire", "export"]
+    assert scanned[0].timestamp_epoch == 0
+
+
+def test_timeline_command_filters(tmp_path):
+    from frece.cli import main
+
+    case_root = tmp_path / "cases"
+    case_dir = case_root / "TL"
+    case_dir.mkdir(parents=True)
+    (case_dir / "carve_manifest.json").write_text(json.dumps({
+        "source": "/dev/sda",
+        "timestamp": "2025-06-01T12:00:00Z",
+        "carved_files": [{"file_type": "jpeg", "offset": 0, "size": 10}],
+    }))
+    out = tmp_path / "timeline.json"
+
+    for extra, expected in (
+        (["--from", "2025-06-01T11:00:00Z", "--to", "2025-06-01T13:00:00Z"], 1),
+        (["--from", "2025-06-01T12:00:01Z"], 0),
+        (["--no-index", "--source", "carving"], 1),
+    ):
+        rc = main(["timeline", "TL", "--root", str(case_root), "--format", "json",
+                   "--output", str(out), *extra])
+        assert rc == 0
+        assert len(json.loads(out.read_text())) == expected
+
+
+def test_timeline_command_reports_index_failure(tmp_path, capsys):
+    import sqlite3
+
+    from frece.cli import main
+
+    case_root = tmp_path / "cases"
+    case_dir = case_root / "TL"
+    case_dir.mkdir(parents=True)
+
+    def broken_query(self, **_):
+        raise sqlite3.DatabaseError("database disk image is malformed")
+        yield
+
+    with patch.object(TimelineIndex, "query", broken_query):
+        rc = main(["timeline", "TL", "--root", str(case_root),
+                   "--output", str(tmp_path / "timeline.json")])
+
+    assert rc != 0
+    assert "Timeline index query failed" in capsys.readouterr().err
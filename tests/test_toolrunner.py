@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Nakum-hub. All rights reserved. Proprietary and confidential.
+"""Tests for the shared external-tool runner (frece.toolrunner)."""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from frece.toolrunner import ToolRunner
+
+
+def _py(script: str) -> list[str]:
+    return [sys.executable, "-c", script]
+
+
+@pytest.fixture
+def runner():
+    tool_runner = ToolRunner(max_processes=2)
+    yield tool_runner
+    tool_runner.close()
+
+
+class TestRun:
+    def test_captures_stdout_stderr_and_status(self, runner):
+        result = runner.run(_py("import sys; print('out'); sys.stderr.write('err'); sys.exit(3)"))
+        assert result.returncode == 3
+        assert result.stdout.strip() == "out"
+        assert result.stderr == "err"
+
+    def test_timeout_kills_and_raises(self, runner):
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            runner.run(_py("import time; time.sleep(30)"), timeout=0.5)
+        assert time.monotonic() - started < 10
+        assert runner.metrics()["live"] == 0
+
+    def test_missing_tool_raises_file_not_found(self, runner):
+        with pytest.raises(FileNotFoundError):
+            runner.run(["frece-no-such-tool"])
+        assert runner.metrics()["tools"]["frece-no-such-tool"]["not_found"] == 1
+
+    def test_run_to_file_writes_stdout(self, runner, tmp_path):
+        dest = tmp_path / "out.bin"
+        with open(dest, "wb") as handle:
+            result = runner.run_to_file(
+                _py("import sys; sys.stdout.buffer.write(b'\\x00\\xffdata')"), handle
+            )
+        assert result.returncode == 0
+        assert dest.read_bytes() == b"\x00\xffdata"
+
+
+class TestStream:
+    def test_streams_lines_then_reports_status(self, runner):
+        script = "import sys\nfor i in range(20000): print(f'line {i}')\nsys.exit(2)"
+        with runner.stream(_py(script)) as stream:
+            lines = list(stream)
+        assert len(lines) == 20000
+        assert lines[0] == "line 0\n"
+        assert lines[-1] == "line 19999\n"
+        assert stream.returncode == 2
+        assert not stream.timed_out
+
+    def test_early_close_kills_child(self, runner):
+        script = "import time\nwhile True:\n    print('x' * 1000, flush=True)\n    time.sleep(0.001)"
+        with runner.stream(_py(script)) as stream:
+            next(iter(stream))
+        assert stream.returncode is not None
+        assert runner.metrics()["live"] == 0
+
+    def test_early_close_after_child_fills_the_queue(self, runner):
+        # One 64 KiB chunk more than the queue holds, so the pump reaches EOF
+        # with the queue full once the consumer has taken the first chunk.
+        script = "import sys\nsys.stdout.write(('x' * 1023 + '\\n') * 1088)"
+        stream = runner.stream(_py(script))
+        next(iter(stream))
+        time.sleep(0.5)  # let the child exit with the queue full
+        closer = threading.Thread(target=stream.close, daemon=True)
+        closer.start()
+        closer.join(timeout=10)
+        assert not closer.is_alive()
+        assert stream.returncode == 0
+        assert runner.metrics()["live"] == 0
+
+    def test_stream_timeout_is_reported(self, runner):
+        with runner.stream(_py("import time; time.sleep(30)"), timeout=0.5) as stream:
+            assert list(stream) == []
+        assert stream.timed_out
+
+
+class TestProcessCap:
+    def test_concurrent_calls_respect_limit(self, runner):
+        errors = []
+
+        def _call():
+            try:
+                runner.run(_py("import time; time.sleep(0.2)"))
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = runner.metrics()
+        assert not errors
+        assert metrics["peak"] == 2
+        (stats,) = metrics["tools"].values()
+        assert stats["spawned"] == 6
+        assert stats["exit_codes"] == {"0": 6}
+
+    def test_limit_never_drops_below_two(self, runner):
+        runner.set_limit(1)
+        assert runner.limit == 2